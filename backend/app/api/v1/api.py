@@ -6,7 +6,7 @@ Import và đăng ký tất cả các routers cho API version 1.
 from fastapi import APIRouter
 
 from app.api.v1.routes import (
-    Room, RoomType, Auth, Address, Building, Contract, Payment, Invoice, User, Maintenance, Appointment, Notification, Dashboard
+    Room, RoomType, Auth, Address, Building, Contract, Payment, Invoice, User, Maintenance, Appointment, Notification, Dashboard, Media
 )
 
 # Tạo main API router cho v1
@@ -26,3 +26,4 @@ api_router.include_router(Maintenance.router)
 api_router.include_router(Appointment.router)
 api_router.include_router(Notification.router)
 api_router.include_router(Dashboard.router)
+api_router.include_router(Media.router)
@@ -7,7 +7,7 @@ from datetime import datetime
 from fastapi import APIRouter, Depends, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.infrastructure.db.session import get_db
+from app.infrastructure.db.session import get_async_db
 from app.core.security import get_current_user
 from app.core.exceptions import (
     BadRequestException,
@@ -48,14 +48,14 @@ router = APIRouter(prefix="/appointments", tags=["Appointment Management"])
     **Lưu ý:** Thời gian đặt lịch phải trong tương lai.
     """,
 )
-def create_appointment(
-    appointment_data: AppointmentCreate, session: AsyncSession = Depends(get_db)
+async def create_appointment(
+    appointment_data: AppointmentCreate, session: AsyncSession = Depends(get_async_db)
 ):
     """Tạo appointment mới (không cần đăng nhập)."""
     try:
 
         service = AppointmentService(session)
-        appointment = service.create_appointment(appointment_data)
+        appointment = await service.create_appointment(appointment_data)
 
         return response.success(
             data=AppointmentResponse.model_validate(appointment),
@@ -85,7 +85,7 @@ def create_appointment(
     - to_date: Lọc đến ngày
     """,
 )
-def get_appointments(
+async def get_appointments(
     page: int = Query(1, ge=1, description="Số trang (bắt đầu từ 1)"),
     pageSize: int = Query(20, ge=1, le=100, description="Số bản ghi mỗi trang"),
     status: Optional[str] = Query(None, description="Lọc theo trạng thái"),
@@ -93,7 +93,7 @@ def get_appointments(
     from_date: Optional[datetime] = Query(None, description="Từ ngày"),
     to_date: Optional[datetime] = Query(None, description="Đến ngày"),
     current_user: User = Depends(get_current_user),
-    session: AsyncSession = Depends(get_db),
+    session: AsyncSession = Depends(get_async_db),
 ):
     """Lấy danh sách appointments (admin only)."""
     try:
@@ -107,7 +107,7 @@ def get_appointments(
         offset = (page - 1) * pageSize
 
         service = AppointmentService(session)
-        appointments = service.get_appointments(
+        appointments = await service.get_appointments(
             skip=offset,
             limit=pageSize,
             status=status,
@@ -116,7 +116,7 @@ def get_appointments(
             to_date=to_date,
         )
 
-        totalItems = service.count_appointments(status=status, room_id=room_id)
+        totalItems = await service.count_appointments(status=status, room_id=room_id)
         totalPages = (totalItems + pageSize - 1) // pageSize if totalItems > 0 else 1
 
         # Convert to list response with room info
@@ -162,9 +162,9 @@ def get_appointments(
     summary="Lấy danh sách appointments chờ xử lý (Admin only)",
     description="API lấy danh sách appointments đang ở trạng thái PENDING",
 )
-def get_pending_appointments(
+async def get_pending_appointments(
     current_user: User = Depends(get_current_user),
-    session: AsyncSession = Depends(get_db),
+    session: AsyncSession = Depends(get_async_db),
 ):
     """Lấy appointments chờ xử lý."""
     try:
@@ -175,7 +175,7 @@ def get_pending_appointments(
             )
 
         service = AppointmentService(session)
-        appointments = service.get_pending_appointments()
+        appointments = await service.get_pending_appointments()
 
         # Convert to response
         appointment_list = []
@@ -216,10 +216,10 @@ def get_pending_appointments(
     - phone: Số điện thoại đã dùng khi đặt lịch
     """,
 )
-def get_my_appointments(
+async def get_my_appointments(
     email: Optional[str] = Query(None, description="Email đã đặt lịch"),
     phone: Optional[str] = Query(None, description="Số điện thoại đã đặt lịch"),
-    session: AsyncSession = Depends(get_db),
+    session: AsyncSession = Depends(get_async_db),
 ):
     """Tra cứu lịch hẹn theo email hoặc phone."""
     try:
@@ -229,7 +229,7 @@ def get_my_appointments(
             )
 
         service = AppointmentService(session)
-        appointments = service.get_appointments_by_contact(email=email, phone=phone)
+        appointments = await service.get_appointments_by_contact(email=email, phone=phone)
 
         # Convert to response with room info
         appointment_list = []
@@ -268,10 +268,10 @@ def get_my_appointments(
     summary="Xem chi tiết appointment (Admin only)",
     description="API lấy thông tin chi tiết của một appointment",
 )
-def get_appointment(
+async def get_appointment(
     appointment_id: UUID,
     current_user: User = Depends(get_current_user),
-    session: AsyncSession = Depends(get_db),
+    session: AsyncSession = Depends(get_async_db),
 ):
     """Lấy chi tiết appointment."""
     try:
@@ -282,7 +282,7 @@ def get_appointment(
             )
 
         service = AppointmentService(session)
-        appointment = service.get_appointment(appointment_id)
+        appointment = await service.get_appointment(appointment_id)
 
         if not appointment:
             raise NotFoundException(
@@ -327,11 +327,11 @@ def get_appointment(
     - CANCELLED: Đã hủy
     """,
 )
-def update_appointment(
+async def update_appointment(
     appointment_id: UUID,
     update_data: AppointmentUpdate,
     current_user: User = Depends(get_current_user),
-    session: AsyncSession = Depends(get_db),
+    session: AsyncSession = Depends(get_async_db),
 ):
     """Cập nhật appointment (admin only)."""
     try:
@@ -342,7 +342,7 @@ def update_appointment(
             )
 
         service = AppointmentService(session)
-        appointment = service.update_appointment_status(
+        appointment = await service.update_appointment_status(
             appointment_id, update_data, current_user.id
         )
 
@@ -370,10 +370,10 @@ def update_appointment(
     summary="Xóa appointment (Admin only)",
     description="API xóa appointment khỏi hệ thống",
 )
-def delete_appointment(
+async def delete_appointment(
     appointment_id: UUID,
     current_user: User = Depends(get_current_user),
-    session: AsyncSession = Depends(get_db),
+    session: AsyncSession = Depends(get_async_db),
 ):
     """Xóa appointment (admin only)."""
     try:
@@ -384,7 +384,7 @@ def delete_appointment(
             )
 
         service = AppointmentService(session)
-        success = service.delete_appointment(appointment_id)
+        success = await service.delete_appointment(appointment_id)
 
         if not success:
             raise NotFoundException(
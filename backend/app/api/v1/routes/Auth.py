@@ -1,8 +1,9 @@
 from fastapi import APIRouter, Depends
 from email_validator import validate_email
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.infrastructure.db.session import get_db
+from app.infrastructure.db.session import get_async_db, get_db
 from app.core import response
 from app.schemas.auth_schema import TokenRefreshRequest, Token
 from app.schemas.user_schema import UserCreate, UserLogin, UserRegister, UserOut
@@ -23,7 +24,7 @@ router = APIRouter(prefix="/auth", tags=["Authentication"])
 
 
 @router.post("/register")
-async def register(user_data: UserRegister, db: Session = Depends(get_db)):
+async def register(user_data: UserRegister, db: AsyncSession = Depends(get_async_db)):
     """
     Đăng ký tài khoản CUSTOMER (public registration).
 
@@ -75,7 +76,7 @@ async def register(user_data: UserRegister, db: Session = Depends(get_db)):
         raise BadRequestException(message=msg)
 
     auth_service = AuthService(db)
-    ok, msg, payload = auth_service.register_user(user_data)
+    ok, msg, payload = await auth_service.register_user(user_data)
     if not ok:
         raise BadRequestException(message=msg)
     
@@ -83,7 +84,7 @@ async def register(user_data: UserRegister, db: Session = Depends(get_db)):
 
 
 @router.post("/login")
-async def login(credentials: UserLogin, db: Session = Depends(get_db)):
+async def login(credentials: UserLogin, db: AsyncSession = Depends(get_async_db)):
     """
     Login with email/password and receive access + refresh tokens.
 
@@ -109,7 +110,7 @@ async def login(credentials: UserLogin, db: Session = Depends(get_db)):
         raise BadRequestException(message=msg)
 
     auth_service = AuthService(db)
-    auth = auth_service.login(email, password)
+    auth = await auth_service.login(email, password)
     
     if not auth:
         raise UnauthorizedException(message="Sai mật khẩu hoặc email")
@@ -121,7 +122,7 @@ async def login(credentials: UserLogin, db: Session = Depends(get_db)):
 
 
 @router.post("/refresh")
-async def refresh(payload: TokenRefreshRequest, db: Session = Depends(get_db)):
+def refresh(payload: TokenRefreshRequest, db: Session = Depends(get_db)):
     """Exchange refresh token for a new access token."""
     token = payload.refresh_token
     if not token:
@@ -137,7 +138,7 @@ async def refresh(payload: TokenRefreshRequest, db: Session = Depends(get_db)):
 
 
 @router.post("/create-tenant")
-async def create_tenant(
+def create_tenant(
     tenant_data: UserCreate,
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
@@ -186,7 +187,7 @@ async def create_tenant(
 
 
 @router.get("/me")
-async def get_current_user_info(
+def get_current_user_info(
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
@@ -202,6 +203,13 @@ async def get_current_user_info(
     **Yêu cầu**: Bearer token hợp lệ
     """
     try:
+        # current_user chỉ là principal rút gọn - load đầy đủ user + documents
+        from app.repositories.user_repository import UserRepository
+
+        current_user = UserRepository(db).get_by_id(current_user.id)
+        if not current_user:
+            raise NotFoundException(message="Không tìm thấy người dùng")
+
         # Ensure role is loaded
         if current_user.role:
             # Manually set role_name and role (role_code)
@@ -247,5 +255,7 @@ async def get_current_user_info(
             message="Lấy thông tin người dùng thành công",
             data=user_dict,
         )
+    except NotFoundException:
+        raise
     except Exception as e:
         raise InternalServerException(message=f"Lỗi hệ thống: {str(e)}")
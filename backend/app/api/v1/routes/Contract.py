@@ -7,6 +7,10 @@ Endpoints:
 - GET    /api/v1/contracts/{id}         - Chi tiết hợp đồng
 - PUT    /api/v1/contracts/{id}         - Cập nhật hợp đồng
 - DELETE /api/v1/contracts/{id}         - Xóa hợp đồng
+
+Route chỉ đọc/ghi qua ContractService là ``def`` (chạy trong threadpool). Route
+có gửi thông báo là ``async def``: ContractService (Session đồng bộ) được gọi
+qua ``run_in_threadpool``, NotificationService dùng AsyncSession riêng.
 """
 
 from __future__ import annotations
@@ -15,9 +19,11 @@ from typing import Optional
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.infrastructure.db.session import get_db
+from app.infrastructure.db.session import get_async_db, get_db
 from app.services.ContractService import ContractService
 from app.services.NotificationService import NotificationService
 from app.schemas.contract_schema import (
@@ -62,7 +68,7 @@ router = APIRouter(prefix="/contracts", tags=["Contracts"])
         }
     }
 )
-async def get_contract_stats(session: Session = Depends(get_db)):
+def get_contract_stats(session: Session = Depends(get_db)):
     """Lấy thống kê hợp đồng cho dashboard.
 
     **Hiển thị trên UI:**
@@ -114,7 +120,7 @@ async def get_contract_stats(session: Session = Depends(get_db)):
         }
     }
 )
-async def get_available_rooms_for_contract(
+def get_available_rooms_for_contract(
     building_id: UUID,
     session: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
@@ -177,7 +183,7 @@ async def get_available_rooms_for_contract(
         }
     }
 )
-async def get_room_info_for_contract(
+def get_room_info_for_contract(
     room_id: UUID,
     session: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
@@ -245,7 +251,7 @@ async def get_room_info_for_contract(
         }
     }
 )
-async def list_contracts(
+def list_contracts(
     page: int = Query(1, ge=1, description="Số trang (bắt đầu từ 1)"),
     pageSize: int = Query(20, ge=1, le=100, description="Số items mỗi trang"),
     status: Optional[str] = Query(
@@ -255,6 +261,11 @@ async def list_contracts(
     search: Optional[str] = Query(
         None, description="Tìm kiếm theo mã hợp đồng, tên khách hàng, số điện thoại"
     ),
+    cursor: Optional[str] = Query(
+        None,
+        description="Cursor pagination: truyền rỗng cho trang đầu, sau đó dùng next_cursor (bỏ qua page)",
+    ),
+    include_total: bool = Query(False, description="Chế độ cursor: trả kèm totalItems (chạy thêm COUNT)"),
     session: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
@@ -266,6 +277,7 @@ async def list_contracts(
     - `status`: Lọc theo trạng thái (ACTIVE, EXPIRED, TERMINATED, PENDING)
     - `building`: Lọc theo tên tòa nhà (tìm kiếm gần đúng)
     - `search`: Tìm kiếm theo mã hợp đồng / tên khách hàng / số điện thoại
+    - `cursor`, `include_total`: Keyset pagination (opt-in), response có `next_cursor`
 
     """
     try:
@@ -277,6 +289,8 @@ async def list_contracts(
             building=building,
             search=search,
             current_user=current_user,
+            cursor=cursor,
+            include_total=include_total,
         )
         return response.success(data=result, message="success")
     except ValueError as e:
@@ -288,7 +302,11 @@ async def list_contracts(
 @router.post(
     "/", response_model=Response[ContractOut], status_code=status.HTTP_201_CREATED
 )
-async def create_contract(payload: ContractCreate, session: Session = Depends(get_db)):
+async def create_contract(
+    payload: ContractCreate,
+    session: Session = Depends(get_db),
+    notify_session: AsyncSession = Depends(get_async_db),
+):
     """Tạo hợp đồng mới.
 
     **Request Body (ContractCreate):**
@@ -321,13 +339,13 @@ async def create_contract(payload: ContractCreate, session: Session = Depends(ge
     - Tự động gửi thông báo cho tenant
     """
     service = ContractService(session)
-    notification_service = NotificationService(session)
+    notification_service = NotificationService(notify_session)
     
     try:
         # TODO: Lấy user_id từ JWT token khi có authentication
         created_by = None  # Placeholder
 
-        contract = service.create_contract(payload, created_by)
+        contract = await run_in_threadpool(service.create_contract, payload, created_by)
         
         # Gửi thông báo cho tenant
         try:
@@ -348,7 +366,7 @@ async def create_contract(payload: ContractCreate, session: Session = Depends(ge
 
 
 @router.get("/{contract_id}", response_model=Response[ContractOut])
-async def get_contract(contract_id: UUID, session: Session = Depends(get_db)):
+def get_contract(contract_id: UUID, session: Session = Depends(get_db)):
     """Lấy chi tiết hợp đồng theo ID.
 
     **Path Parameters:**
@@ -371,6 +389,7 @@ async def update_contract(
     payload: ContractUpdate, 
     reason: Optional[str] = Query(None, description="Lý do thay đổi (hiển thị cho tenant)"),
     session: Session = Depends(get_db),
+    notify_session: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
 ):
     """Cập nhật hợp đồng (partial update).
@@ -411,9 +430,10 @@ async def update_contract(
     - `pending_change`: Thông tin pending change (nếu có)
     """
     service = ContractService(session)
-    notification_service = NotificationService(session)
+    notification_service = NotificationService(notify_session)
     try:
-        result = service.request_contract_update(
+        result = await run_in_threadpool(
+            service.request_contract_update,
             contract_id=contract_id,
             data=payload,
             requester_id=current_user.id,
@@ -448,7 +468,7 @@ async def update_contract(
 
 
 @router.delete("/{contract_id}", response_model=Response[dict])
-async def delete_contract(contract_id: UUID, session: Session = Depends(get_db)):
+def delete_contract(contract_id: UUID, session: Session = Depends(get_db)):
     """Xóa hợp đồng.
 
     **Path Parameters:**
@@ -475,6 +495,7 @@ async def delete_contract(contract_id: UUID, session: Session = Depends(get_db))
 async def request_termination(
     contract_id: UUID,
     session: Session = Depends(get_db),
+    notify_session: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
 ):
     """Gửi yêu cầu chấm dứt hợp đồng.
@@ -488,9 +509,10 @@ async def request_termination(
     - Gửi thông báo cho bên còn lại.
     """
     service = ContractService(session)
-    notification_service = NotificationService(session)
+    notification_service = NotificationService(notify_session)
     try:
-        contract, requester_role = await service.request_contract_termination(
+        contract, requester_role = await run_in_threadpool(
+            service.request_contract_termination,
             contract_id=contract_id,
             requester_id=current_user.id,
             current_user=current_user
@@ -517,6 +539,7 @@ async def request_termination(
 async def approve_termination(
     contract_id: UUID,
     session: Session = Depends(get_db),
+    notify_session: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
 ):
     """Phê duyệt yêu cầu chấm dứt hợp đồng.
@@ -531,9 +554,10 @@ async def approve_termination(
     - Gửi thông báo xác nhận cho cả hai bên.
     """
     service = ContractService(session)
-    notification_service = NotificationService(session)
+    notification_service = NotificationService(notify_session)
     try:
-        contract = await service.approve_contract_termination(
+        contract = await run_in_threadpool(
+            service.approve_contract_termination,
             contract_id=contract_id,
             approver_id=current_user.id,
             current_user=current_user
@@ -612,7 +636,7 @@ async def approve_termination(
         }
     }
 )
-async def get_room_tenants(room_id: UUID, session: Session = Depends(get_db)):
+def get_room_tenants(room_id: UUID, session: Session = Depends(get_db)):
     """Lấy thông tin tất cả người thuê trong phòng (hỗ trợ phòng ở ghép).
     
     **Path Parameters:**
@@ -646,6 +670,7 @@ async def get_room_tenants(room_id: UUID, session: Session = Depends(get_db)):
 async def confirm_contract(
     contract_id: UUID,
     session: Session = Depends(get_db),
+    notify_session: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
 ):
     """Tenant xác nhận hợp đồng PENDING → Kích hoạt hợp đồng.
@@ -660,9 +685,9 @@ async def confirm_contract(
     - Phòng sẽ chuyển sang OCCUPIED
     """
     service = ContractService(session)
-    notification_service = NotificationService(session)
+    notification_service = NotificationService(notify_session)
     try:
-        contract = service.confirm_contract(contract_id, current_user.id)
+        contract = await run_in_threadpool(service.confirm_contract, contract_id, current_user.id)
         
         # Gửi thông báo cho admin/landlord
         try:
@@ -688,6 +713,7 @@ async def confirm_contract(
 async def reject_contract(
     contract_id: UUID,
     session: Session = Depends(get_db),
+    notify_session: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
 ):
     """Tenant từ chối hợp đồng PENDING → Xóa hợp đồng.
@@ -702,12 +728,12 @@ async def reject_contract(
     - Phòng sẽ chuyển về AVAILABLE
     """
     service = ContractService(session)
-    notification_service = NotificationService(session)
+    notification_service = NotificationService(notify_session)
     try:
         # Lấy thông tin trước khi xóa
-        contract = service.get_contract(contract_id)
+        contract = await run_in_threadpool(service.get_contract, contract_id)
         
-        service.reject_contract(contract_id, current_user.id)
+        await run_in_threadpool(service.reject_contract, contract_id, current_user.id)
         
         # Gửi thông báo cho admin/landlord
         try:
@@ -735,6 +761,7 @@ async def reject_contract(
 async def confirm_contract_update(
     contract_id: UUID,
     session: Session = Depends(get_db),
+    notify_session: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
 ):
     """Tenant xác nhận thay đổi hợp đồng → Áp dụng pending changes.
@@ -749,9 +776,9 @@ async def confirm_contract_update(
     - Hợp đồng chuyển về ACTIVE
     """
     service = ContractService(session)
-    notification_service = NotificationService(session)
+    notification_service = NotificationService(notify_session)
     try:
-        contract = service.confirm_contract_update(contract_id, current_user.id)
+        contract = await run_in_threadpool(service.confirm_contract_update, contract_id, current_user.id)
         
         # Gửi thông báo cho admin/landlord
         try:
@@ -777,6 +804,7 @@ async def confirm_contract_update(
 async def reject_contract_update(
     contract_id: UUID,
     session: Session = Depends(get_db),
+    notify_session: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
 ):
     """Tenant từ chối thay đổi hợp đồng → Giữ nguyên hợp đồng cũ.
@@ -791,9 +819,9 @@ async def reject_contract_update(
     - Hợp đồng chuyển về ACTIVE
     """
     service = ContractService(session)
-    notification_service = NotificationService(session)
+    notification_service = NotificationService(notify_session)
     try:
-        contract = service.reject_contract_update(contract_id, current_user.id)
+        contract = await run_in_threadpool(service.reject_contract_update, contract_id, current_user.id)
         
         # Gửi thông báo cho admin/landlord
         try:
@@ -816,7 +844,7 @@ async def reject_contract_update(
 
 
 @router.get("/{contract_id}/pending-changes", response_model=Response[list])
-async def get_pending_changes(
+def get_pending_changes(
     contract_id: UUID,
     session: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
@@ -8,6 +8,8 @@ from sqlalchemy.orm import Session
 from typing import Optional
 from uuid import UUID
 
+from app.core.settings import settings
+from app.infrastructure.db.pool_metrics import pool_stats
 from app.infrastructure.db.session import get_db
 from app.core import response
 from app.core.security import get_current_user
@@ -38,6 +40,10 @@ def get_dashboard_stats(
     - Contract stats (tổng HĐ, sắp hết hạn, active)
     - Recent activities (thanh toán, yêu cầu hủy HĐ, sự cố mới)
     - Pending appointments
+    - meta: thời gian chạy từng section (timings_ms), section lỗi/timeout (errors), partial
+    
+    Các section chạy song song; section quá DASHBOARD_SECTION_TIMEOUT_SECONDS
+    được bỏ qua (trả null/[]) thay vì làm chậm cả response.
     """
     try:
         # Chỉ admin mới được truy cập
@@ -77,3 +83,39 @@ def get_dashboard_stats(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Lỗi khi lấy dữ liệu dashboard: {str(e)}"
         )
+
+
+@router.get("/db-pool", status_code=status.HTTP_200_OK)
+def get_db_pool_stats(current_user: User = Depends(get_current_user)):
+    """
+    Số liệu connection pool của worker hiện tại (engine sync và async)
+
+    Trả về cho mỗi engine:
+    - connects, checkouts, checkins, invalidations, timeouts (cộng dồn từ lúc khởi động)
+    - wait_avg_ms / wait_max_ms: thời gian chờ lấy connection
+    - size, checkedin, checkedout, overflow: trạng thái tức thời (null với NullPool)
+    - config: cấu hình pool đang áp dụng
+
+    Dùng để cân (DB_POOL_SIZE + DB_MAX_OVERFLOW) x số worker với max_connections.
+    """
+    if not is_admin(current_user):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Chỉ admin mới có quyền xem thông tin connection pool"
+        )
+
+    return response.success(
+        data={
+            "engines": pool_stats(),
+            "config": {
+                "pool_size": settings.DB_POOL_SIZE,
+                "max_overflow": settings.DB_MAX_OVERFLOW,
+                "pool_timeout_seconds": settings.DB_POOL_TIMEOUT_SECONDS,
+                "pool_recycle_seconds": settings.DB_POOL_RECYCLE_SECONDS,
+                "pool_pre_ping": settings.DB_POOL_PRE_PING,
+                "statement_timeout_ms": settings.DB_STATEMENT_TIMEOUT_MS,
+                "pgbouncer_mode": settings.DB_PGBOUNCER_MODE,
+            },
+        },
+        message="Lấy thông tin connection pool thành công"
+    )
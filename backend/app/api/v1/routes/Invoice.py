@@ -3,6 +3,8 @@
 Các endpoint tuân thủ REST conventions:
 - GET /invoices - Lấy danh sách hóa đơn
 - POST /invoices - Tạo hóa đơn mới
+- POST /invoices/generate-monthly - Lập hóa đơn tháng hàng loạt
+- POST /invoices/meter-readings/import - Import chỉ số điện từ file CSV/XLSX
 - GET /invoices/{invoice_id} - Xem chi tiết hóa đơn
 - PUT /invoices/{invoice_id} - Cập nhật hóa đơn
 - GET /invoices/buildings - Lấy danh sách tòa nhà cho dropdown
@@ -11,13 +13,17 @@ Các endpoint tuân thủ REST conventions:
 
 from __future__ import annotations
 
+from datetime import date
 from typing import Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, Query, status
+from fastapi import APIRouter, Depends, File, Form, Query, UploadFile, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.infrastructure.db.session import get_db
+from app.infrastructure.db.session import get_async_db, get_db
 from app.core.security import get_current_user
+from app.core.settings import settings
 from app.models.user import User
 from app.core.exceptions import (
     BadRequestException,
@@ -28,9 +34,11 @@ from app.core.exceptions import (
 )
 from app.schemas.invoice_schema import (
     InvoiceCreate, InvoiceUpdate, InvoiceOut, InvoiceListItem,
-    BuildingOption, RoomOption
+    BuildingOption, RoomOption, InvoiceBulkCreate, InvoiceBulkResult
 )
+from app.schemas.meter_reading_schema import MeterReadingImportResult
 from app.services.InvoiceService import InvoiceService
+from app.services.MeterReadingService import MeterReadingService
 from app.services.NotificationService import NotificationService
 from app.core import response
 from app.schemas.response_schema import Response
@@ -100,8 +108,18 @@ def get_rooms_by_building(
 def list_invoices(
     invoice_status: Optional[str] = Query(None, description="Lọc theo trạng thái", alias="status"),
     building_id: Optional[UUID] = Query(None, description="Lọc theo tòa nhà (chỉ admin)"),
+    sort_by: Optional[str] = Query(
+        None,
+        description="Sắp xếp theo (amount_asc, amount_desc). Mặc định: hóa đơn mới nhất trước",
+        regex="^(amount_asc|amount_desc)$"
+    ),
     page: int = Query(1, ge=1, description="Số trang (bắt đầu từ 1)"),
     pageSize: int = Query(20, ge=1, le=100, description="Số items mỗi trang"),
+    cursor: Optional[str] = Query(
+        None,
+        description="Cursor pagination: truyền rỗng cho trang đầu, sau đó dùng next_cursor (bỏ qua page)",
+    ),
+    include_total: bool = Query(False, description="Chế độ cursor: trả kèm totalItems (chạy thêm COUNT)"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -113,7 +131,9 @@ def list_invoices(
     Query params:
     - status: PENDING, PAID, OVERDUE, CANCELLED
     - building_id: UUID (chỉ admin)
+    - sort_by: amount_asc (tổng tiền tăng dần), amount_desc (giảm dần), mặc định là mới nhất
     - page, pageSize: Pagination
+    - cursor, include_total: Keyset pagination (opt-in), response có next_cursor
     """
     try:
         user_role = current_user.role.role_code if current_user.role else "CUSTOMER"
@@ -124,8 +144,11 @@ def list_invoices(
             user_role=user_role,
             status=invoice_status,
             building_id=building_id,
+            sort_by=sort_by,
             page=page,
-            pageSize=pageSize
+            pageSize=pageSize,
+            cursor=cursor,
+            include_total=include_total
         )
         return response.success(data=result, message="Lấy danh sách hóa đơn thành công")
     except ValueError as e:
@@ -144,6 +167,7 @@ def list_invoices(
 async def create_invoice(
     invoice_data: InvoiceCreate,
     db: Session = Depends(get_db),
+    notify_session: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Tạo hóa đơn mới.
@@ -174,9 +198,9 @@ async def create_invoice(
             raise ForbiddenException(message="Chỉ chủ nhà mới có quyền tạo hóa đơn")
         
         invoice_service = InvoiceService(db)
-        notification_service = NotificationService(db)
+        notification_service = NotificationService(notify_session)
         
-        invoice = invoice_service.create_invoice(invoice_data, current_user.id)
+        invoice = await run_in_threadpool(invoice_service.create_invoice, invoice_data, current_user.id)
         
         # Gửi thông báo cho tenant
         try:
@@ -203,6 +227,133 @@ async def create_invoice(
         raise InternalServerException(message=f"Lỗi hệ thống: {str(e)}")
 
 
+@router.post(
+    "/generate-monthly",
+    response_model=Response[InvoiceBulkResult],
+    status_code=status.HTTP_201_CREATED,
+    summary="Lập hóa đơn tháng hàng loạt",
+    description="Chủ nhà lập hóa đơn tháng cho mọi hợp đồng ACTIVE của một tòa nhà (hoặc tất cả)"
+)
+async def generate_monthly_invoices(
+    payload: InvoiceBulkCreate,
+    db: Session = Depends(get_db),
+    notify_session: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Lập hóa đơn tháng hàng loạt.
+    
+    Chỉ chủ nhà (ADMIN). Hợp đồng đã có hóa đơn tháng này được bỏ qua; chỉ số
+    điện cũ lấy từ hóa đơn gần nhất nếu không nhập. Tất cả hóa đơn được lưu
+    trong một transaction, sau đó gửi thông báo cho các tenant.
+    
+    Request body:
+    {
+        "billing_month": "2025-01-01",
+        "due_date": "2025-01-15",
+        "building_id": "uuid",  // bỏ trống = tất cả tòa nhà
+        "readings": [
+            {"room_id": "uuid", "electricity_new_index": 150},
+            {"room_id": "uuid", "electricity_new_index": 320, "number_of_people": 3}
+        ]
+    }
+    
+    Returns:
+        InvoiceBulkResult: số hóa đơn đã tạo/bỏ qua/lỗi và kết quả từng hợp đồng
+    """
+    user_role = current_user.role.role_code if current_user.role else "CUSTOMER"
+    if user_role != "ADMIN":
+        raise ForbiddenException(message="Chỉ chủ nhà mới có quyền tạo hóa đơn")
+    
+    try:
+        invoice_service = InvoiceService(db)
+        result = await run_in_threadpool(invoice_service.generate_monthly_invoices, payload, current_user.id)
+        
+        # Gửi thông báo cho tenant (một lần commit cho tất cả)
+        try:
+            created = [item for item in result.items if item.status == "CREATED" and item.tenant_id]
+            if created:
+                await NotificationService(notify_session).create_invoice_notifications([
+                    {
+                        "user_id": item.tenant_id,
+                        "invoice_id": item.invoice_id,
+                        "invoice_number": item.invoice_number,
+                        "amount": float(item.total_amount or 0),
+                        "due_date": payload.due_date.strftime("%d/%m/%Y"),
+                    }
+                    for item in created
+                ])
+        except Exception as notify_error:
+            # Hóa đơn đã lưu - lỗi gửi thông báo không làm hỏng kết quả
+            print(f"Warning: Failed to send notifications: {notify_error}")
+        
+        return response.created(
+            data=result,
+            message=f"Đã tạo {result.created} hóa đơn, bỏ qua {result.skipped}, lỗi {result.failed}"
+        )
+    except ValueError as e:
+        raise BadRequestException(message=str(e))
+    except Exception as e:
+        raise InternalServerException(message=f"Lỗi hệ thống: {str(e)}")
+
+
+@router.post(
+    "/meter-readings/import",
+    response_model=Response[MeterReadingImportResult],
+    status_code=status.HTTP_200_OK,
+    summary="Import chỉ số điện từ file",
+    description="Chủ nhà tải file CSV/XLSX chỉ số điện tháng; các dòng hợp lệ được lưu để lập hóa đơn hàng loạt"
+)
+async def import_meter_readings(
+    file: UploadFile = File(..., description="File CSV hoặc XLSX"),
+    billing_month: date = Form(..., description="Tháng tính tiền (YYYY-MM-DD)"),
+    building_id: Optional[UUID] = Form(None, description="Tòa nhà (bắt buộc nếu file dùng số phòng)"),
+    dry_run: bool = Form(False, description="Chỉ kiểm tra, không lưu"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Import chỉ số điện tháng từ file.
+    
+    Cột của file (không phân biệt hoa thường/dấu):
+    - room_number (hoặc "Số phòng") hoặc contract_number (hoặc "Mã hợp đồng")
+    - new_index (hoặc "Chỉ số mới"), tùy chọn old_index, reading_date
+    
+    Mỗi dòng được kiểm tra: phòng tồn tại và có hợp đồng ACTIVE, chưa có hóa
+    đơn tháng này, chỉ số mới >= chỉ số cũ (cũ lấy từ hóa đơn gần nhất), tiêu
+    thụ bất thường so với trung bình các tháng trước (chỉ cảnh báo). Dòng không
+    lỗi được lưu và được dùng khi gọi POST /invoices/generate-monthly.
+    
+    Returns:
+        MeterReadingImportResult: số dòng đã lưu và lỗi/cảnh báo theo dòng
+    """
+    user_role = current_user.role.role_code if current_user.role else "CUSTOMER"
+    if user_role != "ADMIN":
+        raise ForbiddenException(message="Chỉ chủ nhà mới có quyền nhập chỉ số điện")
+    if file.size is not None and file.size > settings.METER_IMPORT_MAX_BYTES:
+        raise BadRequestException(
+            message=f"File vượt quá {settings.METER_IMPORT_MAX_BYTES // (1024 * 1024)}MB"
+        )
+    
+    try:
+        meter_service = MeterReadingService(db)
+        result = await run_in_threadpool(
+            meter_service.import_readings,
+            file.file,
+            file.filename or "",
+            billing_month,
+            building_id,
+            current_user.id,
+            dry_run,
+        )
+        return response.success(
+            data=result,
+            message=f"Đã lưu {result.staged}/{result.total_rows} dòng, {result.warnings} cảnh báo, {result.errors} lỗi"
+        )
+    except ValueError as e:
+        raise BadRequestException(message=str(e))
+    except Exception as e:
+        raise InternalServerException(message=f"Lỗi hệ thống: {str(e)}")
+
+
 @router.get(
     "/{invoice_id}",
     response_model=Response[InvoiceOut],
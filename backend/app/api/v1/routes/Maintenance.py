@@ -189,6 +189,11 @@ def get_list_maintenances(
     room_id: Optional[UUID] = Query(None, description="Lọc theo phòng"),
     page: int = Query(1, ge=1, description="Số trang (bắt đầu từ 1)"),
     pageSize: int = Query(20, ge=1, le=100, description="Số items mỗi trang"),
+    cursor: Optional[str] = Query(
+        None,
+        description="Cursor pagination: truyền rỗng cho trang đầu, sau đó dùng next_cursor (bỏ qua page)",
+    ),
+    include_total: bool = Query(False, description="Chế độ cursor: trả kèm totalItems (chạy thêm COUNT)"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
@@ -206,6 +211,8 @@ def get_list_maintenances(
     - building_id: Filter theo tòa nhà
     - room_id: Filter theo phòng
 
+    **Pagination**: page/pageSize, hoặc cursor/include_total (keyset, opt-in; trả về next_cursor)
+
     **Response format**:
     ```json
     {
@@ -243,6 +250,8 @@ def get_list_maintenances(
             room_id=room_id,
             page=page,
             pageSize=pageSize,
+            cursor=cursor,
+            include_total=include_total,
         )
         return response.success(data=result, message="Lấy danh sách yêu cầu thành công")
     except ValueError as e:
@@ -0,0 +1,86 @@
+"""Media Router - phục vụ blob từ blob store.
+
+- ``GET /media/private/{key}``: tài liệu cá nhân (CCCD, avatar) và ảnh bảo
+  trì. Cần đăng nhập, chỉ chủ sở hữu hoặc admin; không cache
+  (``private, no-store``). S3 redirect sang URL ký ngắn hạn.
+- ``GET /media/{key}``: ảnh phòng/tòa nhà/thumbnail. Key là SHA-256 của nội
+  dung nên bất biến - response được cache vĩnh viễn ở trình duyệt/CDN.
+"""
+
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import FileResponse, RedirectResponse
+from sqlalchemy.orm import Session
+
+from app.core.exceptions import ForbiddenException, NotFoundException
+from app.core.security import get_current_user
+from app.core.settings import settings
+from app.infrastructure.db.session import get_db
+from app.infrastructure.storage import PRIVATE_PREFIX, BlobStore, LocalBlobStore, get_blob_store, is_private_key
+from app.models.user import User
+from app.repositories.media_repository import MediaRepository
+
+router = APIRouter(prefix="/media", tags=["Media"])
+
+
+def is_admin(user: User) -> bool:
+    """Kiểm tra user có role admin không"""
+    return user.role and user.role.role_code.upper() == "ADMIN"
+
+
+def _serve(store: BlobStore, key: str):
+    """Stream file local, hoặc redirect sang S3 (URL ký với blob riêng tư)."""
+    headers = {"Cache-Control": store.cache_control(key)}
+    if isinstance(store, LocalBlobStore):
+        try:
+            path = store.path_for(key)
+        except ValueError:
+            path = None
+        if path is None:
+            raise NotFoundException(message="Không tìm thấy file")
+        return FileResponse(path, headers=headers)
+
+    if is_private_key(key):
+        url = store.signed_url(key, settings.MEDIA_SIGNED_URL_TTL_SECONDS)
+    else:
+        url = store.url(key)
+    return RedirectResponse(url, status_code=307, headers=headers)
+
+
+@router.get("/private/{path:path}")
+def get_private_media(
+    path: str,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """Trả về blob riêng tư cho chủ sở hữu hoặc admin.
+
+    Blob không còn được tài liệu/ảnh bảo trì nào tham chiếu trả về 404.
+    """
+    key = PRIVATE_PREFIX + path
+    owner_ids = MediaRepository(db).get_private_owner_ids(key)
+    if owner_ids is None:
+        raise NotFoundException(message="Không tìm thấy file")
+    if current_user.id not in owner_ids and not is_admin(current_user):
+        raise ForbiddenException(message="Bạn không có quyền xem file này")
+    # Đóng session trước khi stream file
+    db.close()
+    return _serve(get_blob_store(), key)
+
+
+@router.get("/{key:path}")
+def get_media(key: str, db: Session = Depends(get_db)):
+    """Trả về ảnh public theo key (ảnh phòng, tòa nhà, thumbnail).
+
+    - Local storage: stream file trực tiếp.
+    - S3 storage: redirect sang URL public của object.
+    """
+    if is_private_key(key):
+        raise NotFoundException(message="Không tìm thấy file")
+    # Tài liệu cá nhân upload trước khi có vùng private/ (chưa chạy
+    # scripts/migrate_media_to_blob_store.py --privatize) cũng không được public
+    if MediaRepository(db).get_private_owner_ids(key) is not None:
+        raise NotFoundException(message="Không tìm thấy file")
+    db.close()
+    return _serve(get_blob_store(), key)
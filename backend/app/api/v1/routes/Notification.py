@@ -6,7 +6,7 @@ from uuid import UUID
 from fastapi import APIRouter, Depends, Query, status, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.infrastructure.db.session import get_db
+from app.infrastructure.db.session import get_async_db
 from app.core.security import get_current_user
 from app.models.user import User
 from app.services.NotificationService import NotificationService
@@ -36,17 +36,15 @@ async def get_notifications(
     pageSize: int = Query(20, ge=1, le=100, description="Số bản ghi mỗi trang"),
     is_read: Optional[bool] = Query(None, description="Lọc theo trạng thái đọc"),
     current_user: User = Depends(get_current_user),
-    session: AsyncSession = Depends(get_db)
+    session: AsyncSession = Depends(get_async_db)
 ):
     """Lấy danh sách thông báo của user."""
     try:
-        offset = (page - 1) * pageSize
-        
         service = NotificationService(session)
         notifications = await service.get_user_notifications(
             user_id=current_user.id,
-            skip=offset,
-            limit=pageSize,
+            page=page,
+            page_size=pageSize,
             is_read=is_read
         )
         
@@ -100,7 +98,7 @@ async def get_notifications(
 )
 async def get_unread_count(
     current_user: User = Depends(get_current_user),
-    session: AsyncSession = Depends(get_db)
+    session: AsyncSession = Depends(get_async_db)
 ):
     """Đếm số thông báo chưa đọc."""
     try:
@@ -128,7 +126,7 @@ async def get_unread_count(
 async def mark_notification_as_read(
     notification_id: UUID,
     current_user: User = Depends(get_current_user),
-    session: AsyncSession = Depends(get_db)
+    session: AsyncSession = Depends(get_async_db)
 ):
     """Đánh dấu thông báo đã đọc."""
     try:
@@ -170,7 +168,7 @@ async def mark_notification_as_read(
 )
 async def mark_all_as_read(
     current_user: User = Depends(get_current_user),
-    session: AsyncSession = Depends(get_db)
+    session: AsyncSession = Depends(get_async_db)
 ):
     """Đánh dấu tất cả thông báo đã đọc."""
     try:
@@ -198,7 +196,7 @@ async def mark_all_as_read(
 async def delete_notification(
     notification_id: UUID,
     current_user: User = Depends(get_current_user),
-    session: AsyncSession = Depends(get_db)
+    session: AsyncSession = Depends(get_async_db)
 ):
     """Xóa thông báo."""
     try:
@@ -5,16 +5,28 @@ Endpoints:
 - POST /api/v1/payments/create-cod - Tạo payment COD
 - POST /api/v1/payments/confirm-cod - Xác nhận COD payment (landlord)
 - POST /api/v1/payments/webhook/payos - PayOS webhook
+- GET /api/v1/payments/reconciler/stats - Số liệu job đối soát PayOS (admin)
 - GET /api/v1/payments/{payment_id} - Lấy thông tin payment
+- POST /api/v1/payments/{payment_id}/check-status - Trạng thái thanh toán (đọc DB)
+- GET /api/v1/payments/{payment_id}/events - Stream SSE trạng thái thanh toán
 - GET /api/v1/payments/invoice/{invoice_id} - Lấy payments của invoice
 """
 
 from fastapi import APIRouter, Depends, HTTPException, status, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List
+from typing import Any, AsyncIterator, Dict, List
+import asyncio
+import json
 import uuid
 
+from app.core.settings import settings
+from app.infrastructure.db.payment_status_events import FINAL_STATUSES
 from app.infrastructure.db.session import get_db
+from app.infrastructure.payment_events import payment_event_hub
+from app.infrastructure.payos_reconciler import payos_reconciler
+from app.infrastructure.payos_webhooks import notify_webhook_worker
 from app.services.PaymentService import PaymentService
 from app.schemas.payment_schema import (
     PaymentCreatePayOSRequest,
@@ -155,6 +167,9 @@ def confirm_cod_payment(
     Webhook endpoint để nhận thông báo từ PayOS khi thanh toán thành công.
     
     Endpoint này được gọi tự động bởi PayOS, không cần authentication.
+    Chỉ kiểm tra chữ ký và lưu sự kiện (PayOS gửi lại cùng sự kiện thì
+    ``duplicate=true``) rồi trả 200 ngay; payment/invoice được cập nhật bởi
+    worker nền.
     """
 )
 async def payos_webhook(
@@ -169,11 +184,10 @@ async def payos_webhook(
         # Parse webhook data
         webhook_data = PayOSWebhookRequest(**body)
         
-        # Process webhook
-        result = await service.handle_payos_webhook(
-            webhook_data.data,
-            webhook_data.signature
-        )
+        # Lưu vào hộp thư webhook (DB sync -> threadpool, không chặn event loop)
+        result = await run_in_threadpool(service.receive_payos_webhook, webhook_data, body)
+        if not result["duplicate"]:
+            notify_webhook_worker()
         
         return result
         
@@ -187,6 +201,33 @@ async def payos_webhook(
         )
 
 
+@router.get(
+    "/reconciler/stats",
+    response_model=Response,
+    status_code=status.HTTP_200_OK,
+    summary="Số liệu job đối soát PayOS",
+    description="""
+    Số payment đã kiểm tra, đã đổi trạng thái, lỗi và độ trễ của job đối soát
+    PayOS nền (tính theo process đang trả lời). Chỉ chủ nhà (ADMIN).
+    """
+)
+def get_reconciler_stats(
+    current_user: User = Depends(get_current_user)
+):
+    """Số liệu job đối soát PayOS."""
+    user_role = current_user.role.role_code if current_user.role else "CUSTOMER"
+    if user_role != "ADMIN":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Chỉ chủ nhà mới có quyền xem số liệu đối soát"
+        )
+    return Response(
+        success=True,
+        message="Lấy số liệu đối soát thành công",
+        data=payos_reconciler.stats()
+    )
+
+
 @router.get(
     "/{payment_id}",
     response_model=Response[PaymentResponse],
@@ -221,23 +262,24 @@ def get_payment(
     "/{payment_id}/check-status",
     response_model=Response,
     status_code=status.HTTP_200_OK,
-    summary="Kiểm tra và cập nhật trạng thái thanh toán từ PayOS",
+    summary="Kiểm tra trạng thái thanh toán",
     description="""
-    Kiểm tra trạng thái thanh toán trực tiếp từ PayOS và cập nhật vào database.
-    Dùng khi webhook không hoạt động hoặc cần sync thủ công.
+    Trả về trạng thái thanh toán hiện tại trong database (dùng cho polling).
+    Payment PayOS được cập nhật bởi webhook và job đối soát nền, endpoint này
+    không gọi PayOS.
     """
 )
-async def check_and_sync_payment_status(
+def check_and_sync_payment_status(
     payment_id: uuid.UUID,
     current_user: User = Depends(get_current_user),
     service: PaymentService = Depends(get_payment_service)
 ):
-    """Kiểm tra và sync trạng thái thanh toán từ PayOS."""
+    """Trạng thái thanh toán hiện tại."""
     try:
-        result = await service.check_and_sync_payos_status(payment_id)
+        result = service.get_payment_status(payment_id)
         return Response(
             success=True,
-            message="Đã kiểm tra và cập nhật trạng thái thanh toán",
+            message="Lấy trạng thái thanh toán thành công",
             data=result
         )
     except HTTPException:
@@ -250,6 +292,83 @@ async def check_and_sync_payment_status(
         )
 
 
+def _sse(event: Dict[str, Any]) -> str:
+    """Một sự kiện SSE, tên sự kiện là trạng thái viết hoa (COMPLETED, FAILED...)."""
+    return f"event: {event['status'].upper()}\ndata: {json.dumps(event)}\n\n"
+
+
+@router.get(
+    "/{payment_id}/events",
+    status_code=status.HTTP_200_OK,
+    summary="Stream trạng thái thanh toán (SSE)",
+    description="""
+    Server-sent events cho một payment: gửi trạng thái hiện tại ngay khi kết
+    nối, sau đó đẩy sự kiện ``COMPLETED`` / ``FAILED`` / ``CANCELLED`` ngay khi
+    webhook hoặc job đối soát cập nhật payment, rồi đóng stream. Dòng
+    ``: keepalive`` được gửi định kỳ; stream tự đóng sau
+    ``PAYMENT_EVENTS_MAX_STREAM_SECONDS`` để client kết nối lại.
+    """
+)
+async def stream_payment_events(
+    payment_id: uuid.UUID,
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    service: PaymentService = Depends(get_payment_service)
+):
+    """Stream SSE trạng thái thanh toán."""
+    final = {s.value for s in FINAL_STATUSES}
+
+    async def read_current() -> Dict[str, Any]:
+        # Trả kết nối DB về pool ngay - stream có thể mở vài phút
+        try:
+            return await run_in_threadpool(service.get_payment_event, payment_id)
+        finally:
+            await run_in_threadpool(service.db.close)
+
+    # Đăng ký trước khi đọc DB để không lỡ sự kiện xảy ra ở giữa
+    queue = payment_event_hub.subscribe(str(payment_id))
+    try:
+        current = await read_current()
+    except Exception:
+        payment_event_hub.unsubscribe(str(payment_id), queue)
+        raise
+
+    async def stream() -> AsyncIterator[str]:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + settings.PAYMENT_EVENTS_MAX_STREAM_SECONDS
+        last_status = current["status"]
+        try:
+            yield "retry: 3000\n\n" + _sse(current)
+            while last_status not in final:
+                timeout = min(settings.PAYMENT_EVENTS_KEEPALIVE_SECONDS, deadline - loop.time())
+                if timeout <= 0:
+                    return
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        return
+                    if not payment_event_hub.connected:
+                        # Mất LISTEN - đọc lại DB cho đến khi nối lại được
+                        event = await read_current()
+                        if event["status"] != last_status:
+                            last_status = event["status"]
+                            yield _sse(event)
+                            continue
+                    yield ": keepalive\n\n"
+                    continue
+                last_status = event["status"]
+                yield _sse(event)
+        finally:
+            payment_event_hub.unsubscribe(str(payment_id), queue)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get(
     "/invoice/{invoice_id}",
     response_model=Response[list],
@@ -2,10 +2,12 @@
 
 Các endpoint tuân thủ REST conventions:
 - GET /rooms - Lấy danh sách phòng
+- GET /rooms/facets - Đếm số phòng theo từng facet (sidebar filter)
 - POST /rooms - Tạo phòng mới
 - GET /rooms/{room_id} - Xem chi tiết phòng
 - PUT /rooms/{room_id} - Cập nhật phòng
 - DELETE /rooms/{room_id} - Xóa phòng
+- GET /rooms/search/advanced - Tìm kiếm phòng nâng cao (giá, diện tích, tiện ích)
 """
 
 from __future__ import annotations
@@ -143,6 +145,11 @@ def list_rooms(
     ),
     page: int = Query(1, ge=1, description="Số trang (bắt đầu từ 1)"),
     pageSize: int = Query(20, ge=1, le=100, description="Số items mỗi trang (Public max 20, Admin max 100)"),
+    cursor: Optional[str] = Query(
+        None,
+        description="Cursor pagination: truyền rỗng cho trang đầu, sau đó dùng next_cursor (Admin only, bỏ qua page)",
+    ),
+    include_total: bool = Query(False, description="Chế độ cursor: trả kèm totalItems (chạy thêm COUNT)"),
     db: Session = Depends(get_db),
     current_user: Optional[User] = Depends(get_current_user_optional),  # Optional - không bắt buộc login
 ):
@@ -154,7 +161,7 @@ def list_rooms(
     - Nếu CÓ token + role ≠ ADMIN → Trả public view
     
     **Query params**:
-    - search: Tìm kiếm theo tên phòng/tòa nhà/tiện ích (all)
+    - search: Tìm kiếm theo tên phòng/tòa nhà/tiện ích, không phân biệt dấu ("da nang" khớp "Đà Nẵng") (all)
     - building_id: Lọc theo tòa nhà (all)
     - city: Lọc theo thành phố (all)
     - ward: Lọc theo phường/quận (all)
@@ -163,7 +170,9 @@ def list_rooms(
     - max_price: Giá thuê tối đa (all)
     - max_capacity: Số người tối đa (all)
     - sort_by: price_asc (giá tăng dần), price_desc (giá giảm dần), mặc định là mới nhất
+      (có search thì mặc định sắp theo độ liên quan)
     - page, pageSize: Pagination
+    - cursor, include_total: Keyset pagination (admin only, opt-in), response có next_cursor
     """
     try:
         room_service = RoomService(db)
@@ -187,6 +196,8 @@ def list_rooms(
                 sort_by=sort_by,
                 page=page,
                 pageSize=min(pageSize, 100),  # Max 100 cho admin
+                cursor=cursor,
+                include_total=include_total,
             )
         else:
             # Public/Customer: chỉ phòng available, pageSize max 20
@@ -210,6 +221,80 @@ def list_rooms(
         raise InternalServerException(message=f"Lỗi hệ thống: {str(e)}")
 
 
+@router.get(
+    "/facets",
+    status_code=status.HTTP_200_OK,
+    summary="Đếm số phòng theo facet cho sidebar filter",
+    description="Số phòng theo thành phố, phường, loại phòng, khoảng giá, sức chứa, tình trạng trống và tiện ích",
+    responses={
+        200: {
+            "description": "Successful Response",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "code": 200,
+                        "message": "Lấy facet phòng thành công",
+                        "data": {
+                            "total": 42,
+                            "cities": [{"value": "Đà Nẵng", "count": 30}],
+                            "wards": [{"value": "Hải Châu", "count": 12}],
+                            "room_types": [{"value": "Studio", "count": 18}],
+                            "price_ranges": [
+                                {"min_price": 2000000, "max_price": 3000000, "count": 10},
+                                {"min_price": 10000000, "max_price": None, "count": 2}
+                            ],
+                            "capacities": [{"value": 2, "count": 25}],
+                            "availability": [
+                                {"value": "EMPTY", "count": 20},
+                                {"value": "PARTIAL", "count": 7},
+                                {"value": "FULL", "count": 15}
+                            ],
+                            "utilities": [{"value": "Điều hòa", "count": 35}]
+                        }
+                    }
+                }
+            }
+        }
+    }
+)
+def get_room_facets(
+    search: Optional[str] = Query(
+        None,
+        description="Tìm kiếm theo tên phòng, tên tòa nhà",
+        alias="searchValue"
+    ),
+    building_id: Optional[UUID] = Query(None, description="Lọc theo tòa nhà"),
+    city: Optional[str] = Query(None, description="Lọc theo thành phố"),
+    ward: Optional[str] = Query(None, description="Lọc theo phường/quận"),
+    min_price: Optional[int] = Query(None, ge=0, description="Giá thuê tối thiểu"),
+    max_price: Optional[int] = Query(None, ge=0, description="Giá thuê tối đa"),
+    max_capacity: Optional[int] = Query(None, ge=1, description="Số người tối đa"),
+    db: Session = Depends(get_db),
+):
+    """Đếm số phòng theo từng facet (Công khai - không cần đăng nhập).
+
+    Nhận cùng filter với danh sách phòng public (GET /rooms) và trả về toàn
+    bộ số đếm trong một request, thay cho việc gọi GET /rooms nhiều lần với
+    từng bộ filter. Số đếm tính trên tập phòng đã áp mọi filter.
+    """
+    try:
+        room_service = RoomService(db)
+        result = room_service.get_public_facets(
+            search=search,
+            building_id=building_id,
+            city=city,
+            ward=ward,
+            min_price=min_price,
+            max_price=max_price,
+            max_capacity=max_capacity,
+        )
+        return response.success(data=result, message="Lấy facet phòng thành công")
+    except ValueError as e:
+        raise BadRequestException(message=str(e))
+    except Exception as e:
+        raise InternalServerException(message=f"Lỗi hệ thống: {str(e)}")
+
+
 @router.post(
     "",
     # response_model=Response[RoomDetailOut],
@@ -535,109 +620,109 @@ def delete_room(
         raise InternalServerException(message=f"Lỗi hệ thống: {str(e)}")
 
 
-# @router.get(
-#     "/search/advanced",
-#     response_model=Response[dict],
-#     status_code=status.HTTP_200_OK,
-#     summary="Tìm kiếm phòng nâng cao (Công khai - không cần đăng nhập)",
-#     description="Tìm kiếm phòng với nhiều điều kiện: giá, diện tích, sức chứa, tiện ích. API công khai cho khách vãng lai.",
-#     responses={
-#         200: {
-#             "description": "Search successful",
-#             "content": {
-#                 "application/json": {
-#                     "example": {
-#                         "code": 200,
-#                         "message": "Tìm kiếm phòng thành công",
-#                         "data": {
-#                             "items": [
-#                                 {
-#                                     "id": "uuid",
-#                                     "room_number": "101",
-#                                     "building_name": "Chung cư Hoàng Anh",
-#                                     "area": 35.0,
-#                                     "capacity": 2,
-#                                     "current_occupants": 0,
-#                                     "status": "AVAILABLE",
-#                                     "base_price": 5000000,
-#                                     "representative": None
-#                                 }
-#                             ],
-#                             "total": 15,
-#                             "offset": 0,
-#                             "limit": 20
-#                         }
-#                     }
-#                 }
-#             }
-#         }
-#     }
-# )
-# def search_rooms(
-#     building_id: Optional[UUID] = Query(None, description="Lọc theo tòa nhà"),
-#     min_price: Optional[Decimal] = Query(None, ge=0, description="Giá tối thiểu"),
-#     max_price: Optional[Decimal] = Query(None, ge=0, description="Giá tối đa"),
-#     min_area: Optional[float] = Query(None, gt=0, description="Diện tích tối thiểu (m²)"),
-#     max_area: Optional[float] = Query(None, gt=0, description="Diện tích tối đa (m²)"),
-#     capacity: Optional[int] = Query(None, ge=1, description="Sức chứa tối thiểu"),
-#     room_status: Optional[str] = Query(None, description="Trạng thái phòng", alias="status"),
-#     utilities: Optional[str] = Query(None, description="Tiện ích (cách nhau bởi dấu phẩy: 'Điều hoà,Bếp,TV')"),
-#     page: int = Query(1, ge=1, description="Số trang (bắt đầu từ 1)"),
-#     pageSize: int = Query(20, ge=1, le=100, description="Số lượng mỗi trang (max 100)"),
-#     db: Session = Depends(get_db),
-#     # KHÔNG có current_user = Depends(get_current_user) - API công khai
-# ):
-#     """Tìm kiếm phòng nâng cao với nhiều điều kiện - API công khai cho khách vãng lai.
-
-#     Query params:
-#     - building_id: UUID của tòa nhà (optional)
-#     - min_price: Giá thuê tối thiểu (optional)
-#     - max_price: Giá thuê tối đa (optional)
-#     - min_area: Diện tích tối thiểu m² (optional)
-#     - max_area: Diện tích tối đa m² (optional)
-#     - capacity: Sức chứa tối thiểu (optional)
-#     - status: Trạng thái phòng (AVAILABLE, OCCUPIED, MAINTENANCE, RESERVED)
-#     - utilities: Danh sách tiện ích cần có, cách nhau bởi dấu phẩy (ví dụ: "Điều hoà,Bếp,TV")
-#     - page: Số trang (default 1)
-#     - pageSize: Số lượng mỗi trang (default 20, max 100)
-
-#     Returns:
-#         {
-#             "success": true,
-#             "message": "success",
-#             "data": {
-#                 "items": [...],
-#                 "pagination": {
-#                     "totalItems": 15,
-#                     "page": 1,
-#                     "pageSize": 20,
-#                     "totalPages": 1
-#                 }
-#             }
-#         }
-#     """
-#     try:
-#         # Parse utilities từ string sang list
-#         utilities_list = None
-#         if utilities:
-#             utilities_list = [u.strip() for u in utilities.split(',') if u.strip()]
+@router.get(
+    "/search/advanced",
+    response_model=Response[dict],
+    status_code=status.HTTP_200_OK,
+    summary="Tìm kiếm phòng nâng cao (Công khai - không cần đăng nhập)",
+    description="Tìm kiếm phòng với nhiều điều kiện: giá, diện tích, sức chứa, tiện ích. API công khai cho khách vãng lai.",
+    responses={
+        200: {
+            "description": "Search successful",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "code": 200,
+                        "message": "Tìm kiếm phòng thành công",
+                        "data": {
+                            "items": [
+                                {
+                                    "id": "uuid",
+                                    "room_number": "101",
+                                    "building_name": "Chung cư Hoàng Anh",
+                                    "area": 35.0,
+                                    "capacity": 2,
+                                    "current_occupants": 0,
+                                    "status": "AVAILABLE",
+                                    "base_price": 5000000,
+                                    "representative": None
+                                }
+                            ],
+                            "total": 15,
+                            "offset": 0,
+                            "limit": 20
+                        }
+                    }
+                }
+            }
+        }
+    }
+)
+def search_rooms(
+    building_id: Optional[UUID] = Query(None, description="Lọc theo tòa nhà"),
+    min_price: Optional[Decimal] = Query(None, ge=0, description="Giá tối thiểu"),
+    max_price: Optional[Decimal] = Query(None, ge=0, description="Giá tối đa"),
+    min_area: Optional[float] = Query(None, gt=0, description="Diện tích tối thiểu (m²)"),
+    max_area: Optional[float] = Query(None, gt=0, description="Diện tích tối đa (m²)"),
+    capacity: Optional[int] = Query(None, ge=1, description="Sức chứa tối thiểu"),
+    room_status: Optional[str] = Query(None, description="Trạng thái phòng", alias="status"),
+    utilities: Optional[str] = Query(None, description="Tiện ích phòng phải có đủ, không phân biệt dấu (cách nhau bởi dấu phẩy: 'Điều hoà,Bếp,TV')"),
+    page: int = Query(1, ge=1, description="Số trang (bắt đầu từ 1)"),
+    pageSize: int = Query(20, ge=1, le=100, description="Số lượng mỗi trang (max 100)"),
+    db: Session = Depends(get_db),
+    # KHÔNG có current_user = Depends(get_current_user) - API công khai
+):
+    """Tìm kiếm phòng nâng cao với nhiều điều kiện - API công khai cho khách vãng lai.
+
+    Query params:
+    - building_id: UUID của tòa nhà (optional)
+    - min_price: Giá thuê tối thiểu (optional)
+    - max_price: Giá thuê tối đa (optional)
+    - min_area: Diện tích tối thiểu m² (optional)
+    - max_area: Diện tích tối đa m² (optional)
+    - capacity: Sức chứa tối thiểu (optional)
+    - status: Trạng thái phòng (AVAILABLE, OCCUPIED, MAINTENANCE, RESERVED)
+    - utilities: Danh sách tiện ích cần có, cách nhau bởi dấu phẩy (ví dụ: "Điều hoà,Bếp,TV")
+    - page: Số trang (default 1)
+    - pageSize: Số lượng mỗi trang (default 20, max 100)
+
+    Returns:
+        {
+            "success": true,
+            "message": "success",
+            "data": {
+                "items": [...],
+                "pagination": {
+                    "totalItems": 15,
+                    "page": 1,
+                    "pageSize": 20,
+                    "totalPages": 1
+                }
+            }
+        }
+    """
+    try:
+        # Parse utilities từ string sang list
+        utilities_list = None
+        if utilities:
+            utilities_list = [u.strip() for u in utilities.split(',') if u.strip()]
         
-#         room_service = RoomService(db)
-#         result = room_service.search_rooms(
-#             building_id=building_id,
-#             min_price=min_price,
-#             max_price=max_price,
-#             min_area=min_area,
-#             max_area=max_area,
-#             capacity=capacity,
-#             status=room_status,
-#             utilities=utilities_list,
-#             page=page,
-#             pageSize=pageSize,
-#         )
-#         return response.success(data=result, message="Tìm kiếm phòng thành công")
-#     except ValueError as e:
-#         raise BadRequestException(message=str(e))
-#     except Exception as e:
-#         raise InternalServerException(message=f"Lỗi hệ thống: {str(e)}")
+        room_service = RoomService(db)
+        result = room_service.search_rooms(
+            building_id=building_id,
+            min_price=min_price,
+            max_price=max_price,
+            min_area=min_area,
+            max_area=max_area,
+            capacity=capacity,
+            status=room_status,
+            utilities=utilities_list,
+            page=page,
+            pageSize=pageSize,
+        )
+        return response.success(data=result, message="Tìm kiếm phòng thành công")
+    except ValueError as e:
+        raise BadRequestException(message=str(e))
+    except Exception as e:
+        raise InternalServerException(message=f"Lỗi hệ thống: {str(e)}")
 
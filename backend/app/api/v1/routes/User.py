@@ -107,6 +107,11 @@ def get_list_users(
     role_code: Optional[str] = Query(None, description="Lọc theo mã role: TENANT, CUSTOMER"),
     page: int = Query(1, ge=1, description="Số trang (bắt đầu từ 1)"),
     pageSize: int = Query(20, ge=1, le=100, description="Số items mỗi trang"),
+    cursor: Optional[str] = Query(
+        None,
+        description="Cursor pagination: truyền rỗng cho trang đầu, sau đó dùng next_cursor (bỏ qua page)",
+    ),
+    include_total: bool = Query(False, description="Chế độ cursor: trả kèm totalItems (chạy thêm COUNT)"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
@@ -124,6 +129,7 @@ def get_list_users(
     **Pagination**:
     - page: Số trang (mặc định 1)
     - pageSize: Số items mỗi trang (1-100, mặc định 20)
+    - cursor, include_total: Keyset pagination (opt-in), pagination trả về next_cursor
     
     **Response format**:
     ```json
@@ -161,6 +167,8 @@ def get_list_users(
             role_code=role_code,
             page=page,
             pageSize=pageSize,
+            cursor=cursor,
+            include_total=include_total,
         )
         return response.success(data=result, message="Lấy danh sách người dùng thành công")
     except ValueError as e:
@@ -0,0 +1,18 @@
+"""Enums cho hàng đợi email (bảng email_outbox)."""
+
+from __future__ import annotations
+
+from .base_enum import BaseEnum
+
+
+class EmailStatus(BaseEnum):
+    """Trạng thái gửi của một email trong outbox.
+
+    - PENDING: Chờ gửi (kể cả đang chờ retry sau lỗi tạm thời)
+    - SENT: Đã gửi thành công
+    - FAILED: Hết số lần thử, không gửi nữa
+    """
+
+    PENDING = "PENDING"   # Chờ gửi / chờ retry
+    SENT = "SENT"         # Đã gửi
+    FAILED = "FAILED"     # Gửi thất bại sau tối đa số lần thử
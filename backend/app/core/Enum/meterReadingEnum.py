@@ -0,0 +1,16 @@
+"""Enums cho chỉ số điện nhập từ file (bảng meter_readings)."""
+
+from __future__ import annotations
+
+from .base_enum import BaseEnum
+
+
+class MeterReadingStatus(BaseEnum):
+    """Trạng thái của một chỉ số điện đã nhập.
+
+    - STAGED: Đã kiểm tra và lưu, chờ lập hóa đơn tháng
+    - APPLIED: Đã dùng để lập hóa đơn (không ghi đè khi import lại)
+    """
+
+    STAGED = "STAGED"     # Chờ lập hóa đơn
+    APPLIED = "APPLIED"   # Đã lập hóa đơn
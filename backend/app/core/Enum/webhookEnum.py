@@ -0,0 +1,20 @@
+"""Enums cho hộp thư webhook thanh toán (bảng payment_webhook_events)."""
+
+from __future__ import annotations
+
+from .base_enum import BaseEnum
+
+
+class WebhookEventStatus(BaseEnum):
+    """Trạng thái xử lý của một webhook đã nhận.
+
+    - PENDING: Đã lưu, chờ worker áp dụng (kể cả đang chờ thử lại sau lỗi)
+    - PROCESSED: Đã áp dụng vào Payment/Invoice
+    - IGNORED: Không có gì để áp dụng (không tìm thấy payment, payment đã xử lý)
+    - FAILED: Lỗi quá số lần thử, cần kiểm tra thủ công
+    """
+
+    PENDING = "PENDING"       # Chờ áp dụng
+    PROCESSED = "PROCESSED"   # Đã áp dụng
+    IGNORED = "IGNORED"       # Bỏ qua
+    FAILED = "FAILED"         # Lỗi sau tối đa số lần thử
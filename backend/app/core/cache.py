@@ -0,0 +1,77 @@
+"""In-process cache utilities.
+
+Module cung cấp TTL/LRU cache đơn giản, thread-safe, dùng cho các dữ liệu
+đọc nhiều - ghi ít trong một worker (ví dụ: principal xác thực theo token).
+
+Lưu ý: cache nằm trong bộ nhớ của từng worker, không chia sẻ giữa các
+process. Vì vậy TTL nên ngắn để giới hạn thời gian dữ liệu cũ tồn tại
+ở các worker không nhận được lệnh invalidate.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Generic, Hashable, Optional, TypeVar
+
+V = TypeVar("V")
+
+
+class TTLCache(Generic[V]):
+    """LRU cache có thời gian sống (TTL) cho từng entry.
+
+    Args:
+        maxsize: Số entry tối đa; entry ít dùng nhất bị loại khi vượt quá.
+        ttl: Thời gian sống của entry (giây). ``<= 0`` để tắt cache.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[float, V]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        """Cache có đang bật hay không."""
+        return self.ttl > 0 and self.maxsize > 0
+
+    def get(self, key: Hashable) -> Optional[V]:
+        """Lấy giá trị theo key, trả None nếu không có hoặc đã hết hạn."""
+        if not self.enabled:
+            return None
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: V) -> None:
+        """Lưu giá trị vào cache, loại bỏ entry cũ nhất nếu đầy."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def invalidate(self, key: Hashable) -> None:
+        """Xóa một key khỏi cache (không lỗi nếu key không tồn tại)."""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Xóa toàn bộ cache."""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
@@ -0,0 +1,187 @@
+"""Keyset (cursor) pagination helpers.
+
+Phân trang dạng OFFSET phải quét bỏ toàn bộ các dòng phía trước nên trang
+càng sâu càng chậm. Keyset pagination lọc trực tiếp theo sort key của dòng
+cuối trang trước (``WHERE (created_at, id) < (...)``) nên mọi trang đều dùng
+được index.
+
+Cursor là chuỗi base64url (opaque với client) chứa:
+- tên kiểu sắp xếp (để từ chối cursor dùng với sort khác),
+- giá trị các sort key của dòng cuối cùng, luôn kết thúc bằng ``id``
+  (UUIDv7 - tăng theo thời gian, đảm bảo thứ tự toàn phần),
+- số dòng đã trả về trước đó (để đánh số thứ tự liên tục giữa các trang).
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Optional, Sequence
+from uuid import UUID
+
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Query
+
+
+@dataclass(frozen=True)
+class SortKey:
+    """Một cột trong khóa sắp xếp keyset.
+
+    Attributes:
+        column: Cột SQLAlchemy dùng để ORDER BY/so sánh.
+        attr: Tên thuộc tính trên row kết quả để đọc giá trị (mặc định ``column.key``).
+        desc: True nếu sắp xếp giảm dần.
+    """
+
+    column: Any
+    desc: bool = False
+    attr: Optional[str] = None
+
+    @property
+    def name(self) -> str:
+        return self.attr or self.column.key
+
+
+def _dump_value(value: Any) -> list:
+    """Serialize giá trị sort key kèm tag kiểu để decode lại đúng type."""
+    if value is None:
+        return ["n", None]
+    if isinstance(value, UUID):
+        return ["u", str(value)]
+    if isinstance(value, datetime):
+        return ["dt", value.isoformat()]
+    if isinstance(value, date):
+        return ["d", value.isoformat()]
+    if isinstance(value, Decimal):
+        return ["dec", str(value)]
+    return ["v", value]
+
+
+def _load_value(item: Any) -> Any:
+    tag, raw = item
+    if tag == "n":
+        return None
+    if tag == "u":
+        return UUID(raw)
+    if tag == "dt":
+        return datetime.fromisoformat(raw)
+    if tag == "d":
+        return date.fromisoformat(raw)
+    if tag == "dec":
+        return Decimal(raw)
+    if tag == "v":
+        return raw
+    raise ValueError(f"Unknown cursor value tag: {tag}")
+
+
+def encode_cursor(sort: str, values: Sequence[Any], position: int = 0) -> str:
+    """Mã hóa sort key của dòng cuối trang thành cursor opaque."""
+    payload = {"s": sort, "k": [_dump_value(v) for v in values], "p": position}
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_payload(cursor: str) -> dict:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    return json.loads(base64.urlsafe_b64decode(padded.encode()))
+
+
+def cursor_position(cursor: Optional[str]) -> int:
+    """Số dòng đứng trước trang hiện tại (0 cho trang đầu hoặc cursor hỏng)."""
+    if not cursor:
+        return 0
+    try:
+        return int(_decode_payload(cursor).get("p", 0))
+    except (binascii.Error, ValueError, TypeError, AttributeError):
+        return 0
+
+
+def decode_cursor(cursor: str, sort: str, size: int) -> list:
+    """Giải mã cursor và kiểm tra khớp với kiểu sắp xếp hiện tại.
+
+    Raises:
+        ValueError: Cursor hỏng hoặc được tạo với kiểu sắp xếp khác.
+    """
+    try:
+        payload = _decode_payload(cursor)
+        values = [_load_value(item) for item in payload["k"]]
+        cursor_sort = payload["s"]
+    except (binascii.Error, ValueError, KeyError, TypeError) as exc:
+        raise ValueError("Cursor không hợp lệ") from exc
+
+    if cursor_sort != sort or len(values) != size:
+        raise ValueError("Cursor không khớp với kiểu sắp xếp hiện tại")
+    return values
+
+
+def _after_condition(keys: Sequence[SortKey], values: Sequence[Any]):
+    """Điều kiện "đứng sau" vị trí cursor theo thứ tự của ``keys``.
+
+    Mở rộng so sánh tuple để hỗ trợ cả chiều tăng/giảm trộn lẫn:
+    ``(k1 > v1) OR (k1 = v1 AND k2 > v2) OR ...``.
+    """
+    clauses = []
+    for i, key in enumerate(keys):
+        prefix = [keys[j].column == values[j] for j in range(i)]
+        step = key.column < values[i] if key.desc else key.column > values[i]
+        clauses.append(and_(*prefix, step))
+    return or_(*clauses)
+
+
+def paginate_keyset(
+    query: Query,
+    keys: Sequence[SortKey],
+    sort: str,
+    cursor: Optional[str],
+    limit: int,
+) -> tuple[list, Optional[str]]:
+    """Chạy ``query`` theo keyset pagination.
+
+    Args:
+        query: Query đã áp filter, chưa ORDER BY/LIMIT. Row kết quả phải có
+            các thuộc tính tương ứng ``keys`` (cột đã select hoặc ORM entity).
+        keys: Khóa sắp xếp, phần tử cuối phải là cột id duy nhất.
+        sort: Tên kiểu sắp xếp, được nhúng vào cursor.
+        cursor: Cursor từ response trước; chuỗi rỗng/None = trang đầu.
+        limit: Số dòng mỗi trang.
+
+    Returns:
+        Tuple (rows của trang, next_cursor hoặc None nếu là trang cuối).
+
+    Raises:
+        ValueError: Cursor không hợp lệ.
+    """
+    if cursor:
+        values = decode_cursor(cursor, sort, len(keys))
+        query = query.filter(_after_condition(keys, values))
+
+    order = [k.column.desc() if k.desc else k.column.asc() for k in keys]
+    # Lấy dư một dòng để biết còn trang sau hay không, không cần COUNT
+    rows = query.order_by(None).order_by(*order).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(
+            sort,
+            [getattr(last, k.name) for k in keys],
+            position=cursor_position(cursor) + limit,
+        )
+    return rows, next_cursor
+
+
+def cursor_pagination(page_size: int, next_cursor: Optional[str], total: Optional[int] = None) -> dict:
+    """Metadata phân trang cho chế độ cursor.
+
+    ``totalItems`` là None khi client không yêu cầu đếm (``include_total``).
+    """
+    return {
+        "pageSize": page_size,
+        "next_cursor": next_cursor,
+        "totalItems": total,
+    }
@@ -0,0 +1,41 @@
+"""Tìm kiếm không dấu (tiếng Việt) dựa trên ``unaccent`` + ``pg_trgm``.
+
+Migration tạo hàm ``f_unaccent(text)`` (IMMUTABLE, bọc ``unaccent``) và các
+GIN index ``gin_trgm_ops`` trên biểu thức ``f_unaccent(lower(<cột>))``. Để
+planner dùng được index, filter phải dùng **đúng** biểu thức đó - luôn build
+qua ``normalized()`` thay vì tự viết lại.
+
+"da nang", "Đà Nẵng", "ĐÀ NẴNG" đều được chuẩn hóa thành "da nang"; chuỗi tìm
+kiếm cũng được chuẩn hóa bằng cùng hàm trong SQL nên hai phía luôn khớp nhau.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from sqlalchemy import Text, func, literal
+
+
+def normalized(expr: Any):
+    """Biểu thức ``f_unaccent(lower(expr))`` - trùng với biểu thức của index."""
+    return func.f_unaccent(func.lower(expr), type_=Text)
+
+
+def _escape_like(term: str) -> str:
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def normalized_term(term: str):
+    """Chuỗi tìm kiếm đã chuẩn hóa (bỏ dấu, chữ thường) dưới dạng biểu thức SQL."""
+    return func.f_unaccent(func.lower(term.strip()), type_=Text)
+
+
+def contains(expr: Any, term: str):
+    """``expr`` chứa ``term`` (không phân biệt hoa thường/dấu), dùng được trigram index."""
+    pattern = literal("%") + normalized_term(_escape_like(term)) + literal("%")
+    return normalized(expr).like(pattern, escape="\\")
+
+
+def rank(expr: Any, term: str):
+    """Điểm liên quan 0..1 của ``expr`` với ``term`` (``word_similarity`` của pg_trgm)."""
+    return func.word_similarity(normalized_term(term), normalized(expr))
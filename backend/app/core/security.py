@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Any
+from typing import Any, Optional
+from uuid import UUID
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
@@ -10,6 +12,7 @@ from jose import jwt
 
 from sqlalchemy.orm import Session
 
+from app.core.cache import TTLCache
 from app.core.settings import settings
 from app.infrastructure.db.session import get_db
 from app.repositories.user_repository import UserRepository
@@ -101,8 +104,86 @@ def decode_token(token: str) -> dict[str, Any]:
 		raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
 
 
-def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security), db: Session = Depends(get_db)):
-	"""FastAPI dependency that returns current user (or raises 401)."""
+@dataclass(frozen=True)
+class PrincipalRole:
+	"""Thông tin role tối thiểu của principal (tương thích với `User.role`)."""
+
+	id: UUID
+	role_code: str
+	role_name: Optional[str] = None
+	display_name: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class AuthPrincipal:
+	"""Principal đã xác thực - bản rút gọn của User dùng cho phân quyền.
+
+	Giữ các thuộc tính mà routes/services đang dùng (`id`, `role_id`,
+	`role.role_code`, `status`) nên có thể thay thế ORM User trong các
+	kiểm tra quyền. Endpoint cần đầy đủ thông tin user phải tự load
+	qua `UserRepository.get_by_id(principal.id)`.
+	"""
+
+	id: UUID
+	role_id: UUID
+	status: str
+	role: PrincipalRole
+
+	@property
+	def role_code(self) -> str:
+		return self.role.role_code
+
+
+# Cache principal theo token `sub` - mỗi worker một cache riêng
+_principal_cache: TTLCache[AuthPrincipal] = TTLCache(
+	maxsize=settings.AUTH_CACHE_MAX_SIZE,
+	ttl=settings.AUTH_CACHE_TTL_SECONDS,
+)
+
+
+def invalidate_principal(user_id: UUID | str) -> None:
+	"""Xóa principal của user khỏi cache.
+
+	Gọi sau khi thay đổi role/status hoặc xóa user để request tiếp theo
+	đọc lại từ database.
+	"""
+	_principal_cache.invalidate(str(user_id))
+
+
+def _load_principal(db: Session, sub: str) -> AuthPrincipal | None:
+	"""Resolve principal từ cache, fallback sang query chỉ lấy cột cần thiết."""
+	principal = _principal_cache.get(sub)
+	if principal is not None:
+		return principal
+
+	try:
+		user_id = UUID(sub)
+	except (ValueError, TypeError):
+		return None
+
+	row = UserRepository(db).get_principal(user_id)
+	if not row:
+		return None
+
+	principal = AuthPrincipal(
+		id=row.id,
+		role_id=row.role_id,
+		status=row.status,
+		role=PrincipalRole(
+			id=row.role_id,
+			role_code=row.role_code,
+			role_name=row.role_name,
+			display_name=row.display_name,
+		),
+	)
+	_principal_cache.set(sub, principal)
+	return principal
+
+
+def get_current_user(
+	credentials: HTTPAuthorizationCredentials = Depends(security), db: Session = Depends(get_db)
+) -> AuthPrincipal:
+	"""FastAPI dependency trả về principal của user hiện tại (hoặc raise 401)."""
 	token = credentials.credentials
 	payload = decode_token(token)
 	if payload.get("type") != "access":
@@ -112,23 +193,22 @@ def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(securit
 	if not sub:
 		raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token payload")
 
-	repo = UserRepository(db)
-	user = repo.get_by_id(sub)
-	if not user:
+	principal = _load_principal(db, sub)
+	if not principal:
 		raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
-	return user
+	return principal
 
 
 def get_current_user_optional(
 	credentials: HTTPAuthorizationCredentials | None = Depends(HTTPBearer(auto_error=False)),
 	db: Session = Depends(get_db)
-):
-	"""FastAPI dependency trả về current user hoặc None nếu không có token.
+) -> AuthPrincipal | None:
+	"""FastAPI dependency trả về principal hiện tại hoặc None nếu không có token.
 	
 	Dùng cho các endpoint cho phép cả authenticated và unauthenticated users.
 	
 	Returns:
-		User instance nếu có token hợp lệ, None nếu không có token hoặc token invalid.
+		AuthPrincipal nếu có token hợp lệ, None nếu không có token hoặc token invalid.
 	"""
 	if credentials is None:
 		return None
@@ -144,12 +224,9 @@ def get_current_user_optional(
 		if not sub:
 			return None
 		
-		repo = UserRepository(db)
-		user = repo.get_by_id(sub)
-		return user
+		return _load_principal(db, sub)
 	except HTTPException:
 		# Token invalid/expired - trả None thay vì raise exception
 		return None
 	except Exception:
 		return None
-
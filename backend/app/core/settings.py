@@ -44,12 +44,39 @@ class Setting(BaseSettings):
     # Database configuration
     DATABASE_URL: str = ""
 
+    # Connection pool (mỗi worker có pool riêng cho engine sync và async;
+    # tổng kết nối ~ số worker x 2 x (DB_POOL_SIZE + DB_MAX_OVERFLOW))
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT_SECONDS: float = 30.0
+    DB_POOL_RECYCLE_SECONDS: int = 300
+    # True: ping trước mỗi checkout (thêm 1 round trip); False: dựa vào
+    # pool_recycle và tự invalidate pool khi gặp lỗi mất kết nối
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_TIMEOUT_MS: int = 0  # 0 = không giới hạn
+    # Chạy sau PgBouncer (transaction pooling): NullPool, tắt prepared statement
+    DB_PGBOUNCER_MODE: bool = False
+    # Xung đột khóa (deadlock, serialization failure, lock_timeout): số lần chạy
+    # lại thao tác và thời gian chờ cơ sở giữa các lần (xem app.infrastructure.db.retry)
+    DB_CONFLICT_RETRY_ATTEMPTS: int = 3
+    DB_CONFLICT_RETRY_BASE_SECONDS: float = 0.05
+    # Thời gian tối đa chờ khóa dòng phòng khi giữ chỗ hợp đồng
+    ROOM_LOCK_TIMEOUT_MS: int = 3000
+
     # JWT configuration  
     SECRET_KEY: str = ""
     ACCESS_TOKEN_EXPIRE: str = ""
     REFRESH_TOKEN_EXPIRE_DAY: str = ""
     ALGORITHM: str = "HS256"
 
+    # Auth principal cache (per-worker, xem app.core.security)
+    AUTH_CACHE_TTL_SECONDS: int = 60
+    AUTH_CACHE_MAX_SIZE: int = 10000
+
+    # Cache facet danh sách phòng public (per-worker, xem RoomService.get_public_facets)
+    ROOM_FACETS_CACHE_TTL_SECONDS: int = 60
+    ROOM_FACETS_CACHE_MAX_SIZE: int = 512
+
     # CORS origins
     BACKEND_CORS_ORIGINS: str = ""
 
@@ -62,6 +89,61 @@ class Setting(BaseSettings):
     PAYOS_CHECKSUM_KEY: str = ""
     PAYOS_RETURN_URL: str = "http://localhost:3000/payment/success"
     PAYOS_CANCEL_URL: str = "http://localhost:3000/payment/cancel"
+    PAYOS_BASE_URL: str = "https://api-merchant.payos.vn"  # scripts/fake_payos_server.py: http://localhost:8900
+    PAYOS_CONNECT_TIMEOUT_SECONDS: float = 3.0
+    PAYOS_READ_TIMEOUT_SECONDS: float = 10.0
+    PAYOS_MAX_CONNECTIONS: int = 20  # Kết nối keep-alive tối đa tới PayOS
+    PAYOS_MAX_CONCURRENCY: int = 20  # Số request PayOS chạy cùng lúc (mỗi process)
+    PAYOS_QUEUE_TIMEOUT_SECONDS: float = 2.0  # Chờ tối đa một slot trước khi báo bận
+    PAYOS_BREAKER_FAILURE_THRESHOLD: int = 5  # Số lỗi liên tiếp để ngắt mạch
+    PAYOS_BREAKER_RESET_SECONDS: float = 30.0  # Thời gian ngắt trước khi thử lại
+
+    # PayOS webhook inbox worker (áp dụng sự kiện đã lưu; an toàn nhờ SKIP LOCKED)
+    PAYOS_WEBHOOK_WORKER_ENABLED: bool = True
+    PAYOS_WEBHOOK_BATCH_SIZE: int = 50
+    PAYOS_WEBHOOK_POLL_INTERVAL_SECONDS: float = 2.0
+    PAYOS_WEBHOOK_MAX_ATTEMPTS: int = 5
+
+    # Job đối soát PayOS nền (payment BANKING còn PENDING)
+    PAYOS_RECONCILE_ENABLED: bool = True
+    PAYOS_RECONCILE_INTERVAL_SECONDS: float = 30.0
+    PAYOS_RECONCILE_MIN_AGE_SECONDS: int = 60  # Chờ webhook trước khi hỏi PayOS
+    PAYOS_RECONCILE_BATCH_SIZE: int = 100  # Số payment mỗi transaction
+    PAYOS_RECONCILE_CONCURRENCY: int = 5  # Số request PayOS song song của job
+    PAYOS_RECONCILE_RATE_PER_SECOND: float = 10.0  # Giới hạn request/giây của job
+
+    # Stream SSE trạng thái payment (LISTEN/NOTIFY giữa các worker)
+    PAYMENT_EVENTS_ENABLED: bool = True
+    PAYMENT_EVENTS_CHANNEL: str = "payment_events"
+    PAYMENT_EVENTS_DATABASE_URL: str = ""  # Kết nối LISTEN trực tiếp tới Postgres (bỏ qua PgBouncer); rỗng = DATABASE_URL
+    PAYMENT_EVENTS_KEEPALIVE_SECONDS: float = 15.0
+    PAYMENT_EVENTS_MAX_STREAM_SECONDS: float = 300.0  # Đóng stream, client tự kết nối lại
+
+    # Blob storage (ảnh phòng, tài liệu user, ảnh bảo trì)
+    STORAGE_BACKEND: str = "local"  # local | s3
+    STORAGE_LOCAL_DIR: str = str(backend_dir / "storage")
+    STORAGE_PUBLIC_BASE_URL: str = ""  # Mặc định /api/v1/media (local) hoặc <endpoint>/<bucket> (s3)
+    S3_BUCKET: str = ""
+    S3_ENDPOINT_URL: str = ""  # Ví dụ MinIO: http://localhost:9000
+    S3_ACCESS_KEY: str = ""
+    S3_SECRET_KEY: str = ""
+    S3_REGION: str = ""
+    MEDIA_SIGNED_URL_TTL_SECONDS: int = 300  # Hạn URL ký S3 cho tài liệu cá nhân/ảnh bảo trì
+
+    # Image pipeline (thumbnail ảnh phòng) - 0 worker để tắt
+    IMAGE_WORKERS: int = 2
+    IMAGE_PROCESS_TIMEOUT_SECONDS: int = 30
+
+    # Dashboard: các section chạy song song, mỗi section một session riêng
+    DASHBOARD_WORKERS: int = 4
+    DASHBOARD_SECTION_TIMEOUT_SECONDS: float = 5.0
+
+    # Import chỉ số điện (CSV/XLSX) - giới hạn file và ngưỡng cảnh báo bất thường:
+    # tiêu thụ > FACTOR x trung bình của HISTORY_MONTHS hóa đơn gần nhất
+    METER_IMPORT_MAX_BYTES: int = 10 * 1024 * 1024
+    METER_IMPORT_MAX_ROWS: int = 20000
+    METER_OUTLIER_FACTOR: float = 3.0
+    METER_OUTLIER_HISTORY_MONTHS: int = 3
 
     # Email configuration
     SMTP_HOST: str = "smtp.gmail.com"
@@ -70,6 +152,18 @@ class Setting(BaseSettings):
     SMTP_PASSWORD: str = "wksi wvfi hdpg yyme"
     SMTP_FROM_EMAIL: str = "hoang2312004@gmail.com"
     SMTP_FROM_NAME: str = "Phòng Trọ Online"
+    SMTP_USE_TLS: bool = True  # STARTTLS; tắt khi dùng SMTP giả lập local (aiosmtpd)
+    SMTP_ALLOW_ANONYMOUS: bool = False  # Cho phép gửi không SMTP_USER/SMTP_PASSWORD (SMTP local)
+    SMTP_TIMEOUT_SECONDS: float = 30.0
+    SMTP_IDLE_TIMEOUT_SECONDS: float = 60.0  # Đóng kết nối SMTP dùng lại khi rảnh quá lâu
+
+    # Email outbox worker (mỗi worker uvicorn một thread, an toàn nhờ SKIP LOCKED)
+    EMAIL_WORKER_ENABLED: bool = True
+    EMAIL_BATCH_SIZE: int = 20
+    EMAIL_POLL_INTERVAL_SECONDS: float = 5.0
+    EMAIL_MAX_ATTEMPTS: int = 5
+    EMAIL_RETRY_BASE_SECONDS: int = 30
+    EMAIL_RETRY_MAX_SECONDS: int = 3600
 
     @property
     def cors_origins(self) -> List[str]:
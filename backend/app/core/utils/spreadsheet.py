@@ -0,0 +1,94 @@
+"""Đọc file CSV/XLSX theo từng dòng (không nạp cả file vào bộ nhớ).
+
+- CSV: đọc qua ``csv.reader`` trên stream (tự nhận dấu phân cách ``,`` ``;``
+  hoặc tab, bỏ BOM của Excel).
+- XLSX: ``openpyxl`` ở chế độ ``read_only`` (đọc từng dòng của sheet đầu
+  tiên). ``openpyxl`` chỉ được import khi cần.
+
+Tên cột được chuẩn hóa (bỏ dấu, chữ thường, khoảng trắng -> ``_``) nên
+"Số phòng", "so phong", "SO_PHONG" là cùng một cột ``so_phong``.
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import re
+import unicodedata
+from typing import Any, BinaryIO, Iterator
+
+SUPPORTED_EXTENSIONS = ("csv", "xlsx")
+
+
+def normalize_header(name: Any) -> str:
+    """Chuẩn hóa tên cột: bỏ dấu tiếng Việt, chữ thường, ký tự khác chữ/số -> ``_``."""
+    text = unicodedata.normalize("NFKD", str(name or "")).replace("đ", "d").replace("Đ", "D")
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    return re.sub(r"[^a-z0-9]+", "_", text.lower()).strip("_")
+
+
+def iter_rows(file: BinaryIO, filename: str) -> Iterator[tuple[int, dict[str, Any]]]:
+    """Duyệt các dòng dữ liệu của file (bỏ dòng trống).
+
+    Args:
+        file: File nhị phân (ví dụ ``UploadFile.file``).
+        filename: Tên file, dùng để nhận dạng định dạng theo đuôi.
+
+    Yields:
+        (số dòng trong file - dòng tiêu đề là 1, dict tên cột đã chuẩn hóa -> giá trị)
+
+    Raises:
+        ValueError: Nếu định dạng không hỗ trợ hoặc thiếu thư viện đọc XLSX.
+    """
+    extension = filename.rsplit(".", 1)[-1].lower() if "." in filename else ""
+    if extension == "csv":
+        yield from _iter_csv(file)
+    elif extension == "xlsx":
+        yield from _iter_xlsx(file)
+    else:
+        raise ValueError(f"Chỉ chấp nhận file {', '.join(SUPPORTED_EXTENSIONS).upper()}")
+
+
+def _iter_csv(file: BinaryIO) -> Iterator[tuple[int, dict[str, Any]]]:
+    text = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+    try:
+        sample = text.read(4096)
+        text.seek(0)
+        try:
+            dialect = csv.Sniffer().sniff(sample, delimiters=",;\t")
+        except csv.Error:
+            dialect = csv.excel
+
+        reader = csv.reader(text, dialect)
+        header = next(reader, None)
+        if header is None:
+            return
+        keys = [normalize_header(name) for name in header]
+        for values in reader:
+            if not any(value.strip() for value in values):
+                continue
+            yield reader.line_num, dict(zip(keys, values))
+    finally:
+        # Không đóng file gốc (do framework quản lý)
+        text.detach()
+
+
+def _iter_xlsx(file: BinaryIO) -> Iterator[tuple[int, dict[str, Any]]]:
+    try:
+        from openpyxl import load_workbook
+    except ImportError as exc:  # pragma: no cover - phụ thuộc môi trường
+        raise ValueError("Server chưa hỗ trợ đọc file XLSX (thiếu openpyxl) - vui lòng dùng CSV") from exc
+
+    workbook = load_workbook(file, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        keys = [normalize_header(name) for name in header]
+        for line_no, values in enumerate(rows, start=2):
+            if all(value is None or str(value).strip() == "" for value in values):
+                continue
+            yield line_no, dict(zip(keys, values))
+    finally:
+        workbook.close()
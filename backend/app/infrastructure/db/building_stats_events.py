@@ -0,0 +1,87 @@
+"""Refresh bảng building_stats khi phòng/hợp đồng/sự cố thay đổi.
+
+Listener gắn vào sessionmaker:
+- ``after_flush``: ghi nhận building_id (Room) và room_id (Contract,
+  MaintenanceRequest) của các object vừa được thêm/sửa/xóa, kể cả giá trị cũ
+  khi object được chuyển sang phòng/tòa nhà khác.
+- ``before_commit``: UPSERT lại các dòng building_stats bị ảnh hưởng trong
+  cùng transaction, nên số liệu dashboard luôn khớp dữ liệu đã commit.
+
+Refresh giữ khóa advisory theo tòa nhà đến khi commit (xem
+``BuildingStatsRepository.refresh``) nên các transaction ghi cùng tòa nhà
+refresh lần lượt, không ghi đè số liệu cũ. Refresh lỗi thì commit lỗi theo -
+thay đổi nghiệp vụ không được lưu kèm thống kê sai.
+"""
+
+from __future__ import annotations
+
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session
+
+from app.models.contract import Contract
+from app.models.maintenance_request import MaintenanceRequest
+from app.models.room import Room
+
+_BUILDINGS_KEY = "building_stats_dirty_buildings"
+_ROOMS_KEY = "building_stats_dirty_rooms"
+
+
+def _current_and_previous(obj, attr: str) -> set:
+    """Giá trị hiện tại và giá trị trước khi sửa của một cột FK."""
+    values = {getattr(obj, attr, None)}
+    history = inspect(obj).attrs[attr].history
+    values.update(history.deleted or ())
+    values.discard(None)
+    return values
+
+
+def _after_flush(session: Session, flush_context) -> None:
+    buildings = session.info.setdefault(_BUILDINGS_KEY, set())
+    rooms = session.info.setdefault(_ROOMS_KEY, set())
+
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, Room):
+            buildings.update(_current_and_previous(obj, "building_id"))
+        elif isinstance(obj, (Contract, MaintenanceRequest)):
+            rooms.update(_current_and_previous(obj, "room_id"))
+
+
+def _before_commit(session: Session) -> None:
+    # Chỉ refresh khi commit transaction ngoài cùng (bỏ qua SAVEPOINT)
+    if session.in_nested_transaction():
+        return
+
+    # Flush các thay đổi còn lại để after_flush kịp ghi nhận
+    session.flush()
+
+    buildings = session.info.pop(_BUILDINGS_KEY, set())
+    rooms = session.info.pop(_ROOMS_KEY, set())
+    if not buildings and not rooms:
+        return
+
+    from app.repositories.building_stats_repository import BuildingStatsRepository
+
+    if rooms:
+        buildings.update(
+            session.execute(
+                select(Room.building_id).where(Room.id.in_(rooms))
+            ).scalars()
+        )
+    BuildingStatsRepository(session).refresh(buildings)
+
+
+def _after_rollback(session: Session, previous_transaction) -> None:
+    # Rollback SAVEPOINT không xóa danh sách: refresh thừa vẫn cho kết quả đúng
+    if previous_transaction.parent is not None:
+        return
+    session.info.pop(_BUILDINGS_KEY, None)
+    session.info.pop(_ROOMS_KEY, None)
+
+
+def register_building_stats_listeners(session_factory) -> None:
+    """Gắn listener vào sessionmaker (gọi một lần lúc khởi động app)."""
+    if event.contains(session_factory, "after_flush", _after_flush):
+        return
+    event.listen(session_factory, "after_flush", _after_flush)
+    event.listen(session_factory, "before_commit", _before_commit)
+    event.listen(session_factory, "after_soft_rollback", _after_rollback)
@@ -0,0 +1,136 @@
+"""Giữ invoices.total_amount / amount_paid / amount_due đồng bộ.
+
+- ``before_insert`` / ``before_update`` (mapper Invoice): tính lại total_amount
+  bằng ``calculate_invoice_total`` khi tạo hóa đơn hoặc sửa một cột tiền
+  (``AMOUNT_FIELDS``); amount_due = total_amount - amount_paid được ghi bằng
+  biểu thức SQL nên không cần đọc amount_paid hiện tại.
+- ``before_flush`` / ``after_flush_postexec`` (session): với mỗi Payment được
+  thêm/sửa/xóa, tính phần đóng góp cũ (status/amount/invoice_id có
+  ``active_history``) và mới - chỉ payment COMPLETED được tính - rồi ghi
+  ``UPDATE invoices SET amount_paid = amount_paid + :delta`` trong transaction
+  của flush (cùng cách với room_occupancy_events).
+
+Insert hàng loạt (``InvoiceRepository.bulk_create``) tự điền các cột này bằng
+``calculate_invoice_total``; bulk UPDATE/SQL thô bỏ qua listener.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from decimal import Decimal
+from typing import Any, Optional
+
+from sqlalchemy import event, inspect, literal, update
+from sqlalchemy.orm import Session
+
+from app.models.invoice import AMOUNT_FIELDS, Invoice, calculate_invoice_total
+from app.models.payment import Payment
+
+_DELTAS_KEY = "invoice_paid_deltas"
+_AMOUNT_ATTRS = ["amount_paid", "amount_due"]
+
+
+def _previous(obj: Payment, attr: str) -> Any:
+    """Giá trị của cột trước khi sửa (đã lưu trong DB)."""
+    history = inspect(obj).attrs[attr].history
+    if history.deleted:
+        return history.deleted[0]
+    return getattr(obj, attr)
+
+
+def _before_insert(mapper, connection, invoice: Invoice) -> None:
+    invoice.total_amount = calculate_invoice_total(invoice)
+    invoice.amount_paid = invoice.amount_paid or Decimal(0)
+    invoice.amount_due = invoice.total_amount - invoice.amount_paid
+
+
+def _before_update(mapper, connection, invoice: Invoice) -> None:
+    state = inspect(invoice)
+    if not any(state.attrs[name].history.has_changes() for name in AMOUNT_FIELDS):
+        return
+    invoice.total_amount = calculate_invoice_total(invoice)
+    invoice.amount_due = literal(invoice.total_amount, Invoice.amount_due.type) - Invoice.__table__.c.amount_paid
+
+
+def _add(deltas: dict, invoice_id: Optional[Any], status: Any, amount: Optional[Decimal], sign: int) -> None:
+    if invoice_id is None or status != Payment.PaymentStatus.COMPLETED:
+        return
+    deltas[invoice_id] += sign * (amount or Decimal(0))
+
+
+def _before_flush(session: Session, flush_context, instances) -> None:
+    # Bỏ chênh lệch của lần flush trước nếu nó lỗi giữa chừng (chưa được ghi)
+    session.info.pop(_DELTAS_KEY, None)
+    deltas = defaultdict(Decimal)
+
+    for obj in session.new:
+        if isinstance(obj, Payment):
+            _add(deltas, obj.invoice_id, obj.status, obj.amount, +1)
+
+    for obj in session.dirty:
+        if isinstance(obj, Payment) and session.is_modified(obj, include_collections=False):
+            _add(
+                deltas,
+                _previous(obj, "invoice_id"),
+                _previous(obj, "status"),
+                _previous(obj, "amount"),
+                -1,
+            )
+            _add(deltas, obj.invoice_id, obj.status, obj.amount, +1)
+
+    for obj in session.deleted:
+        if isinstance(obj, Payment):
+            _add(
+                deltas,
+                _previous(obj, "invoice_id"),
+                _previous(obj, "status"),
+                _previous(obj, "amount"),
+                -1,
+            )
+
+    changed = {invoice_id: delta for invoice_id, delta in deltas.items() if delta}
+    if changed:
+        session.info[_DELTAS_KEY] = changed
+
+
+def _after_flush_postexec(session: Session, flush_context) -> None:
+    deltas = session.info.pop(_DELTAS_KEY, None)
+    if not deltas:
+        return
+
+    connection = session.connection()
+    table = Invoice.__table__
+    # Thứ tự invoice_id cố định để hai transaction không khóa chéo nhau
+    for invoice_id in sorted(deltas, key=str):
+        delta = deltas[invoice_id]
+        connection.execute(
+            update(table)
+            .where(table.c.id == invoice_id)
+            .values(
+                amount_paid=table.c.amount_paid + delta,
+                amount_due=table.c.amount_due - delta,
+            )
+        )
+
+        # Invoice đang nằm trong session giữ giá trị cũ - expire để lần đọc sau lấy từ DB
+        invoice = session.identity_map.get(inspect(Invoice).identity_key_from_primary_key((invoice_id,)))
+        if invoice is not None:
+            session.expire(invoice, _AMOUNT_ATTRS)
+
+
+def _after_rollback(session: Session, previous_transaction) -> None:
+    if previous_transaction.parent is not None:
+        return
+    session.info.pop(_DELTAS_KEY, None)
+
+
+def register_invoice_amount_listeners(session_factory) -> None:
+    """Gắn listener vào mapper Invoice và sessionmaker (gọi một lần lúc khởi động app)."""
+    if not event.contains(Invoice, "before_insert", _before_insert):
+        event.listen(Invoice, "before_insert", _before_insert)
+        event.listen(Invoice, "before_update", _before_update)
+    if event.contains(session_factory, "before_flush", _before_flush):
+        return
+    event.listen(session_factory, "before_flush", _before_flush)
+    event.listen(session_factory, "after_flush_postexec", _after_flush_postexec)
+    event.listen(session_factory, "after_soft_rollback", _after_rollback)
@@ -0,0 +1,110 @@
+"""Giữ notification_counters (tổng số / chưa đọc theo user) đồng bộ.
+
+- ``before_flush``: với mỗi Notification được thêm/sửa/xóa, tính phần đóng góp
+  cũ (user_id/is_read có ``active_history``) và mới rồi gom chênh lệch theo
+  user (cùng cách với invoice_amount_events).
+- ``after_flush_postexec``: ghi chênh lệch bằng
+  ``INSERT ... ON CONFLICT (user_id) DO UPDATE SET unread_count = unread_count + :delta``
+  trong transaction của flush.
+
+Thông báo được ghi qua AsyncSession (``NotificationService``) nên listener được
+gắn cả vào sessionmaker đồng bộ lẫn ``AsyncBackedSession`` (session đồng bộ
+bên trong ``AsyncSessionLocal``). Bulk UPDATE/SQL thô bỏ qua listener - chạy
+``scripts/refresh_notification_counters.py`` sau khi sửa dữ liệu trực tiếp.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import Any
+
+from sqlalchemy import event, func, inspect
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.models.notification import Notification
+from app.models.notification_counter import NotificationCounter
+
+_DELTAS_KEY = "notification_counter_deltas"
+
+
+def _previous(obj: Notification, attr: str) -> Any:
+    """Giá trị của cột trước khi sửa (đã lưu trong DB)."""
+    history = inspect(obj).attrs[attr].history
+    if history.deleted:
+        return history.deleted[0]
+    return getattr(obj, attr)
+
+
+def _add(deltas: dict, user_id: Any, is_read: Any, sign: int) -> None:
+    if user_id is None:
+        return
+    total, unread = deltas[user_id]
+    # is_read chưa gán (None) -> default False khi insert
+    deltas[user_id] = (total + sign, unread + (0 if is_read else sign))
+
+
+def _before_flush(session: Session, flush_context, instances) -> None:
+    # Bỏ chênh lệch của lần flush trước nếu nó lỗi giữa chừng (chưa được ghi)
+    session.info.pop(_DELTAS_KEY, None)
+    deltas = defaultdict(lambda: (0, 0))
+
+    for obj in session.new:
+        if isinstance(obj, Notification):
+            _add(deltas, obj.user_id, obj.is_read, +1)
+
+    for obj in session.dirty:
+        if isinstance(obj, Notification) and session.is_modified(obj, include_collections=False):
+            _add(deltas, _previous(obj, "user_id"), _previous(obj, "is_read"), -1)
+            _add(deltas, obj.user_id, obj.is_read, +1)
+
+    for obj in session.deleted:
+        if isinstance(obj, Notification):
+            _add(deltas, _previous(obj, "user_id"), _previous(obj, "is_read"), -1)
+
+    changed = {user_id: delta for user_id, delta in deltas.items() if delta != (0, 0)}
+    if changed:
+        session.info[_DELTAS_KEY] = changed
+
+
+def _after_flush_postexec(session: Session, flush_context) -> None:
+    deltas = session.info.pop(_DELTAS_KEY, None)
+    if not deltas:
+        return
+
+    connection = session.connection()
+    table = NotificationCounter.__table__
+    # Thứ tự user_id cố định để hai transaction không khóa chéo nhau
+    for user_id in sorted(deltas, key=str):
+        total, unread = deltas[user_id]
+        stmt = insert(table).values(
+            user_id=user_id,
+            total_count=max(total, 0),
+            unread_count=max(unread, 0),
+        )
+        connection.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[table.c.user_id],
+                set_={
+                    "total_count": table.c.total_count + total,
+                    "unread_count": table.c.unread_count + unread,
+                    "updated_at": func.now(),
+                },
+            )
+        )
+
+
+def _after_rollback(session: Session, previous_transaction) -> None:
+    if previous_transaction.parent is not None:
+        return
+    session.info.pop(_DELTAS_KEY, None)
+
+
+def register_notification_counter_listeners(*session_factories) -> None:
+    """Gắn listener vào các sessionmaker / session class (gọi một lần lúc khởi động app)."""
+    for session_factory in session_factories:
+        if event.contains(session_factory, "before_flush", _before_flush):
+            continue
+        event.listen(session_factory, "before_flush", _before_flush)
+        event.listen(session_factory, "after_flush_postexec", _after_flush_postexec)
+        event.listen(session_factory, "after_soft_rollback", _after_rollback)
@@ -0,0 +1,58 @@
+"""Phát sự kiện khi payment đổi sang trạng thái cuối.
+
+``after_flush`` (session): với mỗi Payment có ``status`` vừa đổi sang
+COMPLETED / FAILED / CANCELLED, gửi ``pg_notify(PAYMENT_EVENTS_CHANNEL, json)``
+trên kết nối của flush. Notification nằm trong transaction nên chỉ được giao
+khi commit (savepoint rollback thì bị bỏ); ``app.infrastructure.payment_events``
+nhận và đẩy tới stream SSE.
+
+Chỉ thay đổi qua ORM được phát; bulk UPDATE/SQL thô bỏ qua listener.
+"""
+
+from __future__ import annotations
+
+import json
+
+from sqlalchemy import event, func, inspect, select
+from sqlalchemy.orm import Session
+
+from app.core.settings import settings
+from app.models.payment import Payment
+
+FINAL_STATUSES = (
+    Payment.PaymentStatus.COMPLETED,
+    Payment.PaymentStatus.FAILED,
+    Payment.PaymentStatus.CANCELLED,
+)
+
+
+def payment_event(payment: Payment) -> dict:
+    """Nội dung sự kiện (cũng dùng cho trạng thái ban đầu của stream)."""
+    return {
+        "payment_id": str(payment.payment_id),
+        "invoice_id": str(payment.invoice_id),
+        "status": payment.status.value,
+        "paid_at": payment.paid_at.isoformat() if payment.paid_at else None,
+    }
+
+
+def _after_flush(session: Session, flush_context) -> None:
+    events = []
+    for obj in list(session.new) + list(session.dirty):
+        if not isinstance(obj, Payment) or obj.status not in FINAL_STATUSES:
+            continue
+        if obj in session.new or inspect(obj).attrs.status.history.has_changes():
+            events.append(payment_event(obj))
+
+    if not events:
+        return
+    connection = session.connection()
+    for payload in events:
+        connection.execute(select(func.pg_notify(settings.PAYMENT_EVENTS_CHANNEL, json.dumps(payload))))
+
+
+def register_payment_status_listeners(session_factory) -> None:
+    """Gắn listener vào sessionmaker (gọi một lần lúc khởi động app)."""
+    if event.contains(session_factory, "after_flush", _after_flush):
+        return
+    event.listen(session_factory, "after_flush", _after_flush)
@@ -0,0 +1,137 @@
+"""Đo đạc connection pool của SQLAlchemy (engine sync và async).
+
+Mỗi engine được gắn một ``PoolMetrics``:
+- Đếm connect/checkout/checkin/invalidate qua pool events.
+- Đo thời gian chờ lấy connection (bao gồm cả thời gian mở connection mới)
+  bằng cách bọc ``Pool._do_get``; chờ quá ``pool_timeout`` được đếm là timeout.
+
+Số liệu là per-process (mỗi worker uvicorn một bộ), dùng để cân
+``pool_size + max_overflow`` x số worker với ``max_connections`` của Postgres.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Dict, Optional
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import Pool
+
+
+class PoolMetrics:
+    """Bộ đếm thread-safe cho một connection pool."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self.connects = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.invalidations = 0
+        self.soft_invalidations = 0
+        self.timeouts = 0
+        self.wait_total_ms = 0.0
+        self.wait_max_ms = 0.0
+
+    def incr(self, field: str) -> None:
+        with self._lock:
+            setattr(self, field, getattr(self, field) + 1)
+
+    def record_wait(self, elapsed_ms: float, timed_out: bool = False) -> None:
+        with self._lock:
+            self.wait_total_ms += elapsed_ms
+            self.wait_max_ms = max(self.wait_max_ms, elapsed_ms)
+            if timed_out:
+                self.timeouts += 1
+
+    def snapshot(self, pool: Optional[Pool] = None) -> dict:
+        """Số liệu hiện tại, kèm trạng thái tức thời của pool nếu có."""
+        with self._lock:
+            waits = self.checkouts + self.timeouts
+            data = {
+                "connects": self.connects,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "invalidations": self.invalidations,
+                "soft_invalidations": self.soft_invalidations,
+                "timeouts": self.timeouts,
+                "wait_avg_ms": round(self.wait_total_ms / waits, 3) if waits else 0.0,
+                "wait_max_ms": round(self.wait_max_ms, 3),
+            }
+
+        if pool is not None:
+            data["pool_class"] = type(pool).__name__
+            # NullPool không có các số liệu size/overflow
+            for key in ("size", "checkedin", "checkedout", "overflow"):
+                fn = getattr(pool, key, None)
+                data[key] = fn() if callable(fn) else None
+        return data
+
+
+class _TimedGetMixin:
+    """Bọc ``Pool._do_get`` để đo thời gian chờ lấy connection."""
+
+    metrics: PoolMetrics
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.record_wait((time.perf_counter() - start) * 1000, timed_out=True)
+            raise
+        self.metrics.record_wait((time.perf_counter() - start) * 1000)
+        return conn
+
+
+_registry: Dict[str, tuple[PoolMetrics, Optional[Engine]]] = {}
+
+
+def instrumented_poolclass(name: str, base: type) -> type:
+    """Tạo subclass của ``base`` có đo thời gian chờ, gắn với metrics ``name``.
+
+    Metrics là class attribute nên vẫn giữ nguyên khi pool được ``recreate()``
+    (``engine.dispose()``).
+    """
+    metrics = PoolMetrics(name)
+    _registry[name] = (metrics, None)
+    return type(f"Instrumented{base.__name__}", (_TimedGetMixin, base), {"metrics": metrics})
+
+
+def instrument_engine(name: str, engine: Engine) -> None:
+    """Gắn pool events đếm connect/checkout/checkin/invalidate cho ``engine``.
+
+    ``engine`` phải được tạo với ``poolclass=instrumented_poolclass(name, ...)``.
+    """
+    metrics, _ = _registry[name]
+    _registry[name] = (metrics, engine)
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        metrics.incr("connects")
+
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        metrics.incr("checkouts")
+
+    @event.listens_for(engine, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        metrics.incr("checkins")
+
+    @event.listens_for(engine, "invalidate")
+    def _on_invalidate(dbapi_connection, connection_record, exception):
+        metrics.incr("invalidations")
+
+    @event.listens_for(engine, "soft_invalidate")
+    def _on_soft_invalidate(dbapi_connection, connection_record, exception):
+        metrics.incr("soft_invalidations")
+
+
+def pool_stats() -> dict:
+    """Snapshot metrics của tất cả engine đã đăng ký."""
+    return {
+        name: metrics.snapshot(engine.pool if engine is not None else None)
+        for name, (metrics, engine) in _registry.items()
+    }
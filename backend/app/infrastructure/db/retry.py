@@ -0,0 +1,102 @@
+"""Chạy lại thao tác ghi khi Postgres báo xung đột khóa.
+
+Các lỗi sau không phải lỗi dữ liệu mà do thứ tự thực thi giữa các transaction
+đồng thời - rollback và chạy lại toàn bộ thao tác thường thành công:
+
+- ``40001`` serialization_failure
+- ``40P01`` deadlock_detected
+- ``55P03`` lock_not_available (hết ``lock_timeout`` khi chờ ``FOR UPDATE``)
+
+``retry_on_conflict`` bọc method của service (có ``self.db``). Gọi lồng nhau
+(service method đã bọc gọi method khác cũng được bọc) chỉ retry ở tầng ngoài
+cùng để số lần chạy không nhân lên. Nhiều repository tự commit giữa chừng -
+chỉ chạy lại khi lần thử lỗi chưa commit gì, tránh ghi trùng.
+"""
+
+from __future__ import annotations
+
+import functools
+import logging
+import random
+import time
+
+from sqlalchemy import event, func, select
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+
+from app.core.settings import settings
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_SQLSTATES = frozenset({"40001", "40P01", "55P03"})
+
+_DEPTH_KEY = "retry_on_conflict_depth"
+_COMMITS_KEY = "retry_on_conflict_commits"
+
+
+def _count_commit(session: Session) -> None:
+    session.info[_COMMITS_KEY] = session.info.get(_COMMITS_KEY, 0) + 1
+
+
+def _commit_count(db: Session) -> int:
+    """Số lần commit của Session (gắn listener đếm ở lần gọi đầu)."""
+    if not event.contains(db, "after_commit", _count_commit):
+        event.listen(db, "after_commit", _count_commit)
+    return db.info.get(_COMMITS_KEY, 0)
+
+
+def is_conflict_error(exc: BaseException) -> bool:
+    """Lỗi DB do xung đột khóa giữa các transaction (có thể chạy lại)."""
+    if not isinstance(exc, DBAPIError):
+        return False
+    orig = exc.orig
+    # psycopg2: pgcode, psycopg 3: sqlstate
+    sqlstate = getattr(orig, "pgcode", None) or getattr(orig, "sqlstate", None)
+    return sqlstate in RETRYABLE_SQLSTATES
+
+
+def set_lock_timeout(db: Session, timeout_ms: int) -> None:
+    """Giới hạn thời gian chờ khóa trong transaction hiện tại (``SET LOCAL lock_timeout``)."""
+    if timeout_ms > 0:
+        db.execute(select(func.set_config("lock_timeout", f"{timeout_ms}ms", True)))
+
+
+def retry_on_conflict(method):
+    """Decorator cho method service: rollback và chạy lại khi gặp xung đột khóa.
+
+    Hết ``DB_CONFLICT_RETRY_ATTEMPTS`` lần vẫn xung đột thì báo ``ValueError``
+    (route trả 400) để client thử lại sau.
+    """
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        db: Session = self.db
+        depth = db.info.get(_DEPTH_KEY, 0)
+        if depth:
+            return method(self, *args, **kwargs)
+
+        attempts = max(settings.DB_CONFLICT_RETRY_ATTEMPTS, 1)
+        db.info[_DEPTH_KEY] = 1
+        try:
+            for attempt in range(1, attempts + 1):
+                commits = _commit_count(db)
+                try:
+                    return method(self, *args, **kwargs)
+                except DBAPIError as exc:
+                    # Đã commit một phần thì chạy lại sẽ ghi trùng - trả lỗi gốc
+                    if not is_conflict_error(exc) or _commit_count(db) != commits:
+                        raise
+                    db.rollback()
+                    if attempt == attempts:
+                        logger.warning("%s: xung đột khóa sau %d lần thử: %s",
+                                       method.__qualname__, attempts, exc.orig)
+                        raise ValueError(
+                            "Dữ liệu đang được cập nhật bởi một thao tác khác. Vui lòng thử lại."
+                        ) from exc
+                    # Backoff có jitter để các transaction xung đột không chạy lại cùng lúc
+                    delay = settings.DB_CONFLICT_RETRY_BASE_SECONDS * 2 ** (attempt - 1)
+                    time.sleep(delay * random.uniform(0.5, 1.5))
+        finally:
+            db.info.pop(_DEPTH_KEY, None)
+
+    return wrapper
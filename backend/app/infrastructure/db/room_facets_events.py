@@ -0,0 +1,60 @@
+"""Xóa cache facet phòng khi phòng/hợp đồng/tiện ích thay đổi.
+
+Listener gắn vào sessionmaker:
+- ``after_flush``: đánh dấu session nếu có object ảnh hưởng tới facet
+  (phòng, hợp đồng, tiện ích, tòa nhà, địa chỉ, loại phòng) được thêm/sửa/xóa.
+- ``after_commit``: khi transaction ngoài cùng commit, xóa cache facet của
+  worker hiện tại (``RoomService.invalidate_room_facets``).
+
+Worker khác không nhận được lệnh xóa - entry của chúng hết hạn sau
+``ROOM_FACETS_CACHE_TTL_SECONDS``.
+"""
+
+from __future__ import annotations
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.models.address import Address
+from app.models.building import Building
+from app.models.contract import Contract
+from app.models.room import Room
+from app.models.room_type import RoomType
+from app.models.room_utility import RoomUtility
+
+_DIRTY_KEY = "room_facets_dirty"
+_WATCHED = (Room, Contract, RoomUtility, Building, Address, RoomType)
+
+
+def _after_flush(session: Session, flush_context) -> None:
+    if session.info.get(_DIRTY_KEY):
+        return
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, _WATCHED):
+            session.info[_DIRTY_KEY] = True
+            return
+
+
+def _after_commit(session: Session) -> None:
+    # Commit SAVEPOINT: transaction ngoài vẫn còn, chờ commit thật
+    if session.in_transaction():
+        return
+    if session.info.pop(_DIRTY_KEY, False):
+        from app.services.RoomService import invalidate_room_facets
+
+        invalidate_room_facets()
+
+
+def _after_rollback(session: Session, previous_transaction) -> None:
+    if previous_transaction.parent is not None:
+        return
+    session.info.pop(_DIRTY_KEY, None)
+
+
+def register_room_facets_listeners(session_factory) -> None:
+    """Gắn listener vào sessionmaker (gọi một lần lúc khởi động app)."""
+    if event.contains(session_factory, "after_flush", _after_flush):
+        return
+    event.listen(session_factory, "after_flush", _after_flush)
+    event.listen(session_factory, "after_commit", _after_commit)
+    event.listen(session_factory, "after_soft_rollback", _after_rollback)
@@ -0,0 +1,127 @@
+"""Giữ bộ đếm rooms.current_occupants / rooms.active_contract_count đồng bộ với hợp đồng.
+
+Listener gắn vào sessionmaker:
+- ``before_flush``: với mỗi Contract được thêm/sửa/xóa, tính phần đóng góp cũ
+  (giá trị trước khi sửa - các cột room_id/status/number_of_tenants có
+  ``active_history``) và mới, cộng dồn chênh lệch theo phòng.
+- ``after_flush_postexec``: ghi chênh lệch bằng
+  ``UPDATE rooms SET current_occupants = current_occupants + :delta`` ngay trong
+  transaction của flush. Phép cộng tương đối an toàn khi nhiều transaction
+  cùng sửa một phòng (row lock tuần tự hóa, không ghi đè lẫn nhau).
+
+Cập nhật bằng bulk UPDATE/SQL thô bỏ qua listener - chạy
+``scripts/reconcile_room_occupancy.py`` để tính lại và báo lệch.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import Any, Optional
+
+from sqlalchemy import event, inspect, update
+from sqlalchemy.orm import Session
+
+from app.core.Enum.contractEnum import ContractStatus
+from app.models.contract import Contract
+from app.models.room import Room
+
+# Trạng thái hợp đồng được tính vào current_occupants (cùng rule kiểm tra sức chứa)
+OCCUPYING_STATUSES = frozenset({
+    ContractStatus.ACTIVE.value,
+    ContractStatus.PENDING.value,
+    ContractStatus.PENDING_UPDATE.value,
+})
+
+_DELTAS_KEY = "room_occupancy_deltas"
+_COUNTER_ATTRS = ["current_occupants", "active_contract_count"]
+
+
+def _previous(obj: Contract, attr: str) -> Any:
+    """Giá trị của cột trước khi sửa (đã lưu trong DB)."""
+    history = inspect(obj).attrs[attr].history
+    if history.deleted:
+        return history.deleted[0]
+    return getattr(obj, attr)
+
+
+def _add(deltas: dict, room_id: Optional[Any], status: Optional[str], tenants: Optional[int], sign: int) -> None:
+    if room_id is None:
+        return
+    if status in OCCUPYING_STATUSES:
+        deltas[room_id][0] += sign * (tenants or 0)
+    if status == ContractStatus.ACTIVE.value:
+        deltas[room_id][1] += sign
+
+
+def _before_flush(session: Session, flush_context, instances) -> None:
+    # Bỏ chênh lệch của lần flush trước nếu nó lỗi giữa chừng (chưa được ghi)
+    session.info.pop(_DELTAS_KEY, None)
+    deltas = defaultdict(lambda: [0, 0])
+
+    for obj in session.new:
+        if isinstance(obj, Contract):
+            _add(deltas, obj.room_id, obj.status, obj.number_of_tenants, +1)
+
+    for obj in session.dirty:
+        if isinstance(obj, Contract) and session.is_modified(obj, include_collections=False):
+            _add(
+                deltas,
+                _previous(obj, "room_id"),
+                _previous(obj, "status"),
+                _previous(obj, "number_of_tenants"),
+                -1,
+            )
+            _add(deltas, obj.room_id, obj.status, obj.number_of_tenants, +1)
+
+    for obj in session.deleted:
+        if isinstance(obj, Contract):
+            _add(
+                deltas,
+                _previous(obj, "room_id"),
+                _previous(obj, "status"),
+                _previous(obj, "number_of_tenants"),
+                -1,
+            )
+
+    changed = {room_id: delta for room_id, delta in deltas.items() if delta != [0, 0]}
+    if changed:
+        session.info[_DELTAS_KEY] = changed
+
+
+def _after_flush_postexec(session: Session, flush_context) -> None:
+    deltas = session.info.pop(_DELTAS_KEY, None)
+    if not deltas:
+        return
+
+    connection = session.connection()
+    # Thứ tự room_id cố định để hai transaction không khóa chéo nhau
+    for room_id in sorted(deltas, key=str):
+        occupants, active = deltas[room_id]
+        connection.execute(
+            update(Room.__table__)
+            .where(Room.__table__.c.id == room_id)
+            .values(
+                current_occupants=Room.__table__.c.current_occupants + occupants,
+                active_contract_count=Room.__table__.c.active_contract_count + active,
+            )
+        )
+
+        # Room đang nằm trong session giữ giá trị cũ - expire để lần đọc sau lấy từ DB
+        room = session.identity_map.get(inspect(Room).identity_key_from_primary_key((room_id,)))
+        if room is not None:
+            session.expire(room, _COUNTER_ATTRS)
+
+
+def _after_rollback(session: Session, previous_transaction) -> None:
+    if previous_transaction.parent is not None:
+        return
+    session.info.pop(_DELTAS_KEY, None)
+
+
+def register_room_occupancy_listeners(session_factory) -> None:
+    """Gắn listener vào sessionmaker (gọi một lần lúc khởi động app)."""
+    if event.contains(session_factory, "before_flush", _before_flush):
+        return
+    event.listen(session_factory, "before_flush", _before_flush)
+    event.listen(session_factory, "after_flush_postexec", _after_flush_postexec)
+    event.listen(session_factory, "after_soft_rollback", _after_rollback)
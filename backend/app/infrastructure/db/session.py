@@ -1,18 +1,95 @@
+from uuid import uuid4
+
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base  
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
 from app.core.settings import settings
+from app.infrastructure.db.pool_metrics import instrument_engine, instrumented_poolclass
+
+
+def _pool_kwargs(name: str, queue_pool: type) -> dict:
+    """Tham số pool cho create_engine theo settings.
+
+    PgBouncer mode dùng NullPool: PgBouncer đã pool kết nối, giữ thêm pool phía
+    app chỉ chiếm slot server mà không tái sử dụng được qua transaction pooling.
+    """
+    if settings.DB_PGBOUNCER_MODE:
+        return {"poolclass": instrumented_poolclass(name, NullPool)}
+    return {
+        "poolclass": instrumented_poolclass(name, queue_pool),
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+def _sync_connect_args() -> dict:
+    # PgBouncer (transaction pooling) không nhận startup parameter ``options``:
+    # khi đó đặt statement_timeout ở role (ALTER ROLE ... SET statement_timeout)
+    if settings.DB_STATEMENT_TIMEOUT_MS > 0 and not settings.DB_PGBOUNCER_MODE:
+        return {"options": f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"}
+    return {}
+
+
+def _async_connect_args() -> dict:
+    args: dict = {}
+    if settings.DB_STATEMENT_TIMEOUT_MS > 0 and not settings.DB_PGBOUNCER_MODE:
+        args["server_settings"] = {"statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS)}
+    if settings.DB_PGBOUNCER_MODE:
+        # Prepared statement gắn với server connection, PgBouncer có thể đổi
+        # connection giữa các transaction -> tắt cache và dùng tên duy nhất
+        args["statement_cache_size"] = 0
+        args["prepared_statement_cache_size"] = 0
+        args["prepared_statement_name_func"] = lambda: f"__asyncpg_{uuid4()}__"
+    return args
+
 
 # Tạo engine kết nối database
 engine = create_engine(
     settings.DATABASE_URL,
-    pool_pre_ping=True,  # Kiểm tra kết nối trước khi sử dụng
-    pool_recycle=300,    # Làm mới kết nối sau 5 phút
+    connect_args=_sync_connect_args(),
+    **_pool_kwargs("sync", QueuePool),
 )
+instrument_engine("sync", engine)
 
 # Tạo SessionLocal để tạo database sessions
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+
+def _async_database_url(url: str):
+    """Đổi driver của DATABASE_URL (psycopg2) sang asyncpg cho async engine."""
+    return make_url(url).set(drivername="postgresql+asyncpg")
+
+
+# Async engine dùng cho các route ``async def`` (không block event loop)
+async_engine = create_async_engine(
+    _async_database_url(settings.DATABASE_URL),
+    connect_args=_async_connect_args(),
+    **_pool_kwargs("async", AsyncAdaptedQueuePool),
+)
+instrument_engine("async", async_engine.sync_engine)
+
+class AsyncBackedSession(Session):
+    """Session đồng bộ bên trong AsyncSession.
+
+    Lớp riêng để gắn session event cho phía async mà không ảnh hưởng SessionLocal.
+    """
+
+
+# expire_on_commit=False: với AsyncSession, truy cập thuộc tính bị expire sau
+# commit sẽ phát sinh lazy load ngầm (không được phép ngoài greenlet)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    autoflush=False,
+    expire_on_commit=False,
+    sync_session_class=AsyncBackedSession,
+)
+
 # Base class cho các models
 Base = declarative_base()
 
@@ -27,3 +104,12 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    """
+    Dependency để lấy AsyncSession (asyncpg).
+    Dùng cho các route khai báo ``async def``; route đồng bộ dùng ``get_db``.
+    """
+    async with AsyncSessionLocal() as session:
+        yield session
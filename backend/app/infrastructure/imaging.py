@@ -0,0 +1,166 @@
+"""Image derivation pipeline - tạo thumbnail cho ảnh upload.
+
+Mỗi ảnh chỉ được decode một lần, sau đó resize ra các kích thước cố định và
+encode sang WebP/JPEG. Việc xử lý ảnh (CPU-bound) chạy trong process pool để
+ảnh lớn không chiếm GIL của API worker.
+
+Pillow là dependency tùy chọn: nếu chưa cài, pipeline tự tắt và ảnh gốc vẫn
+được lưu bình thường.
+"""
+
+from __future__ import annotations
+
+import io
+import logging
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Optional
+
+from app.core.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Các width cố định cho thumbnail (px) và định dạng output
+THUMBNAIL_WIDTHS: tuple[int, ...] = (320, 640)
+THUMBNAIL_FORMATS: tuple[str, ...] = ("webp", "jpeg")
+
+# Variant dùng cho ảnh đại diện ở trang danh sách phòng public
+LISTING_VARIANT = ("w640", "webp")
+
+_CONTENT_TYPES = {"webp": "image/webp", "jpeg": "image/jpeg"}
+
+try:
+    import PIL  # noqa: F401
+
+    PILLOW_AVAILABLE = True
+except ImportError:  # pragma: no cover - phụ thuộc môi trường
+    PILLOW_AVAILABLE = False
+
+
+@dataclass(frozen=True)
+class ImageVariant:
+    """Một phiên bản resize của ảnh gốc.
+
+    Attributes:
+        label: Nhãn kích thước (ví dụ ``w320``).
+        format: ``webp`` hoặc ``jpeg``.
+        width: Chiều rộng thực tế (px).
+        height: Chiều cao thực tế (px).
+        data: Nội dung ảnh đã encode.
+    """
+
+    label: str
+    format: str
+    width: int
+    height: int
+    data: bytes
+
+    @property
+    def content_type(self) -> str:
+        return _CONTENT_TYPES[self.format]
+
+    @property
+    def byte_size(self) -> int:
+        return len(self.data)
+
+
+def render_variants(
+    data: bytes,
+    widths: tuple[int, ...] = THUMBNAIL_WIDTHS,
+    formats: tuple[str, ...] = THUMBNAIL_FORMATS,
+) -> list[ImageVariant]:
+    """Decode ảnh một lần và tạo tất cả thumbnail (chạy trong worker process).
+
+    Args:
+        data: Nội dung ảnh gốc.
+        widths: Các width cần tạo; ảnh nhỏ hơn width không bị phóng to.
+        formats: Các định dạng output.
+
+    Returns:
+        Danh sách ImageVariant.
+    """
+    from PIL import Image, ImageOps
+
+    with Image.open(io.BytesIO(data)) as img:
+        # JPEG: decode trực tiếp ở độ phân giải thấp hơn (nhanh hơn nhiều với ảnh lớn)
+        img.draft("RGB", (max(widths), max(widths) * 4))
+        img = ImageOps.exif_transpose(img)
+        if img.mode not in ("RGB", "RGBA"):
+            img = img.convert("RGBA" if "A" in img.getbands() else "RGB")
+
+        variants = []
+        for width in sorted(widths, reverse=True):
+            resized = img
+            if img.width > width:
+                height = max(1, round(img.height * width / img.width))
+                resized = img.resize((width, height), Image.Resampling.LANCZOS)
+
+            for fmt in formats:
+                out = io.BytesIO()
+                frame = resized
+                if fmt == "jpeg" and frame.mode != "RGB":
+                    # JPEG không có alpha - ghép lên nền trắng
+                    background = Image.new("RGB", frame.size, (255, 255, 255))
+                    background.paste(frame, mask=frame.getchannel("A"))
+                    frame = background
+                frame.save(out, format=fmt.upper(), quality=80, optimize=True)
+                variants.append(
+                    ImageVariant(
+                        label=f"w{width}",
+                        format=fmt,
+                        width=frame.width,
+                        height=frame.height,
+                        data=out.getvalue(),
+                    )
+                )
+        return variants
+
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    """Process pool dùng chung, khởi tạo lazy ở lần dùng đầu tiên."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ProcessPoolExecutor(max_workers=settings.IMAGE_WORKERS)
+    return _executor
+
+
+def submit_variants(data: bytes) -> Optional[Future]:
+    """Đẩy ảnh vào process pool để tạo thumbnail.
+
+    Returns:
+        Future trả về list[ImageVariant], hoặc None nếu pipeline bị tắt.
+    """
+    if not PILLOW_AVAILABLE or settings.IMAGE_WORKERS <= 0:
+        return None
+    return _get_executor().submit(render_variants, data)
+
+
+def collect_variants(future: Optional[Future]) -> list[ImageVariant]:
+    """Chờ kết quả từ ``submit_variants``.
+
+    Lỗi decode/timeout không làm hỏng request upload: ảnh gốc vẫn được lưu,
+    chỉ là không có thumbnail.
+    """
+    if future is None:
+        return []
+    try:
+        return future.result(timeout=settings.IMAGE_PROCESS_TIMEOUT_SECONDS)
+    except Exception as exc:
+        logger.warning("Không tạo được thumbnail: %s", exc)
+        return []
+
+
+def shutdown_executor() -> None:
+    """Dừng process pool (gọi khi tắt ứng dụng)."""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
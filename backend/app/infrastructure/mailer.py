@@ -0,0 +1,265 @@
+"""Gửi email nền từ bảng email_outbox.
+
+- ``SMTPConnection``: giữ một kết nối SMTP đã STARTTLS + login để gửi nhiều
+  email liên tiếp; tự kết nối lại khi server ngắt hoặc rảnh quá
+  ``SMTP_IDLE_TIMEOUT_SECONDS``.
+- ``EmailOutboxWorker``: lấy batch email PENDING đến hạn bằng
+  ``SELECT ... FOR UPDATE SKIP LOCKED`` (nhiều worker uvicorn chạy song song
+  không gửi trùng), gửi qua kết nối dùng lại, ghi SENT hoặc lên lịch retry với
+  exponential backoff; quá ``EMAIL_MAX_ATTEMPTS`` (hoặc lỗi vĩnh viễn 5xx) thì
+  FAILED.
+
+Thử local không cần Gmail: ``python -m aiosmtpd -n -l localhost:1025`` và đặt
+``SMTP_HOST=localhost SMTP_PORT=1025 SMTP_USE_TLS=false SMTP_ALLOW_ANONYMOUS=true``.
+
+Email chỉ được bật khi có ``SMTP_USER``/``SMTP_PASSWORD`` (hoặc
+``SMTP_ALLOW_ANONYMOUS``); để trống là tắt hẳn: không xếp hàng, không chạy worker.
+"""
+
+from __future__ import annotations
+
+import logging
+import random
+import smtplib
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from typing import Optional
+
+from sqlalchemy import func, select
+
+from app.core.Enum.emailEnum import EmailStatus
+from app.core.settings import settings
+from app.infrastructure.db.session import SessionLocal
+from app.models.email_outbox import EmailOutbox
+
+logger = logging.getLogger(__name__)
+
+
+def smtp_configured() -> bool:
+    """Email đã được cấu hình (có tài khoản SMTP hoặc cho phép gửi ẩn danh) chưa."""
+    if not settings.SMTP_HOST:
+        return False
+    return bool(settings.SMTP_USER and settings.SMTP_PASSWORD) or settings.SMTP_ALLOW_ANONYMOUS
+
+
+def from_address() -> str:
+    return settings.SMTP_FROM_EMAIL or settings.SMTP_USER
+
+
+def build_message(
+    to_email: str,
+    subject: str,
+    html_content: str,
+    text_content: Optional[str] = None,
+) -> MIMEMultipart:
+    """Tạo message multipart (text + HTML)."""
+    msg = MIMEMultipart("alternative")
+    msg["Subject"] = subject
+    msg["From"] = f"{settings.SMTP_FROM_NAME} <{from_address()}>"
+    msg["To"] = to_email
+
+    if text_content:
+        msg.attach(MIMEText(text_content, "plain", "utf-8"))
+    msg.attach(MIMEText(html_content, "html", "utf-8"))
+    return msg
+
+
+def is_permanent_error(exc: Exception) -> bool:
+    """Lỗi 5xx từ server (địa chỉ sai, bị từ chối...) - retry không có ích."""
+    if isinstance(exc, smtplib.SMTPRecipientsRefused):
+        return all(code >= 500 for code, _ in exc.recipients.values())
+    if isinstance(exc, smtplib.SMTPResponseException):
+        return exc.smtp_code >= 500
+    return False
+
+
+class SMTPConnection:
+    """Kết nối SMTP dùng lại giữa nhiều lần gửi (không thread-safe)."""
+
+    def __init__(self):
+        self._server: Optional[smtplib.SMTP] = None
+        self._last_used = 0.0
+
+    def _open(self) -> smtplib.SMTP:
+        server = smtplib.SMTP(
+            settings.SMTP_HOST,
+            settings.SMTP_PORT,
+            timeout=settings.SMTP_TIMEOUT_SECONDS,
+        )
+        try:
+            if settings.SMTP_USE_TLS:
+                server.starttls()
+            if settings.SMTP_USER and settings.SMTP_PASSWORD:
+                server.login(settings.SMTP_USER, settings.SMTP_PASSWORD)
+        except Exception:
+            server.close()
+            raise
+        return server
+
+    def _get(self) -> smtplib.SMTP:
+        if self._server is not None and time.monotonic() - self._last_used > settings.SMTP_IDLE_TIMEOUT_SECONDS:
+            # Server thường tự ngắt kết nối rảnh; mở lại thay vì gửi vào socket chết
+            self.close()
+        if self._server is None:
+            self._server = self._open()
+        return self._server
+
+    def send(self, msg: MIMEMultipart) -> None:
+        """Gửi một message; kết nối lại một lần nếu server đã ngắt."""
+        try:
+            self._get().sendmail(from_address(), [msg["To"]], msg.as_string())
+        except smtplib.SMTPServerDisconnected:
+            self.close()
+            self._get().sendmail(from_address(), [msg["To"]], msg.as_string())
+        except (OSError, smtplib.SMTPException) as exc:
+            # Lỗi ở tầng kết nối: bỏ kết nối hiện tại; lỗi theo từng email (4xx/5xx
+            # cho recipient) vẫn giữ kết nối cho email kế tiếp
+            if not isinstance(exc, (smtplib.SMTPRecipientsRefused, smtplib.SMTPDataError)):
+                self.close()
+            raise
+        self._last_used = time.monotonic()
+
+    def close_if_idle(self) -> None:
+        if self._server is not None and time.monotonic() - self._last_used > settings.SMTP_IDLE_TIMEOUT_SECONDS:
+            self.close()
+
+    def close(self) -> None:
+        if self._server is None:
+            return
+        try:
+            self._server.quit()
+        except Exception:
+            self._server.close()
+        finally:
+            self._server = None
+
+
+def retry_delay(attempts: int) -> timedelta:
+    """Exponential backoff có jitter: base * 2^(attempts-1), tối đa RETRY_MAX."""
+    delay = min(
+        settings.EMAIL_RETRY_MAX_SECONDS,
+        settings.EMAIL_RETRY_BASE_SECONDS * 2 ** max(attempts - 1, 0),
+    )
+    return timedelta(seconds=delay * random.uniform(0.8, 1.2))
+
+
+class EmailOutboxWorker:
+    """Gửi email trong outbox theo batch qua một kết nối SMTP dùng lại."""
+
+    def __init__(self, session_factory=SessionLocal, connection: Optional[SMTPConnection] = None):
+        self.session_factory = session_factory
+        self.connection = connection or SMTPConnection()
+
+    def process_batch(self) -> int:
+        """Gửi một batch email đến hạn.
+
+        Returns:
+            Số email đã xử lý (thành công hoặc lỗi).
+        """
+        db = self.session_factory()
+        try:
+            emails = db.execute(
+                select(EmailOutbox)
+                .where(
+                    EmailOutbox.status == EmailStatus.PENDING.value,
+                    EmailOutbox.next_attempt_at <= func.now(),
+                )
+                .order_by(EmailOutbox.next_attempt_at)
+                .limit(settings.EMAIL_BATCH_SIZE)
+                .with_for_update(skip_locked=True)
+            ).scalars().all()
+
+            for email in emails:
+                self._deliver(email)
+
+            db.commit()
+            return len(emails)
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def _deliver(self, email: EmailOutbox) -> None:
+        now = datetime.now(timezone.utc)
+        email.attempts += 1
+        try:
+            self.connection.send(
+                build_message(email.to_email, email.subject, email.html_content, email.text_content)
+            )
+        except Exception as exc:
+            email.last_error = str(exc)[:1000]
+            if is_permanent_error(exc) or email.attempts >= settings.EMAIL_MAX_ATTEMPTS:
+                email.status = EmailStatus.FAILED.value
+                logger.error("Email %s tới %s thất bại: %s", email.id, email.to_email, exc)
+            else:
+                email.next_attempt_at = now + retry_delay(email.attempts)
+                logger.warning("Email %s tới %s lỗi (lần %d), sẽ thử lại: %s",
+                               email.id, email.to_email, email.attempts, exc)
+            return
+
+        email.status = EmailStatus.SENT.value
+        email.sent_at = now
+        email.last_error = None
+
+    def drain(self) -> int:
+        """Gửi đến khi không còn email đến hạn (dùng cho script)."""
+        total = 0
+        while True:
+            processed = self.process_batch()
+            total += processed
+            if processed < settings.EMAIL_BATCH_SIZE:
+                return total
+
+    def run(self, stop_event: threading.Event) -> None:
+        """Vòng lặp của thread nền: gửi liên tục khi còn việc, rảnh thì chờ poll."""
+        try:
+            while not stop_event.is_set():
+                try:
+                    processed = self.process_batch()
+                except Exception:
+                    logger.exception("Email outbox worker lỗi khi xử lý batch")
+                    processed = 0
+                if processed < settings.EMAIL_BATCH_SIZE:
+                    self.connection.close_if_idle()
+                    stop_event.wait(settings.EMAIL_POLL_INTERVAL_SECONDS)
+        finally:
+            self.connection.close()
+
+
+_worker_thread: Optional[threading.Thread] = None
+_stop_event = threading.Event()
+_worker_lock = threading.Lock()
+
+
+def start_email_worker() -> None:
+    """Khởi động thread gửi email nền (gọi lúc app startup)."""
+    global _worker_thread
+    if not settings.EMAIL_WORKER_ENABLED or not smtp_configured():
+        logger.info("Email outbox worker tắt (EMAIL_WORKER_ENABLED/SMTP_USER/SMTP_PASSWORD)")
+        return
+    with _worker_lock:
+        if _worker_thread is not None and _worker_thread.is_alive():
+            return
+        _stop_event.clear()
+        _worker_thread = threading.Thread(
+            target=EmailOutboxWorker().run,
+            args=(_stop_event,),
+            name="email-outbox-worker",
+            daemon=True,
+        )
+        _worker_thread.start()
+
+
+def shutdown_email_worker(timeout: float = 10.0) -> None:
+    """Dừng thread gửi email (gọi lúc app shutdown); batch đang gửi được hoàn tất."""
+    global _worker_thread
+    with _worker_lock:
+        if _worker_thread is None:
+            return
+        _stop_event.set()
+        _worker_thread.join(timeout)
+        _worker_thread = None
@@ -0,0 +1,149 @@
+"""Pub/sub trạng thái payment cho stream SSE ``GET /payments/{payment_id}/events``.
+
+- Phát: listener ``app.infrastructure.db.payment_status_events`` gửi
+  ``pg_notify(PAYMENT_EVENTS_CHANNEL, ...)`` trong chính transaction đổi trạng
+  thái payment (webhook, job đối soát, xác nhận COD). Postgres chỉ giao
+  notification khi transaction commit, nên không có sự kiện "ảo".
+- Nhận: mỗi process giữ **một** kết nối asyncpg ``LISTEN`` kênh đó và chia sự
+  kiện cho các stream đang mở trong process (``PaymentEventHub``); nhờ vậy
+  worker uvicorn nào đổi trạng thái thì mọi worker đều thấy.
+
+Kết nối LISTEN tự nối lại khi mất. LISTEN không chạy qua PgBouncer transaction
+pooling - đặt ``PAYMENT_EVENTS_DATABASE_URL`` trỏ thẳng vào Postgres khi dùng
+PgBouncer.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from collections import defaultdict
+from typing import Any, Dict, Optional, Set
+
+import asyncpg
+from sqlalchemy.engine import make_url
+
+from app.core.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+def _listen_dsn() -> str:
+    """DSN asyncpg (``postgresql://``) cho kết nối LISTEN."""
+    url = make_url(settings.PAYMENT_EVENTS_DATABASE_URL or settings.DATABASE_URL)
+    return url.set(drivername="postgresql").render_as_string(hide_password=False)
+
+
+class PaymentEventHub:
+    """Chia sự kiện trạng thái payment cho các subscriber trong process."""
+
+    def __init__(self, channel: str):
+        self.channel = channel
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = defaultdict(set)
+        self._task: Optional[asyncio.Task] = None
+        self._stop_event: Optional[asyncio.Event] = None
+        self.connected = False
+
+    def subscribe(self, payment_id: str) -> asyncio.Queue:
+        """Đăng ký nhận sự kiện của một payment (gọi ``unsubscribe`` khi xong)."""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=16)
+        self._subscribers[payment_id].add(queue)
+        return queue
+
+    def unsubscribe(self, payment_id: str, queue: asyncio.Queue) -> None:
+        queues = self._subscribers.get(payment_id)
+        if queues is None:
+            return
+        queues.discard(queue)
+        if not queues:
+            del self._subscribers[payment_id]
+
+    def dispatch(self, payload: str) -> None:
+        """Chuyển một notification tới các stream của payment đó."""
+        try:
+            event: Dict[str, Any] = json.loads(payload)
+        except ValueError:
+            logger.warning("Payment event không hợp lệ: %r", payload)
+            return
+        for queue in list(self._subscribers.get(event.get("payment_id"), ())):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # Stream không đọc kịp - sự kiện cuối cùng vẫn có thể đọc lại từ DB
+                logger.warning("Payment event queue full for %s", event.get("payment_id"))
+
+    def _on_notification(self, connection, pid, channel, payload) -> None:
+        self.dispatch(payload)
+
+    async def _listen(self, stop_event: asyncio.Event) -> None:
+        delay = 1.0
+        while not stop_event.is_set():
+            connection = None
+            lost = asyncio.Event()
+            try:
+                connection = await asyncpg.connect(_listen_dsn())
+                connection.add_termination_listener(lambda _: lost.set())
+                await connection.add_listener(self.channel, self._on_notification)
+                self.connected = True
+                delay = 1.0
+                logger.info("Payment events: listening on %s", self.channel)
+                stop_waiter = asyncio.ensure_future(stop_event.wait())
+                lost_waiter = asyncio.ensure_future(lost.wait())
+                try:
+                    await asyncio.wait({stop_waiter, lost_waiter}, return_when=asyncio.FIRST_COMPLETED)
+                finally:
+                    stop_waiter.cancel()
+                    lost_waiter.cancel()
+                if lost.is_set():
+                    logger.warning("Payment events: LISTEN connection lost, reconnecting")
+            except Exception as e:
+                logger.warning(f"Payment events: cannot LISTEN on {self.channel}: {e}")
+            finally:
+                self.connected = False
+                if connection is not None and not connection.is_closed():
+                    await connection.close()
+            if not stop_event.is_set():
+                try:
+                    await asyncio.wait_for(stop_event.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                delay = min(delay * 2, 30.0)
+
+    def start(self) -> None:
+        """Mở kết nối LISTEN trong event loop hiện tại (gọi lúc app startup)."""
+        if self._task is not None and not self._task.done():
+            return
+        self._stop_event = asyncio.Event()
+        self._task = asyncio.get_running_loop().create_task(
+            self._listen(self._stop_event), name="payment-events-listener"
+        )
+
+    async def stop(self, timeout: float = 5.0) -> None:
+        """Đóng kết nối LISTEN (gọi lúc app shutdown)."""
+        if self._task is None:
+            return
+        self._stop_event.set()
+        try:
+            await asyncio.wait_for(self._task, timeout)
+        except asyncio.TimeoutError:
+            pass
+        self._task = None
+        self._stop_event = None
+
+
+# Singleton instance (một kết nối LISTEN cho cả process)
+payment_event_hub = PaymentEventHub(settings.PAYMENT_EVENTS_CHANNEL)
+
+
+def start_payment_events() -> None:
+    """Bắt đầu nhận sự kiện payment (gọi lúc app startup)."""
+    if not settings.PAYMENT_EVENTS_ENABLED:
+        logger.info("Payment events tắt (PAYMENT_EVENTS_ENABLED)")
+        return
+    payment_event_hub.start()
+
+
+async def shutdown_payment_events() -> None:
+    """Dừng nhận sự kiện payment khi tắt ứng dụng."""
+    await payment_event_hub.stop()
@@ -0,0 +1,302 @@
+"""Gọi PayOS bất đồng bộ (không chặn event loop).
+
+- ``AsyncPayOS`` của SDK chạy trên một ``httpx.AsyncClient`` dùng chung cho cả
+  process: kết nối keep-alive được giữ trong pool (``PAYOS_MAX_CONNECTIONS``),
+  timeout kết nối/đọc tách riêng và ngắn. SDK không tự retry - request thanh
+  toán lặp lại không an toàn, client tự gọi lại khi cần.
+- Semaphore giới hạn số request PayOS chạy cùng lúc; chờ slot quá
+  ``PAYOS_QUEUE_TIMEOUT_SECONDS`` thì báo bận thay vì xếp hàng vô hạn.
+- ``CircuitBreaker``: sau ``PAYOS_BREAKER_FAILURE_THRESHOLD`` lỗi hạ tầng liên
+  tiếp (timeout, mất kết nối, 5xx/429) thì từ chối ngay trong
+  ``PAYOS_BREAKER_RESET_SECONDS``, sau đó cho một request thử; thành công thì
+  đóng mạch lại. Lỗi nghiệp vụ (4xx, code khác "00") không tính.
+
+Client được tạo lười trong event loop đang chạy và đóng lúc shutdown
+(``shutdown_payos_gateway``). Thử local: ``python scripts/fake_payos_server.py``
+và đặt ``PAYOS_BASE_URL=http://localhost:8900``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Any, Dict, Optional
+
+import httpx
+from payos import APIError, AsyncPayOS, ConnectionError as PayOSConnectionError, ConnectionTimeoutError
+from payos.types.v2.payment_requests import CreatePaymentLinkRequest, ItemData
+
+from app.core.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class PayOSUnavailableError(Exception):
+    """PayOS đang lỗi/quá tải - request bị từ chối ngay, không gọi ra ngoài."""
+
+
+def is_infrastructure_error(exc: BaseException) -> bool:
+    """Lỗi do PayOS/mạng (tính vào circuit breaker), không phải lỗi nghiệp vụ."""
+    if isinstance(exc, (PayOSConnectionError, ConnectionTimeoutError, httpx.TransportError)):
+        return True
+    if isinstance(exc, APIError):
+        return exc.status_code is not None and (exc.status_code >= 500 or exc.status_code == 429)
+    return False
+
+
+class CircuitBreaker:
+    """Circuit breaker ba trạng thái: closed -> open -> half-open -> closed.
+
+    Chỉ dùng trong một event loop (không cần lock).
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._trial_in_flight = False
+
+    def before_call(self) -> None:
+        """Raise PayOSUnavailableError nếu mạch đang ngắt."""
+        if self.state == self.OPEN:
+            if time.monotonic() - self.opened_at < self.reset_seconds:
+                raise PayOSUnavailableError("Cổng thanh toán đang gián đoạn, vui lòng thử lại sau")
+            self.state = self.HALF_OPEN
+        if self.state == self.HALF_OPEN:
+            # Chỉ một request thử, các request khác vẫn bị từ chối
+            if self._trial_in_flight:
+                raise PayOSUnavailableError("Cổng thanh toán đang gián đoạn, vui lòng thử lại sau")
+            self._trial_in_flight = True
+
+    def record_success(self) -> None:
+        if self.state != self.CLOSED:
+            logger.info("PayOS circuit closed")
+        self.state = self.CLOSED
+        self.failures = 0
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self._trial_in_flight = False
+        self.failures += 1
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                logger.warning("PayOS circuit opened after %s failures", self.failures)
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+
+    def record_ignored(self) -> None:
+        """PayOS có trả lời nhưng là lỗi nghiệp vụ - vẫn coi là PayOS hoạt động."""
+        if self.state == self.HALF_OPEN:
+            self.record_success()
+
+    def cancel_call(self) -> None:
+        """Request không hoàn tất vì phía mình (hết slot, bị hủy) - trả lại lượt thử.
+
+        Không tính là lỗi của PayOS: half-open quay về open (giữ nguyên
+        ``opened_at``) để request kế tiếp được thử lại.
+        """
+        self._trial_in_flight = False
+        if self.state == self.HALF_OPEN:
+            self.state = self.OPEN
+
+
+class PayOSGateway:
+    """Adapter PayOS: pool HTTP dùng chung, giới hạn đồng thời, circuit breaker."""
+
+    def __init__(self):
+        self._client: Optional[AsyncPayOS] = None
+        self._http: Optional[httpx.AsyncClient] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self.breaker = CircuitBreaker(
+            settings.PAYOS_BREAKER_FAILURE_THRESHOLD,
+            settings.PAYOS_BREAKER_RESET_SECONDS,
+        )
+
+    def _get_client(self) -> AsyncPayOS:
+        if self._client is None:
+            timeout = httpx.Timeout(
+                settings.PAYOS_READ_TIMEOUT_SECONDS,
+                connect=settings.PAYOS_CONNECT_TIMEOUT_SECONDS,
+            )
+            self._http = httpx.AsyncClient(
+                timeout=timeout,
+                limits=httpx.Limits(
+                    max_connections=settings.PAYOS_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.PAYOS_MAX_CONNECTIONS,
+                ),
+            )
+            try:
+                self._client = AsyncPayOS(
+                    client_id=settings.PAYOS_CLIENT_ID,
+                    api_key=settings.PAYOS_API_KEY,
+                    checksum_key=settings.PAYOS_CHECKSUM_KEY,
+                    base_url=settings.PAYOS_BASE_URL,
+                    max_retries=0,
+                    http_client=self._http,
+                )
+            except Exception as e:
+                logger.error(f"Failed to initialize PayOS client: {e}")
+                raise Exception(f"PayOS configuration error: {str(e)}")
+            # SDK truyền self.timeout vào từng request - dùng Timeout tách connect/read
+            self._client.timeout = timeout
+            self._slots = asyncio.Semaphore(settings.PAYOS_MAX_CONCURRENCY)
+        return self._client
+
+    async def _call(self, operation: str, func, *args) -> Any:
+        client = self._get_client()
+        self.breaker.before_call()
+        try:
+            await asyncio.wait_for(self._slots.acquire(), settings.PAYOS_QUEUE_TIMEOUT_SECONDS)
+        except asyncio.TimeoutError:
+            self.breaker.cancel_call()
+            raise PayOSUnavailableError("Cổng thanh toán đang quá tải, vui lòng thử lại sau") from None
+        except BaseException:
+            # CancelledError khi đang chờ slot - không để kẹt lượt thử half-open
+            self.breaker.cancel_call()
+            raise
+
+        started = time.perf_counter()
+        try:
+            result = await func(client, *args)
+        except Exception as e:
+            if is_infrastructure_error(e):
+                self.breaker.record_failure()
+            else:
+                self.breaker.record_ignored()
+            logger.error(f"PayOS {operation} failed after {(time.perf_counter() - started) * 1000:.0f}ms: {e}")
+            raise
+        except BaseException:
+            # CancelledError (wait_for của caller, shutdown reconciler): không phải
+            # lỗi PayOS nhưng phải trả lại lượt thử, nếu không mạch kẹt ở half-open
+            self.breaker.cancel_call()
+            raise
+        finally:
+            self._slots.release()
+        self.breaker.record_success()
+        return result
+
+    async def create_payment_link(
+        self,
+        order_code: int,
+        amount: int,
+        description: str,
+        buyer_name: Optional[str] = None,
+        buyer_email: Optional[str] = None,
+        buyer_phone: Optional[str] = None,
+        return_url: Optional[str] = None,
+        cancel_url: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Tạo payment link (checkout URL + QR).
+
+        Raises:
+            PayOSUnavailableError: PayOS đang ngắt mạch hoặc quá tải.
+            payos.PayOSError: Lỗi từ PayOS.
+        """
+        payment_data = CreatePaymentLinkRequest(
+            orderCode=order_code,
+            amount=amount,
+            description=description,
+            items=[ItemData(name=description, quantity=1, price=amount)],
+            returnUrl=return_url or settings.PAYOS_RETURN_URL,
+            cancelUrl=cancel_url or settings.PAYOS_CANCEL_URL,
+            buyerName=buyer_name,
+            buyerEmail=buyer_email,
+            buyerPhone=buyer_phone
+        )
+        response = await self._call(
+            "create_payment_link",
+            lambda client, data: client.payment_requests.create(data),
+            payment_data,
+        )
+        logger.info(f"Created PayOS payment link for order {order_code}")
+        return {
+            "checkout_url": response.checkout_url,
+            "qr_code": response.qr_code,
+            "payment_link_id": response.payment_link_id,
+            "order_code": order_code,
+            "amount": amount,
+            "description": description
+        }
+
+    async def get_payment_info(self, order_code: int) -> Dict[str, Any]:
+        """Lấy thông tin payment link theo order code."""
+        response = await self._call(
+            "get_payment_info",
+            lambda client, code: client.payment_requests.get(code),
+            order_code,
+        )
+        return {
+            "id": response.id,
+            "order_code": response.order_code,
+            "amount": response.amount,
+            "amount_paid": response.amount_paid,
+            "amount_remaining": response.amount_remaining,
+            "status": response.status,
+            "created_at": response.created_at,
+            "transactions": response.transactions,
+            "cancellation_reason": response.cancellation_reason,
+            "canceled_at": response.canceled_at
+        }
+
+    async def check_payment_status(self, order_code: int) -> Dict[str, Any]:
+        """Trạng thái thanh toán (PENDING, PAID, CANCELLED, EXPIRED) - không raise.
+
+        Lỗi (kể cả đang ngắt mạch) trả về status "ERROR".
+        """
+        try:
+            info = await self.get_payment_info(order_code)
+        except Exception as e:
+            return {
+                "order_code": order_code,
+                "status": "ERROR",
+                "is_paid": False,
+                "error": str(e)
+            }
+        return {
+            "order_code": info["order_code"],
+            "amount": info["amount"],
+            "amount_paid": info["amount_paid"],
+            "status": info["status"],
+            "transactions": info["transactions"] or [],
+            "is_paid": info["status"] == "PAID"
+        }
+
+    async def cancel_payment_link(self, order_code: int, reason: Optional[str] = None) -> Dict[str, Any]:
+        """Hủy payment link."""
+        response = await self._call(
+            "cancel_payment_link",
+            lambda client, code: client.payment_requests.cancel(code, reason),
+            order_code,
+        )
+        logger.info(f"Cancelled PayOS payment link {order_code}")
+        return {
+            "id": response.id,
+            "order_code": response.order_code,
+            "status": response.status,
+            "canceled_at": response.canceled_at,
+            "cancellation_reason": response.cancellation_reason
+        }
+
+    async def aclose(self) -> None:
+        """Đóng pool kết nối (gọi lúc shutdown)."""
+        if self._http is not None:
+            await self._http.aclose()
+        self._client = None
+        self._http = None
+        self._slots = None
+
+
+# Singleton instance (một pool kết nối cho cả process)
+payos_gateway = PayOSGateway()
+
+
+async def shutdown_payos_gateway() -> None:
+    """Đóng pool kết nối PayOS khi tắt ứng dụng."""
+    await payos_gateway.aclose()
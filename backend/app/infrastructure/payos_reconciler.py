@@ -0,0 +1,254 @@
+"""Đối soát nền các payment PayOS đang chờ.
+
+Thay cho việc client gọi PayOS mỗi lần poll: cứ ``PAYOS_RECONCILE_INTERVAL_SECONDS``
+job này
+
+1. lấy **một lần** tất cả payment BANKING còn PENDING tạo trước hơn
+   ``PAYOS_RECONCILE_MIN_AGE_SECONDS`` (webhook thường đã về trước đó);
+2. hỏi PayOS theo batch ``PAYOS_RECONCILE_BATCH_SIZE``, tối đa
+   ``PAYOS_RECONCILE_CONCURRENCY`` request cùng lúc và không quá
+   ``PAYOS_RECONCILE_RATE_PER_SECOND`` request/giây (qua ``payos_gateway`` nên
+   vẫn chịu circuit breaker);
+3. ghi kết quả mỗi batch trong một transaction
+   (``PaymentService.apply_payos_statuses``).
+
+Chạy như một task asyncio trong event loop của app (cùng pool HTTP với
+``payos_gateway``). Nhiều worker uvicorn dùng ``pg_try_advisory_lock`` nên mỗi
+lượt chỉ một process đối soát. Số liệu (``stats``) tính theo process.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+
+from sqlalchemy import text
+
+from app.core.settings import settings
+from app.infrastructure.db.session import SessionLocal, engine
+from app.infrastructure.payos_gateway import payos_gateway
+from app.repositories.payment_repository import PaymentRepository
+from app.services.PaymentService import PaymentService
+
+logger = logging.getLogger(__name__)
+
+# Khóa advisory dùng chung giữa các process ("PAYOS" dạng số)
+_ADVISORY_LOCK_KEY = 0x5041594F53
+
+
+@dataclass
+class ReconcileStats:
+    """Số liệu của một lượt đối soát (hoặc cộng dồn)."""
+
+    runs: int = 0
+    checked: int = 0     # Số payment đã hỏi PayOS
+    flipped: int = 0     # Số payment đổi trạng thái (completed + cancelled)
+    completed: int = 0
+    cancelled: int = 0
+    errors: int = 0      # Lỗi gọi PayOS hoặc ghi batch
+    lag_seconds: float = 0.0  # Tuổi của payment chờ lâu nhất khi bắt đầu lượt
+    duration_seconds: float = 0.0
+    skipped: bool = False  # Process khác đang đối soát
+    finished_at: Optional[datetime] = field(default=None)
+
+    def add(self, other: "ReconcileStats") -> None:
+        for name in ("runs", "checked", "flipped", "completed", "cancelled", "errors"):
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+        self.lag_seconds = other.lag_seconds
+        self.duration_seconds = other.duration_seconds
+        self.finished_at = other.finished_at
+
+
+class RateLimiter:
+    """Giãn đều các lần gọi: tối đa ``rate`` lần/giây (chỉ dùng trong một event loop)."""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next = 0.0
+
+    async def acquire(self) -> None:
+        now = time.monotonic()
+        wait = self._next - now
+        self._next = max(now, self._next) + self.interval
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+class PayOSReconciler:
+    """Job đối soát trạng thái payment PayOS theo batch."""
+
+    def __init__(self, session_factory=SessionLocal, gateway=payos_gateway):
+        self.session_factory = session_factory
+        self.gateway = gateway
+        self.totals = ReconcileStats()
+        self.last_run: Optional[ReconcileStats] = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Số liệu cộng dồn và của lượt gần nhất."""
+        return {
+            "totals": asdict(self.totals),
+            "last_run": asdict(self.last_run) if self.last_run else None,
+        }
+
+    def _try_lock(self):
+        """Giữ khóa advisory trên một kết nối riêng; None nếu process khác đang giữ."""
+        connection = engine.connect()
+        try:
+            acquired = connection.execute(
+                text("SELECT pg_try_advisory_lock(:key)"), {"key": _ADVISORY_LOCK_KEY}
+            ).scalar()
+            # Khóa mức session vẫn giữ sau commit - không để transaction mở trong lúc gọi PayOS
+            connection.commit()
+        except Exception:
+            connection.close()
+            raise
+        if not acquired:
+            connection.close()
+            return None
+        return connection
+
+    @staticmethod
+    def _unlock(connection) -> None:
+        try:
+            connection.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": _ADVISORY_LOCK_KEY})
+            connection.commit()
+        finally:
+            connection.close()
+
+    def _select_pending(self) -> list:
+        db = self.session_factory()
+        try:
+            created_before = datetime.now(timezone.utc) - timedelta(seconds=settings.PAYOS_RECONCILE_MIN_AGE_SECONDS)
+            return PaymentRepository(db).get_pending_banking(created_before)
+        finally:
+            db.close()
+
+    def _apply(self, statuses: Dict[Any, str]) -> Dict[str, int]:
+        db = self.session_factory()
+        try:
+            return PaymentService(db).apply_payos_statuses(statuses)
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    async def _check(self, order_code: str, slots: asyncio.Semaphore, limiter: RateLimiter) -> Optional[str]:
+        """Trạng thái PayOS của một đơn; None nếu lỗi."""
+        async with slots:
+            await limiter.acquire()
+            try:
+                info = await self.gateway.get_payment_info(int(order_code))
+            except Exception as e:
+                logger.warning(f"PayOS reconcile: cannot check order {order_code}: {e}")
+                return None
+            return info["status"]
+
+    async def run_once(self) -> ReconcileStats:
+        """Một lượt đối soát toàn bộ payment đang chờ."""
+        started = time.perf_counter()
+        stats = ReconcileStats(runs=1)
+
+        connection = await asyncio.to_thread(self._try_lock)
+        if connection is None:
+            stats.skipped = True
+            stats.finished_at = datetime.now(timezone.utc)
+            return stats
+
+        try:
+            pending = await asyncio.to_thread(self._select_pending)
+            if pending:
+                stats.lag_seconds = (datetime.now(timezone.utc) - pending[0].created_at).total_seconds()
+
+            slots = asyncio.Semaphore(settings.PAYOS_RECONCILE_CONCURRENCY)
+            limiter = RateLimiter(settings.PAYOS_RECONCILE_RATE_PER_SECOND)
+            batch_size = settings.PAYOS_RECONCILE_BATCH_SIZE
+            for offset in range(0, len(pending), batch_size):
+                batch = pending[offset:offset + batch_size]
+                results = await asyncio.gather(*(
+                    self._check(row.banking_transaction_id, slots, limiter) for row in batch
+                ))
+                stats.checked += len(batch)
+                stats.errors += sum(1 for result in results if result is None)
+
+                statuses = {
+                    row.id: result for row, result in zip(batch, results)
+                    if result in ("PAID", "CANCELLED", "EXPIRED")
+                }
+                if not statuses:
+                    continue
+                try:
+                    counts = await asyncio.to_thread(self._apply, statuses)
+                except Exception:
+                    logger.exception("PayOS reconcile: failed to apply batch of %d payments", len(statuses))
+                    stats.errors += len(statuses)
+                    continue
+                stats.completed += counts["completed"]
+                stats.cancelled += counts["cancelled"]
+                stats.flipped += counts["completed"] + counts["cancelled"]
+        finally:
+            await asyncio.to_thread(self._unlock, connection)
+
+        stats.duration_seconds = time.perf_counter() - started
+        stats.finished_at = datetime.now(timezone.utc)
+        if stats.checked:
+            logger.info(
+                "PayOS reconcile: checked %d, completed %d, cancelled %d, errors %d, lag %.0fs in %.2fs",
+                stats.checked, stats.completed, stats.cancelled, stats.errors,
+                stats.lag_seconds, stats.duration_seconds,
+            )
+        return stats
+
+    async def run(self, stop_event: asyncio.Event) -> None:
+        """Vòng lặp đối soát định kỳ đến khi ``stop_event`` được set."""
+        while not stop_event.is_set():
+            try:
+                stats = await self.run_once()
+                if not stats.skipped:
+                    self.totals.add(stats)
+                    self.last_run = stats
+            except Exception:
+                logger.exception("PayOS reconciler lỗi khi đối soát")
+            try:
+                await asyncio.wait_for(stop_event.wait(), settings.PAYOS_RECONCILE_INTERVAL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+
+
+# Singleton instance (số liệu của process hiện tại)
+payos_reconciler = PayOSReconciler()
+
+_task: Optional[asyncio.Task] = None
+_stop_event: Optional[asyncio.Event] = None
+
+
+def start_payos_reconciler() -> None:
+    """Chạy job đối soát trong event loop hiện tại (gọi lúc app startup)."""
+    global _task, _stop_event
+    if not settings.PAYOS_RECONCILE_ENABLED or not settings.PAYOS_CLIENT_ID:
+        logger.info("PayOS reconciler tắt (PAYOS_RECONCILE_ENABLED/PAYOS_CLIENT_ID)")
+        return
+    if _task is not None and not _task.done():
+        return
+    _stop_event = asyncio.Event()
+    _task = asyncio.get_running_loop().create_task(
+        payos_reconciler.run(_stop_event), name="payos-reconciler"
+    )
+
+
+async def shutdown_payos_reconciler(timeout: float = 10.0) -> None:
+    """Dừng job đối soát (gọi lúc app shutdown, trước khi đóng payos_gateway)."""
+    global _task, _stop_event
+    if _task is None:
+        return
+    _stop_event.set()
+    try:
+        await asyncio.wait_for(_task, timeout)
+    except asyncio.TimeoutError:
+        _task.cancel()
+    _task = None
+    _stop_event = None
@@ -0,0 +1,141 @@
+"""Áp dụng webhook PayOS nền từ bảng payment_webhook_events.
+
+Endpoint webhook chỉ lưu sự kiện rồi trả 200 (``PaymentService.receive_payos_webhook``).
+``PaymentWebhookWorker`` lấy batch sự kiện bằng ``SELECT ... FOR UPDATE SKIP
+LOCKED`` - mỗi đơn chỉ sự kiện cũ nhất còn chờ, nên các sự kiện của cùng một đơn
+được áp dụng đúng thứ tự kể cả khi nhiều worker uvicorn chạy song song - rồi
+gọi ``PaymentService.apply_payos_event`` (khóa payment/invoice, chỉ chuyển
+trạng thái từ PENDING). Mỗi sự kiện chạy trong một savepoint: lỗi thì giữ
+PENDING để thử lại, quá ``PAYOS_WEBHOOK_MAX_ATTEMPTS`` thì FAILED.
+
+Endpoint gọi ``notify_webhook_worker`` sau khi lưu sự kiện mới để worker trong
+cùng process xử lý ngay thay vì chờ hết chu kỳ poll.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from datetime import datetime, timezone
+from typing import Optional
+
+from app.core.Enum.webhookEnum import WebhookEventStatus
+from app.core.settings import settings
+from app.infrastructure.db.session import SessionLocal
+from app.models.payment_webhook_event import PaymentWebhookEvent
+from app.repositories.payment_webhook_repository import PaymentWebhookRepository
+from app.schemas.payment_schema import PayOSWebhookData
+from app.services.PaymentService import PaymentService
+
+logger = logging.getLogger(__name__)
+
+
+class PaymentWebhookWorker:
+    """Áp dụng các webhook PayOS đang chờ theo batch."""
+
+    def __init__(self, session_factory=SessionLocal):
+        self.session_factory = session_factory
+
+    def process_batch(self) -> int:
+        """Áp dụng một batch sự kiện đang chờ (một transaction).
+
+        Returns:
+            Số sự kiện đã xử lý (kể cả lỗi).
+        """
+        db = self.session_factory()
+        try:
+            events = PaymentWebhookRepository(db).claim_pending(settings.PAYOS_WEBHOOK_BATCH_SIZE)
+            service = PaymentService(db)
+            for event in events:
+                self._apply(db, service, event)
+
+            db.commit()
+            return len(events)
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def _apply(self, db, service: PaymentService, event: PaymentWebhookEvent) -> None:
+        event.attempts += 1
+        try:
+            with db.begin_nested():
+                status, note = service.apply_payos_event(PayOSWebhookData(**event.payload["data"]))
+        except Exception as exc:
+            event.last_error = str(exc)[:1000]
+            if event.attempts >= settings.PAYOS_WEBHOOK_MAX_ATTEMPTS:
+                event.status = WebhookEventStatus.FAILED.value
+                logger.error("Webhook PayOS %s (order %s) thất bại: %s", event.id, event.order_code, exc)
+            else:
+                logger.warning("Webhook PayOS %s (order %s) lỗi (lần %d), sẽ thử lại: %s",
+                               event.id, event.order_code, event.attempts, exc)
+            return
+
+        event.status = status.value
+        event.last_error = note if status == WebhookEventStatus.IGNORED else None
+        event.processed_at = datetime.now(timezone.utc)
+
+    def drain(self) -> int:
+        """Áp dụng đến khi không còn sự kiện chờ (dùng cho script)."""
+        total = 0
+        while True:
+            processed = self.process_batch()
+            total += processed
+            if processed < settings.PAYOS_WEBHOOK_BATCH_SIZE:
+                return total
+
+    def run(self, stop_event: threading.Event, wake_event: Optional[threading.Event] = None) -> None:
+        """Vòng lặp của thread nền: xử lý liên tục khi còn việc, rảnh thì chờ poll hoặc được đánh thức."""
+        wake_event = wake_event or stop_event
+        while not stop_event.is_set():
+            try:
+                processed = self.process_batch()
+            except Exception:
+                logger.exception("PayOS webhook worker lỗi khi xử lý batch")
+                processed = 0
+            if processed < settings.PAYOS_WEBHOOK_BATCH_SIZE:
+                wake_event.wait(settings.PAYOS_WEBHOOK_POLL_INTERVAL_SECONDS)
+                wake_event.clear()
+
+
+_worker_thread: Optional[threading.Thread] = None
+_stop_event = threading.Event()
+_wake_event = threading.Event()
+_worker_lock = threading.Lock()
+
+
+def notify_webhook_worker() -> None:
+    """Đánh thức worker trong process (có sự kiện mới)."""
+    _wake_event.set()
+
+
+def start_webhook_worker() -> None:
+    """Khởi động thread áp dụng webhook nền (gọi lúc app startup)."""
+    global _worker_thread
+    if not settings.PAYOS_WEBHOOK_WORKER_ENABLED:
+        logger.info("PayOS webhook worker tắt (PAYOS_WEBHOOK_WORKER_ENABLED)")
+        return
+    with _worker_lock:
+        if _worker_thread is not None and _worker_thread.is_alive():
+            return
+        _stop_event.clear()
+        _worker_thread = threading.Thread(
+            target=PaymentWebhookWorker().run,
+            args=(_stop_event, _wake_event),
+            name="payos-webhook-worker",
+            daemon=True,
+        )
+        _worker_thread.start()
+
+
+def shutdown_webhook_worker(timeout: float = 10.0) -> None:
+    """Dừng thread áp dụng webhook (gọi lúc app shutdown); batch đang chạy được hoàn tất."""
+    global _worker_thread
+    with _worker_lock:
+        if _worker_thread is None:
+            return
+        _stop_event.set()
+        _wake_event.set()
+        _worker_thread.join(timeout)
+        _worker_thread = None
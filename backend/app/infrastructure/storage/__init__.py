@@ -0,0 +1,46 @@
+"""Blob storage package.
+
+Chọn backend qua ``settings.STORAGE_BACKEND`` (``local`` hoặc ``s3``).
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+
+from app.core.settings import settings
+
+from .base import PRIVATE_PREFIX, BlobStore, StoredBlob, content_key, decode_data_url, is_data_url, is_private_key
+from .local import LocalBlobStore
+from .s3 import S3BlobStore
+
+
+@lru_cache(maxsize=1)
+def get_blob_store() -> BlobStore:
+    """Trả về blob store dùng chung cho toàn bộ process."""
+    if settings.STORAGE_BACKEND == "s3":
+        return S3BlobStore(
+            bucket=settings.S3_BUCKET,
+            endpoint_url=settings.S3_ENDPOINT_URL,
+            access_key=settings.S3_ACCESS_KEY,
+            secret_key=settings.S3_SECRET_KEY,
+            region=settings.S3_REGION,
+            public_base_url=settings.STORAGE_PUBLIC_BASE_URL,
+        )
+    return LocalBlobStore(
+        root=settings.STORAGE_LOCAL_DIR,
+        public_base_url=settings.STORAGE_PUBLIC_BASE_URL or "/api/v1/media",
+    )
+
+
+__all__ = [
+    "BlobStore",
+    "StoredBlob",
+    "LocalBlobStore",
+    "S3BlobStore",
+    "content_key",
+    "decode_data_url",
+    "is_data_url",
+    "is_private_key",
+    "PRIVATE_PREFIX",
+    "get_blob_store",
+]
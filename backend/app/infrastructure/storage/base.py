@@ -0,0 +1,156 @@
+"""Blob storage abstraction - lưu ảnh/tài liệu theo content hash.
+
+Mọi backend đều lưu blob theo key dạng ``<sha[:2]>/<sha256>.<ext>`` nên
+cùng một nội dung chỉ được lưu một lần (dedupe). Database chỉ giữ key/URL.
+
+Blob riêng tư (CCCD, avatar, ảnh bảo trì) nằm dưới prefix ``private/``: không
+bao giờ có URL public, chỉ tải qua route ``/media/private`` (cần đăng nhập,
+kiểm tra chủ sở hữu) hoặc URL ký ngắn hạn của backend.
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import hashlib
+import re
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Optional
+
+
+# Map content-type -> extension dùng trong key
+_EXTENSIONS = {
+    "image/png": "png",
+    "image/jpeg": "jpg",
+    "image/jpg": "jpg",
+    "image/webp": "webp",
+    "image/gif": "gif",
+    "application/pdf": "pdf",
+}
+
+# Prefix key của blob riêng tư (bucket policy nên chặn đọc public prefix này)
+PRIVATE_PREFIX = "private/"
+
+_DATA_URL_RE = re.compile(r"^data:(?P<mime>[\w.+-]+/[\w.+-]+);base64,(?P<data>.+)$", re.DOTALL)
+
+
+@dataclass(frozen=True)
+class StoredBlob:
+    """Kết quả sau khi lưu blob.
+
+    Attributes:
+        key: Key content-addressed trong storage.
+        url: URL để client tải blob (blob riêng tư: route ``/media/private``).
+        size: Kích thước (bytes).
+        content_type: MIME type.
+    """
+
+    key: str
+    url: str
+    size: int
+    content_type: str
+
+
+def is_data_url(value: Optional[str]) -> bool:
+    """Kiểm tra string có phải data URL base64 (``data:<mime>;base64,...``)."""
+    return bool(value) and value.startswith("data:")
+
+
+def decode_data_url(value: str, default_mime: str = "image/png") -> tuple[bytes, str]:
+    """Decode data URL (hoặc base64 thuần) thành bytes + content-type.
+
+    Args:
+        value: ``data:image/png;base64,...`` hoặc chuỗi base64 không prefix.
+        default_mime: MIME dùng khi không có prefix.
+
+    Returns:
+        Tuple (bytes, content_type).
+
+    Raises:
+        ValueError: Nếu base64 không hợp lệ.
+    """
+    match = _DATA_URL_RE.match(value)
+    if match:
+        mime = match.group("mime").lower()
+        payload = match.group("data")
+    else:
+        mime = default_mime
+        payload = value
+    try:
+        return base64.b64decode(payload, validate=False), mime
+    except (binascii.Error, ValueError) as e:
+        raise ValueError(f"Base64 không hợp lệ: {e}")
+
+
+def content_key(data: bytes, content_type: str, private: bool = False) -> str:
+    """Tính key content-addressed từ SHA-256 của nội dung."""
+    digest = hashlib.sha256(data).hexdigest()
+    ext = _EXTENSIONS.get(content_type, "bin")
+    key = f"{digest[:2]}/{digest}.{ext}"
+    return PRIVATE_PREFIX + key if private else key
+
+
+def is_private_key(key: str) -> bool:
+    """Key thuộc vùng blob riêng tư hay không."""
+    return key.startswith(PRIVATE_PREFIX)
+
+
+class BlobStore(ABC):
+    """Interface chung cho các storage backend."""
+
+    # Prefix URL của route media trong API (blob riêng tư luôn đi qua route này)
+    private_base_url = "/api/v1/media"
+
+    def put(self, data: bytes, content_type: str, private: bool = False) -> StoredBlob:
+        """Lưu blob (idempotent theo nội dung) và trả về key/URL.
+
+        Args:
+            private: True cho tài liệu cá nhân/ảnh bảo trì - key nằm dưới
+                ``private/`` và URL trỏ tới route cần đăng nhập.
+        """
+        key = content_key(data, content_type, private=private)
+        if not self.exists(key):
+            self._write(key, data, content_type)
+        return StoredBlob(key=key, url=self.blob_url(key), size=len(data), content_type=content_type)
+
+    def put_data_url(self, value: str, default_mime: str = "image/png", private: bool = False) -> StoredBlob:
+        """Decode data URL/base64 rồi lưu vào storage."""
+        data, content_type = decode_data_url(value, default_mime=default_mime)
+        return self.put(data, content_type, private=private)
+
+    def blob_url(self, key: str) -> str:
+        """URL lưu trong DB: public URL, hoặc route ``/media/private`` cho blob riêng tư."""
+        if is_private_key(key):
+            return f"{self.private_base_url.rstrip('/')}/{key}"
+        return self.url(key)
+
+    def cache_control(self, key: str) -> str:
+        """Cache-Control của blob: bất biến cho ảnh public, không cache cho blob riêng tư."""
+        if is_private_key(key):
+            return "private, no-store"
+        return "public, max-age=31536000, immutable"
+
+    @abstractmethod
+    def _write(self, key: str, data: bytes, content_type: str) -> None:
+        """Ghi blob vào backend."""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[bytes]:
+        """Đọc blob theo key, None nếu không tồn tại."""
+
+    @abstractmethod
+    def exists(self, key: str) -> bool:
+        """Kiểm tra blob đã tồn tại chưa."""
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Xóa blob (không lỗi nếu không tồn tại)."""
+
+    @abstractmethod
+    def url(self, key: str) -> str:
+        """URL public của blob (không dùng cho blob riêng tư)."""
+
+    def signed_url(self, key: str, expires_in: int) -> Optional[str]:
+        """URL ký có hạn ``expires_in`` giây để tải trực tiếp, None nếu backend không hỗ trợ."""
+        return None
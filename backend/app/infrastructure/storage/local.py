@@ -0,0 +1,70 @@
+"""Local filesystem blob store.
+
+Lưu blob vào thư mục trên disk; file được phục vụ qua route ``/media``.
+"""
+
+from __future__ import annotations
+
+import os
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+from .base import BlobStore
+
+
+class LocalBlobStore(BlobStore):
+    """Blob store trên filesystem local.
+
+    Args:
+        root: Thư mục gốc lưu blob.
+        public_base_url: Prefix URL public (ví dụ ``/api/v1/media``).
+    """
+
+    def __init__(self, root: str | Path, public_base_url: str):
+        self.root = Path(root).resolve()
+        self.public_base_url = public_base_url.rstrip("/")
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key: str) -> Path:
+        path = (self.root / key).resolve()
+        # Chặn path traversal (key do client gửi lên route /media)
+        if self.root not in path.parents:
+            raise ValueError(f"Key không hợp lệ: {key}")
+        return path
+
+    def _write(self, key: str, data: bytes, content_type: str) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Ghi ra file tạm rồi rename để không bao giờ để lại file ghi dở
+        fd, tmp = tempfile.mkstemp(dir=path.parent)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+
+    def get(self, key: str) -> Optional[bytes]:
+        path = self._path(key)
+        if not path.is_file():
+            return None
+        return path.read_bytes()
+
+    def exists(self, key: str) -> bool:
+        return self._path(key).is_file()
+
+    def delete(self, key: str) -> None:
+        path = self._path(key)
+        if path.is_file():
+            path.unlink()
+
+    def url(self, key: str) -> str:
+        return f"{self.public_base_url}/{key}"
+
+    def path_for(self, key: str) -> Optional[Path]:
+        """Đường dẫn file của blob (dùng để stream response), None nếu không có."""
+        path = self._path(key)
+        return path if path.is_file() else None
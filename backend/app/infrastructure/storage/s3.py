@@ -0,0 +1,99 @@
+"""S3-compatible blob store (AWS S3, MinIO, ...)."""
+
+from __future__ import annotations
+
+from typing import Optional
+
+from .base import BlobStore
+
+
+class S3BlobStore(BlobStore):
+    """Blob store trên S3 hoặc dịch vụ tương thích S3.
+
+    Args:
+        bucket: Tên bucket.
+        endpoint_url: Endpoint tùy chỉnh (MinIO/local stand-in), None cho AWS.
+        access_key: Access key id.
+        secret_key: Secret access key.
+        region: Region.
+        public_base_url: Prefix URL public; nếu trống dùng ``<endpoint>/<bucket>``.
+        client: boto3 client có sẵn (dùng cho test).
+    """
+
+    def __init__(
+        self,
+        bucket: str,
+        endpoint_url: Optional[str] = None,
+        access_key: Optional[str] = None,
+        secret_key: Optional[str] = None,
+        region: Optional[str] = None,
+        public_base_url: Optional[str] = None,
+        client=None,
+    ):
+        if client is None:
+            import boto3
+
+            client = boto3.client(
+                "s3",
+                endpoint_url=endpoint_url or None,
+                aws_access_key_id=access_key or None,
+                aws_secret_access_key=secret_key or None,
+                region_name=region or None,
+            )
+        self.client = client
+        self.bucket = bucket
+        if public_base_url:
+            self.public_base_url = public_base_url.rstrip("/")
+        elif endpoint_url:
+            self.public_base_url = f"{endpoint_url.rstrip('/')}/{bucket}"
+        else:
+            self.public_base_url = f"https://{bucket}.s3.amazonaws.com"
+
+    def _write(self, key: str, data: bytes, content_type: str) -> None:
+        # Ảnh public bất biến theo key -> cache vĩnh viễn; blob riêng tư không cache
+        self.client.put_object(
+            Bucket=self.bucket,
+            Key=key,
+            Body=data,
+            ContentType=content_type,
+            CacheControl=self.cache_control(key),
+        )
+
+    def get(self, key: str) -> Optional[bytes]:
+        from botocore.exceptions import ClientError
+
+        try:
+            obj = self.client.get_object(Bucket=self.bucket, Key=key)
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("NoSuchKey", "404"):
+                return None
+            raise
+        return obj["Body"].read()
+
+    def exists(self, key: str) -> bool:
+        from botocore.exceptions import ClientError
+
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=key)
+            return True
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("NoSuchKey", "404", "NotFound"):
+                return False
+            raise
+
+    def delete(self, key: str) -> None:
+        self.client.delete_object(Bucket=self.bucket, Key=key)
+
+    def url(self, key: str) -> str:
+        return f"{self.public_base_url}/{key}"
+
+    def signed_url(self, key: str, expires_in: int) -> Optional[str]:
+        return self.client.generate_presigned_url(
+            "get_object",
+            Params={
+                "Bucket": self.bucket,
+                "Key": key,
+                "ResponseCacheControl": self.cache_control(key),
+            },
+            ExpiresIn=expires_in,
+        )
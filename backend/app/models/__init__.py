@@ -14,15 +14,18 @@ from .role import Role
 # Address and Building models
 from .address import Address
 from .building import Building
+from .building_stats import BuildingStats
 
 # Room-related models
 from .room import Room
 from .room_type import RoomType
 from .room_utility import RoomUtility
+from .utility import Utility
 
 # Media/Document models
 from .building_photo import BuildingPhoto
 from .room_photo import RoomPhoto
+from .room_photo_variant import RoomPhotoVariant
 from .maintenance_photo import MaintenancePhoto
 from .user_document import UserDocument
 from .contract_document import ContractDocument
@@ -35,8 +38,13 @@ from .invoice import Invoice
 from .payment import Payment
 from .maintenance_request import MaintenanceRequest
 from .notification import Notification
+from .notification_counter import NotificationCounter
 from .review import Review
 from .appointment import Appointment
+from .email_outbox import EmailOutbox
+from .document_counter import DocumentCounter
+from .meter_reading import MeterReading
+from .payment_webhook_event import PaymentWebhookEvent
 
 
 __all__ = [
@@ -50,11 +58,13 @@ __all__ = [
     # Address and Building
     "Address",
     "Building",
+    "BuildingStats",
     
     # Room and Utilities
     "Room",
     "RoomType",
     "RoomUtility",
+    "Utility",
     
     # Business models
     "Contract",
@@ -62,12 +72,18 @@ __all__ = [
     "Payment",
     "MaintenanceRequest",
     "Notification",
+    "NotificationCounter",
     "Review",
     "Appointment",
+    "EmailOutbox",
+    "DocumentCounter",
+    "MeterReading",
+    "PaymentWebhookEvent",
     
     # Media/Document models
     "BuildingPhoto",
     "RoomPhoto",
+    "RoomPhotoVariant",
     "UserDocument",
     "MaintenancePhoto",
     "ContractDocument",
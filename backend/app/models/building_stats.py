@@ -0,0 +1,44 @@
+"""Building Stats model cho hệ thống quản lý phòng trọ.
+
+Bảng tổng hợp (materialized) số liệu dashboard theo từng tòa nhà. Mỗi dòng
+được tính lại khi có thay đổi phòng/hợp đồng/sự cố thuộc tòa nhà đó
+(xem ``app.infrastructure.db.building_stats_events``).
+"""
+
+from __future__ import annotations
+
+from sqlalchemy import Column, Integer, DECIMAL, DateTime, ForeignKey, func
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.infrastructure.db.session import Base
+
+
+class BuildingStats(Base):
+    """Model cho bảng building_stats.
+    
+    Khóa chính là building_id (một dòng/tòa nhà) để refresh bằng UPSERT.
+    """
+    __tablename__ = "building_stats"
+    
+    building_id = Column(
+        UUID(as_uuid=True), ForeignKey("buildings.id", ondelete="CASCADE"), primary_key=True
+    )
+    
+    # Rooms
+    total_rooms = Column(Integer, nullable=False, default=0)
+    empty_rooms = Column(Integer, nullable=False, default=0)  # AVAILABLE
+    occupied_rooms = Column(Integer, nullable=False, default=0)  # OCCUPIED
+    revenue = Column(DECIMAL(18, 2), nullable=False, default=0)  # Tổng base_price phòng OCCUPIED
+    
+    # Contracts
+    total_contracts = Column(Integer, nullable=False, default=0)
+    active_contracts = Column(Integer, nullable=False, default=0)
+    expired_contracts = Column(Integer, nullable=False, default=0)
+    
+    # Maintenance requests
+    maintenance_total = Column(Integer, nullable=False, default=0)
+    maintenance_pending = Column(Integer, nullable=False, default=0)  # PENDING
+    maintenance_in_progress = Column(Integer, nullable=False, default=0)  # IN_PROGRESS
+    maintenance_processed = Column(Integer, nullable=False, default=0)  # COMPLETED + CANCELLED
+    
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -5,8 +5,8 @@ Model này định nghĩa cấu trúc hợp đồng thuê phòng theo database s
 
 from __future__ import annotations
 
-from sqlalchemy import Column, String, Date, DECIMAL, Integer, Text, ForeignKey, Float
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, String, Date, DECIMAL, Integer, Text, ForeignKey, Float, Index
+from sqlalchemy.orm import column_property, relationship
 from sqlalchemy.dialects.postgresql import UUID, JSON
 
 from .base import BaseModel
@@ -19,9 +19,19 @@ class Contract(BaseModel):
     Lưu trữ thông tin hợp đồng thuê phòng giữa chủ trọ và người thuê.
     """
     __tablename__ = "contracts"
+    __table_args__ = (
+        # Keyset pagination: ORDER BY created_at DESC, id DESC
+        Index("ix_contracts_created_at_id", "created_at", "id"),
+        # Dashboard: đếm hợp đồng ACTIVE sắp hết hạn
+        Index("ix_contracts_status_end_date", "status", "end_date"),
+    )
     
     contract_number = Column(String(50), unique=True, nullable=False, index=True)
-    room_id = Column(UUID(as_uuid=True), ForeignKey("rooms.id"), nullable=False, index=True)
+    # active_history: giữ giá trị cũ khi sửa để tính chênh lệch rooms.current_occupants
+    room_id = column_property(
+        Column(UUID(as_uuid=True), ForeignKey("rooms.id"), nullable=False, index=True),
+        active_history=True,
+    )
     tenant_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True)
     start_date = Column(Date, nullable=False)
     end_date = Column(Date, nullable=False)
@@ -30,8 +40,14 @@ class Contract(BaseModel):
     rental_price = Column(DECIMAL(15, 2), nullable=False)  # Giá thuê thỏa thuận
     deposit_amount = Column(DECIMAL(15, 2), nullable=False)  # Tiền đặt cọc
     payment_day = Column(Integer, nullable=True)  # Ngày thanh toán hàng tháng (1-31)
-    number_of_tenants = Column(Integer, nullable=False, default=1)  # Số người ở trong phòng
-    status = Column(String(50), nullable=False, default=ContractStatus.ACTIVE.value, index=True)
+    number_of_tenants = column_property(
+        Column(Integer, nullable=False, default=1),  # Số người ở trong phòng
+        active_history=True,
+    )
+    status = column_property(
+        Column(String(50), nullable=False, default=ContractStatus.ACTIVE.value, index=True),
+        active_history=True,
+    )
     
     # Thông tin thanh toán chi tiết
     payment_cycle_months = Column(Integer, nullable=True, default=1)  # Chu kỳ thanh toán (tháng)
@@ -0,0 +1,28 @@
+"""Document Counter model cho hệ thống quản lý phòng trọ.
+
+Bộ đếm số chứng từ (mã hợp đồng ``HD001``, mã hóa đơn ``INV-YYYYMM-001``...)
+theo từng tiền tố và kỳ. Cấp số bằng một câu UPSERT tăng ``last_value``
+(xem ``app.repositories.document_counter_repository``) thay vì đọc MAX/COUNT
+rồi cộng 1, nên không cấp trùng khi nhiều request tạo đồng thời.
+"""
+
+from __future__ import annotations
+
+from sqlalchemy import BigInteger, Column, DateTime, String, func
+
+from app.infrastructure.db.session import Base
+
+
+class DocumentCounter(Base):
+    """Model cho bảng document_counters.
+    
+    Khóa chính (prefix, period): ``period`` là chuỗi rỗng với bộ đếm không
+    theo kỳ (mã hợp đồng) hoặc ``YYYYMM`` với bộ đếm đánh lại mỗi tháng
+    (mã hóa đơn).
+    """
+    __tablename__ = "document_counters"
+    
+    prefix = Column(String(20), primary_key=True)
+    period = Column(String(20), primary_key=True, default="")
+    last_value = Column(BigInteger, nullable=False, default=0)  # Số đã cấp gần nhất
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -0,0 +1,38 @@
+"""EmailOutbox model - hàng đợi email gửi đi.
+
+Request handler chỉ thêm dòng vào bảng này (cùng transaction với thay đổi
+nghiệp vụ); worker nền (``app.infrastructure.mailer``) gửi theo batch qua một
+kết nối SMTP dùng lại, retry với backoff và ghi lại trạng thái.
+"""
+
+from __future__ import annotations
+
+from sqlalchemy import Column, DateTime, Index, Integer, String, Text, func, text
+
+from app.core.Enum.emailEnum import EmailStatus
+
+from .base import BaseModel
+
+
+class EmailOutbox(BaseModel):
+    """Model cho bảng email_outbox."""
+
+    __tablename__ = "email_outbox"
+    __table_args__ = (
+        # Worker chỉ quét email đang chờ, theo thời điểm được phép gửi
+        Index(
+            "ix_email_outbox_pending_next_attempt",
+            "next_attempt_at",
+            postgresql_where=text("status = 'PENDING'"),
+        ),
+    )
+
+    to_email = Column(String(255), nullable=False)
+    subject = Column(String(255), nullable=False)
+    html_content = Column(Text, nullable=False)
+    text_content = Column(Text, nullable=True)
+    status = Column(String(20), nullable=False, default=EmailStatus.PENDING.value, index=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    last_error = Column(Text, nullable=True)
+    sent_at = Column(DateTime(timezone=True), nullable=True)
@@ -5,13 +5,46 @@ Model này định nghĩa cấu trúc hóa đơn thuê phòng theo database sche
 
 from __future__ import annotations
 
-from sqlalchemy import Column, String, Date, DECIMAL, Float, Text, ForeignKey, Integer
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Any, Mapping
+
+from sqlalchemy import Column, String, Date, DECIMAL, Float, Text, ForeignKey, Integer, Index, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
 
 from .base import BaseModel
 from app.core.Enum.invoiceEnum import InvoiceStatus
 
+# Các cột quyết định tổng tiền của hóa đơn
+AMOUNT_FIELDS = (
+    "room_price", "electricity_old_index", "electricity_new_index", "electricity_unit_price",
+    "number_of_people", "water_unit_price", "service_fee", "internet_fee", "parking_fee", "other_fees",
+)
+_CENT = Decimal("0.01")
+
+
+def calculate_invoice_total(source: Any) -> Decimal:
+    """Tổng tiền hóa đơn - công thức duy nhất của hệ thống.
+    
+    Phòng + điện (mới - cũ) x đơn giá + nước (số người x đơn giá) + các phí,
+    làm tròn 2 chữ số như cột DECIMAL(15, 2) (cùng kết quả với backfill SQL).
+    
+    Args:
+        source: Invoice ORM hoặc dict giá trị cột (insert hàng loạt)
+    """
+    get = source.get if isinstance(source, Mapping) else lambda name: getattr(source, name)
+    electricity_cost = Decimal(0)
+    if get("electricity_new_index") is not None and get("electricity_old_index") is not None:
+        usage = get("electricity_new_index") - get("electricity_old_index")
+        electricity_cost = Decimal(str(usage)) * (get("electricity_unit_price") or 0)
+    water_cost = (get("number_of_people") or 0) * (get("water_unit_price") or 0)
+    total = (
+        (get("room_price") or 0) + electricity_cost + water_cost
+        + (get("service_fee") or 0) + (get("internet_fee") or 0)
+        + (get("parking_fee") or 0) + (get("other_fees") or 0)
+    )
+    return Decimal(total).quantize(_CENT, rounding=ROUND_HALF_UP)
+
 
 class Invoice(BaseModel):
     """Model cho bảng invoices.
@@ -19,6 +52,25 @@ class Invoice(BaseModel):
     Lưu trữ thông tin hóa đơn thanh toán hàng tháng của người thuê.
     """
     __tablename__ = "invoices"
+    __table_args__ = (
+        # Keyset pagination: ORDER BY created_at DESC, id DESC
+        Index("ix_invoices_created_at_id", "created_at", "id"),
+        # Sắp xếp/keyset theo số tiền
+        Index("ix_invoices_total_amount_id", "total_amount", "id"),
+        # Doanh thu theo tháng: index-only scan
+        Index(
+            "ix_invoices_billing_month_amounts",
+            "billing_month",
+            postgresql_include=["total_amount", "amount_paid"],
+        ),
+        # Công nợ: chỉ hóa đơn còn nợ
+        Index(
+            "ix_invoices_outstanding_due_date",
+            "due_date",
+            postgresql_include=["amount_due"],
+            postgresql_where=text("amount_due > 0"),
+        ),
+    )
     
     invoice_number = Column(String(50), unique=True, nullable=False, index=True)
     contract_id = Column(UUID(as_uuid=True), ForeignKey("contracts.id"), nullable=False, index=True)
@@ -36,6 +88,12 @@ class Invoice(BaseModel):
     parking_fee = Column(DECIMAL(15, 2), nullable=False, default=0)    # Phí gửi xe
     other_fees = Column(DECIMAL(15, 2), nullable=False, default=0)
     other_fees_description = Column(Text, nullable=True)
+    
+    # Lưu sẵn để lọc/sắp xếp/cộng dồn bằng index (infrastructure/db/invoice_amount_events.py):
+    # total_amount tính lại khi sửa các cột AMOUNT_FIELDS, amount_paid cộng dồn payment COMPLETED
+    total_amount = Column(DECIMAL(15, 2), nullable=False, default=0, server_default="0")
+    amount_paid = Column(DECIMAL(15, 2), nullable=False, default=0, server_default="0")
+    amount_due = Column(DECIMAL(15, 2), nullable=False, default=0, server_default="0")  # total - paid
     due_date = Column(Date, nullable=False, index=True)
     status = Column(String(20), nullable=False, default=InvoiceStatus.PENDING.value, index=True)
     notes = Column(Text, nullable=True)
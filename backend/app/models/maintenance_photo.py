@@ -21,6 +21,7 @@ class MaintenancePhoto(BaseModel):
     
     request_id = Column(UUID(as_uuid=True), ForeignKey("maintenance_requests.request_id"), nullable=False, index=True)
     url = Column(String(500), nullable=False)
+    storage_key = Column(String(255), nullable=True, index=True)  # Key trong blob store (nếu upload qua base64)
     is_before = Column(Boolean, nullable=False, default=True, index=True)  # true=ảnh trước sửa, false=ảnh sau sửa
     uploaded_by = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     
@@ -5,7 +5,7 @@ Model này định nghĩa cấu trúc yêu cầu bảo trì theo database schema
 
 from __future__ import annotations
 
-from sqlalchemy import Column, String, Text, DateTime, DECIMAL, ForeignKey
+from sqlalchemy import Column, String, Text, DateTime, DECIMAL, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
 
@@ -19,6 +19,10 @@ class MaintenanceRequest(BaseModel):
     Lưu trữ thông tin yêu cầu bảo trì từ người thuê.
     """
     __tablename__ = "maintenance_requests"
+    __table_args__ = (
+        # Keyset pagination: ORDER BY created_at DESC, id DESC
+        Index("ix_maintenance_requests_created_at_id", "created_at", "id"),
+    )
     
     # request_id là unique identifier riêng, không phải PK (PK là 'id' từ BaseModel)
     request_id = Column(UUID(as_uuid=True), unique=True, nullable=False, index=True)
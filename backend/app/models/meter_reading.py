@@ -0,0 +1,40 @@
+"""MeterReading model - chỉ số điện nhập từ file của nhân viên tòa nhà.
+
+Mỗi phòng có tối đa một chỉ số cho mỗi tháng tính tiền. Import lại file cùng
+tháng ghi đè chỉ số đang STAGED; lập hóa đơn hàng loạt
+(``InvoiceService.generate_monthly_invoices``) đọc các chỉ số STAGED rồi
+chuyển sang APPLIED kèm hóa đơn đã lập.
+"""
+
+from __future__ import annotations
+
+from sqlalchemy import Column, Date, Float, ForeignKey, Index, Integer, String, Text, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.core.Enum.meterReadingEnum import MeterReadingStatus
+
+from .base import BaseModel
+
+
+class MeterReading(BaseModel):
+    """Model cho bảng meter_readings."""
+
+    __tablename__ = "meter_readings"
+    __table_args__ = (
+        UniqueConstraint("room_id", "billing_month", name="uq_meter_readings_room_month"),
+        Index("ix_meter_readings_month_status", "billing_month", "status"),
+    )
+
+    batch_id = Column(UUID(as_uuid=True), nullable=False, index=True)  # Lần import
+    row_number = Column(Integer, nullable=True)  # Dòng trong file (để đối chiếu)
+    room_id = Column(UUID(as_uuid=True), ForeignKey("rooms.id", ondelete="CASCADE"), nullable=False)
+    contract_id = Column(UUID(as_uuid=True), ForeignKey("contracts.id", ondelete="SET NULL"), nullable=True)
+    billing_month = Column(Date, nullable=False)  # YYYY-MM-01
+    reading_date = Column(Date, nullable=True)  # Ngày ghi chỉ số
+    electricity_old_index = Column(Float, nullable=True)  # Chỉ số cũ tại thời điểm import
+    electricity_new_index = Column(Float, nullable=False)
+    average_usage = Column(Float, nullable=True)  # Tiêu thụ trung bình các tháng trước
+    warning = Column(Text, nullable=True)  # Cảnh báo (tiêu thụ bất thường...)
+    status = Column(String(20), nullable=False, default=MeterReadingStatus.STAGED.value)
+    invoice_id = Column(UUID(as_uuid=True), ForeignKey("invoices.id", ondelete="SET NULL"), nullable=True)
+    created_by = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True)
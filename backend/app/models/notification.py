@@ -5,8 +5,8 @@ Model này định nghĩa cấu trúc thông báo cho người dùng theo databa
 
 from __future__ import annotations
 
-from sqlalchemy import Column, String, Text, Boolean, DateTime, ForeignKey
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, String, Text, Boolean, DateTime, ForeignKey, Index, text
+from sqlalchemy.orm import column_property, relationship
 from sqlalchemy.dialects.postgresql import UUID
 
 from .base import BaseModel
@@ -18,16 +18,24 @@ class Notification(BaseModel):
     Lưu trữ thông báo gửi tới người dùng về các sự kiện trong hệ thống.
     """
     __tablename__ = "notifications"
+    __table_args__ = (
+        # Danh sách/đánh dấu "chưa đọc" của một user chỉ quét thông báo chưa đọc
+        Index("ix_notifications_user_unread", "user_id", postgresql_where=text("NOT is_read")),
+    )
     
     # notification_id là unique identifier riêng, không phải PK (PK là 'id' từ BaseModel)
     notification_id = Column(UUID(as_uuid=True), unique=True, nullable=False, index=True)
-    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True, index=True)
+    # active_history: giữ giá trị cũ khi sửa để tính chênh lệch notification_counters
+    user_id = column_property(
+        Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True, index=True),
+        active_history=True,
+    )
     title = Column(String(200), nullable=False)
     content = Column(Text, nullable=False)
     type = Column(String(50), nullable=False, index=True)  # INVOICE, CONTRACT, MAINTENANCE, SYSTEM
     related_id = Column(UUID(as_uuid=True), nullable=True)   # ID của invoice, contract, etc.
     related_type = Column(String(50), nullable=True)        # INVOICE, CONTRACT, MAINTENANCE, etc.
-    is_read = Column(Boolean, nullable=False, default=False, index=True)
+    is_read = column_property(Column(Boolean, nullable=False, default=False, index=True), active_history=True)
     read_at = Column(DateTime(timezone=True), nullable=True)
     
     # Relationships
@@ -0,0 +1,27 @@
+"""NotificationCounter model - số thông báo của từng người dùng.
+
+Một dòng/người dùng, cộng trừ theo chênh lệch khi thông báo được tạo, đánh dấu
+đã đọc hoặc xóa (xem ``app.infrastructure.db.notification_counter_events``),
+nên badge "chưa đọc" và tổng số thông báo là một lần đọc theo khóa chính,
+không phụ thuộc số thông báo đã tích lũy.
+"""
+
+from __future__ import annotations
+
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, func
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.infrastructure.db.session import Base
+
+
+class NotificationCounter(Base):
+    """Model cho bảng notification_counters."""
+
+    __tablename__ = "notification_counters"
+
+    user_id = Column(
+        UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    total_count = Column(Integer, nullable=False, default=0, server_default="0")
+    unread_count = Column(Integer, nullable=False, default=0, server_default="0")
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -7,8 +7,8 @@ from __future__ import annotations
 
 import enum
 
-from sqlalchemy import Column, String, DateTime, DECIMAL, Text, ForeignKey, func, Enum as SAEnum
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, String, DateTime, DECIMAL, Index, Text, ForeignKey, func, text, Enum as SAEnum
+from sqlalchemy.orm import column_property, relationship
 from sqlalchemy.dialects.postgresql import UUID
 
 from .base import BaseModel
@@ -20,14 +20,26 @@ class Payment(BaseModel):
     Lưu trữ thông tin thanh toán của người thuê cho hóa đơn.
     """
     __tablename__ = "payments"
+    __table_args__ = (
+        # Job đối soát PayOS chỉ quét payment banking đang chờ, cũ nhất trước
+        Index(
+            "ix_payments_pending_banking_created_at",
+            "created_at",
+            postgresql_where=text("status = 'pending' AND method = 'banking'"),
+        ),
+    )
     
     # payment_id là unique identifier riêng, không phải PK (PK là 'id' từ BaseModel)
     payment_id = Column(UUID(as_uuid=True), unique=True, nullable=False, index=True)
-    invoice_id = Column(UUID(as_uuid=True), ForeignKey("invoices.id"), nullable=False, index=True)
+    # active_history: giữ giá trị cũ khi sửa để tính chênh lệch invoices.amount_paid
+    invoice_id = column_property(
+        Column(UUID(as_uuid=True), ForeignKey("invoices.id"), nullable=False, index=True),
+        active_history=True,
+    )
     payer_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True, index=True)
     
     # DECIMAL(15, 2) để hỗ trợ giá trị lớn (tới hàng nghìn tỷ VND)
-    amount = Column(DECIMAL(15, 2), nullable=False)
+    amount = column_property(Column(DECIMAL(15, 2), nullable=False), active_history=True)
 
     # Payment method and status
     class PaymentMethod(enum.Enum):
@@ -50,15 +62,18 @@ class Payment(BaseModel):
         nullable=False,
         index=True
     )
-    status = Column(
-        SAEnum(
-            PaymentStatus,
-            name="payment_status",
-            values_callable=lambda x: [e.value for e in x]
+    status = column_property(
+        Column(
+            SAEnum(
+                PaymentStatus,
+                name="payment_status",
+                values_callable=lambda x: [e.value for e in x]
+            ),
+            nullable=False,
+            server_default="pending",
+            index=True
         ),
-        nullable=False,
-        server_default="pending",
-        index=True
+        active_history=True,
     )
 
     # Banking-specific fields
@@ -0,0 +1,43 @@
+"""PaymentWebhookEvent model - hộp thư webhook PayOS.
+
+Endpoint webhook chỉ kiểm tra chữ ký rồi chèn nguyên body vào bảng này
+(``ON CONFLICT DO NOTHING`` theo ``order_code`` + ``reference`` nên PayOS gửi
+lại không tạo dòng mới) và trả 200 ngay. Worker nền
+(``app.infrastructure.payos_webhooks``) áp dụng lần lượt từng sự kiện của mỗi
+đơn vào Payment/Invoice. ``payload`` không bao giờ bị sửa; các cột còn lại chỉ
+ghi trạng thái xử lý.
+"""
+
+from __future__ import annotations
+
+from sqlalchemy import BigInteger, Column, DateTime, Index, Integer, String, Text, UniqueConstraint, text
+from sqlalchemy.dialects.postgresql import JSONB
+
+from app.core.Enum.webhookEnum import WebhookEventStatus
+
+from .base import BaseModel
+
+
+class PaymentWebhookEvent(BaseModel):
+    """Model cho bảng payment_webhook_events."""
+
+    __tablename__ = "payment_webhook_events"
+    __table_args__ = (
+        UniqueConstraint("order_code", "reference", name="uq_payment_webhook_events_order_reference"),
+        # Worker chỉ quét sự kiện đang chờ, sự kiện cũ nhất của từng đơn trước
+        Index(
+            "ix_payment_webhook_events_pending",
+            "order_code",
+            "id",
+            postgresql_where=text("status = 'PENDING'"),
+        ),
+    )
+
+    order_code = Column(BigInteger, nullable=False)  # orderCode PayOS (= payments.banking_transaction_id)
+    reference = Column(String(100), nullable=False)  # Mã tham chiếu giao dịch của sự kiện
+    code = Column(String(10), nullable=False)  # "00" = thanh toán thành công
+    payload = Column(JSONB, nullable=False)  # Body webhook nguyên bản (data + signature)
+    status = Column(String(20), nullable=False, default=WebhookEventStatus.PENDING.value)
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(Text, nullable=True)
+    processed_at = Column(DateTime(timezone=True), nullable=True)
@@ -5,9 +5,9 @@ Model này định nghĩa cấu trúc phòng theo database schema.
 
 from __future__ import annotations
 
-from sqlalchemy import Column, String, Float, Integer, ForeignKey, Text, DECIMAL
+from sqlalchemy import Column, String, Float, Integer, ForeignKey, Text, DECIMAL, Index
 from sqlalchemy.orm import relationship
-from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy.dialects.postgresql import ARRAY, UUID, JSONB
 
 from .base import BaseModel
 from app.core.Enum.roomEnum import RoomStatus
@@ -19,6 +19,12 @@ class Room(BaseModel):
     Lưu trữ thông tin chi tiết về từng phòng trong tòa nhà.
     """
     __tablename__ = "rooms"
+    __table_args__ = (
+        # Keyset pagination: ORDER BY created_at DESC, id DESC
+        Index("ix_rooms_created_at_id", "created_at", "id"),
+        # Lọc "có đủ các tiện ích": utility_ids @> ARRAY[...]
+        Index("ix_rooms_utility_ids", "utility_ids", postgresql_using="gin"),
+    )
     
     building_id = Column(UUID(as_uuid=True), ForeignKey("buildings.id"), nullable=False, index=True)
     room_type_id = Column(UUID(as_uuid=True), ForeignKey("room_types.id"), nullable=True, index=True)  # Loại phòng
@@ -36,8 +42,18 @@ class Room(BaseModel):
     # Phí dịch vụ mặc định: [{"name": "Internet", "amount": 100000}, {"name": "Parking", "amount": 50000}]
     default_service_fees = Column(JSONB, nullable=True, default=list)
     
+    # Id tiện ích (bảng utilities), đồng bộ với room_utilities khi tạo/sửa phòng
+    utility_ids = Column(ARRAY(Integer), nullable=False, default=list, server_default="{}")
+    
+    # Bộ đếm denormalized, cập nhật trong cùng transaction khi hợp đồng thay đổi
+    # (app.infrastructure.db.room_occupancy_events); sửa lệch bằng scripts/reconcile_room_occupancy.py
+    current_occupants = Column(Integer, nullable=False, default=0, server_default="0")  # Tổng người của HĐ ACTIVE/PENDING/PENDING_UPDATE
+    active_contract_count = Column(Integer, nullable=False, default=0, server_default="0")  # Số HĐ ACTIVE
+    
     status = Column(String(20), nullable=False, default=RoomStatus.AVAILABLE.value, index=True)
     description = Column(Text, nullable=True)
+    # Thumbnail ảnh đại diện (tính sẵn khi ảnh thay đổi) cho danh sách phòng public
+    primary_thumbnail_url = Column(String(500), nullable=True)
     
     # Relationships
     building = relationship("Building", back_populates="rooms")
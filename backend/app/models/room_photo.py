@@ -21,11 +21,15 @@ class RoomPhoto(BaseModel):
     
     room_id = Column(UUID(as_uuid=True), ForeignKey("rooms.id"), nullable=False, index=True)
     url = Column(String(500), nullable=True)  # URL ảnh (optional, dùng khi upload lên cloud)
-    image_base64 = Column(Text, nullable=True)  # Ảnh dạng base64 string
+    image_base64 = Column(Text, nullable=True)  # Legacy: ảnh base64 (đã chuyển sang blob store)
+    storage_key = Column(String(255), nullable=True, index=True)  # Key content-addressed trong blob store
     is_primary = Column(Boolean, nullable=False, default=False, index=True)
     sort_order = Column(Integer, nullable=False, default=0)
     uploaded_by = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True)  # Nullable để hỗ trợ upload không cần user_id
     
     # Relationships
     room = relationship("Room", back_populates="room_photos")
-    uploader = relationship("User", back_populates="uploaded_room_photos")
\ No newline at end of file
+    uploader = relationship("User", back_populates="uploaded_room_photos")
+    variants = relationship(
+        "RoomPhotoVariant", back_populates="photo", cascade="all, delete-orphan", passive_deletes=True
+    )
\ No newline at end of file
@@ -0,0 +1,37 @@
+"""Room Photo Variant model cho hệ thống quản lý phòng trọ.
+
+Model này lưu các thumbnail (resize + WebP/JPEG) được tạo từ ảnh phòng.
+"""
+
+from __future__ import annotations
+
+from sqlalchemy import Column, String, Integer, ForeignKey, UniqueConstraint
+from sqlalchemy.orm import relationship
+from sqlalchemy.dialects.postgresql import UUID
+
+from .base import BaseModel
+
+
+class RoomPhotoVariant(BaseModel):
+    """Model cho bảng room_photo_variants.
+    
+    Mỗi ảnh phòng có nhiều variant theo (kích thước, định dạng).
+    """
+    __tablename__ = "room_photo_variants"
+    __table_args__ = (
+        UniqueConstraint("photo_id", "label", "format", name="uq_room_photo_variants_photo_label_format"),
+    )
+    
+    photo_id = Column(
+        UUID(as_uuid=True), ForeignKey("room_photos.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    label = Column(String(20), nullable=False)  # w320, w640
+    format = Column(String(10), nullable=False)  # webp, jpeg
+    width = Column(Integer, nullable=False)
+    height = Column(Integer, nullable=False)
+    byte_size = Column(Integer, nullable=False)
+    storage_key = Column(String(255), nullable=False)
+    url = Column(String(500), nullable=False)
+    
+    # Relationships
+    photo = relationship("RoomPhoto", back_populates="variants")
@@ -5,7 +5,7 @@ Model này định nghĩa cấu trúc người dùng theo database schema.
 
 from __future__ import annotations
 
-from sqlalchemy import Column, String, Date, Boolean, ForeignKey
+from sqlalchemy import Column, String, Date, Boolean, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
 
@@ -20,6 +20,10 @@ class User(BaseModel):
     thông tin cá nhân, tài khoản và trạng thái.
     """
     __tablename__ = "users"
+    __table_args__ = (
+        # Keyset pagination: ORDER BY created_at DESC, id DESC
+        Index("ix_users_created_at_id", "created_at", "id"),
+    )
     
     first_name = Column(String(50), nullable=False)
     last_name = Column(String(50), nullable=False)
@@ -21,7 +21,8 @@ class UserDocument(BaseModel):
     
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True)
     document_type = Column(String(20), nullable=False)  # AVATAR, CCCD_FRONT, CCCD_BACK
-    url = Column(Text, nullable=False)  # Changed from String(500) to Text for base64 images
+    url = Column(Text, nullable=False)  # URL blob store (legacy: data URL base64)
+    storage_key = Column(String(255), nullable=True, index=True)  # Key content-addressed trong blob store
     uploaded_by = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     
     # Relationships
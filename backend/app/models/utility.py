@@ -0,0 +1,28 @@
+"""Utility model cho hệ thống quản lý phòng trọ.
+
+Danh mục tiện ích chuẩn hóa (Điều hoà, Bếp, Tủ lạnh...) với id số nguyên nhỏ.
+Mỗi phòng lưu danh sách id tiện ích của mình trong ``rooms.utility_ids``
+(mảng int có GIN index) để lọc "có đủ các tiện ích" bằng một phép ``@>``.
+"""
+
+from __future__ import annotations
+
+from sqlalchemy import Column, Integer, String, DateTime, func
+
+from app.infrastructure.db.session import Base
+
+
+class Utility(Base):
+    """Model cho bảng utilities.
+    
+    Khóa chính là số nguyên (không dùng UUID của BaseModel) để mảng
+    ``rooms.utility_ids`` nhỏ gọn. ``normalized_name`` là tên bỏ dấu, chữ
+    thường (``f_unaccent(lower(trim(name)))``, tính trong SQL) nên
+    "Điều hoà" và "điều hòa" là cùng một tiện ích.
+    """
+    __tablename__ = "utilities"
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    name = Column(String(100), nullable=False)  # Tên hiển thị (lần đầu xuất hiện)
+    normalized_name = Column(String(100), nullable=False, unique=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -1,10 +1,10 @@
-"""Repository cho Appointment model."""
+"""Repository cho Appointment model (AsyncSession)."""
 
 from typing import List, Optional
 from uuid import UUID
 from datetime import datetime
 
-from sqlalchemy import select, and_, or_
+from sqlalchemy import select, and_, or_, func
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
@@ -20,15 +20,15 @@ class AppointmentRepository:
     def __init__(self, session: AsyncSession):
         self.session = session
 
-    def create(self, appointment_data: dict) -> Appointment:
+    async def create(self, appointment_data: dict) -> Appointment:
         """Tạo appointment mới."""
         appointment = Appointment(**appointment_data)
         self.session.add(appointment)
-        self.session.commit()
-        self.session.refresh(appointment)
+        await self.session.commit()
+        await self.session.refresh(appointment)
         return appointment
 
-    def get_by_id(self, appointment_id: UUID) -> Optional[Appointment]:
+    async def get_by_id(self, appointment_id: UUID) -> Optional[Appointment]:
         """Lấy appointment theo ID với thông tin room và building."""
         from app.models.address import Address
         stmt = (
@@ -40,10 +40,10 @@ class AppointmentRepository:
             )
             .where(Appointment.id == appointment_id)
         )
-        result = self.session.execute(stmt)
+        result = await self.session.execute(stmt)
         return result.scalar_one_or_none()
 
-    def get_all(
+    async def get_all(
         self,
         skip: int = 0,
         limit: int = 100,
@@ -79,10 +79,10 @@ class AppointmentRepository:
             stmt = stmt.where(and_(*filters))
 
         stmt = stmt.offset(skip).limit(limit)
-        result = self.session.execute(stmt)
+        result = await self.session.execute(stmt)
         return list(result.scalars().all())
 
-    def get_pending_appointments(self) -> List[Appointment]:
+    async def get_pending_appointments(self) -> List[Appointment]:
         """Lấy danh sách appointments đang chờ xử lý."""
         from app.models.address import Address
         stmt = (
@@ -95,14 +95,14 @@ class AppointmentRepository:
             .where(Appointment.status == AppointmentStatus.PENDING)
             .order_by(Appointment.appointment_datetime.asc())
         )
-        result = self.session.execute(stmt)
+        result = await self.session.execute(stmt)
         return list(result.scalars().all())
 
-    def update(
+    async def update(
         self, appointment_id: UUID, update_data: dict, handled_by: Optional[UUID] = None
     ) -> Optional[Appointment]:
         """Cập nhật appointment."""
-        appointment = self.get_by_id(appointment_id)
+        appointment = await self.get_by_id(appointment_id)
         if not appointment:
             return None
 
@@ -114,25 +114,27 @@ class AppointmentRepository:
             appointment.handled_by = handled_by
             appointment.handled_at = datetime.now()
 
-        self.session.commit()
-        self.session.refresh(appointment)
+        await self.session.commit()
+        # Chỉ nạp lại cột do DB sinh; refresh toàn bộ sẽ expire room/building đã
+        # eager load (AsyncSession không lazy load được)
+        await self.session.refresh(appointment, ["updated_at"])
         return appointment
 
-    def delete(self, appointment_id: UUID) -> bool:
+    async def delete(self, appointment_id: UUID) -> bool:
         """Xóa appointment."""
-        appointment = self.get_by_id(appointment_id)
+        appointment = await self.get_by_id(appointment_id)
         if not appointment:
             return False
 
-        self.session.delete(appointment)
-        self.session.commit()
+        await self.session.delete(appointment)
+        await self.session.commit()
         return True
 
-    def count(
+    async def count(
         self, status: Optional[str] = None, room_id: Optional[UUID] = None
     ) -> int:
         """Đếm số lượng appointments."""
-        stmt = select(Appointment)
+        stmt = select(func.count(Appointment.id))
 
         filters = []
         if status:
@@ -143,10 +145,10 @@ class AppointmentRepository:
         if filters:
             stmt = stmt.where(and_(*filters))
 
-        result = self.session.execute(stmt)
-        return len(list(result.scalars().all()))
+        result = await self.session.execute(stmt)
+        return result.scalar() or 0
 
-    def get_by_contact(
+    async def get_by_contact(
         self, email: Optional[str] = None, phone: Optional[str] = None
     ) -> List[Appointment]:
         """Lấy danh sách appointments theo email hoặc phone.
@@ -179,5 +181,5 @@ class AppointmentRepository:
         if conditions:
             stmt = stmt.where(or_(*conditions))
 
-        result = self.session.execute(stmt)
+        result = await self.session.execute(stmt)
         return list(result.scalars().all())
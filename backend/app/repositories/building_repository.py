@@ -17,6 +17,7 @@ from app.models.address import Address
 from app.schemas.building_schema import BuildingCreate, BuildingUpdate
 from app.core.Enum.base_enum import StatusEnum
 from app.core.Enum.roomEnum import RoomStatus
+from app.core.search import contains
 
 
 class BuildingRepository:
@@ -48,6 +49,18 @@ class BuildingRepository:
             .first()
         )
     
+    def get_many(self, building_ids: list[UUID]) -> dict[UUID, Building]:
+        """Lấy nhiều Building theo ID trong một query (không load relationships).
+
+        Args:
+            building_ids: Danh sách UUID tòa nhà.
+
+        Returns:
+            Dict building_id -> Building; ID không tồn tại không xuất hiện.
+        """
+        buildings = self.db.query(Building).filter(Building.id.in_(building_ids)).all()
+        return {building.id: building for building in buildings}
+
     def get_by_id_with_stats(self, building_id: UUID) -> Optional[dict]:
         """Lấy Building theo ID kèm thống kê phòng.
         
@@ -256,19 +269,18 @@ class BuildingRepository:
         
         # Apply city filter
         if city:
-            query = query.filter(Address.city.ilike(f"%{city}%"))
+            query = query.filter(contains(Address.city, city))
         
         # Apply ward filter
         if ward:
-            query = query.filter(Address.ward.ilike(f"%{ward}%"))
+            query = query.filter(contains(Address.ward, ward))
         
         # Apply search filter - tìm theo tên tòa nhà hoặc địa chỉ
         if search:
-            search_pattern = f"%{search}%"
             query = query.filter(
-                (Building.building_name.ilike(search_pattern))
-                | (Address.full_address.ilike(search_pattern))
-                | (Building.building_code.ilike(search_pattern))
+                contains(Building.building_name, search)
+                | contains(Address.full_address, search)
+                | contains(Building.building_code, search)
             )
         
         # Apply sorting
@@ -335,19 +347,18 @@ class BuildingRepository:
         
         # Apply city filter
         if city:
-            query = query.filter(Address.city.ilike(f"%{city}%"))
+            query = query.filter(contains(Address.city, city))
         
         # Apply ward filter
         if ward:
-            query = query.filter(Address.ward.ilike(f"%{ward}%"))
+            query = query.filter(contains(Address.ward, ward))
         
         # Apply search filter
         if search:
-            search_pattern = f"%{search}%"
             query = query.filter(
-                (Building.building_name.ilike(search_pattern))
-                | (Address.full_address.ilike(search_pattern))
-                | (Building.building_code.ilike(search_pattern))
+                contains(Building.building_name, search)
+                | contains(Address.full_address, search)
+                | contains(Building.building_code, search)
             )
             
         return query.count()
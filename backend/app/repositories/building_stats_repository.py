@@ -0,0 +1,217 @@
+"""Building Stats Repository - data access layer cho bảng building_stats.
+
+Bảng building_stats là bản tổng hợp theo tòa nhà, được refresh bằng một câu
+``INSERT ... SELECT ... ON CONFLICT DO UPDATE`` dùng ``COUNT(*) FILTER (WHERE ...)``.
+Dashboard đọc bảng này trong một query duy nhất, không phụ thuộc số phòng.
+
+Trước khi tổng hợp, ``refresh`` giữ ``pg_advisory_xact_lock`` cho từng tòa
+nhà (theo thứ tự cố định). Hai transaction cùng ghi một tòa nhà vì vậy refresh
+lần lượt: transaction sau chỉ tổng hợp khi transaction trước đã commit, và với
+READ COMMITTED câu tổng hợp chạy sau khi có khóa thấy dữ liệu vừa commit đó -
+dòng thống kê ghi cuối luôn đầy đủ.
+"""
+
+from __future__ import annotations
+
+from datetime import date, timedelta
+from typing import Iterable, Optional
+from uuid import UUID
+
+from sqlalchemy import and_, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.models.building import Building
+from app.models.building_stats import BuildingStats
+from app.models.contract import Contract
+from app.models.maintenance_request import MaintenanceRequest
+from app.models.room import Room
+from app.core.Enum.contractEnum import ContractStatus
+from app.core.Enum.maintenanceEnum import MaintenanceStatus
+from app.core.Enum.roomEnum import RoomStatus
+
+
+STAT_COLUMNS = (
+    "total_rooms",
+    "empty_rooms",
+    "occupied_rooms",
+    "revenue",
+    "total_contracts",
+    "active_contracts",
+    "expired_contracts",
+    "maintenance_total",
+    "maintenance_pending",
+    "maintenance_in_progress",
+    "maintenance_processed",
+)
+CONTRACT_COLUMNS = ("total_contracts", "active_contracts", "expired_contracts")
+
+# Namespace khóa advisory (hai tham số int4) cho refresh building_stats ("BSTS")
+_LOCK_NAMESPACE = 0x42535453
+
+
+class BuildingStatsRepository:
+    """Repository cho bảng tổng hợp building_stats.
+
+    Args:
+        db: SQLAlchemy Session.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def _aggregate_select(self, building_ids: Optional[Iterable[UUID]] = None):
+        """SELECT tính lại toàn bộ cột thống kê cho các tòa nhà (None = tất cả)."""
+        room_agg = (
+            select(
+                Room.building_id.label("building_id"),
+                func.count().label("total_rooms"),
+                func.count().filter(Room.status == RoomStatus.AVAILABLE.value).label("empty_rooms"),
+                func.count().filter(Room.status == RoomStatus.OCCUPIED.value).label("occupied_rooms"),
+                func.coalesce(
+                    func.sum(Room.base_price).filter(Room.status == RoomStatus.OCCUPIED.value), 0
+                ).label("revenue"),
+            )
+            .group_by(Room.building_id)
+        )
+        contract_agg = (
+            select(
+                Room.building_id.label("building_id"),
+                func.count().label("total_contracts"),
+                func.count().filter(Contract.status == ContractStatus.ACTIVE.value).label("active_contracts"),
+                func.count().filter(Contract.status == ContractStatus.EXPIRED.value).label("expired_contracts"),
+            )
+            .join(Room, Contract.room_id == Room.id)
+            .group_by(Room.building_id)
+        )
+        maintenance_agg = (
+            select(
+                Room.building_id.label("building_id"),
+                func.count().label("maintenance_total"),
+                func.count().filter(
+                    MaintenanceRequest.status == MaintenanceStatus.PENDING.value
+                ).label("maintenance_pending"),
+                func.count().filter(
+                    MaintenanceRequest.status == MaintenanceStatus.IN_PROGRESS.value
+                ).label("maintenance_in_progress"),
+                func.count().filter(
+                    MaintenanceRequest.status.in_([
+                        MaintenanceStatus.COMPLETED.value,
+                        MaintenanceStatus.CANCELLED.value,
+                    ])
+                ).label("maintenance_processed"),
+            )
+            .join(Room, MaintenanceRequest.room_id == Room.id)
+            .group_by(Room.building_id)
+        )
+
+        if building_ids is not None:
+            ids = list(building_ids)
+            room_agg = room_agg.where(Room.building_id.in_(ids))
+            contract_agg = contract_agg.where(Room.building_id.in_(ids))
+            maintenance_agg = maintenance_agg.where(Room.building_id.in_(ids))
+
+        r = room_agg.subquery()
+        c = contract_agg.subquery()
+        m = maintenance_agg.subquery()
+
+        stmt = (
+            select(
+                Building.id.label("building_id"),
+                func.coalesce(r.c.total_rooms, 0),
+                func.coalesce(r.c.empty_rooms, 0),
+                func.coalesce(r.c.occupied_rooms, 0),
+                func.coalesce(r.c.revenue, 0),
+                func.coalesce(c.c.total_contracts, 0),
+                func.coalesce(c.c.active_contracts, 0),
+                func.coalesce(c.c.expired_contracts, 0),
+                func.coalesce(m.c.maintenance_total, 0),
+                func.coalesce(m.c.maintenance_pending, 0),
+                func.coalesce(m.c.maintenance_in_progress, 0),
+                func.coalesce(m.c.maintenance_processed, 0),
+            )
+            .outerjoin(r, r.c.building_id == Building.id)
+            .outerjoin(c, c.c.building_id == Building.id)
+            .outerjoin(m, m.c.building_id == Building.id)
+        )
+        if building_ids is not None:
+            stmt = stmt.where(Building.id.in_(ids))
+        return stmt
+
+    def _lock(self, building_ids: Optional[list[UUID]]) -> None:
+        """Khóa advisory (đến hết transaction) từng tòa nhà sắp refresh, None = tất cả.
+
+        Khóa theo thứ tự id để hai transaction không chờ chéo nhau.
+        """
+        if building_ids is None:
+            building_ids = self.db.execute(select(Building.id)).scalars().all()
+        for building_id in sorted(building_ids, key=str):
+            self.db.execute(
+                select(func.pg_advisory_xact_lock(
+                    _LOCK_NAMESPACE, func.hashtext(str(building_id))
+                ))
+            )
+
+    def refresh(self, building_ids: Optional[Iterable[UUID]] = None) -> None:
+        """Tính lại (UPSERT) thống kê cho các tòa nhà chỉ định, None = tất cả.
+
+        Không commit - chạy trong transaction của caller (khóa advisory được
+        giữ đến khi caller commit/rollback).
+        """
+        if building_ids is not None:
+            building_ids = [b for b in set(building_ids) if b is not None]
+            if not building_ids:
+                return
+
+        self._lock(building_ids)
+        stmt = insert(BuildingStats).from_select(
+            ["building_id", *STAT_COLUMNS], self._aggregate_select(building_ids)
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[BuildingStats.building_id],
+            set_={
+                **{col: stmt.excluded[col] for col in STAT_COLUMNS},
+                "updated_at": func.now(),
+            },
+        )
+        self.db.execute(stmt)
+
+    def get_totals(self, building_id: Optional[UUID] = None) -> dict:
+        """Lấy số liệu dashboard trong một round-trip.
+
+        Cộng dồn các dòng building_stats. Khi lọc theo tòa nhà, chỉ số phòng và
+        sự cố được lọc (``SUM(...) FILTER (WHERE building_id = ...)``); chỉ số
+        hợp đồng luôn tính toàn hệ thống như dashboard hiện tại.
+        ``expiring_soon`` phụ thuộc ngày hiện tại nên không materialize được;
+        nó được đếm trực tiếp bằng scalar subquery trong cùng câu SELECT.
+
+        Args:
+            building_id: Lọc theo tòa nhà (optional).
+
+        Returns:
+            Dict các cột thống kê + expiring_soon.
+        """
+        today = date.today()
+        expiring_soon = (
+            select(func.count(Contract.id))
+            .where(
+                and_(
+                    Contract.status == ContractStatus.ACTIVE.value,
+                    Contract.end_date <= today + timedelta(days=30),
+                    Contract.end_date >= today,
+                )
+            )
+            .scalar_subquery()
+        )
+
+        columns = []
+        for col in STAT_COLUMNS:
+            total = func.sum(getattr(BuildingStats, col))
+            if building_id and col not in CONTRACT_COLUMNS:
+                total = total.filter(BuildingStats.building_id == building_id)
+            columns.append(func.coalesce(total, 0).label(col))
+
+        row = self.db.execute(
+            select(*columns, expiring_soon.label("expiring_soon"))
+        ).one()
+        return dict(row._mapping)
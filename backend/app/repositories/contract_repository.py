@@ -13,7 +13,7 @@ from typing import Optional
 from uuid import UUID
 from decimal import Decimal
 
-from sqlalchemy import select, func, and_, case, or_
+from sqlalchemy import BigInteger, cast, select, func, and_, case, or_
 from sqlalchemy.orm import Session, joinedload
 from sqlalchemy.exc import IntegrityError
 
@@ -23,6 +23,7 @@ from app.models.building import Building
 from app.models.user import User
 from app.schemas.contract_schema import ContractCreate, ContractUpdate
 from app.core.Enum.contractEnum import ContractStatus
+from app.core.pagination import SortKey, paginate_keyset
 
 
 class ContractRepository:
@@ -109,7 +110,50 @@ class ContractRepository:
         Returns:
             List[dict] chứa thông tin hợp đồng đã join
         """
+        query = self._list_query(status_filter, building_filter, search_query, tenant_id)
         
+        # Order by created_at desc (mới nhất trước)
+        query = query.order_by(Contract.created_at.desc(), Contract.id.desc())
+        
+        # Pagination
+        query = query.offset(offset).limit(limit)
+        
+        return [self._list_row(row) for row in query.all()]
+    
+    def list_with_details_keyset(
+        self,
+        cursor: Optional[str] = None,
+        limit: int = 20,
+        status_filter: Optional[str] = None,
+        building_filter: Optional[str] = None,
+        search_query: Optional[str] = None,
+        tenant_id: Optional[UUID] = None
+    ) -> tuple[list[dict], Optional[str]]:
+        """Lấy danh sách hợp đồng phân trang bằng cursor (created_at, id).
+        
+        Returns:
+            Tuple (list dict của trang, next_cursor hoặc None nếu hết dữ liệu)
+            
+        Raises:
+            ValueError: Cursor không hợp lệ
+        """
+        rows, next_cursor = paginate_keyset(
+            self._list_query(status_filter, building_filter, search_query, tenant_id),
+            [SortKey(Contract.created_at, desc=True), SortKey(Contract.id, desc=True)],
+            sort="created_at_desc",
+            cursor=cursor,
+            limit=limit,
+        )
+        return [self._list_row(row) for row in rows], next_cursor
+    
+    def _list_query(
+        self,
+        status_filter: Optional[str],
+        building_filter: Optional[str],
+        search_query: Optional[str],
+        tenant_id: Optional[UUID],
+    ):
+        """Query danh sách hợp đồng đã áp filters (chưa sắp xếp/phân trang)."""
         # Ghép tên đầy đủ của tenant
         # Build tenant full name as "last_name first_name" (middle_name removed)
         tenant_full_name = func.concat(
@@ -153,29 +197,22 @@ class ContractRepository:
         if tenant_id:
             query = query.filter(Contract.tenant_id == tenant_id)
         
-        # Order by created_at desc (mới nhất trước)
-        query = query.order_by(Contract.created_at.desc())
-        
-        # Pagination
-        query = query.offset(offset).limit(limit)
-        
-        # Convert to dict list
-        results = query.all()
-        return [
-            {
-                "id": row.id,
-                "contract_number": row.contract_number,
-                "room_number": row.room_number,
-                "tenant_name": row.tenant_name,
-                "building_name": row.building_name,
-                "start_date": row.start_date,
-                "end_date": row.end_date,
-                "rental_price": row.rental_price,
-                "status": row.status,
-                "created_at": row.created_at
-            }
-            for row in results
-        ]
+        return query
+    
+    @staticmethod
+    def _list_row(row) -> dict:
+        return {
+            "id": row.id,
+            "contract_number": row.contract_number,
+            "room_number": row.room_number,
+            "tenant_name": row.tenant_name,
+            "building_name": row.building_name,
+            "start_date": row.start_date,
+            "end_date": row.end_date,
+            "rental_price": row.rental_price,
+            "status": row.status,
+            "created_at": row.created_at
+        }
     
     def count_contracts(
         self,
@@ -240,36 +277,56 @@ class ContractRepository:
         today = date.today()
         expiring_date = today + timedelta(days=30)
         
-        total = self.db.query(func.count(Contract.id)).scalar()
-        active = self.db.query(func.count(Contract.id)).filter(
-            Contract.status == ContractStatus.ACTIVE.value
-        ).scalar()
-        
-        expiring = self.db.query(func.count(Contract.id)).filter(
-            and_(
-                Contract.status == ContractStatus.ACTIVE.value,
-                Contract.end_date <= expiring_date,
-                Contract.end_date >= today
-            )
-        ).scalar()
-        
-        expired = self.db.query(func.count(Contract.id)).filter(
-            Contract.status == ContractStatus.EXPIRED.value
-        ).scalar()
+        # Một query duy nhất với COUNT(*) FILTER thay vì 4 lần COUNT
+        is_active = Contract.status == ContractStatus.ACTIVE.value
+        row = self.db.query(
+            func.count().label("total"),
+            func.count().filter(is_active).label("active"),
+            func.count().filter(
+                and_(
+                    is_active,
+                    Contract.end_date <= expiring_date,
+                    Contract.end_date >= today
+                )
+            ).label("expiring"),
+            func.count().filter(Contract.status == ContractStatus.EXPIRED.value).label("expired"),
+        ).select_from(Contract).one()
         
         return {
-            "total_contracts": total or 0,
-            "active_contracts": active or 0,
-            "expiring_soon": expiring or 0,
-            "expired_contracts": expired or 0
+            "total_contracts": row.total or 0,
+            "active_contracts": row.active or 0,
+            "expiring_soon": row.expiring or 0,
+            "expired_contracts": row.expired or 0
         }
     
-    def create(self, data: ContractCreate, created_by: UUID) -> Contract:
+    def get_existing_numbers(self, contract_numbers: list[str]) -> set[str]:
+        """Các mã hợp đồng trong danh sách đã tồn tại."""
+        if not contract_numbers:
+            return set()
+        rows = self.db.execute(
+            select(Contract.contract_number).where(Contract.contract_number.in_(contract_numbers))
+        ).scalars()
+        return set(rows)
+
+    def get_max_sequence_number(self, prefix: str) -> int:
+        """Số lớn nhất trong các mã dạng ``<prefix><số>`` (0 nếu chưa có).
+
+        Quét bảng - chỉ dùng khi bộ đếm bị mã nhập tay vượt trước.
+        """
+        pattern = f"^{prefix}([0-9]+)$"
+        number = func.substring(Contract.contract_number, pattern)
+        value = self.db.execute(
+            select(func.max(cast(number, BigInteger))).where(Contract.contract_number.op("~")(pattern))
+        ).scalar()
+        return int(value or 0)
+
+    def create(self, data: ContractCreate, created_by: UUID, contract_number: str) -> Contract:
         """Tạo hợp đồng mới.
         
         Args:
             data: ContractCreate schema
             created_by: UUID của user tạo hợp đồng
+            contract_number: Mã hợp đồng (nhập tay hoặc cấp bởi DocumentNumberService)
             
         Returns:
             Contract ORM instance vừa tạo
@@ -291,21 +348,6 @@ class ContractRepository:
                 service_fees_json.append(fee_dict)
             contract_dict["service_fees"] = service_fees_json
         
-        # Tạo contract_number nếu chưa có
-        contract_number = data.contract_number
-        if not contract_number:
-            # Tự động sinh mã: HD + số thứ tự
-            max_number = self.db.query(func.max(Contract.contract_number)).scalar()
-            if max_number:
-                # Extract số từ HD001 -> 1, increment
-                try:
-                    num = int(max_number.replace("HD", ""))
-                    contract_number = f"HD{num + 1:03d}"
-                except:
-                    contract_number = "HD001"
-            else:
-                contract_number = "HD001"
-        
         # ID (UUIDv7) sẽ được tự động tạo bởi BaseModel.id default=generate_uuid7
         obj = Contract(
             contract_number=contract_number,
@@ -382,10 +424,15 @@ class ContractRepository:
             - Hợp đồng 2: 1 người (PENDING)
             - Tổng: 3 người
         """
-        query = (
-            self.db.query(func.sum(Contract.number_of_tenants))
-            .filter(
-                and_(
+        # Bộ đếm rooms.current_occupants (một dòng) thay vì SUM qua các hợp đồng
+        total = self.db.query(Room.current_occupants).filter(Room.id == room_id).scalar() or 0
+        
+        # Loại trừ hợp đồng hiện tại nếu đang update (chỉ khi nó đang được tính vào bộ đếm)
+        if exclude_contract_id:
+            excluded = (
+                self.db.query(Contract.number_of_tenants)
+                .filter(
+                    Contract.id == exclude_contract_id,
                     Contract.room_id == room_id,
                     Contract.status.in_([
                         ContractStatus.ACTIVE.value,
@@ -393,15 +440,69 @@ class ContractRepository:
                         ContractStatus.PENDING_UPDATE.value
                     ])
                 )
+                .scalar()
             )
-        )
-        
-        # Loại trừ hợp đồng hiện tại nếu đang update
-        if exclude_contract_id:
-            query = query.filter(Contract.id != exclude_contract_id)
+            total -= excluded or 0
         
-        total = query.scalar()
-        return total if total else 0
+        return total
+    
+    def get_total_tenants_by_rooms(self, room_ids: list[UUID]) -> dict[UUID, int]:
+        """Bản batch của get_total_tenants_in_room cho nhiều phòng (đọc rooms.current_occupants).
+
+        Args:
+            room_ids: Danh sách UUID phòng.
+
+        Returns:
+            Dict room_id -> tổng số người; phòng không có hợp đồng không xuất hiện.
+        """
+        rows = (
+            self.db.query(Room.id, Room.current_occupants)
+            .filter(Room.id.in_(room_ids), Room.current_occupants > 0)
+            .all()
+        )
+        return dict(rows)
+
+    def count_by_rooms(self, room_ids: list[UUID], statuses: list[str]) -> dict[UUID, int]:
+        """Đếm hợp đồng theo phòng với các trạng thái cho trước (một query GROUP BY).
+
+        Args:
+            room_ids: Danh sách UUID phòng.
+            statuses: Các trạng thái hợp đồng cần đếm.
+
+        Returns:
+            Dict room_id -> số hợp đồng; phòng không có hợp đồng không xuất hiện.
+        """
+        rows = (
+            self.db.query(Contract.room_id, func.count(Contract.id))
+            .filter(Contract.room_id.in_(room_ids), Contract.status.in_(statuses))
+            .group_by(Contract.room_id)
+            .all()
+        )
+        return dict(rows)
+
+    def get_active_contracts_by_rooms(self, room_ids: list[UUID]) -> dict[UUID, list[Contract]]:
+        """Bản batch của get_active_contracts_by_room cho nhiều phòng.
+
+        Args:
+            room_ids: Danh sách UUID phòng.
+
+        Returns:
+            Dict room_id -> list Contract ACTIVE (kèm tenant, sắp theo created_at).
+        """
+        contracts = (
+            self.db.query(Contract)
+            .options(joinedload(Contract.tenant))
+            .filter(
+                Contract.room_id.in_(room_ids),
+                Contract.status == ContractStatus.ACTIVE.value
+            )
+            .order_by(Contract.room_id, Contract.created_at.asc())
+            .all()
+        )
+        grouped: dict[UUID, list[Contract]] = {}
+        for contract in contracts:
+            grouped.setdefault(contract.room_id, []).append(contract)
+        return grouped
 
     def get_active_contracts_by_room(self, room_id: UUID) -> list[Contract]:
         """Lấy tất cả hợp đồng đang hoạt động của phòng (hỗ trợ phòng ở ghép).
@@ -0,0 +1,78 @@
+"""Document Counter Repository - cấp số chứng từ không trùng.
+
+Mỗi lần cấp là một câu::
+
+    INSERT INTO document_counters (prefix, period, last_value) VALUES (:p, :k, :n)
+    ON CONFLICT (prefix, period) DO UPDATE
+        SET last_value = document_counters.last_value + EXCLUDED.last_value
+    RETURNING last_value
+
+Postgres khóa dòng bộ đếm khi UPDATE nên hai transaction cấp cùng (prefix,
+period) được tuần tự hóa - không bao giờ nhận cùng một số. Khóa giữ đến khi
+transaction gọi commit/rollback: số chỉ được "tiêu" khi chứng từ được lưu
+(rollback thì số được trả lại, không tạo lỗ hổng), đổi lại nên cấp số ngay
+trước khi insert để giữ khóa ngắn.
+"""
+
+from __future__ import annotations
+
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.models.document_counter import DocumentCounter
+
+
+class DocumentCounterRepository:
+    """Repository cho bảng document_counters.
+
+    Args:
+        db: SQLAlchemy Session.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def allocate(self, prefix: str, period: str = "", count: int = 1) -> range:
+        """Cấp ``count`` số liên tiếp cho bộ đếm (prefix, period).
+
+        Bộ đếm chưa có sẽ được tạo, bắt đầu từ 1.
+
+        Args:
+            prefix: Tiền tố chứng từ (``HD``, ``INV``...).
+            period: Kỳ đánh số (``YYYYMM``) hoặc ``""`` nếu không theo kỳ.
+            count: Số lượng số cần cấp (cấp theo khối cho tác vụ hàng loạt).
+
+        Returns:
+            ``range`` các số đã cấp (tăng dần).
+        """
+        if count < 1:
+            raise ValueError("count phải >= 1")
+
+        stmt = insert(DocumentCounter).values(prefix=prefix, period=period, last_value=count)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[DocumentCounter.prefix, DocumentCounter.period],
+            set_={
+                "last_value": DocumentCounter.last_value + stmt.excluded.last_value,
+                "updated_at": func.now(),
+            },
+        ).returning(DocumentCounter.last_value)
+
+        last_value = self.db.execute(stmt).scalar_one()
+        return range(last_value - count + 1, last_value + 1)
+
+    def raise_to(self, prefix: str, period: str, value: int) -> None:
+        """Đưa bộ đếm lên ít nhất ``value`` (không bao giờ giảm).
+
+        Dùng khi một số được nhập tay vượt trước bộ đếm, để lần cấp kế tiếp
+        không trùng với nó.
+        """
+        stmt = insert(DocumentCounter).values(prefix=prefix, period=period, last_value=value)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[DocumentCounter.prefix, DocumentCounter.period],
+            set_={
+                "last_value": func.greatest(DocumentCounter.last_value, stmt.excluded.last_value),
+                "updated_at": func.now(),
+            },
+        )
+        self.db.execute(stmt)
@@ -8,15 +8,25 @@ from __future__ import annotations
 from typing import Optional, List
 from uuid import UUID
 from datetime import date
+from decimal import Decimal
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func, and_, or_, extract
+from sqlalchemy import func, and_, or_, extract, exists, insert, select
 
-from app.models.invoice import Invoice
+from app.models.invoice import Invoice, calculate_invoice_total
 from app.models.contract import Contract
 from app.models.room import Room
 from app.models.building import Building
 from app.models.user import User
+from app.core.Enum.contractEnum import ContractStatus
 from app.core.Enum.invoiceEnum import InvoiceStatus
+from app.core.pagination import SortKey, paginate_keyset
+
+
+def month_range(billing_month: date) -> tuple[date, date]:
+    """[ngày 1 của tháng, ngày 1 tháng sau) - lọc theo khoảng để dùng được index billing_month."""
+    start = billing_month.replace(day=1)
+    end = date(start.year + start.month // 12, start.month % 12 + 1, 1)
+    return start, end
 
 
 class InvoiceRepository:
@@ -78,6 +88,7 @@ class InvoiceRepository:
         status_filter: Optional[str] = None,
         building_id: Optional[UUID] = None,
         tenant_id: Optional[UUID] = None,
+        sort_by: Optional[str] = None,
         offset: int = 0,
         limit: int = 20
     ) -> List[dict]:
@@ -87,27 +98,68 @@ class InvoiceRepository:
             status_filter: Lọc theo trạng thái (PENDING, PAID, OVERDUE, CANCELLED)
             building_id: Lọc theo tòa nhà
             tenant_id: Lọc theo người thuê
+            sort_by: Sắp xếp (amount_asc, amount_desc), mặc định created_at desc
             offset: Vị trí bắt đầu
             limit: Số lượng tối đa
             
         Returns:
             List[dict] chứa thông tin hóa đơn
         """
-        # Ghép tên đầy đủ của tenant
-        tenant_full_name = func.concat(User.last_name, ' ', User.first_name)
+        query = self._list_query(status_filter, building_id, tenant_id)
+        
+        query = query.order_by(*[
+            k.column.desc() if k.desc else k.column.asc() for k in self._list_sort_keys(sort_by)
+        ])
+        
+        # Pagination
+        query = query.offset(offset).limit(limit)
         
-        # Tính tổng tiền
-        electricity_cost = (Invoice.electricity_new_index - Invoice.electricity_old_index) * Invoice.electricity_unit_price
-        water_cost = Invoice.number_of_people * Invoice.water_unit_price
-        total_amount = (
-            Invoice.room_price + 
-            func.coalesce(electricity_cost, 0) + 
-            water_cost +
-            Invoice.service_fee +
-            Invoice.internet_fee +
-            Invoice.parking_fee +
-            Invoice.other_fees
+        return [self._list_row(row) for row in query.all()]
+    
+    def list_with_details_keyset(
+        self,
+        status_filter: Optional[str] = None,
+        building_id: Optional[UUID] = None,
+        tenant_id: Optional[UUID] = None,
+        sort_by: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limit: int = 20
+    ) -> tuple[List[dict], Optional[str]]:
+        """Lấy danh sách hóa đơn phân trang bằng cursor (sort key, id).
+        
+        Returns:
+            Tuple (list dict của trang, next_cursor hoặc None nếu hết dữ liệu)
+            
+        Raises:
+            ValueError: Cursor không hợp lệ
+        """
+        rows, next_cursor = paginate_keyset(
+            self._list_query(status_filter, building_id, tenant_id),
+            self._list_sort_keys(sort_by),
+            sort=sort_by or "created_at_desc",
+            cursor=cursor,
+            limit=limit,
         )
+        return [self._list_row(row) for row in rows], next_cursor
+    
+    @staticmethod
+    def _list_sort_keys(sort_by: Optional[str]) -> List[SortKey]:
+        """Khóa sắp xếp danh sách hóa đơn (dùng index (total_amount, id) / (created_at, id))."""
+        if sort_by == "amount_asc":
+            return [SortKey(Invoice.total_amount), SortKey(Invoice.id)]
+        if sort_by == "amount_desc":
+            return [SortKey(Invoice.total_amount, desc=True), SortKey(Invoice.id, desc=True)]
+        return [SortKey(Invoice.created_at, desc=True), SortKey(Invoice.id, desc=True)]
+    
+    def _list_query(
+        self,
+        status_filter: Optional[str],
+        building_id: Optional[UUID],
+        tenant_id: Optional[UUID],
+    ):
+        """Query danh sách hóa đơn đã áp filters (chưa sắp xếp/phân trang)."""
+        # Ghép tên đầy đủ của tenant
+        tenant_full_name = func.concat(User.last_name, ' ', User.first_name)
         
         query = (
             self.db.query(
@@ -115,7 +167,9 @@ class InvoiceRepository:
                 Invoice.invoice_number,
                 tenant_full_name.label("tenant_name"),
                 Invoice.billing_month,
-                total_amount.label("total_amount"),
+                Invoice.total_amount,
+                Invoice.amount_paid,
+                Invoice.amount_due,
                 Building.building_name,
                 Room.room_number,
                 Invoice.due_date,
@@ -138,29 +192,24 @@ class InvoiceRepository:
         if tenant_id:
             query = query.filter(Contract.tenant_id == tenant_id)
         
-        # Order by created_at desc
-        query = query.order_by(Invoice.created_at.desc())
-        
-        # Pagination
-        query = query.offset(offset).limit(limit)
-        
-        # Convert to dict list
-        results = query.all()
-        return [
-            {
-                "id": row.id,
-                "invoice_number": row.invoice_number,
-                "tenant_name": row.tenant_name,
-                "billing_month": row.billing_month,
-                "total_amount": row.total_amount,
-                "building_name": row.building_name,
-                "room_number": row.room_number,
-                "due_date": row.due_date,
-                "status": row.status,
-                "created_at": row.created_at
-            }
-            for row in results
-        ]
+        return query
+    
+    @staticmethod
+    def _list_row(row) -> dict:
+        return {
+            "id": row.id,
+            "invoice_number": row.invoice_number,
+            "tenant_name": row.tenant_name,
+            "billing_month": row.billing_month,
+            "total_amount": row.total_amount,
+            "amount_paid": row.amount_paid,
+            "amount_due": row.amount_due,
+            "building_name": row.building_name,
+            "room_number": row.room_number,
+            "due_date": row.due_date,
+            "status": row.status,
+            "created_at": row.created_at
+        }
     
     def count(
         self,
@@ -282,3 +331,114 @@ class InvoiceRepository:
             .scalar()
         )
         return count > 0
+    
+    def lock_billing_month(self, billing_month: date) -> None:
+        """Khóa advisory theo tháng tính tiền đến hết transaction.
+        
+        Tuần tự hóa các thao tác lập hóa đơn cùng tháng (tạo lẻ và hàng loạt) để
+        bước "đã có hóa đơn tháng này chưa" không bị hai transaction cùng vượt qua.
+        
+        Args:
+            billing_month: Tháng tính tiền
+        """
+        self.db.execute(
+            select(func.pg_advisory_xact_lock(
+                func.hashtext("invoices.billing_month"),
+                billing_month.year * 100 + billing_month.month,
+            ))
+        )
+    
+    def get_billing_candidates(self, billing_month: date, building_id: Optional[UUID] = None) -> list:
+        """Các hợp đồng ACTIVE cần lập hóa đơn tháng ``billing_month`` (một query).
+        
+        Mỗi dòng gồm thông tin hợp đồng/phòng/tòa nhà/khách thuê, chỉ số điện mới
+        của hóa đơn gần nhất trước tháng này (``row_number()`` theo hợp đồng) và
+        cờ ``has_invoice`` nếu hợp đồng đã có hóa đơn trong tháng.
+        
+        Args:
+            billing_month: Tháng tính tiền
+            building_id: Lọc theo tòa nhà (None = tất cả)
+            
+        Returns:
+            List Row sắp xếp theo tòa nhà, số phòng, hợp đồng cũ nhất trước
+        """
+        month_start, month_end = month_range(billing_month)
+        
+        # Hợp đồng ACTIVE có hiệu lực trong tháng
+        conditions = [
+            Contract.status == ContractStatus.ACTIVE.value,
+            Contract.start_date < month_end,
+            Contract.end_date >= month_start,
+        ]
+        if building_id:
+            conditions.append(Room.building_id == building_id)
+        billable = select(Contract.id).join(Room, Contract.room_id == Room.id).where(*conditions)
+        
+        # Hóa đơn có chỉ số điện gần nhất trước tháng này của từng hợp đồng
+        previous = (
+            select(
+                Invoice.contract_id,
+                Invoice.electricity_new_index,
+                func.row_number().over(
+                    partition_by=Invoice.contract_id,
+                    order_by=(Invoice.billing_month.desc(), Invoice.created_at.desc()),
+                ).label("rn"),
+            )
+            .where(
+                Invoice.contract_id.in_(billable),
+                Invoice.billing_month < month_start,
+                Invoice.electricity_new_index.isnot(None),
+            )
+            .subquery("previous_invoices")
+        )
+        
+        has_invoice = exists().where(
+            Invoice.contract_id == Contract.id,
+            Invoice.billing_month >= month_start,
+            Invoice.billing_month < month_end,
+        )
+        
+        stmt = (
+            select(
+                Contract.id.label("contract_id"),
+                Contract.contract_number,
+                Contract.tenant_id,
+                Contract.number_of_tenants,
+                Contract.rental_price,
+                Contract.initial_electricity_index,
+                Contract.service_fees,
+                Room.id.label("room_id"),
+                Room.room_number,
+                Room.electricity_price,
+                Room.water_price_per_person,
+                Building.building_name,
+                User.first_name,
+                User.last_name,
+                previous.c.electricity_new_index.label("previous_electricity_index"),
+                has_invoice.label("has_invoice"),
+            )
+            .join(Room, Contract.room_id == Room.id)
+            .join(Building, Room.building_id == Building.id)
+            .join(User, Contract.tenant_id == User.id)
+            .outerjoin(previous, and_(previous.c.contract_id == Contract.id, previous.c.rn == 1))
+            .where(*conditions)
+            # Trong phòng ở ghép, hợp đồng cũ nhất (người đại diện) đứng đầu
+            .order_by(Building.building_name, Room.room_number, Contract.created_at)
+        )
+        return self.db.execute(stmt).all()
+    
+    def bulk_create(self, rows: list[dict]) -> None:
+        """Insert nhiều hóa đơn bằng một lệnh executemany (chưa commit).
+        
+        Core insert không qua listener của Invoice nên total_amount/amount_due
+        được tính tại đây bằng cùng công thức.
+        
+        Args:
+            rows: List dict giá trị cột (đã gồm id, invoice_number)
+        """
+        for row in rows:
+            row["total_amount"] = calculate_invoice_total(row)
+            row["amount_paid"] = Decimal(0)
+            row["amount_due"] = row["total_amount"]
+        if rows:
+            self.db.execute(insert(Invoice), rows)
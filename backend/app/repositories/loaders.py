@@ -0,0 +1,132 @@
+"""Batch loader kiểu DataLoader cho các quan hệ hay bị truy vấn trong vòng lặp.
+
+Thay vì gọi repository một lần cho mỗi phòng (N+1 query), service gom key lại:
+
+    loaders = get_loaders(db)
+    occupants = loaders.occupancy.load_many(room_ids)  # 1 query GROUP BY room_id
+
+- Mỗi loader chạy một query ``WHERE key IN (...)`` cho các key chưa có trong
+  memo (chia lô ``max_batch_size`` key để tránh IN quá dài).
+- Memo gắn với Session (``session.info``) - mỗi request một Session qua
+  ``get_db`` nên memo có phạm vi request và dùng chung giữa các service.
+- Memo tự xóa sau mỗi flush/commit/rollback của Session để không trả dữ liệu
+  cũ sau khi ghi.
+"""
+
+from __future__ import annotations
+
+from typing import Callable, Generic, Hashable, Iterable, TypeVar
+from uuid import UUID
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.Enum.contractEnum import ContractStatus
+from app.models.building import Building
+from app.models.contract import Contract
+from app.repositories.building_repository import BuildingRepository
+from app.repositories.contract_repository import ContractRepository
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+_LOADERS_KEY = "batch_loaders"
+
+
+class BatchLoader(Generic[K, V]):
+    """Gom nhiều key thành một lần gọi ``batch_fn`` và memo kết quả.
+
+    Args:
+        batch_fn: Hàm nhận list key, trả dict key -> value (key thiếu dùng default).
+        default_factory: Tạo giá trị cho key không có trong kết quả batch.
+        max_batch_size: Số key tối đa mỗi lần gọi ``batch_fn``.
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable[[list[K]], dict[K, V]],
+        default_factory: Callable[[], V] = lambda: None,
+        max_batch_size: int = 500,
+    ):
+        self._batch_fn = batch_fn
+        self._default_factory = default_factory
+        self._max_batch_size = max_batch_size
+        self._memo: dict[K, V] = {}
+
+    def load(self, key: K) -> V:
+        """Lấy giá trị của một key (dùng memo nếu đã load)."""
+        return self.load_many([key])[0]
+
+    def load_many(self, keys: Iterable[K]) -> list[V]:
+        """Lấy giá trị theo thứ tự ``keys``; các key chưa có được load trong một lô."""
+        keys = list(keys)
+        # Kết quả gom vào dict cục bộ: query của batch_fn có thể autoflush và
+        # listener xóa memo giữa chừng, làm mất các key đã có trong memo
+        results = {key: self._memo[key] for key in dict.fromkeys(keys) if key in self._memo}
+        missing = [key for key in dict.fromkeys(keys) if key not in results]
+        for start in range(0, len(missing), self._max_batch_size):
+            chunk = missing[start:start + self._max_batch_size]
+            found = self._batch_fn(chunk)
+            for key in chunk:
+                value = found[key] if key in found else self._default_factory()
+                results[key] = self._memo[key] = value
+        return [results[key] for key in keys]
+
+    def prime(self, key: K, value: V) -> None:
+        """Ghi sẵn giá trị cho key (ví dụ object vừa load bằng query khác)."""
+        self._memo[key] = value
+
+    def clear(self) -> None:
+        """Xóa memo."""
+        self._memo.clear()
+
+
+class Loaders:
+    """Các batch loader dùng chung trong một Session.
+
+    Args:
+        db: SQLAlchemy Session của request.
+    """
+
+    def __init__(self, db: Session):
+        contract_repo = ContractRepository(db)
+        building_repo = BuildingRepository(db)
+
+        # building_id -> Building (hoặc None)
+        self.building: BatchLoader[UUID, Building | None] = BatchLoader(building_repo.get_many)
+        # room_id -> tổng số người của hợp đồng ACTIVE/PENDING/PENDING_UPDATE
+        self.occupancy: BatchLoader[UUID, int] = BatchLoader(
+            contract_repo.get_total_tenants_by_rooms, default_factory=int
+        )
+        # room_id -> list hợp đồng ACTIVE (kèm tenant, cũ nhất trước)
+        self.active_contracts: BatchLoader[UUID, list[Contract]] = BatchLoader(
+            contract_repo.get_active_contracts_by_rooms, default_factory=list
+        )
+        # room_id -> số hợp đồng ACTIVE/PENDING (chặn xóa phòng/tòa nhà)
+        self.open_contract_count: BatchLoader[UUID, int] = BatchLoader(
+            lambda room_ids: contract_repo.count_by_rooms(
+                room_ids, [ContractStatus.ACTIVE.value, ContractStatus.PENDING.value]
+            ),
+            default_factory=int,
+        )
+
+    def clear(self) -> None:
+        """Xóa memo của tất cả loader."""
+        for loader in vars(self).values():
+            if isinstance(loader, BatchLoader):
+                loader.clear()
+
+
+def get_loaders(db: Session) -> Loaders:
+    """Loaders của Session ``db`` (tạo lần đầu, dùng lại cho cả request)."""
+    loaders = db.info.get(_LOADERS_KEY)
+    if loaders is None:
+        loaders = db.info[_LOADERS_KEY] = Loaders(db)
+
+        def _clear(*_args) -> None:
+            loaders.clear()
+
+        event.listen(db, "after_flush", _clear)
+        event.listen(db, "after_commit", _clear)
+        event.listen(db, "after_soft_rollback", _clear)
+    return loaders
@@ -17,6 +17,7 @@ from app.models.room import Room
 from app.models.user import User
 from app.models.building import Building
 from app.core.Enum.maintenanceEnum import MaintenanceStatus, MaintenancePriority
+from app.core.pagination import SortKey, cursor_position, paginate_keyset
 
 
 class MaintenanceRepository:
@@ -124,6 +125,61 @@ class MaintenanceRepository:
         
         Trả về dict để dễ customize output cho dashboard.
         """
+        query = self._list_query(
+            search, status, priority, request_type, building_id, room_id, tenant_id
+        )
+        
+        # Order by created_at desc (mới nhất trước)
+        query = query.order_by(MaintenanceRequest.created_at.desc(), MaintenanceRequest.id.desc())
+        
+        # Pagination
+        requests = query.offset(offset).limit(limit).all()
+        
+        return [self._list_row(req, idx) for idx, req in enumerate(requests, start=offset + 1)]
+
+    def list_with_filters_keyset(
+        self,
+        search: Optional[str] = None,
+        status: Optional[str] = None,
+        priority: Optional[str] = None,
+        request_type: Optional[str] = None,
+        building_id: Optional[UUID] = None,
+        room_id: Optional[UUID] = None,
+        tenant_id: Optional[UUID] = None,
+        cursor: Optional[str] = None,
+        limit: int = 20,
+    ) -> tuple[list[dict], Optional[str]]:
+        """Lấy danh sách maintenance requests phân trang bằng cursor (created_at, id).
+        
+        Raises:
+            ValueError: Cursor không hợp lệ
+        """
+        requests, next_cursor = paginate_keyset(
+            self._list_query(
+                search, status, priority, request_type, building_id, room_id, tenant_id
+            ),
+            [
+                SortKey(MaintenanceRequest.created_at, desc=True),
+                SortKey(MaintenanceRequest.id, desc=True),
+            ],
+            sort="created_at_desc",
+            cursor=cursor,
+            limit=limit,
+        )
+        start = cursor_position(cursor) + 1
+        return [self._list_row(req, idx) for idx, req in enumerate(requests, start=start)], next_cursor
+
+    def _list_query(
+        self,
+        search: Optional[str],
+        status: Optional[str],
+        priority: Optional[str],
+        request_type: Optional[str],
+        building_id: Optional[UUID],
+        room_id: Optional[UUID],
+        tenant_id: Optional[UUID],
+    ):
+        """Query danh sách maintenance requests đã áp filters (chưa sắp xếp/phân trang)."""
         query = (
             self.db.query(MaintenanceRequest)
             .join(Room, MaintenanceRequest.room_id == Room.id)
@@ -164,27 +220,20 @@ class MaintenanceRepository:
         if tenant_id:
             query = query.filter(MaintenanceRequest.tenant_id == tenant_id)
         
-        # Order by created_at desc (mới nhất trước)
-        query = query.order_by(MaintenanceRequest.created_at.desc())
-        
-        # Pagination
-        requests = query.offset(offset).limit(limit).all()
-        
-        # Convert sang dict
-        result = []
-        for idx, req in enumerate(requests, start=offset + 1):
-            result.append({
-                "id": req.id,
-                "request_code": str(100 + idx),  # Mã tạm
-                "room_code": req.room.room_code if req.room else "N/A",
-                "tenant_name": f"{req.tenant.first_name} {req.tenant.last_name}" if req.tenant else "N/A",
-                "request_date": req.created_at,
-                "content": req.title,
-                "building_name": req.room.building.building_name if req.room and req.room.building else "N/A",
-                "status": req.status,
-            })
-        
-        return result
+        return query
+
+    @staticmethod
+    def _list_row(req: MaintenanceRequest, idx: int) -> dict:
+        return {
+            "id": req.id,
+            "request_code": str(100 + idx),  # Mã tạm
+            "room_code": req.room.room_code if req.room else "N/A",
+            "tenant_name": f"{req.tenant.first_name} {req.tenant.last_name}" if req.tenant else "N/A",
+            "request_date": req.created_at,
+            "content": req.title,
+            "building_name": req.room.building.building_name if req.room and req.room.building else "N/A",
+            "status": req.status,
+        }
 
     def count(
         self,
@@ -243,43 +292,59 @@ class MaintenanceRepository:
             tenant_id: Lọc theo tenant (cho người thuê)
             building_id: Lọc theo tòa nhà (cho admin)
         """
-        query = self.db.query(MaintenanceRequest)
+        # Một query duy nhất với COUNT(*) FILTER thay vì 5 lần COUNT
+        status = MaintenanceRequest.status
+        query = self.db.query(
+            func.count().label("total"),
+            func.count().filter(status == MaintenanceStatus.PENDING.value).label("pending"),
+            func.count().filter(status == MaintenanceStatus.IN_PROGRESS.value).label("in_progress"),
+            func.count().filter(
+                status.in_([MaintenanceStatus.COMPLETED.value, MaintenanceStatus.CANCELLED.value])
+            ).label("processed"),
+        ).select_from(MaintenanceRequest)
         
         if tenant_id:
             query = query.filter(MaintenanceRequest.tenant_id == tenant_id)
         
         if building_id:
-            query = query.join(Room).filter(Room.building_id == building_id)
+            query = query.join(Room, MaintenanceRequest.room_id == Room.id).filter(
+                Room.building_id == building_id
+            )
         
-        total = query.count()
-        pending = query.filter(MaintenanceRequest.status == MaintenanceStatus.PENDING.value).count()
-        in_progress = query.filter(MaintenanceRequest.status == MaintenanceStatus.IN_PROGRESS.value).count()
-        completed = query.filter(MaintenanceRequest.status == MaintenanceStatus.COMPLETED.value).count()
-        cancelled = query.filter(MaintenanceRequest.status == MaintenanceStatus.CANCELLED.value).count()
+        row = query.one()
         
         return {
-            "total_requests": total,
-            "pending": in_progress,  # "Đang xử lý" = IN_PROGRESS
-            "not_processed": pending,  # "Chưa xử lý" = PENDING
-            "processed": completed + cancelled,  # "Đã xử lý" = COMPLETED + CANCELLED
+            "total_requests": row.total,
+            "pending": row.in_progress,  # "Đang xử lý" = IN_PROGRESS
+            "not_processed": row.pending,  # "Chưa xử lý" = PENDING
+            "processed": row.processed,  # "Đã xử lý" = COMPLETED + CANCELLED
         }
 
-    def add_photos(self, request_id: UUID, photo_urls: list[str], uploaded_by: UUID) -> list[MaintenancePhoto]:
+    def add_photos(
+        self,
+        request_id: UUID,
+        photo_urls: list[str],
+        uploaded_by: UUID,
+        storage_keys: Optional[list[Optional[str]]] = None,
+    ) -> list[MaintenancePhoto]:
         """Thêm ảnh cho maintenance request.
         
         Args:
             request_id: request_id của maintenance request
             photo_urls: Danh sách URL ảnh
             uploaded_by: UUID của người upload
+            storage_keys: Key blob store tương ứng với từng URL (optional)
             
         Returns:
             List MaintenancePhoto instances
         """
+        keys = storage_keys or [None] * len(photo_urls)
         photos = []
-        for url in photo_urls:
+        for url, storage_key in zip(photo_urls, keys):
             photo = MaintenancePhoto(
                 request_id=request_id,
                 url=url,
+                storage_key=storage_key,
                 is_before=True,  # Ảnh khi tạo request = ảnh trước sửa
                 uploaded_by=uploaded_by,
             )
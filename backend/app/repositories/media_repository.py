@@ -0,0 +1,46 @@
+"""Media Repository - tra cứu chủ sở hữu của blob riêng tư.
+
+Blob riêng tư (tài liệu cá nhân, ảnh bảo trì) chỉ được tải khi dòng DB tham
+chiếu tới nó còn tồn tại: xóa tài liệu là thu hồi quyền truy cập.
+"""
+
+from __future__ import annotations
+
+from typing import Optional, Set
+from uuid import UUID
+
+from sqlalchemy import select, union
+from sqlalchemy.orm import Session
+
+from app.models.maintenance_photo import MaintenancePhoto
+from app.models.maintenance_request import MaintenanceRequest
+from app.models.user_document import UserDocument
+
+
+class MediaRepository:
+    """Repository tra cứu quyền truy cập blob.
+
+    Args:
+        db: SQLAlchemy Session.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_private_owner_ids(self, storage_key: str) -> Optional[Set[UUID]]:
+        """Người dùng sở hữu blob riêng tư.
+
+        Chủ của tài liệu cá nhân là ``user_documents.user_id``; chủ của ảnh bảo
+        trì là người thuê gửi yêu cầu.
+
+        Returns:
+            Tập user id, None nếu không có tài liệu/ảnh bảo trì nào dùng key này.
+        """
+        stmt = union(
+            select(UserDocument.user_id.label("owner_id")).where(UserDocument.storage_key == storage_key),
+            select(MaintenanceRequest.tenant_id.label("owner_id"))
+            .join(MaintenancePhoto, MaintenancePhoto.request_id == MaintenanceRequest.request_id)
+            .where(MaintenancePhoto.storage_key == storage_key),
+        )
+        owner_ids = set(self.db.execute(stmt).scalars().all())
+        return owner_ids or None
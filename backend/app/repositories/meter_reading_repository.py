@@ -0,0 +1,252 @@
+"""Meter Reading Repository - kiểm tra và lưu chỉ số điện nhập từ file.
+
+Cả lô chỉ số được kiểm tra bằng **một** query: các cột của file được truyền
+dưới dạng mảng (``unnest``), join với phòng/hợp đồng và lịch sử hóa đơn; mỗi
+điều kiện lỗi là một cột boolean tính cho toàn bộ lô - không có query theo
+từng dòng.
+"""
+
+from __future__ import annotations
+
+from datetime import date
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import (
+    Float, Integer, String, and_, bindparam, case, column, exists, func,
+    literal, select, update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+from sqlalchemy.orm import Session
+
+from app.core.Enum.contractEnum import ContractStatus
+from app.core.Enum.meterReadingEnum import MeterReadingStatus
+from app.models.contract import Contract
+from app.models.invoice import Invoice
+from app.models.meter_reading import MeterReading
+from app.models.room import Room
+from app.repositories.invoice_repository import month_range
+
+
+class MeterReadingRepository:
+    """Repository cho bảng meter_readings.
+
+    Args:
+        db: SQLAlchemy Session.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def validate_batch(
+        self,
+        billing_month: date,
+        building_id: Optional[UUID],
+        columns: dict[str, list],
+        outlier_factor: float,
+        history_months: int,
+    ) -> list:
+        """Đối chiếu cả lô chỉ số với DB trong một query.
+
+        Args:
+            billing_month: Tháng tính tiền.
+            building_id: Tòa nhà của file (bắt buộc nếu dòng chỉ có số phòng).
+            columns: Các cột cùng độ dài ``row_no``, ``room_number``,
+                ``contract_number``, ``new_index``, ``old_index``.
+            outlier_factor: Cảnh báo nếu tiêu thụ > factor x trung bình.
+            history_months: Số hóa đơn gần nhất dùng tính trung bình.
+
+        Returns:
+            List Row theo ``row_no`` với phòng/hợp đồng đã tra, chỉ số cũ hiệu
+            lực, tiêu thụ trung bình và các cờ lỗi:
+            ``room_missing``, ``wrong_building``, ``no_contract``, ``duplicate``,
+            ``invoiced``, ``decreasing``, ``outlier``.
+        """
+        month_start, month_end = month_range(billing_month)
+
+        rows = func.unnest(
+            literal(columns["row_no"], ARRAY(Integer)),
+            literal(columns["room_number"], ARRAY(String)),
+            literal(columns["contract_number"], ARRAY(String)),
+            literal(columns["new_index"], ARRAY(Float)),
+            literal(columns["old_index"], ARRAY(Float)),
+        ).table_valued(
+            column("row_no", Integer),
+            column("room_number", String),
+            column("contract_number", String),
+            column("new_index", Float),
+            column("old_index", Float),
+        ).render_derived(name="input_rows")
+
+        # Phòng theo mã hợp đồng (mọi trạng thái) hoặc theo số phòng trong tòa nhà
+        by_contract = select(Contract.room_id).where(
+            Contract.contract_number == rows.c.contract_number
+        ).scalar_subquery()
+        by_number = select(Room.id).where(
+            Room.room_number == rows.c.room_number,
+            Room.building_id == building_id,
+        ).scalar_subquery()
+        resolved = (
+            select(
+                rows.c.row_no,
+                rows.c.new_index,
+                rows.c.old_index,
+                func.coalesce(by_contract, by_number).label("room_id"),
+            )
+            .cte("resolved")
+        )
+
+        # Hợp đồng ACTIVE đại diện của phòng (cũ nhất) - hóa đơn mang tiền điện của phòng
+        primary = (
+            select(Contract.id, Contract.contract_number, Contract.initial_electricity_index)
+            .where(Contract.room_id == resolved.c.room_id, Contract.status == ContractStatus.ACTIVE.value)
+            .order_by(Contract.created_at)
+            .limit(1)
+            .lateral("primary_contract")
+        )
+
+        # Lịch sử chỉ số điện của phòng trước tháng này (mới nhất trước)
+        history = (
+            select(
+                Contract.room_id,
+                Invoice.electricity_old_index,
+                Invoice.electricity_new_index,
+                func.row_number().over(
+                    partition_by=Contract.room_id,
+                    order_by=(Invoice.billing_month.desc(), Invoice.created_at.desc()),
+                ).label("rn"),
+            )
+            .join(Contract, Invoice.contract_id == Contract.id)
+            .where(
+                Contract.room_id.in_(select(resolved.c.room_id)),
+                Invoice.billing_month < month_start,
+                Invoice.electricity_new_index.isnot(None),
+            )
+            .subquery("history")
+        )
+        stats = (
+            select(
+                history.c.room_id,
+                func.max(case((history.c.rn == 1, history.c.electricity_new_index))).label("previous_index"),
+                func.avg(history.c.electricity_new_index - history.c.electricity_old_index).label("average_usage"),
+            )
+            .where(history.c.rn <= history_months)
+            .group_by(history.c.room_id)
+            .subquery("stats")
+        )
+
+        old_index = func.coalesce(
+            resolved.c.old_index, stats.c.previous_index, primary.c.initial_electricity_index
+        )
+        usage = resolved.c.new_index - old_index
+        wrong_building = (
+            func.coalesce(Room.building_id != building_id, False) if building_id else literal(False)
+        )
+        invoiced = exists().where(
+            Invoice.contract_id == primary.c.id,
+            Invoice.billing_month >= month_start,
+            Invoice.billing_month < month_end,
+        )
+
+        stmt = (
+            select(
+                resolved.c.row_no,
+                resolved.c.room_id,
+                Room.room_number,
+                primary.c.id.label("contract_id"),
+                primary.c.contract_number,
+                resolved.c.new_index,
+                old_index.label("old_index"),
+                usage.label("usage"),
+                stats.c.average_usage,
+                resolved.c.room_id.is_(None).label("room_missing"),
+                wrong_building.label("wrong_building"),
+                and_(resolved.c.room_id.isnot(None), primary.c.id.is_(None)).label("no_contract"),
+                and_(
+                    resolved.c.room_id.isnot(None),
+                    func.count().over(partition_by=resolved.c.room_id) > 1,
+                ).label("duplicate"),
+                invoiced.label("invoiced"),
+                func.coalesce(usage < 0, False).label("decreasing"),
+                func.coalesce(
+                    and_(stats.c.average_usage > 0, usage > stats.c.average_usage * outlier_factor),
+                    False,
+                ).label("outlier"),
+            )
+            .select_from(resolved)
+            .outerjoin(Room, Room.id == resolved.c.room_id)
+            .outerjoin(primary, literal(True))
+            .outerjoin(stats, stats.c.room_id == resolved.c.room_id)
+            .order_by(resolved.c.row_no)
+        )
+        return self.db.execute(stmt).all()
+
+    def stage(self, readings: list[dict]) -> set[UUID]:
+        """Lưu chỉ số (UPSERT theo phòng + tháng), chưa commit.
+
+        Chỉ số đã APPLIED (đã lập hóa đơn) không bị ghi đè.
+
+        Args:
+            readings: List dict giá trị cột của MeterReading.
+
+        Returns:
+            Tập room_id đã được lưu.
+        """
+        if not readings:
+            return set()
+        stmt = insert(MeterReading)
+        stmt = stmt.on_conflict_do_update(
+            constraint="uq_meter_readings_room_month",
+            set_={
+                "batch_id": stmt.excluded.batch_id,
+                "row_number": stmt.excluded.row_number,
+                "contract_id": stmt.excluded.contract_id,
+                "reading_date": stmt.excluded.reading_date,
+                "electricity_old_index": stmt.excluded.electricity_old_index,
+                "electricity_new_index": stmt.excluded.electricity_new_index,
+                "average_usage": stmt.excluded.average_usage,
+                "warning": stmt.excluded.warning,
+                "created_by": stmt.excluded.created_by,
+                "updated_at": func.now(),
+            },
+            where=MeterReading.status == MeterReadingStatus.STAGED.value,
+        ).returning(MeterReading.room_id)
+        return set(self.db.scalars(stmt, readings).all())
+
+    def get_staged(self, billing_month: date, building_id: Optional[UUID] = None) -> list[MeterReading]:
+        """Các chỉ số đang chờ lập hóa đơn của tháng (lọc theo tòa nhà nếu có)."""
+        query = self.db.query(MeterReading).filter(
+            MeterReading.billing_month == billing_month.replace(day=1),
+            MeterReading.status == MeterReadingStatus.STAGED.value,
+        )
+        if building_id:
+            query = query.join(Room, Room.id == MeterReading.room_id).filter(Room.building_id == building_id)
+        return query.all()
+
+    def mark_applied(self, billing_month: date, invoice_ids: dict[UUID, UUID]) -> None:
+        """Chuyển chỉ số đã dùng sang APPLIED kèm hóa đơn (executemany, chưa commit).
+
+        Args:
+            billing_month: Tháng tính tiền.
+            invoice_ids: room_id -> id hóa đơn đã lập từ chỉ số của phòng.
+        """
+        if not invoice_ids:
+            return
+        table = MeterReading.__table__
+        stmt = (
+            update(table)
+            .where(
+                table.c.room_id == bindparam("b_room_id"),
+                table.c.billing_month == billing_month.replace(day=1),
+                table.c.status == MeterReadingStatus.STAGED.value,
+            )
+            .values(
+                status=MeterReadingStatus.APPLIED.value,
+                invoice_id=bindparam("b_invoice_id"),
+                updated_at=func.now(),
+            )
+        )
+        self.db.execute(
+            stmt,
+            [{"b_room_id": room_id, "b_invoice_id": invoice_id} for room_id, invoice_id in invoice_ids.items()],
+        )
@@ -0,0 +1,68 @@
+"""Notification Counter Repository - data access layer cho bảng notification_counters.
+
+Bình thường bộ đếm được cộng trừ theo chênh lệch bởi listener
+``app.infrastructure.db.notification_counter_events``. ``refresh`` tính lại toàn
+bộ từ bảng notifications bằng một câu ``INSERT ... SELECT ... ON CONFLICT DO UPDATE``
+dùng ``COUNT(*) FILTER (WHERE ...)``.
+"""
+
+from __future__ import annotations
+
+from sqlalchemy import func, not_, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.models.notification import Notification
+from app.models.notification_counter import NotificationCounter
+
+
+class NotificationCounterRepository:
+    """Repository cho bảng notification_counters.
+
+    Args:
+        db: SQLAlchemy Session.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def refresh(self) -> None:
+        """Tính lại (UPSERT) bộ đếm cho mọi người dùng từ bảng notifications.
+
+        Người dùng không còn thông báo nào được đưa về 0.
+        Không commit - chạy trong transaction của caller.
+        """
+        aggregate = (
+            select(
+                Notification.user_id,
+                func.count().label("total_count"),
+                func.count().filter(not_(Notification.is_read)).label("unread_count"),
+            )
+            .where(Notification.user_id.isnot(None))
+            .group_by(Notification.user_id)
+        )
+        stmt = insert(NotificationCounter).from_select(
+            ["user_id", "total_count", "unread_count"], aggregate
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[NotificationCounter.user_id],
+            set_={
+                "total_count": stmt.excluded.total_count,
+                "unread_count": stmt.excluded.unread_count,
+                "updated_at": func.now(),
+            },
+        )
+        self.db.execute(stmt)
+
+        has_notifications = (
+            select(Notification.id)
+            .where(Notification.user_id == NotificationCounter.user_id)
+            .exists()
+        )
+        self.db.execute(
+            update(NotificationCounter)
+            .where(~has_notifications)
+            .where((NotificationCounter.total_count != 0) | (NotificationCounter.unread_count != 0))
+            .values(total_count=0, unread_count=0, updated_at=func.now())
+            .execution_options(synchronize_session=False)
+        )
@@ -1,6 +1,6 @@
 """Payment Repository - Database operations for payments."""
 
-from typing import Optional, List
+from typing import Optional, List, Tuple
 from uuid import UUID
 from datetime import datetime
 from sqlalchemy.orm import Session
@@ -36,11 +36,17 @@ class PaymentRepository:
         """Lấy payments theo method."""
         return self.db.query(Payment).filter(Payment.method == method).all()
     
-    def get_by_banking_transaction_id(self, transaction_id: str) -> Optional[Payment]:
-        """Lấy payment theo banking transaction ID (để check duplicate)."""
-        return self.db.query(Payment).filter(
+    def get_by_banking_transaction_id(self, transaction_id: str, for_update: bool = False) -> Optional[Payment]:
+        """Lấy payment theo banking transaction ID (để check duplicate).
+
+        ``for_update=True`` khóa dòng payment đến hết transaction.
+        """
+        query = self.db.query(Payment).filter(
             Payment.banking_transaction_id == transaction_id
-        ).first()
+        )
+        if for_update:
+            query = query.with_for_update()
+        return query.first()
     
     def get_pending_payments(self, invoice_id: Optional[UUID] = None) -> List[Payment]:
         """Lấy các payment đang pending."""
@@ -49,6 +55,26 @@ class PaymentRepository:
             query = query.filter(Payment.invoice_id == invoice_id)
         return query.all()
     
+    def get_pending_banking(self, created_before: datetime) -> List[Tuple[UUID, str, datetime]]:
+        """Các payment BANKING đang chờ tạo trước ``created_before`` (một query, cũ nhất trước).
+
+        Returns:
+            List (id, banking_transaction_id, created_at).
+        """
+        return self.db.query(Payment.id, Payment.banking_transaction_id, Payment.created_at).filter(
+            Payment.status == Payment.PaymentStatus.PENDING,
+            Payment.method == Payment.PaymentMethod.BANKING,
+            Payment.created_at <= created_before,
+            Payment.banking_transaction_id.isnot(None),
+        ).order_by(Payment.created_at).all()
+
+    def lock_pending_by_ids(self, ids: List[UUID]) -> List[Payment]:
+        """Khóa (``FOR UPDATE``) các payment trong ``ids`` còn đang chờ, theo thứ tự id."""
+        return self.db.query(Payment).filter(
+            Payment.id.in_(ids),
+            Payment.status == Payment.PaymentStatus.PENDING,
+        ).order_by(Payment.id).with_for_update().all()
+
     def get_completed_payments(self, invoice_id: Optional[UUID] = None) -> List[Payment]:
         """Lấy các payment đã completed."""
         query = self.db.query(Payment).filter(Payment.status == "completed")
@@ -0,0 +1,64 @@
+"""Payment Webhook Repository - hộp thư webhook PayOS.
+
+Ghi nhận webhook là **một** câu ``INSERT ... ON CONFLICT DO NOTHING``: PayOS gửi
+lại cùng sự kiện (cùng ``order_code`` + ``reference``) không tạo dòng mới và
+không chạm tới payments/invoices.
+"""
+
+from __future__ import annotations
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.core.Enum.webhookEnum import WebhookEventStatus
+from app.models.payment_webhook_event import PaymentWebhookEvent
+
+
+class PaymentWebhookRepository:
+    """Repository cho bảng payment_webhook_events.
+
+    Args:
+        db: SQLAlchemy Session.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def insert_event(self, order_code: int, reference: str, code: str, payload: dict) -> bool:
+        """Lưu webhook vào hộp thư và commit.
+
+        Returns:
+            True nếu là sự kiện mới, False nếu đã nhận trước đó.
+        """
+        stmt = (
+            insert(PaymentWebhookEvent)
+            .values(order_code=order_code, reference=reference, code=code, payload=payload)
+            .on_conflict_do_nothing(constraint="uq_payment_webhook_events_order_reference")
+            .returning(PaymentWebhookEvent.id)
+        )
+        inserted = self.db.execute(stmt).scalar_one_or_none()
+        self.db.commit()
+        return inserted is not None
+
+    def claim_pending(self, limit: int) -> list[PaymentWebhookEvent]:
+        """Khóa một batch sự kiện đang chờ (``FOR UPDATE SKIP LOCKED``).
+
+        Mỗi đơn chỉ lấy sự kiện cũ nhất còn PENDING: sự kiện sau của cùng đơn
+        chỉ được lấy khi sự kiện trước đã xử lý xong, kể cả khi nhiều worker
+        chạy song song (sự kiện trước đang bị khóa thì đơn đó bị bỏ qua).
+        """
+        pending = PaymentWebhookEvent.status == WebhookEventStatus.PENDING.value
+        oldest_per_order = (
+            select(PaymentWebhookEvent.id)
+            .where(pending)
+            .distinct(PaymentWebhookEvent.order_code)
+            .order_by(PaymentWebhookEvent.order_code, PaymentWebhookEvent.id)
+        )
+        return list(self.db.scalars(
+            select(PaymentWebhookEvent)
+            .where(PaymentWebhookEvent.id.in_(oldest_per_order), pending)
+            .order_by(PaymentWebhookEvent.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        ).all())
@@ -7,6 +7,7 @@ from __future__ import annotations
 
 from typing import Optional
 from uuid import UUID
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.models.role import Role
@@ -43,6 +44,18 @@ class RoleRepository:
             Role instance hoặc None nếu không tìm thấy.
         """
         return self.db.query(Role).filter(Role.role_code == role_code).first()
+
+    async def get_by_code_async(self, role_code: str) -> Optional[Role]:
+        """Lấy Role theo role_code (repository khởi tạo với AsyncSession).
+
+        Args:
+            role_code: Mã role (ADMIN, TENANT, CUSTOMER, etc.).
+
+        Returns:
+            Role instance hoặc None nếu không tìm thấy.
+        """
+        result = await self.db.execute(select(Role).where(Role.role_code == role_code).limit(1))
+        return result.scalar_one_or_none()
     
     def get_by_name(self, role_name: str) -> Optional[Role]:
         """Lấy Role theo role_name.
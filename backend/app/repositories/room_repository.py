@@ -5,10 +5,11 @@ Chỉ xử lý truy vấn database, không chứa business logic.
 
 from __future__ import annotations
 
+from decimal import Decimal
 from typing import Optional
 from uuid import UUID
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import select, func, case
+from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy import String, any_, cast, select, func, case, literal, literal_column, union, union_all, update
 
 from app.models.room import Room
 from app.models.building import Building
@@ -16,7 +17,24 @@ from app.models.contract import Contract
 from app.models.user import User
 from app.models.address import Address
 from app.models.room_type import RoomType
+from app.models.room_photo import RoomPhoto
+from app.models.utility import Utility
 from app.core.Enum.contractEnum import ContractStatus
+from app.core.pagination import SortKey, paginate_keyset
+from app.core.search import contains, rank
+
+# Văn bản tìm kiếm của phòng - phải trùng biểu thức của index ix_rooms_search_trgm
+# (migration f1a7c3e92b54), nếu không planner sẽ không dùng index
+ROOM_SEARCH_TEXT = (
+    Room.room_number.op("||")(literal_column("' '"))
+    .op("||")(func.coalesce(Room.room_name, literal_column("''")))
+)
+
+# Mốc giá (VND) của facet khoảng giá: bucket i = [bound[i-1], bound[i]), bucket cuối không giới hạn trên
+PRICE_FACET_BOUNDS = [2_000_000, 3_000_000, 5_000_000, 7_000_000, 10_000_000]
+
+# Các facet tính bằng GROUPING SETS (mỗi phòng thuộc đúng một giá trị của mỗi facet)
+GROUPED_FACETS = ["city", "ward", "room_type", "price_bucket", "capacity", "availability"]
 
 
 class RoomRepository:
@@ -40,6 +58,27 @@ class RoomRepository:
         """
         return self.db.query(Room).filter(Room.id == room_id).first()
 
+    def get_for_update(self, room_id: UUID) -> Optional[Room]:
+        """Lấy Room theo ID và khóa dòng (``SELECT ... FOR UPDATE``) đến hết transaction.
+
+        Dùng để tuần tự hóa việc giữ chỗ trong phòng: transaction khác muốn khóa
+        cùng phòng phải chờ commit/rollback. ``populate_existing`` ghi đè Room
+        đã có trong session bằng giá trị vừa đọc (sau khi có khóa).
+
+        Args:
+            room_id: UUID của phòng.
+
+        Returns:
+            Room instance hoặc None nếu không tìm thấy.
+        """
+        return (
+            self.db.query(Room)
+            .filter(Room.id == room_id)
+            .populate_existing()
+            .with_for_update(of=Room)
+            .first()
+        )
+
     def get_by_id_with_relations(self, room_id: UUID) -> Optional[Room]:
         """Lấy Room theo ID với eager loading utilities, photos và room_type.
 
@@ -53,7 +92,7 @@ class RoomRepository:
             self.db.query(Room)
             .options(
                 joinedload(Room.utilities),
-                joinedload(Room.room_photos),
+                joinedload(Room.room_photos).selectinload(RoomPhoto.variants),
                 joinedload(Room.room_type),
             )
             .filter(Room.id == room_id)
@@ -133,41 +172,15 @@ class RoomRepository:
         """
         query = self.db.query(Room)
 
-        # Join với Building nếu cần search theo building_name hoặc filter city/ward
-        if search or city or ward:
-            query = query.join(Building, Room.building_id == Building.id)
-            if city or ward:
-                query = query.join(Address, Building.address_id == Address.id)
-
-        if building_id:
-            query = query.filter(Room.building_id == building_id)
-        if status:
-            query = query.filter(Room.status == status)
-
-        # Apply city and ward filters
-        if city:
-            query = query.filter(Address.city.ilike(f"%{city}%"))
-        if ward:
-            query = query.filter(Address.ward.ilike(f"%{ward}%"))
-
-        # Apply search filter - tìm kiếm theo tên phòng, số phòng hoặc tên tòa nhà
-        if search:
-            search_pattern = f"%{search}%"
-            query = query.filter(
-                (Room.room_number.ilike(search_pattern))
-                | (Room.room_name.ilike(search_pattern))
-                | (Building.building_name.ilike(search_pattern))
+        # Search không cần join (lọc bằng subquery); city/ward cần Building + Address
+        if city or ward:
+            query = query.join(Building, Room.building_id == Building.id).join(
+                Address, Building.address_id == Address.id
             )
 
-        # Apply price filters
-        if min_price is not None:
-            query = query.filter(Room.base_price >= min_price)
-        if max_price is not None:
-            query = query.filter(Room.base_price <= max_price)
-
-        # Apply capacity filter
-        if max_capacity is not None:
-            query = query.filter(Room.capacity <= max_capacity)
+        query = self._apply_filters(
+            query, building_id, status, search, city, ward, min_price, max_price, max_capacity
+        )
 
         return query.count()
 
@@ -231,6 +244,261 @@ class RoomRepository:
         self.db.delete(room)
         self.db.commit()
 
+    def list_by_building_for_delete(self, building_id: UUID) -> list[Room]:
+        """Lấy tất cả phòng của tòa nhà kèm các quan hệ bị ảnh hưởng khi xóa.
+
+        Các collection cascade (utilities, ảnh, sự cố, review, lịch hẹn) và
+        hợp đồng được load bằng selectinload - mỗi quan hệ một query cho cả
+        tòa nhà thay vì một query cho mỗi phòng lúc ``session.delete``.
+
+        Args:
+            building_id: UUID của tòa nhà.
+
+        Returns:
+            Danh sách Room instances.
+        """
+        return (
+            self.db.query(Room)
+            .options(
+                selectinload(Room.utilities),
+                selectinload(Room.room_photos),
+                selectinload(Room.maintenance_requests),
+                selectinload(Room.reviews),
+                selectinload(Room.appointments),
+                selectinload(Room.contracts),
+            )
+            .filter(Room.building_id == building_id)
+            .all()
+        )
+
+    def delete_many(self, rooms: list[Room]) -> None:
+        """Đánh dấu xóa nhiều phòng (flush, chưa commit - commit cùng thao tác gọi).
+
+        Args:
+            rooms: Danh sách Room instances cần xóa.
+        """
+        for room in rooms:
+            self.db.delete(room)
+        self.db.flush()
+
+    def find_occupancy_drift(self, lock: bool = False) -> list:
+        """Tìm các phòng có bộ đếm current_occupants/active_contract_count lệch với hợp đồng.
+
+        Giá trị đúng được tính lại set-based trong một query (GROUP BY room_id
+        trên contracts, LEFT JOIN vào rooms).
+
+        Args:
+            lock: Khóa (FOR UPDATE) các phòng bị lệch đến hết transaction, để
+                hợp đồng ghi đồng thời chờ cho tới khi sửa xong. Giá trị đúng
+                được tính lại bằng câu lệnh mới *sau* khi đã có khóa: hợp đồng
+                commit trong lúc chờ khóa được tính vào, không ghi đè bộ đếm
+                bằng số liệu cũ.
+
+        Returns:
+            List row (id, room_number, stored_occupants, actual_occupants,
+            stored_active, actual_active).
+        """
+        drift = self.db.execute(self._occupancy_drift_query()).all()
+        if not lock or not drift:
+            return drift
+
+        room_ids = [row.id for row in drift]
+        self.db.execute(
+            select(Room.id).where(Room.id.in_(room_ids)).order_by(Room.id).with_for_update()
+        ).all()
+        # Snapshot mới (READ COMMITTED): thấy mọi hợp đồng đã commit trước khi có khóa
+        return self.db.execute(self._occupancy_drift_query(room_ids)).all()
+
+    @staticmethod
+    def _occupancy_drift_query(room_ids: Optional[list[UUID]] = None):
+        """SELECT các phòng lệch bộ đếm (giới hạn trong ``room_ids`` nếu có)."""
+        occupying = [
+            ContractStatus.ACTIVE.value,
+            ContractStatus.PENDING.value,
+            ContractStatus.PENDING_UPDATE.value,
+        ]
+        actual = (
+            select(
+                Contract.room_id,
+                func.coalesce(
+                    func.sum(Contract.number_of_tenants).filter(Contract.status.in_(occupying)), 0
+                ).label("occupants"),
+                func.count().filter(Contract.status == ContractStatus.ACTIVE.value).label("active"),
+            )
+            .group_by(Contract.room_id)
+        )
+        if room_ids is not None:
+            actual = actual.where(Contract.room_id.in_(room_ids))
+        actual = actual.subquery()
+        actual_occupants = func.coalesce(actual.c.occupants, 0)
+        actual_active = func.coalesce(actual.c.active, 0)
+
+        query = (
+            select(
+                Room.id,
+                Room.room_number,
+                Room.current_occupants.label("stored_occupants"),
+                actual_occupants.label("actual_occupants"),
+                Room.active_contract_count.label("stored_active"),
+                actual_active.label("actual_active"),
+            )
+            .outerjoin(actual, actual.c.room_id == Room.id)
+            .where(
+                (Room.current_occupants != actual_occupants)
+                | (Room.active_contract_count != actual_active)
+            )
+            .order_by(Room.id)
+        )
+        if room_ids is not None:
+            query = query.where(Room.id.in_(room_ids))
+        return query
+
+    def fix_occupancy(self, drift: list) -> int:
+        """Ghi giá trị đúng cho các phòng lệch (executemany theo khóa chính, chưa commit).
+
+        Args:
+            drift: Kết quả của find_occupancy_drift.
+
+        Returns:
+            Số phòng đã sửa.
+        """
+        if not drift:
+            return 0
+        self.db.execute(
+            update(Room),
+            [
+                {
+                    "id": row.id,
+                    "current_occupants": row.actual_occupants,
+                    "active_contract_count": row.actual_active,
+                }
+                for row in drift
+            ],
+        )
+        return len(drift)
+
+    @staticmethod
+    def _search_filter(search: str):
+        """Phòng khớp ``search`` theo số/tên phòng hoặc tên tòa nhà (không dấu).
+
+        Tách thành UNION hai nhánh để mỗi nhánh dùng trigram index riêng của
+        rooms/buildings - OR trực tiếp qua hai bảng sẽ buộc seq scan.
+        """
+        matched = union(
+            select(Room.id).where(contains(ROOM_SEARCH_TEXT, search)),
+            select(Room.id)
+            .join(Building, Room.building_id == Building.id)
+            .where(contains(Building.building_name, search)),
+        ).subquery()
+        return Room.id.in_(select(matched.c.id))
+
+    @staticmethod
+    def _search_rank(search: str):
+        """Điểm liên quan của phòng với ``search`` (query phải join Building)."""
+        return func.greatest(rank(ROOM_SEARCH_TEXT, search), rank(Building.building_name, search))
+
+    def _apply_filters(
+        self,
+        query,
+        building_id: Optional[UUID],
+        status: Optional[str],
+        search: Optional[str],
+        city: Optional[str],
+        ward: Optional[str],
+        min_price: Optional[int],
+        max_price: Optional[int],
+        max_capacity: Optional[int],
+    ):
+        """Áp các filter chung của danh sách phòng (city/ward cần join Address)."""
+        if building_id:
+            query = query.filter(Room.building_id == building_id)
+        if status:
+            query = query.filter(Room.status == status)
+
+        # City/ward: không phân biệt dấu ("da nang" khớp "Đà Nẵng")
+        if city:
+            query = query.filter(contains(Address.city, city))
+        if ward:
+            query = query.filter(contains(Address.ward, ward))
+
+        # Search theo tên phòng, số phòng hoặc tên tòa nhà
+        if search:
+            query = query.filter(self._search_filter(search))
+
+        # Apply price filters
+        if min_price is not None:
+            query = query.filter(Room.base_price >= min_price)
+        if max_price is not None:
+            query = query.filter(Room.base_price <= max_price)
+
+        # Apply capacity filter
+        if max_capacity is not None:
+            query = query.filter(Room.capacity <= max_capacity)
+
+        return query
+
+    def search(
+        self,
+        building_id: Optional[UUID] = None,
+        min_price: Optional[Decimal] = None,
+        max_price: Optional[Decimal] = None,
+        min_area: Optional[float] = None,
+        max_area: Optional[float] = None,
+        capacity: Optional[int] = None,
+        status: Optional[str] = None,
+        utility_ids: Optional[list[int]] = None,
+        offset: int = 0,
+        limit: int = 20,
+    ) -> tuple[list[Room], int]:
+        """Tìm kiếm phòng nâng cao (trang hiện tại + tổng số).
+
+        Điều kiện "có đủ các tiện ích" là một phép chứa mảng
+        ``utility_ids @> ARRAY[...]`` dùng GIN index ix_rooms_utility_ids,
+        thay vì một lần join room_utilities cho mỗi tiện ích.
+
+        Args:
+            building_id: Lọc theo tòa nhà.
+            min_price: Giá tối thiểu.
+            max_price: Giá tối đa.
+            min_area: Diện tích tối thiểu.
+            max_area: Diện tích tối đa.
+            capacity: Sức chứa tối thiểu.
+            status: Trạng thái phòng.
+            utility_ids: Id tiện ích (bảng utilities) phòng phải có đủ.
+            offset: Vị trí bắt đầu.
+            limit: Số phòng mỗi trang.
+
+        Returns:
+            Tuple (list Room của trang, tổng số phòng thỏa điều kiện).
+        """
+        query = self.db.query(Room)
+
+        if building_id:
+            query = query.filter(Room.building_id == building_id)
+        if min_price:
+            query = query.filter(Room.base_price >= min_price)
+        if max_price:
+            query = query.filter(Room.base_price <= max_price)
+        if min_area:
+            query = query.filter(Room.area >= min_area)
+        if max_area:
+            query = query.filter(Room.area <= max_area)
+        if capacity:
+            query = query.filter(Room.capacity >= capacity)
+        if status:
+            query = query.filter(Room.status == status)
+        if utility_ids:
+            query = query.filter(Room.utility_ids.contains(utility_ids))
+
+        total = query.count()
+        rooms = (
+            query.order_by(Room.created_at.desc(), Room.id.desc())
+            .offset(offset)
+            .limit(limit)
+            .all()
+        )
+        return rooms, total
+
     def list_with_details(
         self,
         building_id: Optional[UUID] = None,
@@ -263,17 +531,81 @@ class RoomRepository:
         Returns:
             List of dict chứa thông tin room với building name và tenant info.
         """
-        # Subquery để lấy contract ACTIVE mới nhất của mỗi room
-        active_contract_count_subq = (
-            self.db.query(
-                Contract.room_id,
-                func.sum(Contract.number_of_tenants).label("current_occupants"),
-            )
-            .filter(Contract.status == ContractStatus.ACTIVE.value)
-            .group_by(Contract.room_id)
-            .subquery()
+        query = self._details_query(
+            building_id, status, search, city, ward, min_price, max_price, max_capacity
+        )
+        order = [
+            k.column.desc() if k.desc else k.column.asc()
+            for k in self._details_sort_keys(sort_by, search)
+        ]
+        results = query.order_by(*order).offset(offset).limit(limit).all()
+        return [self._details_row(row) for row in results]
+
+    def list_with_details_keyset(
+        self,
+        building_id: Optional[UUID] = None,
+        status: Optional[str] = None,
+        search: Optional[str] = None,
+        city: Optional[str] = None,
+        ward: Optional[str] = None,
+        min_price: Optional[int] = None,
+        max_price: Optional[int] = None,
+        max_capacity: Optional[int] = None,
+        sort_by: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+    ) -> tuple[list[dict], Optional[str]]:
+        """Giống list_with_details nhưng phân trang bằng cursor (keyset).
+
+        Returns:
+            Tuple (list dict của trang, next_cursor hoặc None nếu hết dữ liệu).
+
+        Raises:
+            ValueError: Cursor không hợp lệ.
+        """
+        query = self._details_query(
+            building_id, status, search, city, ward, min_price, max_price, max_capacity
         )
+        rows, next_cursor = paginate_keyset(
+            query,
+            self._details_sort_keys(sort_by, search),
+            sort=sort_by or ("relevance" if search else "created_at_desc"),
+            cursor=cursor,
+            limit=limit,
+        )
+        return [self._details_row(row) for row in rows], next_cursor
+
+    @classmethod
+    def _details_sort_keys(cls, sort_by: Optional[str], search: Optional[str] = None) -> list[SortKey]:
+        """Khóa sắp xếp của danh sách phòng, luôn kết thúc bằng id để ổn định.
 
+        Khi có ``search`` và không chọn sort, kết quả liên quan nhất lên trước.
+        """
+        if sort_by == "price_asc":
+            return [SortKey(Room.base_price), SortKey(Room.id)]
+        if sort_by == "price_desc":
+            return [SortKey(Room.base_price, desc=True), SortKey(Room.id, desc=True)]
+        if search:
+            return [
+                SortKey(cls._search_rank(search), desc=True, attr="search_rank"),
+                SortKey(Room.created_at, desc=True),
+                SortKey(Room.id, desc=True),
+            ]
+        # Mặc định theo created_at DESC (mới nhất trước)
+        return [SortKey(Room.created_at, desc=True), SortKey(Room.id, desc=True)]
+
+    def _details_query(
+        self,
+        building_id: Optional[UUID],
+        status: Optional[str],
+        search: Optional[str],
+        city: Optional[str],
+        ward: Optional[str],
+        min_price: Optional[int],
+        max_price: Optional[int],
+        max_capacity: Optional[int],
+    ):
+        """Query danh sách phòng đã áp filters (chưa sắp xếp/phân trang)."""
         representative_subq = (
             self.db.query(
                 Contract.room_id,
@@ -300,22 +632,16 @@ class RoomRepository:
                 Room.capacity,
                 Room.status,
                 Room.base_price,
+                Room.created_at,
                 Building.building_name,
                 RoomType.name.label("room_type_name"),
-                func.coalesce(active_contract_count_subq.c.current_occupants, 0).label(
-                    "current_occupants"
-                ),
+                Room.current_occupants,
                 func.concat(User.last_name, " ", User.first_name).label(
                     "representative"
                 ),
             )
             .join(Building, Room.building_id == Building.id)
             .outerjoin(RoomType, Room.room_type_id == RoomType.id)
-            # JOIN count occupants
-            .outerjoin(
-                active_contract_count_subq,
-                Room.id == active_contract_count_subq.c.room_id,
-            )
             # JOIN representative (chỉ rn = 1)
             .outerjoin(
                 representative_subq,
@@ -329,66 +655,260 @@ class RoomRepository:
         if city or ward:
             query = query.join(Address, Building.address_id == Address.id)
 
-        # Apply filters
-        if building_id:
-            query = query.filter(Room.building_id == building_id)
-        if status:
-            query = query.filter(Room.status == status)
+        # Điểm liên quan (dùng để sắp xếp/keyset khi có search)
+        if search:
+            query = query.add_columns(self._search_rank(search).label("search_rank"))
 
-        # Apply city and ward filters
-        if city:
-            query = query.filter(Address.city.ilike(f"%{city}%"))
-        if ward:
-            query = query.filter(Address.ward.ilike(f"%{ward}%"))
+        query = self._apply_filters(
+            query, building_id, status, search, city, ward, min_price, max_price, max_capacity
+        )
 
-        # Apply search filter - tìm kiếm theo tên phòng, số phòng hoặc tên tòa nhà
-        if search:
-            search_pattern = f"%{search}%"
-            query = query.filter(
-                (Room.room_number.ilike(search_pattern))
-                | (Room.room_name.ilike(search_pattern))
-                | (Building.building_name.ilike(search_pattern))
+        return query
+
+    @staticmethod
+    def _details_row(row) -> dict:
+        return {
+            "id": row.id,
+            "room_number": row.room_number,
+            "room_name": row.room_name,
+            "description": row.description,
+            "building_name": row.building_name,
+            "room_type": row.room_type_name,
+            "area": row.area,
+            "capacity": row.capacity,
+            "current_occupants": row.current_occupants,
+            "status": row.status,
+            "base_price": row.base_price,
+            "representative": row.representative if row.representative else None,
+        }
+
+    @staticmethod
+    def _availability_priority(occupants):
+        """0 = trống, 1 = còn chỗ, 2 = đã đủ người."""
+        return case(
+            (occupants == 0, 0),
+            (occupants < Room.capacity, 1),
+            else_=2,
+        )
+
+    def list_public(
+        self,
+        building_id: Optional[UUID] = None,
+        search: Optional[str] = None,
+        city: Optional[str] = None,
+        ward: Optional[str] = None,
+        min_price: Optional[int] = None,
+        max_price: Optional[int] = None,
+        max_capacity: Optional[int] = None,
+        sort_by: Optional[str] = None,
+        offset: int = 0,
+        limit: int = 10,
+    ) -> tuple[list[dict], int]:
+        """Lấy một trang phòng public, sắp xếp theo mức độ còn trống - toàn bộ trong SQL.
+
+        - Số người đang ở/đặt đọc từ bộ đếm rooms.current_occupants (hợp đồng
+          ACTIVE/PENDING/PENDING_UPDATE, cùng rule với get_total_tenants_in_room).
+        - availability_priority: 0 = trống, 1 = còn chỗ, 2 = đã đủ người.
+        - Sắp xếp (priority, giá hoặc created_at), LIMIT/OFFSET trong DB; tổng số
+          dòng lấy bằng COUNT(*) OVER () trong cùng query.
+        - Ảnh đại diện: thumbnail tính sẵn, fallback sang ảnh đầu tiên - chỉ
+          tính cho các phòng thuộc trang hiện tại.
+
+        Args:
+            building_id: Lọc theo tòa nhà (optional).
+            search: Tìm kiếm theo tên phòng, số phòng hoặc tên tòa nhà (optional).
+            city: Lọc theo thành phố (optional).
+            ward: Lọc theo phường/quận (optional).
+            min_price: Giá thuê tối thiểu (optional).
+            max_price: Giá thuê tối đa (optional).
+            max_capacity: Số người tối đa (optional).
+            sort_by: price_asc, price_desc, mặc định created_at desc.
+            offset: Vị trí bắt đầu.
+            limit: Số phòng mỗi trang.
+
+        Returns:
+            Tuple (list dict của trang hiện tại, tổng số phòng thỏa filter).
+        """
+        occupants = Room.current_occupants
+        priority = self._availability_priority(occupants)
+
+        # Có search mà không chọn sort: phòng liên quan nhất lên trước (trong cùng priority)
+        search_rank = self._search_rank(search) if search else literal_column("0")
+        if sort_by == "price_asc":
+            secondary_order = [Room.base_price.asc()]
+        elif sort_by == "price_desc":
+            secondary_order = [Room.base_price.desc()]
+        elif search:
+            secondary_order = [search_rank.desc(), Room.created_at.desc()]
+        else:
+            secondary_order = [Room.created_at.desc()]
+
+        query = (
+            self.db.query(
+                Room.id,
+                Room.room_number,
+                Room.room_name,
+                Room.base_price,
+                Room.area,
+                Room.capacity,
+                Room.description,
+                Room.created_at,
+                Room.primary_thumbnail_url,
+                Building.building_name,
+                Address.address_line,
+                Address.ward,
+                Address.city,
+                occupants.label("current_occupants"),
+                priority.label("availability_priority"),
+                search_rank.label("search_rank"),
+                func.count(literal_column("*")).over().label("total_count"),
             )
+            .join(Building, Room.building_id == Building.id)
+            .outerjoin(Address, Building.address_id == Address.id)
+        )
 
-        # Apply price filters
-        if min_price is not None:
-            query = query.filter(Room.base_price >= min_price)
-        if max_price is not None:
-            query = query.filter(Room.base_price <= max_price)
+        query = self._apply_filters(
+            query, building_id, None, search, city, ward, min_price, max_price, max_capacity
+        )
 
-        # Apply capacity filter
-        if max_capacity is not None:
-            query = query.filter(Room.capacity <= max_capacity)
+        page = (
+            query.order_by(priority, *secondary_order, Room.id)
+            .offset(offset)
+            .limit(limit)
+            .subquery()
+        )
+
+        # Ảnh fallback cho phòng chưa có thumbnail - chỉ chạy cho các dòng của trang
+        fallback_photo = (
+            select(func.coalesce(RoomPhoto.url, RoomPhoto.image_base64))
+            .where(RoomPhoto.room_id == page.c.id)
+            .order_by(RoomPhoto.is_primary.desc(), RoomPhoto.sort_order.asc())
+            .limit(1)
+            .correlate(page)
+            .scalar_subquery()
+        )
 
-        # Apply sorting - mặc định theo created_at DESC (mới nhất trước)
         if sort_by == "price_asc":
-            query = query.order_by(Room.base_price.asc())
+            page_secondary = [page.c.base_price.asc()]
         elif sort_by == "price_desc":
-            query = query.order_by(Room.base_price.desc())
+            page_secondary = [page.c.base_price.desc()]
+        elif search:
+            page_secondary = [page.c.search_rank.desc(), page.c.created_at.desc()]
         else:
-            query = query.order_by(Room.created_at.desc())
+            page_secondary = [page.c.created_at.desc()]
 
-        # Apply pagination
-        results = query.offset(offset).limit(limit).all()
+        rows = (
+            self.db.query(
+                page,
+                func.coalesce(page.c.primary_thumbnail_url, fallback_photo).label("primary_photo"),
+            )
+            .order_by(page.c.availability_priority, *page_secondary, page.c.id)
+            .all()
+        )
 
-        # Convert to dict
-        from app.schemas.room_type_schema import RoomTypeSimple
+        total = rows[0].total_count if rows else (
+            # Trang vượt quá dữ liệu: vẫn cần tổng số để tính totalPages
+            query.with_entities(func.count(Room.id)).scalar() if offset else 0
+        )
 
-        return [
+        items = [
             {
                 "id": row.id,
                 "room_number": row.room_number,
                 "room_name": row.room_name,
-                "description": row.description,
                 "building_name": row.building_name,
-                # 'room_type': RoomTypeSimple(id=row.room_type_id, name=row.room_type_name) if row.room_type_id else None,
-                "room_type": row.room_type_name ,
+                "full_address": (
+                    f"{row.address_line}, {row.ward}, {row.city}" if row.address_line else "N/A"
+                ),
+                "base_price": row.base_price,
                 "area": row.area,
                 "capacity": row.capacity,
-                "current_occupants": row.current_occupants,
-                "status": row.status,
-                "base_price": row.base_price,
-                "representative": row.representative if row.representative else None,
+                "current_occupants": int(row.current_occupants),
+                "is_available": row.current_occupants < row.capacity,
+                "description": row.description,
+                "primary_photo": row.primary_photo,
+                "created_at": row.created_at,
             }
-            for row in results
+            for row in rows
         ]
+        return items, total
+
+    def public_facets(
+        self,
+        building_id: Optional[UUID] = None,
+        search: Optional[str] = None,
+        city: Optional[str] = None,
+        ward: Optional[str] = None,
+        min_price: Optional[int] = None,
+        max_price: Optional[int] = None,
+        max_capacity: Optional[int] = None,
+    ) -> dict[str, list[tuple[str, int]]]:
+        """Đếm số phòng public theo từng facet - một câu SQL duy nhất.
+
+        - Tập phòng thỏa filter (cùng filter với list_public) là CTE ``facet_rooms``.
+        - Các facet trong GROUPED_FACETS tính bằng một ``GROUP BY GROUPING SETS``
+          trên CTE; ``grouping()`` cho biết dòng kết quả thuộc facet nào.
+        - Tiện ích (nhiều giá trị mỗi phòng) đếm riêng theo danh mục utilities
+          (``utilities.id = ANY(utility_ids)``) và ``UNION ALL`` vào cùng câu lệnh.
+        - Giá trị NULL (phòng chưa có địa chỉ/loại phòng) bị bỏ qua.
+
+        Args:
+            building_id: Lọc theo tòa nhà (optional).
+            search: Tìm kiếm theo tên phòng, số phòng hoặc tên tòa nhà (optional).
+            city: Lọc theo thành phố (optional).
+            ward: Lọc theo phường/quận (optional).
+            min_price: Giá thuê tối thiểu (optional).
+            max_price: Giá thuê tối đa (optional).
+            max_capacity: Số người tối đa (optional).
+
+        Returns:
+            Dict tên facet -> list (giá trị dạng text, số phòng). Tên facet gồm
+            GROUPED_FACETS và ``utility``.
+        """
+        price_bucket = case(
+            *[(Room.base_price < bound, index) for index, bound in enumerate(PRICE_FACET_BOUNDS)],
+            else_=len(PRICE_FACET_BOUNDS),
+        )
+
+        query = (
+            self.db.query(
+                Room.id.label("id"),
+                Address.city.label("city"),
+                Address.ward.label("ward"),
+                RoomType.name.label("room_type"),
+                price_bucket.label("price_bucket"),
+                Room.capacity.label("capacity"),
+                self._availability_priority(Room.current_occupants).label("availability"),
+                Room.utility_ids.label("utility_ids"),
+            )
+            .join(Building, Room.building_id == Building.id)
+            .outerjoin(Address, Building.address_id == Address.id)
+            .outerjoin(RoomType, Room.room_type_id == RoomType.id)
+        )
+        query = self._apply_filters(
+            query, building_id, None, search, city, ward, min_price, max_price, max_capacity
+        )
+        rooms = query.cte("facet_rooms")
+
+        dimensions = [rooms.c[name] for name in GROUPED_FACETS]
+        facet = case(
+            *[(func.grouping(col) == 0, literal(name)) for name, col in zip(GROUPED_FACETS, dimensions)]
+        )
+        value = case(
+            *[(func.grouping(col) == 0, cast(col, String)) for col in dimensions]
+        )
+        grouped = (
+            select(facet.label("facet"), value.label("value"), func.count().label("count"))
+            .group_by(func.grouping_sets(*dimensions))
+        )
+        utilities = (
+            select(literal("utility"), Utility.name, func.count())
+            .join(rooms, Utility.id == any_(rooms.c.utility_ids))
+            .group_by(Utility.id, Utility.name)
+        )
+
+        facets: dict[str, list[tuple[str, int]]] = {name: [] for name in [*GROUPED_FACETS, "utility"]}
+        for row in self.db.execute(union_all(grouped, utilities)):
+            if row.value is not None:
+                facets[row.facet].append((row.value, row.count))
+        return facets
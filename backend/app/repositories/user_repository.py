@@ -7,6 +7,7 @@ from sqlalchemy import select, func, case, or_
 from app.models.user import User
 from app.models.contract import Contract
 from app.core.Enum.userEnum import UserStatus
+from app.core.pagination import SortKey, cursor_position, paginate_keyset
 
 class UserRepository:
     def __init__(self, db: Session):
@@ -28,6 +29,34 @@ class UserRepository:
             .first()
         )
 
+    def get_principal(self, user_id: UUID):
+        """Lấy thông tin tối thiểu để xác thực user (chỉ các cột cần thiết).
+
+        Không load ORM User/documents - chỉ select id, status và thông tin role,
+        dùng cho dependency xác thực chạy ở mọi request.
+
+        Args:
+            user_id: UUID của user
+
+        Returns:
+            Row (id, role_id, status, role_code, role_name, display_name) hoặc None
+        """
+        from app.models.role import Role
+
+        stmt = (
+            select(
+                User.id,
+                User.role_id,
+                User.status,
+                Role.role_code,
+                Role.role_name,
+                Role.display_name,
+            )
+            .join(Role, User.role_id == Role.id)
+            .where(User.id == user_id)
+        )
+        return self.db.execute(stmt).first()
+
     def get_by_email(self, email: str) -> Optional[User]:
         """Lấy user theo email với eager loading role relationship.
         
@@ -66,6 +95,20 @@ class UserRepository:
         """
         return self.db.query(User).filter(User.cccd == cccd).first()
 
+    async def get_by_email_async(self, email: str) -> Optional[User]:
+        """Lấy user theo email kèm role (repository khởi tạo với AsyncSession).
+
+        Args:
+            email: Địa chỉ email
+
+        Returns:
+            User object nếu tìm thấy, None nếu không tìm thấy
+        """
+        result = await self.db.execute(
+            select(User).options(joinedload(User.role)).where(User.email == email)
+        )
+        return result.scalar_one_or_none()
+
     def create_user(self, *, user_in: dict) -> User:
         """Tạo một user mới và commit vào database.
 
@@ -81,6 +124,21 @@ class UserRepository:
         self.db.refresh(obj)
         return obj
 
+    async def create_user_async(self, *, user_in: dict) -> User:
+        """Tạo user mới và commit (repository khởi tạo với AsyncSession).
+
+        Args:
+            user_in: dict chứa các trường mô tả user (đã hash password)
+
+        Returns:
+            User: ORM instance mới được persist
+        """
+        obj = User(**user_in)
+        self.db.add(obj)
+        await self.db.commit()
+        await self.db.refresh(obj)
+        return obj
+
     def update(self, user: User, update_data: dict) -> User:
         """Cập nhật thông tin user.
         
@@ -132,6 +190,55 @@ class UserRepository:
         Returns:
             List dict chứa thông tin user cơ bản
         """
+        query = self._list_query(search, status, gender, district, role_id)
+        
+        # Execute query với pagination (sắp xếp ổn định để các trang không trùng lặp)
+        users = (
+            query.order_by(User.created_at.desc(), User.id.desc())
+            .offset(offset)
+            .limit(limit)
+            .all()
+        )
+        
+        return [self._list_row(user, idx) for idx, user in enumerate(users, start=offset + 1)]
+
+    def list_with_filters_keyset(
+        self,
+        search: Optional[str] = None,
+        status: Optional[str] = None,
+        gender: Optional[str] = None,
+        district: Optional[str] = None,
+        role_id: Optional[UUID] = None,
+        cursor: Optional[str] = None,
+        limit: int = 20,
+    ) -> tuple[list[dict], Optional[str]]:
+        """Lấy danh sách users phân trang bằng cursor (created_at, id).
+        
+        Returns:
+            Tuple (list dict của trang, next_cursor hoặc None nếu hết dữ liệu)
+            
+        Raises:
+            ValueError: Cursor không hợp lệ
+        """
+        users, next_cursor = paginate_keyset(
+            self._list_query(search, status, gender, district, role_id),
+            [SortKey(User.created_at, desc=True), SortKey(User.id, desc=True)],
+            sort="created_at_desc",
+            cursor=cursor,
+            limit=limit,
+        )
+        start = cursor_position(cursor) + 1
+        return [self._list_row(user, idx) for idx, user in enumerate(users, start=start)], next_cursor
+
+    def _list_query(
+        self,
+        search: Optional[str],
+        status: Optional[str],
+        gender: Optional[str],
+        district: Optional[str],
+        role_id: Optional[UUID],
+    ):
+        """Query danh sách users đã áp filters (chưa sắp xếp/phân trang)."""
         query = self.db.query(User).options(joinedload(User.role))
         
         # Loại trừ ADMIN - chỉ hiển thị TENANT và CUSTOMER
@@ -167,26 +274,22 @@ class UserRepository:
         if role_id:
             query = query.filter(User.role_id == role_id)
         
-        # Execute query với pagination
-        users = query.offset(offset).limit(limit).all()
-        
-        # Convert sang dict để dễ thêm thông tin
-        result = []
-        for idx, user in enumerate(users, start=offset + 1):
-            result.append({
-                "id": user.id,
-                "code": str(100 + idx),  # Mã tạm thời, có thể customize
-                "full_name": f"{user.first_name} {user.last_name}",
-                "phone": user.phone,
-                "email": user.email,
-                "cccd": user.cccd,  # Thêm CCCD
-                "gender": user.gender,  # Lấy từ user object
-                "district": user.hometown,  # Hiển thị quê quán vào field district
-                "status": user.status,
-                "role_name": user.role.display_name if user.role and user.role.display_name else (user.role.role_name if user.role else None),  # Tên role tiếng Việt
-            })
-        
-        return result
+        return query
+
+    @staticmethod
+    def _list_row(user: User, idx: int) -> dict:
+        return {
+            "id": user.id,
+            "code": str(100 + idx),  # Mã tạm thời, có thể customize
+            "full_name": f"{user.first_name} {user.last_name}",
+            "phone": user.phone,
+            "email": user.email,
+            "cccd": user.cccd,  # Thêm CCCD
+            "gender": user.gender,  # Lấy từ user object
+            "district": user.hometown,  # Hiển thị quê quán vào field district
+            "status": user.status,
+            "role_name": user.role.display_name if user.role and user.role.display_name else (user.role.role_name if user.role else None),  # Tên role tiếng Việt
+        }
 
     def count(
         self,
@@ -253,24 +356,29 @@ class UserRepository:
         Returns:
             Dict chứa thống kê
         """
-        query = self.db.query(User)
+        # Một query duy nhất với COUNT(*) FILTER
+        query = self.db.query(
+            func.count().label("total"),
+            func.count().filter(User.status == UserStatus.ACTIVE.value).label("active"),
+            func.count().filter(User.status == UserStatus.INACTIVE.value).label("inactive"),
+        ).select_from(User)
         
         if role_id:
             query = query.filter(User.role_id == role_id)
         
-        total = query.count()
-        active = query.filter(User.status == UserStatus.ACTIVE.value).count()
-        inactive = query.filter(User.status == UserStatus.INACTIVE.value).count()
+        row = query.one()
         
         return {
-            "total_tenants": total,
-            "active_tenants": active,
-            "returned_rooms": inactive,
+            "total_tenants": row.total,
+            "active_tenants": row.active,
+            "returned_rooms": row.inactive,
             "not_rented": 0,  # Cần logic phức tạp hơn với Contract
         }
     
     async def get_admins(self):
         """Lấy danh sách admin users.
+
+        Chỉ dùng khi repository được khởi tạo với AsyncSession.
         
         Returns:
             List of admin users
@@ -280,7 +388,7 @@ class UserRepository:
         stmt = (
             select(User)
             .join(Role, User.role_id == Role.id)
-            .where(or_(Role.role_name == "ADMIN", Role.role_name == "MANAGER"))
+            .where(Role.role_code.in_(["ADMIN", "MANAGER"]))
             .where(User.status == UserStatus.ACTIVE.value)
         )
         result = await self.db.execute(stmt)
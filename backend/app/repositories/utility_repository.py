@@ -0,0 +1,82 @@
+"""Utility Repository - data access layer cho danh mục tiện ích.
+
+Tên tiện ích được chuẩn hóa trong SQL bằng ``app.core.search.normalized``
+(bỏ dấu, chữ thường) nên việc so khớp luôn nhất quán với dữ liệu đã lưu.
+"""
+
+from __future__ import annotations
+
+from typing import Iterable
+
+from sqlalchemy import String, column, select, values
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.core.search import normalized
+from app.models.utility import Utility
+
+
+def _clean(names: Iterable[str]) -> list[str]:
+    return list(dict.fromkeys(name.strip() for name in names if name and name.strip()))
+
+
+class UtilityRepository:
+    """Repository cho bảng utilities.
+
+    Args:
+        db: SQLAlchemy Session.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    @staticmethod
+    def _input_names(names: list[str]):
+        return values(column("name", String), name="input_names").data([(name,) for name in names])
+
+    def get_ids_by_names(self, names: Iterable[str]) -> dict[str, int]:
+        """Tra id tiện ích theo tên (không phân biệt hoa thường/dấu).
+
+        Args:
+            names: Danh sách tên tiện ích.
+
+        Returns:
+            Dict tên (đã trim) -> id; tên chưa có trong danh mục không xuất hiện.
+        """
+        names = _clean(names)
+        if not names:
+            return {}
+
+        input_names = self._input_names(names)
+        rows = self.db.execute(
+            select(input_names.c.name, Utility.id)
+            .join(Utility, Utility.normalized_name == normalized(input_names.c.name))
+        )
+        return {row.name: row.id for row in rows}
+
+    def ensure_ids(self, names: Iterable[str]) -> list[int]:
+        """Lấy id tiện ích theo tên, thêm vào danh mục nếu chưa có.
+
+        Dùng ``INSERT ... ON CONFLICT DO NOTHING`` trên normalized_name nên an
+        toàn khi nhiều request cùng thêm một tiện ích mới.
+
+        Args:
+            names: Danh sách tên tiện ích.
+
+        Returns:
+            List id (tăng dần, không trùng) của các tiện ích.
+        """
+        names = _clean(names)
+        if not names:
+            return []
+
+        input_names = self._input_names(names)
+        self.db.execute(
+            insert(Utility)
+            .from_select(
+                ["name", "normalized_name"],
+                select(input_names.c.name, normalized(input_names.c.name)),
+            )
+            .on_conflict_do_nothing(index_elements=[Utility.normalized_name])
+        )
+        return sorted(set(self.get_ids_by_names(names).values()))
@@ -67,6 +67,73 @@ class InvoiceCreate(BaseModel):
         return self
 
 
+class MeterReadingItem(BaseModel):
+    """Chỉ số điện của một phòng dùng khi lập hóa đơn hàng loạt."""
+    
+    room_id: uuid.UUID = Field(..., description="ID phòng")
+    electricity_new_index: float = Field(..., ge=0, description="Chỉ số điện mới (kWh)")
+    electricity_old_index: Optional[float] = Field(
+        None, ge=0, description="Chỉ số điện cũ - bỏ trống để lấy từ hóa đơn tháng trước"
+    )
+    number_of_people: Optional[int] = Field(
+        None, ge=1, description="Số người trong tháng - bỏ trống để lấy từ hợp đồng"
+    )
+
+
+class InvoiceBulkCreate(BaseModel):
+    """Schema lập hóa đơn tháng cho mọi hợp đồng ACTIVE của một tòa nhà (hoặc tất cả)."""
+    
+    billing_month: date = Field(..., description="Tháng lập hóa đơn (YYYY-MM-01)")
+    due_date: date = Field(..., description="Hạn thanh toán")
+    building_id: Optional[uuid.UUID] = Field(None, description="Tòa nhà - bỏ trống để lập cho tất cả tòa nhà")
+    readings: List[MeterReadingItem] = Field(
+        default_factory=list, description="Chỉ số điện theo phòng (phòng không có chỉ số thì bỏ trống tiền điện)"
+    )
+    use_staged_readings: bool = Field(
+        True, description="Dùng chỉ số điện đã import từ file (POST /invoices/meter-readings/import) cho phòng không có trong readings"
+    )
+    notes: Optional[str] = Field(None, description="Ghi chú cho tất cả hóa đơn")
+    
+    @model_validator(mode='after')
+    def validate_bulk_create(self) -> Self:
+        """Chuẩn hóa billing_month về ngày 1, kiểm tra hạn thanh toán và phòng trùng."""
+        self.billing_month = self.billing_month.replace(day=1)
+        if self.due_date < self.billing_month:
+            raise ValueError("Hạn thanh toán phải sau ngày lập hóa đơn")
+        
+        room_ids = [reading.room_id for reading in self.readings]
+        if len(room_ids) != len(set(room_ids)):
+            raise ValueError("Mỗi phòng chỉ được có một chỉ số điện")
+        return self
+
+
+class InvoiceBulkResultItem(BaseModel):
+    """Kết quả lập hóa đơn của một hợp đồng (hoặc một chỉ số điện không dùng được)."""
+    
+    status: str = Field(..., description="CREATED | SKIPPED | ERROR")
+    message: Optional[str] = None
+    room_id: uuid.UUID
+    room_number: Optional[str] = None
+    building_name: Optional[str] = None
+    contract_id: Optional[uuid.UUID] = None
+    contract_number: Optional[str] = None
+    tenant_id: Optional[uuid.UUID] = None
+    tenant_name: Optional[str] = None
+    invoice_id: Optional[uuid.UUID] = None
+    invoice_number: Optional[str] = None
+    total_amount: Optional[Decimal] = None
+
+
+class InvoiceBulkResult(BaseModel):
+    """Báo cáo lập hóa đơn hàng loạt."""
+    
+    billing_month: date
+    created: int = 0
+    skipped: int = 0
+    failed: int = 0
+    items: List[InvoiceBulkResultItem] = Field(default_factory=list)
+
+
 class InvoiceUpdate(BaseModel):
     """Schema for updating invoice - Chỉ update nếu chưa thanh toán."""
     
@@ -113,6 +180,8 @@ class InvoiceOut(BaseModel):
     other_fees_description: Optional[str] = None
     
     total_amount: Decimal = Field(..., description="Tổng tiền")
+    amount_paid: Decimal = Field(Decimal(0), description="Đã thanh toán")
+    amount_due: Decimal = Field(Decimal(0), description="Còn nợ")
     
     notes: Optional[str] = None
     created_at: datetime
@@ -129,6 +198,8 @@ class InvoiceListItem(BaseModel):
     tenant_name: str
     billing_month: date
     total_amount: Decimal
+    amount_paid: Decimal = Decimal(0)
+    amount_due: Decimal = Decimal(0)
     building_name: str
     room_number: str
     due_date: date
@@ -0,0 +1,40 @@
+"""Meter reading schemas - kết quả import chỉ số điện từ file CSV/XLSX."""
+
+from __future__ import annotations
+
+import uuid
+from datetime import date
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class MeterReadingRowResult(BaseModel):
+    """Kết quả kiểm tra một dòng trong file."""
+    
+    row_number: int = Field(..., description="Số dòng trong file (dòng tiêu đề là 1)")
+    status: str = Field(..., description="VALID | WARNING (vẫn được lưu) | ERROR (không lưu)")
+    messages: List[str] = Field(default_factory=list)
+    room_id: Optional[uuid.UUID] = None
+    room_number: Optional[str] = None
+    contract_number: Optional[str] = None
+    old_index: Optional[float] = None
+    new_index: Optional[float] = None
+    usage: Optional[float] = None
+    average_usage: Optional[float] = None
+
+
+class MeterReadingImportResult(BaseModel):
+    """Báo cáo import chỉ số điện.
+    
+    ``rows`` chỉ gồm các dòng có cảnh báo hoặc lỗi; dòng hợp lệ chỉ được đếm.
+    """
+    
+    batch_id: uuid.UUID
+    billing_month: date
+    dry_run: bool = False
+    total_rows: int = 0
+    staged: int = 0
+    warnings: int = 0
+    errors: int = 0
+    rows: List[MeterReadingRowResult] = Field(default_factory=list)
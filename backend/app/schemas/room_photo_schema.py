@@ -6,7 +6,7 @@ Pydantic schemas cho RoomPhoto entity - dùng cho validation và serialization.
 from __future__ import annotations
 
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 import uuid
 
@@ -59,6 +59,19 @@ class RoomPhotoUpdate(BaseModel):
     model_config = {"from_attributes": True}
 
 
+class RoomPhotoVariantOut(BaseModel):
+    """Thumbnail của ảnh phòng (resize theo width cố định)."""
+
+    label: str = Field(..., description="Nhãn kích thước, ví dụ w320")
+    format: str = Field(..., description="webp hoặc jpeg")
+    width: int
+    height: int
+    byte_size: int
+    url: str
+
+    model_config = {"from_attributes": True}
+
+
 class RoomPhotoOut(RoomPhotoBase):
     """Schema returned by the API for RoomPhoto resources.
     
@@ -71,5 +84,6 @@ class RoomPhotoOut(RoomPhotoBase):
     image_base64: Optional[str] = None  # Có thể null nếu chỉ lưu URL
     uploaded_by: uuid.UUID
     created_at: Optional[datetime] = None
+    variants: List[RoomPhotoVariantOut] = Field(default_factory=list, description="Các thumbnail")
 
     model_config = {"from_attributes": True}
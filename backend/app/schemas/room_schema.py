@@ -311,7 +311,7 @@ class RoomPublicListItem(BaseModel):
     current_occupants: int = Field(0, description="Số người đang ở trong phòng")
     is_available: bool = Field(..., description="Phòng còn trống không (chưa full)")
     primary_photo: Optional[str] = Field(
-        None, description="Ảnh đại diện (URL hoặc base64)"
+        None, description="URL thumbnail ảnh đại diện (dữ liệu cũ: URL/base64 ảnh gốc)"
     )
     created_at: datetime = Field(..., description="Thời gian tạo phòng")
 
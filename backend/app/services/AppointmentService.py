@@ -1,4 +1,4 @@
-"""Service layer cho Appointment."""
+"""Service layer cho Appointment (AsyncSession)."""
 
 from typing import List, Optional
 from uuid import UUID
@@ -7,10 +7,10 @@ from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.repositories.appointment_repository import AppointmentRepository
-from app.repositories.room_repository import RoomRepository
 from app.repositories.user_repository import UserRepository
 from app.schemas.appointment_schema import AppointmentCreate, AppointmentUpdate
 from app.models.appointment import Appointment
+from app.models.room import Room
 from app.core.Enum.appointmentEnum import AppointmentStatus
 from app.core.Enum.roomEnum import RoomStatus
 from app.services.NotificationService import NotificationService
@@ -23,11 +23,10 @@ class AppointmentService:
     def __init__(self, session: AsyncSession):
         self.session = session
         self.appointment_repo = AppointmentRepository(session)
-        self.room_repo = RoomRepository(session)
         self.user_repo = UserRepository(session)
         self.notification_service = NotificationService(session)
 
-    def create_appointment(self, appointment_data: AppointmentCreate) -> Appointment:
+    async def create_appointment(self, appointment_data: AppointmentCreate) -> Appointment:
         """
         Tạo appointment mới (dành cho người dùng).
 
@@ -41,7 +40,7 @@ class AppointmentService:
             ValueError: Nếu phòng không tồn tại hoặc không available
         """
         # Kiểm tra room tồn tại và available
-        room = self.room_repo.get_by_id(appointment_data.room_id)
+        room = await self.session.get(Room, appointment_data.room_id)
         if not room:
             raise ValueError("Phòng không tồn tại")
 
@@ -54,19 +53,19 @@ class AppointmentService:
         appointment_dict = appointment_data.model_dump()
         appointment_dict["status"] = AppointmentStatus.PENDING.value
 
-        appointment = self.appointment_repo.create(appointment_dict)
+        appointment = await self.appointment_repo.create(appointment_dict)
 
         # Gửi thông báo cho admin
         try:
             # Lấy danh sách admin
-            admins = self.user_repo.get_admins()
+            admins = await self.user_repo.get_admins()
             admin_ids = [admin.id for admin in admins]
 
             if admin_ids:
                 # Format appointment time
                 apt_time = appointment.appointment_datetime.strftime("%d/%m/%Y %H:%M")
 
-                self.notification_service.create_appointment_notification_for_admin(
+                await self.notification_service.create_appointment_notification_for_admin(
                     admin_ids=admin_ids,
                     appointment_id=appointment.id,
                     customer_name=appointment.full_name,
@@ -79,11 +78,11 @@ class AppointmentService:
 
         return appointment
 
-    def get_appointment(self, appointment_id: UUID) -> Optional[Appointment]:
+    async def get_appointment(self, appointment_id: UUID) -> Optional[Appointment]:
         """Lấy thông tin appointment theo ID."""
-        return self.appointment_repo.get_by_id(appointment_id)
+        return await self.appointment_repo.get_by_id(appointment_id)
 
-    def get_appointments(
+    async def get_appointments(
         self,
         skip: int = 0,
         limit: int = 100,
@@ -93,7 +92,7 @@ class AppointmentService:
         to_date: Optional[datetime] = None,
     ) -> List[Appointment]:
         """Lấy danh sách appointments với filter."""
-        return self.appointment_repo.get_all(
+        return await self.appointment_repo.get_all(
             skip=skip,
             limit=limit,
             status=status,
@@ -102,11 +101,11 @@ class AppointmentService:
             to_date=to_date,
         )
 
-    def get_pending_appointments(self) -> List[Appointment]:
+    async def get_pending_appointments(self) -> List[Appointment]:
         """Lấy danh sách appointments chờ xử lý (dành cho admin)."""
-        return self.appointment_repo.get_pending_appointments()
+        return await self.appointment_repo.get_pending_appointments()
 
-    def update_appointment_status(
+    async def update_appointment_status(
         self, appointment_id: UUID, update_data: AppointmentUpdate, admin_id: UUID
     ) -> Optional[Appointment]:
         """
@@ -123,7 +122,7 @@ class AppointmentService:
         Raises:
             ValueError: Nếu appointment không tồn tại
         """
-        appointment = self.appointment_repo.get_by_id(appointment_id)
+        appointment = await self.appointment_repo.get_by_id(appointment_id)
         if not appointment:
             raise ValueError("Appointment không tồn tại")
 
@@ -135,13 +134,9 @@ class AppointmentService:
                     f"Trạng thái không hợp lệ. Phải là một trong: {', '.join(valid_statuses)}"
                 )
 
-        update_dict = update_data.model_dump(exclude_unset=True)
-        updated_appointment = self.appointment_repo.update(
-            appointment_id, update_dict, handled_by=admin_id
-        )
-
-        # Gửi email thông báo nếu có email và trạng thái thay đổi
-        if updated_appointment and update_data.status and appointment.email:
+        # Xếp email thông báo vào outbox trước khi update: repository commit cả
+        # thay đổi lịch hẹn lẫn email trong cùng một transaction
+        if update_data.status and appointment.email:
             try:
                 # Lấy thông tin phòng và địa chỉ
                 room_number = "N/A"
@@ -162,8 +157,8 @@ class AppointmentService:
                 # Format thời gian
                 apt_time = appointment.appointment_datetime.strftime("%d/%m/%Y lúc %H:%M")
 
-                # Gửi email
-                email_service.send_appointment_status_notification(
+                email_service.enqueue_appointment_status_notification(
+                    self.session,
                     to_email=appointment.email,
                     customer_name=appointment.full_name,
                     room_number=room_number,
@@ -177,11 +172,16 @@ class AppointmentService:
                 )
             except Exception as email_error:
                 # Log error but don't fail the update
-                print(f"[AppointmentService] Lỗi gửi email thông báo: {email_error}")
+                print(f"[AppointmentService] Lỗi tạo email thông báo: {email_error}")
+
+        update_dict = update_data.model_dump(exclude_unset=True)
+        updated_appointment = await self.appointment_repo.update(
+            appointment_id, update_dict, handled_by=admin_id
+        )
 
         return updated_appointment
 
-    def cancel_appointment(self, appointment_id: UUID) -> Optional[Appointment]:
+    async def cancel_appointment(self, appointment_id: UUID) -> Optional[Appointment]:
         """
         Hủy appointment (có thể do user hoặc admin).
 
@@ -191,7 +191,7 @@ class AppointmentService:
         Returns:
             Appointment đã hủy
         """
-        appointment = self.appointment_repo.get_by_id(appointment_id)
+        appointment = await self.appointment_repo.get_by_id(appointment_id)
         if not appointment:
             raise ValueError("Appointment không tồn tại")
 
@@ -204,19 +204,19 @@ class AppointmentService:
             )
 
         update_dict = {"status": AppointmentStatus.CANCELLED.value}
-        return self.appointment_repo.update(appointment_id, update_dict)
+        return await self.appointment_repo.update(appointment_id, update_dict)
 
-    def delete_appointment(self, appointment_id: UUID) -> bool:
+    async def delete_appointment(self, appointment_id: UUID) -> bool:
         """Xóa appointment (chỉ admin)."""
-        return self.appointment_repo.delete(appointment_id)
+        return await self.appointment_repo.delete(appointment_id)
 
-    def count_appointments(
+    async def count_appointments(
         self, status: Optional[str] = None, room_id: Optional[UUID] = None
     ) -> int:
         """Đếm số lượng appointments."""
-        return self.appointment_repo.count(status=status, room_id=room_id)
+        return await self.appointment_repo.count(status=status, room_id=room_id)
 
-    def get_appointments_by_contact(
+    async def get_appointments_by_contact(
         self, email: Optional[str] = None, phone: Optional[str] = None
     ) -> List[Appointment]:
         """Lấy danh sách appointments theo email hoặc phone.
@@ -230,4 +230,4 @@ class AppointmentService:
         Returns:
             List appointments khớp với thông tin liên hệ
         """
-        return self.appointment_repo.get_by_contact(email=email, phone=phone)
+        return await self.appointment_repo.get_by_contact(email=email, phone=phone)
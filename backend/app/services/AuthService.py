@@ -12,9 +12,13 @@ from __future__ import annotations
 from uuid import UUID
 
 from fastapi import HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
+from starlette.concurrency import run_in_threadpool
 
+from app.core.security import invalidate_principal
 from app.repositories import role_repository, user_repository
 from app.schemas.user_schema import UserCreate, UserRegister
 
@@ -22,22 +26,25 @@ from app.schemas.user_schema import UserCreate, UserRegister
 class AuthService:
     """Service xử lý business logic cho Authentication.
     
+    ``register_user``/``login`` chạy trên AsyncSession (route async), các
+    use case còn lại dùng Session đồng bộ.
+
     Args:
-        db: SQLAlchemy Session được inject từ FastAPI Depends.
+        db: SQLAlchemy Session hoặc AsyncSession được inject từ FastAPI Depends.
     """
     
-    def __init__(self, db: Session):
+    def __init__(self, db: Session | AsyncSession):
         self.db = db
         self.user_repo = user_repository.UserRepository(db)
         self.role_repo = role_repository.RoleRepository(db)
 
-    def register_user(self, user_data: UserRegister):
+    async def register_user(self, user_data: UserRegister):
         """
         Đăng ký tài khoản CUSTOMER (public registration).
         Role mặc định: CUSTOMER
         """
 
-        if self.user_repo.get_by_email(user_data.email):
+        if await self.user_repo.get_by_email_async(user_data.email):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Email đã tồn tại",
@@ -47,7 +54,7 @@ class AuthService:
         from app.models.role import Role
         from app.core.Enum.userEnum import UserRole
 
-        customer_role = self.role_repo.get_by_code(UserRole.CUSTOMER.value)
+        customer_role = await self.role_repo.get_by_code_async(UserRole.CUSTOMER.value)
 
         if not customer_role:
             return False, "Role CUSTOMER không tồn tại trong hệ thống", None
@@ -55,7 +62,8 @@ class AuthService:
         # create user
         from app.core.security import get_password_hash
 
-        hashed = get_password_hash(user_data.password)
+        # bcrypt tốn CPU -> chạy trong threadpool để không block event loop
+        hashed = await run_in_threadpool(get_password_hash, user_data.password)
         user = {
             "first_name": user_data.first_name,
             "last_name": user_data.last_name,
@@ -64,11 +72,11 @@ class AuthService:
             "password": hashed,
         }
 
-        user_obj = self.user_repo.create_user(user_in=user)
+        user_obj = await self.user_repo.create_user_async(user_in=user)
 
         return True, "Created", {}
 
-    def login(self, email: str, password: str):
+    async def login(self, email: str, password: str):
         """Verify credentials and return user if valid, otherwise None."""
         from app.core.security import (
             verify_password,
@@ -77,11 +85,11 @@ class AuthService:
         )
         from app.models.user_document import UserDocument
 
-        user = self.user_repo.get_by_email(email)
+        user = await self.user_repo.get_by_email_async(email)
         if not user:
             return None
 
-        if not verify_password(password, user.password):
+        if not await run_in_threadpool(verify_password, password, user.password):
             return None
 
         access = create_access_token(str(user.id))
@@ -89,14 +97,15 @@ class AuthService:
         
         # Lấy avatar của user (nếu có)
         avatar_url = None
-        avatar_doc = (
-            self.db.query(UserDocument)
-            .filter(
+        result = await self.db.execute(
+            select(UserDocument)
+            .where(
                 UserDocument.user_id == user.id,
                 UserDocument.document_type == "AVATAR"
             )
-            .first()
+            .limit(1)
         )
+        avatar_doc = result.scalar_one_or_none()
         if avatar_doc:
             avatar_url = avatar_doc.url
 
@@ -238,6 +247,7 @@ class AuthService:
         user.role_id = tenant_role.id
         self.db.commit()
         self.db.refresh(user)
+        invalidate_principal(user.id)
 
         return True, "Đã nâng cấp lên TENANT", user
 
@@ -294,6 +304,7 @@ class AuthService:
         user.role_id = customer_role.id
         self.db.commit()
         self.db.refresh(user)
+        invalidate_principal(user.id)
 
         return True, "Đã hạ cấp về CUSTOMER", user
 
@@ -12,9 +12,8 @@ from sqlalchemy.orm import Session
 from app.repositories.building_repository import BuildingRepository
 from app.repositories.address_respository import AddressRepository
 from app.repositories.room_repository import RoomRepository
+from app.repositories.loaders import get_loaders
 from app.schemas.address_schema import AddressCreate
-from app.models.contract import Contract
-from app.core.Enum.contractEnum import ContractStatus
 from app.schemas.building_schema import (
     BuildingCreate,
     BuildingUpdate,
@@ -40,6 +39,7 @@ class BuildingService:
         self.building_repo = BuildingRepository(db)
         self.address_repo = AddressRepository(db)
         self.room_repo = RoomRepository(db)
+        self.loaders = get_loaders(db)
 
     def create_building(self, building_data: BuildingCreate) -> BuildingOut:
         """Tạo tòa nhà mới với validation.
@@ -342,30 +342,23 @@ class BuildingService:
         # Xóa tất cả phòng thuộc tòa nhà trước (nếu có)
         rooms_deleted = 0
         if total_rooms > 0:
-            # Lấy danh sách phòng của tòa nhà
-            rooms = self.room_repo.list(building_id=building_id, limit=1000)
+            rooms = self.room_repo.list_by_building_for_delete(building_id)
             
-            # Kiểm tra hợp đồng ACTIVE/PENDING cho từng phòng
-            active_statuses = [ContractStatus.ACTIVE.value, ContractStatus.PENDING.value]
-            for room in rooms:
-                active_contracts = (
-                    self.db.query(Contract)
-                    .filter(
-                        Contract.room_id == room.id,
-                        Contract.status.in_(active_statuses)
-                    )
-                    .count()
-                )
+            # Kiểm tra hợp đồng ACTIVE/PENDING của tất cả phòng trong một query
+            open_contracts = self.loaders.open_contract_count.load_many(room.id for room in rooms)
+            for room, active_contracts in zip(rooms, open_contracts):
                 if active_contracts > 0:
                     raise ValueError(
                         f"Không thể xoá tòa nhà vì phòng {room.room_number} đang có hợp đồng. "
                         "Vui lòng kết thúc hoặc huỷ hợp đồng trước khi thực hiện thao tác này."
                     )
             
-            # Xóa tất cả phòng (cascade sẽ xóa utilities, photos, appointments, etc.)
-            for room in rooms:
-                self.room_repo.delete(room)
+            # Xóa tất cả phòng (cascade sẽ xóa utilities, photos, appointments, etc.),
+            # commit cùng lúc với xóa tòa nhà
+            self.room_repo.delete_many(rooms)
             rooms_deleted = len(rooms)
+            # building.rooms đã load sẵn: load lại (rỗng) để không cập nhật phòng đã xóa
+            self.db.expire(building_orm, ["rooms"])
 
         # Xóa tòa nhà
         self.building_repo.delete(building_orm)
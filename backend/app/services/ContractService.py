@@ -19,15 +19,21 @@ from sqlalchemy.exc import IntegrityError
 from app.repositories.contract_repository import ContractRepository
 from app.repositories.room_repository import RoomRepository
 from app.repositories.user_repository import UserRepository
+from app.repositories.loaders import get_loaders
+from app.services.DocumentNumberService import DocumentNumberService
+from app.infrastructure.db.retry import retry_on_conflict, set_lock_timeout
 from app.schemas.contract_schema import (
     ContractCreate,
     ContractUpdate,
     ContractOut,
     ContractListItem
 )
+from app.models.room import Room
 from app.models.user import User
 from app.core.Enum.contractEnum import ContractStatus
 from app.core.Enum.roomEnum import RoomStatus
+from app.core.pagination import cursor_pagination
+from app.core.settings import settings
 
 
 class ContractService:
@@ -39,6 +45,8 @@ class ContractService:
     - Khi tạo hợp đồng ACTIVE, tự động chuyển phòng sang OCCUPIED
     - Khi hủy/kết thúc hợp đồng, phòng trở về AVAILABLE
     - Không thể xóa hợp đồng đã có invoice
+    - Giữ chỗ (tạo, xác nhận, đổi số người) được kiểm tra sau khi khóa dòng
+      phòng - hai yêu cầu đồng thời cho cùng phòng không thể cùng vượt sức chứa
     
     Args:
         db: SQLAlchemy session được tiêm qua FastAPI Depends.
@@ -49,13 +57,44 @@ class ContractService:
         self.contract_repo = ContractRepository(db)
         self.room_repo = RoomRepository(db)
         self.user_repo = UserRepository(db)
+        self.loaders = get_loaders(db)
+        self.numbers = DocumentNumberService(db)
     
+    def _lock_room_occupancy(self, room_id: UUID, exclude_contract_id: Optional[UUID] = None) -> tuple[Room, int]:
+        """Khóa dòng phòng (FOR UPDATE) rồi đọc số người đang giữ chỗ.
+        
+        Kiểm tra sức chứa phải nằm giữa lần khóa này và commit: transaction khác
+        giữ chỗ cùng phòng phải chờ, sau đó đọc được bộ đếm rooms.current_occupants
+        đã gồm phần vừa commit. Chờ quá ``ROOM_LOCK_TIMEOUT_MS`` thì lỗi
+        lock_not_available và ``retry_on_conflict`` chạy lại thao tác.
+        
+        Args:
+            room_id: UUID của phòng
+            exclude_contract_id: Hợp đồng không tính vào số người (đang sửa chính nó)
+            
+        Returns:
+            (Room đã khóa, số người đang ở/đặt trong phòng)
+            
+        Raises:
+            ValueError: Nếu không tìm thấy phòng
+        """
+        set_lock_timeout(self.db, settings.ROOM_LOCK_TIMEOUT_MS)
+        room = self.room_repo.get_for_update(room_id)
+        if not room:
+            raise ValueError(f"Không tìm thấy phòng với ID: {room_id}")
+        current_tenants = self.contract_repo.get_total_tenants_in_room(
+            room_id,
+            exclude_contract_id=exclude_contract_id
+        )
+        return room, current_tenants
+    
+    @retry_on_conflict
     def create_contract(self, data: ContractCreate, created_by: UUID) -> ContractOut:
         """Tạo hợp đồng mới.
         
         Luồng:
-        1. Validate room_id và tenant_id tồn tại
-        2. Validate phòng không có hợp đồng ACTIVE (nếu tạo hợp đồng ACTIVE)
+        1. Validate room_id và tenant_id tồn tại (khóa dòng phòng đến khi commit)
+        2. Validate phòng còn đủ chỗ (hợp đồng ACTIVE/PENDING đều giữ chỗ)
         3. Validate ngày hợp lệ (end_date > start_date)
         4. Tạo hợp đồng
         5. Nếu hợp đồng ACTIVE, chuyển phòng sang OCCUPIED
@@ -70,10 +109,8 @@ class ContractService:
         Raises:
             ValueError: Nếu vi phạm business rules
         """
-        # 1. Validate room tồn tại
-        room = self.room_repo.get_by_id(data.room_id)
-        if not room:
-            raise ValueError(f"Không tìm thấy phòng với ID: {data.room_id}")
+        # 1. Validate room tồn tại và khóa phòng để giữ chỗ
+        room, current_tenants = self._lock_room_occupancy(data.room_id)
         
         # 2. Validate tenant tồn tại
         tenant = self.user_repo.get_by_id(data.tenant_id)
@@ -83,9 +120,8 @@ class ContractService:
         # 3. Validate phòng ở ghép: Kiểm tra còn chỗ trống
         contract_status = data.status if hasattr(data, 'status') and data.status else ContractStatus.ACTIVE.value
         
-        if contract_status == ContractStatus.ACTIVE.value:
-            # Đếm tổng số người đang ở trong phòng từ các hợp đồng ACTIVE
-            current_tenants = self.contract_repo.get_total_tenants_in_room(data.room_id)
+        if contract_status in [ContractStatus.ACTIVE.value, ContractStatus.PENDING.value]:
+            # Hợp đồng ACTIVE và PENDING đều được tính vào số người của phòng
             new_tenants = data.number_of_tenants
             total_after_add = current_tenants + new_tenants
             
@@ -95,7 +131,8 @@ class ContractService:
                     f"Phòng {room.room_number} chỉ còn {room.capacity - current_tenants}/{room.capacity} chỗ trống. "
                     f"Hiện có {current_tenants} người, không thể thêm {new_tenants} người nữa."
                 )
-            
+        
+        if contract_status == ContractStatus.ACTIVE.value:
             # 4. Validate phòng phải AVAILABLE, RESERVED hoặc OCCUPIED (ở ghép) để tạo hợp đồng ACTIVE
             if room.status not in [RoomStatus.AVAILABLE.value, RoomStatus.RESERVED.value, RoomStatus.OCCUPIED.value]:
                 raise ValueError(
@@ -108,13 +145,18 @@ class ContractService:
                     f"Phòng {room.room_number} không ở trạng thái sẵn sàng (hiện tại: {room.status})"
                 )
         
-        # 5. Tạo hợp đồng
+        # 5. Tạo hợp đồng (cấp mã từ bộ đếm nếu không nhập; mã nhập tay đẩy bộ đếm lên)
+        if data.contract_number:
+            contract_number = data.contract_number
+            self.numbers.note_contract_number(contract_number)
+        else:
+            contract_number = self.numbers.next_contract_number()
         try:
-            contract_orm = self.contract_repo.create(data, created_by)
+            contract_orm = self.contract_repo.create(data, created_by, contract_number)
         except IntegrityError as e:
             # Xử lý lỗi duplicate contract_number
             if "contract_number" in str(e.orig):
-                raise ValueError(f"Mã hợp đồng '{data.contract_number}' đã tồn tại. Vui lòng sử dụng mã khác.")
+                raise ValueError(f"Mã hợp đồng '{contract_number}' đã tồn tại. Vui lòng sử dụng mã khác.")
             # Các lỗi IntegrityError khác
             raise ValueError(f"Lỗi tạo hợp đồng: {str(e.orig)}")
         
@@ -173,6 +215,8 @@ class ContractService:
         building: Optional[str] = None,
         search: Optional[str] = None,
         current_user: User = None,
+        cursor: Optional[str] = None,
+        include_total: bool = False,
     ) -> dict:
         """Lấy danh sách hợp đồng với pagination và filters.
         
@@ -183,9 +227,12 @@ class ContractService:
             building: Lọc theo tên tòa nhà
             search: Tìm kiếm theo mã hợp đồng, tên khách, sđt
             current_user: User hiện tại
+            cursor: Bật chế độ cursor khi khác None ("" = trang đầu), bỏ qua page
+            include_total: Chế độ cursor: có chạy COUNT để trả totalItems không
             
         Returns:
-            Dict chứa items và pagination (totalItems, page, pageSize, totalPages).
+            Dict chứa items và pagination (totalItems, page, pageSize, totalPages),
+            hoặc (pageSize, next_cursor, totalItems) ở chế độ cursor.
         """
         # Validate page và pageSize
         if page < 1:
@@ -201,6 +248,26 @@ class ContractService:
         if current_user and current_user.role.role_code == "TENANT":
             tenant_id = current_user.id
         
+        if cursor is not None:
+            items_dict, next_cursor = self.contract_repo.list_with_details_keyset(
+                cursor=cursor,
+                limit=pageSize,
+                status_filter=status,
+                building_filter=building,
+                search_query=search,
+                tenant_id=tenant_id
+            )
+            total = self.contract_repo.count_contracts(
+                status_filter=status,
+                building_filter=building,
+                search_query=search,
+                tenant_id=tenant_id
+            ) if include_total else None
+            return {
+                "items": [ContractListItem.model_validate(item) for item in items_dict],
+                "pagination": cursor_pagination(pageSize, next_cursor, total)
+            }
+        
         # Lấy dữ liệu từ repository
         items_dict = self.contract_repo.list_with_details(
             offset=offset,
@@ -234,6 +301,7 @@ class ContractService:
             }
         }
     
+    @retry_on_conflict
     def update_contract(self, contract_id: UUID, data: ContractUpdate) -> ContractOut:
         """Cập nhật hợp đồng.
         
@@ -283,22 +351,22 @@ class ContractService:
         old_status = contract_orm.status
         old_number_of_tenants = contract_orm.number_of_tenants
         
-        # 2.1. Nếu thay đổi số người, kiểm tra sức chứa
-        if data.number_of_tenants is not None and data.number_of_tenants != old_number_of_tenants:
-            room = self.room_repo.get_by_id(contract_orm.room_id)
-            if room:
-                # Tính tổng số người sau khi thay đổi (loại trừ hợp đồng hiện tại)
-                current_tenants = self.contract_repo.get_total_tenants_in_room(
-                    contract_orm.room_id, 
-                    exclude_contract_id=contract_id
+        # 2.1. Nếu thay đổi số người hoặc kích hoạt hợp đồng, kiểm tra sức chứa (dưới khóa phòng)
+        new_number_of_tenants = data.number_of_tenants if data.number_of_tenants is not None else old_number_of_tenants
+        activating = data.status == ContractStatus.ACTIVE.value and old_status != ContractStatus.ACTIVE.value
+        if new_number_of_tenants != old_number_of_tenants or activating:
+            # Tính tổng số người sau khi thay đổi (loại trừ hợp đồng hiện tại)
+            room, current_tenants = self._lock_room_occupancy(
+                contract_orm.room_id,
+                exclude_contract_id=contract_id
+            )
+            total_after_change = current_tenants + new_number_of_tenants
+            
+            if total_after_change > room.capacity:
+                raise ValueError(
+                    f"Phòng {room.room_number} chỉ còn {room.capacity - current_tenants}/{room.capacity} chỗ trống. "
+                    f"Không thể xếp {new_number_of_tenants} người cho hợp đồng {contract_orm.contract_number}."
                 )
-                total_after_change = current_tenants + data.number_of_tenants
-                
-                if total_after_change > room.capacity:
-                    raise ValueError(
-                        f"Phòng {room.room_number} chỉ còn {room.capacity - current_tenants}/{room.capacity} chỗ trống. "
-                        f"Không thể tăng lên {data.number_of_tenants} người."
-                    )
         
         # 3. Update hợp đồng
         contract_orm = self.contract_repo.update(contract_orm, data)
@@ -445,6 +513,7 @@ class ContractService:
         else:
             print(f"ℹ️ User {tenant_id} not downgraded: {msg}")
     
+    @retry_on_conflict
     def confirm_contract(self, contract_id: UUID, tenant_id: UUID) -> ContractOut:
         """Tenant xác nhận hợp đồng PENDING → chuyển sang ACTIVE.
         
@@ -551,9 +620,28 @@ class ContractService:
                 }
             }
         """
-        # Lấy tất cả hợp đồng ACTIVE của phòng (đã sắp xếp theo created_at)
-        contracts = self.contract_repo.get_active_contracts_by_room(room_id)
+        return self.get_rooms_tenants_info([room_id])[room_id]
+
+    def get_rooms_tenants_info(self, room_ids: list[UUID]) -> dict[UUID, dict]:
+        """Bản batch của get_room_tenants_info cho nhiều phòng.
         
+        Hợp đồng ACTIVE (kèm tenant) của tất cả phòng được lấy bằng một query
+        qua batch loader thay vì một query cho mỗi phòng.
+        
+        Args:
+            room_ids: Danh sách UUID phòng
+            
+        Returns:
+            Dict room_id -> thông tin người thuê (cùng cấu trúc get_room_tenants_info)
+        """
+        contracts_by_room = self.loaders.active_contracts.load_many(room_ids)
+        return {
+            room_id: self._build_tenants_info(contracts)
+            for room_id, contracts in zip(room_ids, contracts_by_room)
+        }
+
+    def _build_tenants_info(self, contracts: list) -> dict:
+        """Tổng hợp thông tin người thuê từ các hợp đồng ACTIVE của một phòng (cũ nhất trước)."""
         if not contracts:
             return {
                 "total_tenants": 0,
@@ -610,7 +698,7 @@ class ContractService:
             "other_tenants": other_tenants
         }
         
-    async def request_contract_termination(self, contract_id: UUID, requester_id: UUID, current_user: User) -> tuple[ContractOut, str]:
+    def request_contract_termination(self, contract_id: UUID, requester_id: UUID, current_user: User) -> tuple[ContractOut, str]:
         """Xử lý yêu cầu chấm dứt hợp đồng.
         
         Args:
@@ -653,7 +741,7 @@ class ContractService:
         
         return ContractOut.model_validate(updated_contract_orm), requester_role
 
-    async def approve_contract_termination(self, contract_id: UUID, approver_id: UUID, current_user: User) -> ContractOut:
+    def approve_contract_termination(self, contract_id: UUID, approver_id: UUID, current_user: User) -> ContractOut:
         """Phê duyệt yêu cầu chấm dứt hợp đồng.
         
         Args:
@@ -793,6 +881,7 @@ class ContractService:
             "pending_change": ContractPendingChangeOut.model_validate(pending_change)
         }
     
+    @retry_on_conflict
     def confirm_contract_update(self, contract_id: UUID, tenant_id: UUID) -> ContractOut:
         """Tenant xác nhận thay đổi hợp đồng → Áp dụng pending changes.
         
@@ -829,8 +918,21 @@ class ContractService:
         if not pending_change:
             raise ValueError("Không tìm thấy thay đổi chờ xác nhận")
         
-        # Áp dụng các thay đổi
+        # Đổi số người: kiểm tra sức chứa dưới khóa phòng trước khi áp dụng
         changes = pending_change.changes
+        new_number_of_tenants = changes.get("number_of_tenants")
+        if new_number_of_tenants is not None and new_number_of_tenants != contract_orm.number_of_tenants:
+            room, current_tenants = self._lock_room_occupancy(
+                contract_orm.room_id,
+                exclude_contract_id=contract_id
+            )
+            if current_tenants + new_number_of_tenants > room.capacity:
+                raise ValueError(
+                    f"Phòng {room.room_number} chỉ còn {room.capacity - current_tenants}/{room.capacity} chỗ trống. "
+                    f"Không thể tăng lên {new_number_of_tenants} người."
+                )
+        
+        # Áp dụng các thay đổi
         for key, value in changes.items():
             if hasattr(contract_orm, key):
                 setattr(contract_orm, key, value)
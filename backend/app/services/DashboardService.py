@@ -6,20 +6,56 @@ Service tổng hợp dữ liệu từ nhiều nguồn để hiển thị dashboa
 - Contract stats (hợp đồng)
 - Recent activities (hoạt động gần đây)
 - Pending appointments (lịch hẹn chờ xác nhận)
+
+Các section độc lập được chạy song song trên thread pool, mỗi section dùng
+một session riêng lấy từ connection pool, có timeout riêng và trả kết quả
+một phần nếu section nào đó chậm/lỗi.
 """
 
 from __future__ import annotations
 
-from typing import Optional, List, Dict, Any
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Optional, List, Dict, Any, Callable
 from uuid import UUID
 from datetime import datetime, timedelta
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import or_, and_, desc
+from sqlalchemy.orm import Session, joinedload, sessionmaker
+from sqlalchemy import or_, and_, desc, text
 
+from app.core.settings import settings
+from app.infrastructure.db.session import SessionLocal
 from app.models import Room, Contract, Invoice, MaintenanceRequest, Appointment
 from app.models.user import User
-from app.services.MaintenanceService import MaintenanceService
-from app.services.ContractService import ContractService
+from app.repositories.building_stats_repository import BuildingStatsRepository
+
+logger = logging.getLogger(__name__)
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Thread pool dùng chung cho các section dashboard, khởi tạo lazy."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.DASHBOARD_WORKERS,
+                    thread_name_prefix="dashboard",
+                )
+    return _executor
+
+
+def shutdown_dashboard_executor() -> None:
+    """Dừng thread pool dashboard (gọi khi tắt ứng dụng)."""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
 
 
 class DashboardService:
@@ -36,10 +72,10 @@ class DashboardService:
         db: SQLAlchemy Session được inject từ FastAPI Depends.
     """
 
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, session_factory: sessionmaker = SessionLocal):
         self.db = db
-        self.maintenance_service = MaintenanceService(db)
-        self.contract_service = ContractService(db)
+        self.session_factory = session_factory
+        self.stats_repo = BuildingStatsRepository(db)
 
     def _get_user_full_name(self, user: User) -> str:
         """Helper để lấy tên đầy đủ của user.
@@ -53,7 +89,7 @@ class DashboardService:
         return f"{first_name} {last_name}".strip() or "N/A"
 
     def get_room_stats(self, building_id: Optional[UUID] = None) -> Dict[str, Any]:
-        """Lấy thống kê phòng.
+        """Lấy thống kê phòng (đọc từ bảng tổng hợp building_stats).
         
         Args:
             building_id: Filter theo tòa nhà (optional)
@@ -65,46 +101,23 @@ class DashboardService:
             - occupied_rooms: Phòng đang thuê (OCCUPIED)
             - revenue: Tổng doanh thu từ phòng đang thuê
         """
-        room_query = self.db.query(Room)
-        if building_id:
-            room_query = room_query.filter(Room.building_id == building_id)
-        
-        rooms = room_query.all()
-        total_rooms = len(rooms)
-        
-        # Đếm phòng trống
-        empty_rooms = sum(1 for r in rooms if r.status == "AVAILABLE")
-        
-        # Tính doanh thu từ phòng đang thuê
-        occupied_rooms = [r for r in rooms if r.status == "OCCUPIED"]
-        revenue = sum(float(r.base_price or 0) for r in occupied_rooms)
-        
-        return {
-            "total_rooms": total_rooms,
-            "empty_rooms": empty_rooms,
-            "occupied_rooms": len(occupied_rooms),
-            "revenue": revenue
-        }
+        return self._room_stats(self.stats_repo.get_totals(building_id))
 
     def get_maintenance_stats(
         self, 
         user_id: UUID, 
         building_id: Optional[UUID] = None
     ) -> Dict[str, Any]:
-        """Lấy thống kê sự cố/bảo trì.
+        """Lấy thống kê sự cố/bảo trì (toàn bộ requests, góc nhìn admin).
         
         Args:
             user_id: ID của admin
             building_id: Filter theo tòa nhà (optional)
             
         Returns:
-            Dict chứa total, pending, in_progress, completed
+            Dict chứa total_requests, pending, not_processed, processed
         """
-        return self.maintenance_service.get_stats(
-            user_id=user_id,
-            is_admin=True,
-            building_id=building_id
-        )
+        return self._maintenance_stats(self.stats_repo.get_totals(building_id))
 
     def get_contract_stats(self) -> Dict[str, Any]:
         """Lấy thống kê hợp đồng.
@@ -116,7 +129,34 @@ class DashboardService:
             - expiring_soon: Sắp hết hạn
             - expired_contracts: Đã hết hạn
         """
-        return self.contract_service.get_contract_stats()
+        return self._contract_stats(self.stats_repo.get_totals())
+
+    @staticmethod
+    def _room_stats(totals: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "total_rooms": totals["total_rooms"],
+            "empty_rooms": totals["empty_rooms"],
+            "occupied_rooms": totals["occupied_rooms"],
+            "revenue": float(totals["revenue"] or 0)
+        }
+
+    @staticmethod
+    def _maintenance_stats(totals: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "total_requests": totals["maintenance_total"],
+            "pending": totals["maintenance_in_progress"],  # "Đang xử lý" = IN_PROGRESS
+            "not_processed": totals["maintenance_pending"],  # "Chưa xử lý" = PENDING
+            "processed": totals["maintenance_processed"],  # "Đã xử lý" = COMPLETED + CANCELLED
+        }
+
+    @staticmethod
+    def _contract_stats(totals: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "total_contracts": totals["total_contracts"],
+            "active_contracts": totals["active_contracts"],
+            "expiring_soon": totals["expiring_soon"],
+            "expired_contracts": totals["expired_contracts"]
+        }
 
     def get_recent_activities(
         self, 
@@ -166,21 +206,12 @@ class DashboardService:
                 if inv.contract.room:
                     room_number = inv.contract.room.room_number
             
-            # Tính total_amount
-            total_amount = float(inv.room_price or 0) + float(inv.service_fee or 0) + float(inv.internet_fee or 0) + float(inv.parking_fee or 0) + float(inv.other_fees or 0)
-            # Tính tiền điện
-            if inv.electricity_new_index and inv.electricity_old_index:
-                electricity_usage = inv.electricity_new_index - inv.electricity_old_index
-                total_amount += electricity_usage * float(inv.electricity_unit_price or 0)
-            # Tính tiền nước
-            total_amount += float(inv.number_of_people or 1) * float(inv.water_unit_price or 0)
-            
             activities.append({
                 "id": f"payment-{inv.id}",
                 "type": "payment",
                 "title": "Thanh toán hóa đơn",
                 "description": f"{tenant_name} - Phòng {room_number}",
-                "amount": total_amount,
+                "amount": float(inv.total_amount or 0),
                 "created_at": (inv.updated_at or inv.created_at).isoformat() if (inv.updated_at or inv.created_at) else None,
                 "status": inv.status
             })
@@ -361,11 +392,92 @@ class DashboardService:
         Returns:
             Dict chứa tất cả dữ liệu dashboard
         """
+        sections: Dict[str, Callable[[DashboardService], Any]] = {
+            # Room/maintenance/contract stats: một query trên bảng building_stats
+            "stats": lambda svc: svc.stats_repo.get_totals(building_id),
+            "recent_activities": lambda svc: svc.get_recent_activities(building_id),
+            "pending_appointments": lambda svc: svc.get_pending_appointments(building_id),
+        }
+        results, meta = self._run_sections(sections)
+
+        totals = results.get("stats")
         return {
-            "room_stats": self.get_room_stats(building_id),
-            "maintenance_stats": self.get_maintenance_stats(user_id, building_id),
-            "contract_stats": self.get_contract_stats(),
-            "recent_activities": self.get_recent_activities(building_id),
-            "pending_appointments": self.get_pending_appointments(building_id),
-            "building_filter": str(building_id) if building_id else None
+            "room_stats": self._room_stats(totals) if totals else None,
+            "maintenance_stats": self._maintenance_stats(totals) if totals else None,
+            "contract_stats": self._contract_stats(totals) if totals else None,
+            "recent_activities": results.get("recent_activities") or [],
+            "pending_appointments": results.get("pending_appointments") or [],
+            "building_filter": str(building_id) if building_id else None,
+            "meta": meta,
+        }
+
+    def _run_section(
+        self, fn: Callable[[DashboardService], Any]
+    ) -> tuple[Any, float, Optional[Exception]]:
+        """Chạy một section trên session riêng.
+
+        ``statement_timeout`` của Postgres được đặt theo timeout của section để
+        query chậm bị hủy phía DB thay vì giữ connection sau khi đã trả response.
+
+        Returns:
+            Tuple (kết quả, thời gian chạy ms, exception nếu lỗi).
+        """
+        started = time.perf_counter()
+        db = self.session_factory()
+        try:
+            timeout_ms = int(settings.DASHBOARD_SECTION_TIMEOUT_SECONDS * 1000)
+            db.execute(text(f"SET LOCAL statement_timeout = {timeout_ms}"))
+            value = fn(DashboardService(db, self.session_factory))
+            return value, (time.perf_counter() - started) * 1000, None
+        except Exception as exc:
+            logger.exception("Dashboard section failed")
+            return None, (time.perf_counter() - started) * 1000, exc
+        finally:
+            db.rollback()
+            db.close()
+
+    def _run_sections(
+        self, sections: Dict[str, Callable[[DashboardService], Any]]
+    ) -> tuple[Dict[str, Any], Dict[str, Any]]:
+        """Fan-out các section song song, chờ tối đa DASHBOARD_SECTION_TIMEOUT_SECONDS.
+
+        Returns:
+            Tuple (kết quả theo section, meta gồm timings_ms/errors/partial).
+            Section timeout hoặc lỗi sẽ không có trong kết quả và được ghi vào errors.
+        """
+        executor = _get_executor()
+        started = time.perf_counter()
+        futures: Dict[str, Future] = {
+            name: executor.submit(self._run_section, fn)
+            for name, fn in sections.items()
+        }
+
+        deadline = started + settings.DASHBOARD_SECTION_TIMEOUT_SECONDS
+        results: Dict[str, Any] = {}
+        timings: Dict[str, Optional[float]] = {}
+        errors: Dict[str, str] = {}
+        for name, future in futures.items():
+            try:
+                value, elapsed_ms, exc = future.result(
+                    timeout=max(0.0, deadline - time.perf_counter())
+                )
+            except FutureTimeoutError:
+                # Thread không hủy được; session của section tự đóng khi chạy xong
+                future.cancel()
+                errors[name] = "timeout"
+                timings[name] = None
+                continue
+
+            timings[name] = round(elapsed_ms, 1)
+            if exc is not None:
+                errors[name] = str(exc)
+            else:
+                results[name] = value
+
+        total_ms = round((time.perf_counter() - started) * 1000, 1)
+        logger.info("Dashboard sections: total=%sms %s errors=%s", total_ms, timings, errors or None)
+        return results, {
+            "timings_ms": {**timings, "total": total_ms},
+            "errors": errors,
+            "partial": bool(errors),
         }
@@ -0,0 +1,95 @@
+"""Document Number Service - sinh mã hợp đồng / mã hóa đơn.
+
+Số thứ tự lấy từ bộ đếm ``document_counters`` (xem
+``DocumentCounterRepository``), không đọc MAX/COUNT của bảng chứng từ nên
+không cấp trùng khi tạo đồng thời và không bị giới hạn ở 999.
+
+Định dạng:
+- Hợp đồng: ``HD001``, ``HD002``... (``HD1000`` sau ``HD999``)
+- Hóa đơn: ``INV-YYYYMM-001`` theo tháng tính tiền, đánh lại từ 001 mỗi tháng
+
+Mã hợp đồng có thể nhập tay. Mã nhập tay đúng dạng ``HD<số>`` đẩy bộ đếm lên
+ít nhất số đó (``note_contract_number``); nếu bộ đếm vẫn cấp trúng mã đã có
+(mã nhập tay lưu trước khi có bước này), bộ đếm được đưa lên trên mã lớn nhất
+rồi cấp lại - mã tự sinh không bao giờ kẹt ở một mã đã tồn tại.
+"""
+
+from __future__ import annotations
+
+import re
+from datetime import date
+
+from sqlalchemy.orm import Session
+
+from app.repositories.contract_repository import ContractRepository
+from app.repositories.document_counter_repository import DocumentCounterRepository
+
+CONTRACT_PREFIX = "HD"
+INVOICE_PREFIX = "INV"
+
+_CONTRACT_NUMBER_RE = re.compile(rf"^{CONTRACT_PREFIX}(\d+)$")
+
+
+class DocumentNumberService:
+    """Service cấp mã chứng từ.
+
+    Số được cấp trong transaction của ``db`` - gọi ngay trước khi insert
+    chứng từ và commit cùng lúc (xem ghi chú khóa trong repository).
+
+    Args:
+        db: SQLAlchemy Session.
+    """
+
+    def __init__(self, db: Session):
+        self.counter_repo = DocumentCounterRepository(db)
+        self.contract_repo = ContractRepository(db)
+
+    def next_contract_number(self) -> str:
+        """Mã hợp đồng kế tiếp (``HD001``)."""
+        return self.reserve_contract_numbers(1)[0]
+
+    def reserve_contract_numbers(self, count: int) -> list[str]:
+        """Cấp trước một khối ``count`` mã hợp đồng liên tiếp chưa được dùng."""
+        numbers = self._allocate_contract_numbers(count)
+        if self.contract_repo.get_existing_numbers(numbers):
+            # Mã nhập tay đã vượt trước bộ đếm: đưa bộ đếm lên trên mã lớn nhất rồi cấp lại
+            self.counter_repo.raise_to(
+                CONTRACT_PREFIX, "", self.contract_repo.get_max_sequence_number(CONTRACT_PREFIX)
+            )
+            numbers = self._allocate_contract_numbers(count)
+        return numbers
+
+    def note_contract_number(self, contract_number: str) -> None:
+        """Ghi nhận mã hợp đồng nhập tay: đẩy bộ đếm lên nếu mã có dạng ``HD<số>``.
+
+        Gọi trong transaction tạo hợp đồng, trước khi insert.
+        """
+        match = _CONTRACT_NUMBER_RE.match(contract_number)
+        if match:
+            self.counter_repo.raise_to(CONTRACT_PREFIX, "", int(match.group(1)))
+
+    def _allocate_contract_numbers(self, count: int) -> list[str]:
+        return [
+            f"{CONTRACT_PREFIX}{number:03d}"
+            for number in self.counter_repo.allocate(CONTRACT_PREFIX, count=count)
+        ]
+
+    def next_invoice_number(self, billing_month: date) -> str:
+        """Mã hóa đơn kế tiếp của tháng tính tiền (``INV-YYYYMM-001``)."""
+        return self.reserve_invoice_numbers(billing_month, 1)[0]
+
+    def reserve_invoice_numbers(self, billing_month: date, count: int) -> list[str]:
+        """Cấp trước một khối ``count`` mã hóa đơn của tháng (dùng cho lập hóa đơn hàng loạt).
+
+        Args:
+            billing_month: Tháng tính tiền (chỉ dùng năm/tháng).
+            count: Số mã cần cấp.
+
+        Returns:
+            List mã hóa đơn theo thứ tự tăng dần.
+        """
+        period = billing_month.strftime("%Y%m")
+        return [
+            f"{INVOICE_PREFIX}-{period}-{number:03d}"
+            for number in self.counter_repo.allocate(INVOICE_PREFIX, period, count)
+        ]
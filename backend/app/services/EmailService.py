@@ -1,32 +1,64 @@
 """Email Service - Gửi email thông báo.
 
-Service này xử lý việc gửi email cho các thông báo trong hệ thống.
+Service này dựng nội dung email cho các thông báo trong hệ thống và đưa vào
+hàng đợi ``email_outbox``. Việc gửi SMTP do worker nền
+(``app.infrastructure.mailer``) đảm nhận nên request không phải chờ SMTP.
 """
 
 from __future__ import annotations
 
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
 from typing import Optional
 
 from app.core.settings import settings
+from app.infrastructure.mailer import SMTPConnection, build_message, smtp_configured
+from app.models.email_outbox import EmailOutbox
 
 
 class EmailService:
-    """Service gửi email thông báo."""
+    """Service dựng và xếp hàng email thông báo."""
 
     def __init__(self):
-        self.smtp_host = settings.SMTP_HOST
-        self.smtp_port = settings.SMTP_PORT
-        self.smtp_user = settings.SMTP_USER
-        self.smtp_password = settings.SMTP_PASSWORD
-        self.from_email = settings.SMTP_FROM_EMAIL or settings.SMTP_USER
         self.from_name = settings.SMTP_FROM_NAME
 
     def _is_configured(self) -> bool:
         """Kiểm tra email đã được cấu hình chưa."""
-        return bool(self.smtp_user and self.smtp_password)
+        return smtp_configured()
+
+    def enqueue_email(
+        self,
+        session,
+        to_email: str,
+        subject: str,
+        html_content: str,
+        text_content: Optional[str] = None,
+    ) -> Optional[EmailOutbox]:
+        """Thêm email vào outbox (chưa commit).
+
+        Email được commit cùng transaction với thay đổi nghiệp vụ của caller,
+        nên không có email "mồ côi" khi nghiệp vụ rollback. Email chưa được
+        cấu hình thì bỏ qua (không tạo dòng outbox).
+
+        Args:
+            session: Session hoặc AsyncSession của caller
+            to_email: Email người nhận
+            subject: Tiêu đề email
+            html_content: Nội dung HTML
+            text_content: Nội dung text thuần (optional)
+
+        Returns:
+            EmailOutbox vừa được add vào session, None nếu email chưa được cấu hình
+        """
+        if not self._is_configured():
+            return None
+
+        email = EmailOutbox(
+            to_email=to_email,
+            subject=subject,
+            html_content=html_content,
+            text_content=text_content,
+        )
+        session.add(email)
+        return email
 
     def send_email(
         self,
@@ -35,7 +67,7 @@ class EmailService:
         html_content: str,
         text_content: Optional[str] = None,
     ) -> bool:
-        """Gửi email.
+        """Gửi email ngay (đồng bộ, kết nối SMTP riêng) - chỉ dùng cho script.
 
         Args:
             to_email: Email người nhận
@@ -50,37 +82,20 @@ class EmailService:
             print("[EmailService] Email chưa được cấu hình, bỏ qua gửi email")
             return False
 
+        connection = SMTPConnection()
         try:
-            # Tạo message
-            msg = MIMEMultipart("alternative")
-            msg["Subject"] = subject
-            msg["From"] = f"{self.from_name} <{self.from_email}>"
-            msg["To"] = to_email
-
-            # Thêm text part
-            if text_content:
-                part1 = MIMEText(text_content, "plain", "utf-8")
-                msg.attach(part1)
-
-            # Thêm HTML part
-            part2 = MIMEText(html_content, "html", "utf-8")
-            msg.attach(part2)
-
-            # Gửi email
-            with smtplib.SMTP(self.smtp_host, self.smtp_port) as server:
-                server.starttls()
-                server.login(self.smtp_user, self.smtp_password)
-                server.sendmail(self.from_email, to_email, msg.as_string())
-
+            connection.send(build_message(to_email, subject, html_content, text_content))
             print(f"[EmailService] Đã gửi email thành công đến {to_email}")
             return True
-
         except Exception as e:
             print(f"[EmailService] Lỗi gửi email: {e}")
             return False
+        finally:
+            connection.close()
 
-    def send_appointment_status_notification(
+    def enqueue_appointment_status_notification(
         self,
+        session,
         to_email: str,
         customer_name: str,
         room_number: str,
@@ -91,10 +106,11 @@ class EmailService:
         building_address: Optional[str] = None,
         ward_name: Optional[str] = None,
         city_name: Optional[str] = None,
-    ) -> bool:
-        """Gửi email thông báo cập nhật trạng thái lịch hẹn.
+    ) -> Optional[EmailOutbox]:
+        """Xếp hàng email thông báo cập nhật trạng thái lịch hẹn.
 
         Args:
+            session: Session hoặc AsyncSession của caller (commit cùng nghiệp vụ)
             to_email: Email người đặt lịch
             customer_name: Tên khách hàng
             room_number: Số phòng
@@ -107,7 +123,7 @@ class EmailService:
             city_name: Tỉnh/Thành phố
 
         Returns:
-            True nếu gửi thành công
+            EmailOutbox vừa được add vào session, None nếu email chưa được cấu hình
         """
         # Map status sang tiếng Việt
         status_map = {
@@ -224,7 +240,7 @@ class EmailService:
         {self.from_name}
         """
 
-        return self.send_email(to_email, subject, html_content, text_content)
+        return self.enqueue_email(session, to_email, subject, html_content, text_content)
 
 
 # Singleton instance
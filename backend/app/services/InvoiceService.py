@@ -10,17 +10,19 @@ from uuid import UUID
 from datetime import date, datetime
 from decimal import Decimal
 from sqlalchemy.orm import Session
-from sqlalchemy import func, extract
 
 from app.repositories.invoice_repository import InvoiceRepository
 from app.repositories.contract_repository import ContractRepository
 from app.repositories.building_repository import BuildingRepository
 from app.repositories.room_repository import RoomRepository
+from app.repositories.meter_reading_repository import MeterReadingRepository
+from app.services.DocumentNumberService import DocumentNumberService
 from app.schemas.invoice_schema import (
     InvoiceCreate, InvoiceUpdate, InvoiceOut, InvoiceListItem,
-    BuildingOption, RoomOption, ServiceFeeItem
+    BuildingOption, RoomOption, ServiceFeeItem,
+    InvoiceBulkCreate, InvoiceBulkResult, InvoiceBulkResultItem, MeterReadingItem
 )
-from app.models.invoice import Invoice
+from app.models.invoice import Invoice, calculate_invoice_total
 from app.models.building import Building
 from app.models.room import Room
 from app.models.contract import Contract
@@ -28,6 +30,24 @@ from app.models.user import User
 from app.core.Enum.invoiceEnum import InvoiceStatus
 from app.core.Enum.contractEnum import ContractStatus
 from app.core.utils.uuid import generate_uuid7
+from app.core.pagination import cursor_pagination
+
+# Đơn giá mặc định khi phòng chưa cấu hình giá điện/nước
+DEFAULT_ELECTRICITY_PRICE = Decimal("3500")
+DEFAULT_WATER_PRICE_PER_PERSON = Decimal("80000")
+
+
+def summarize_service_fees(fees: List[ServiceFeeItem]) -> tuple[Decimal, str]:
+    """Tổng phí dịch vụ và mô tả ("Internet: 100,000đ, Vệ sinh: 30,000đ (tầng 2)")."""
+    total = Decimal(0)
+    parts = []
+    for fee in fees:
+        total += fee.amount
+        desc = f"{fee.name}: {fee.amount:,.0f}đ"
+        if fee.description:
+            desc += f" ({fee.description})"
+        parts.append(desc)
+    return total, ", ".join(parts)
 
 
 class InvoiceService:
@@ -43,6 +63,8 @@ class InvoiceService:
         self.contract_repo = ContractRepository(db)
         self.building_repo = BuildingRepository(db)
         self.room_repo = RoomRepository(db)
+        self.meter_repo = MeterReadingRepository(db)
+        self.numbers = DocumentNumberService(db)
     
     def get_buildings_for_dropdown(self) -> List[BuildingOption]:
         """Lấy danh sách tòa nhà cho dropdown."""
@@ -127,14 +149,16 @@ class InvoiceService:
         billing_year = invoice_data.billing_month.year
         billing_month_num = invoice_data.billing_month.month
         
+        # Khóa tháng tính tiền để không tạo trùng khi có thao tác lập hóa đơn song song
+        self.invoice_repo.lock_billing_month(invoice_data.billing_month)
         if self.invoice_repo.exists_for_contract_month(contract.id, billing_year, billing_month_num):
             raise ValueError(f"Đã tồn tại hóa đơn cho tháng {billing_month_num}/{billing_year}")
         
         # Lấy thông tin giá từ hợp đồng/phòng
         room = contract.room
         room_price = contract.rental_price  # Giá thuê từ hợp đồng
-        electricity_unit_price = room.electricity_price if room.electricity_price else Decimal("3500")
-        water_unit_price = room.water_price_per_person if room.water_price_per_person else Decimal("80000")
+        electricity_unit_price = room.electricity_price if room.electricity_price else DEFAULT_ELECTRICITY_PRICE
+        water_unit_price = room.water_price_per_person if room.water_price_per_person else DEFAULT_WATER_PRICE_PER_PERSON
         
         # Tính tiền điện
         electricity_usage = 0
@@ -147,32 +171,10 @@ class InvoiceService:
         parking_fee = invoice_data.parking_fee if invoice_data.parking_fee else Decimal(0)
         
         # Service fees từ danh sách service_fees
-        service_fee = Decimal(0)
-        service_fee_description = ""
+        service_fee, service_fee_description = summarize_service_fees(invoice_data.service_fees or [])
         
-        if invoice_data.service_fees:
-            for fee in invoice_data.service_fees:
-                service_fee += fee.amount
-                if service_fee_description:
-                    service_fee_description += ", "
-                desc = f"{fee.name}: {fee.amount:,.0f}đ"
-                if fee.description:
-                    desc += f" ({fee.description})"
-                service_fee_description += desc
-        
-        # Generate invoice_number (format: INV-YYYYMM-XXX)
-        # Đếm số invoice đã tạo trong tháng này (toàn hệ thống)
-        month_invoice_count = (
-            self.db.query(func.count(Invoice.id))
-            .filter(
-                extract('year', Invoice.billing_month) == billing_year,
-                extract('month', Invoice.billing_month) == billing_month_num
-            )
-            .scalar()
-        ) or 0
-        
-        billing_year_month = invoice_data.billing_month.strftime("%Y%m")
-        invoice_number = f"INV-{billing_year_month}-{month_invoice_count + 1:03d}"
+        # Generate invoice_number (format: INV-YYYYMM-XXX) từ bộ đếm theo tháng
+        invoice_number = self.numbers.next_invoice_number(invoice_data.billing_month)
         
         # Tạo invoice dict
         invoice_dict = {
@@ -200,6 +202,138 @@ class InvoiceService:
         # Convert to InvoiceOut
         return self._invoice_to_out(invoice)
     
+    def generate_monthly_invoices(self, data: InvoiceBulkCreate, created_by: UUID) -> InvoiceBulkResult:
+        """Lập hóa đơn tháng cho mọi hợp đồng ACTIVE của một tòa nhà (hoặc tất cả).
+        
+        Luồng (một transaction):
+        1. Khóa tháng tính tiền (không chạy song song với lập hóa đơn khác cùng tháng)
+        2. Một query lấy hợp đồng + phòng + chỉ số điện của hóa đơn tháng trước
+        3. Ghép chỉ số điện theo phòng (gửi kèm request, nếu không có thì lấy chỉ
+           số đã import từ file), tính tiền từng hợp đồng
+        4. Cấp một khối mã hóa đơn, insert tất cả bằng một lệnh, đánh dấu chỉ số
+           import đã dùng, commit một lần
+        
+        Hợp đồng đã có hóa đơn tháng này được bỏ qua (SKIPPED); chỉ số điện sai
+        (mới < cũ) hoặc của phòng không có hợp đồng cần lập được báo ERROR.
+        Phòng ở ghép: chỉ số điện của phòng tính vào hóa đơn của người đại diện
+        (hợp đồng cũ nhất chưa có hóa đơn tháng này), các hợp đồng còn lại không
+        có tiền điện.
+        
+        Args:
+            data: Tháng, hạn thanh toán, tòa nhà và chỉ số điện theo phòng
+            created_by: UUID của user lập hóa đơn
+            
+        Returns:
+            InvoiceBulkResult với kết quả từng hợp đồng
+        """
+        billing_month = data.billing_month
+        self.invoice_repo.lock_billing_month(billing_month)
+        
+        candidates = self.invoice_repo.get_billing_candidates(billing_month, data.building_id)
+        readings = {reading.room_id: reading for reading in data.readings}
+        staged_rooms: set[UUID] = set()
+        if data.use_staged_readings:
+            for staged in self.meter_repo.get_staged(billing_month, data.building_id):
+                if staged.room_id not in readings:
+                    staged_rooms.add(staged.room_id)
+                    readings[staged.room_id] = MeterReadingItem(
+                        room_id=staged.room_id,
+                        electricity_new_index=staged.electricity_new_index,
+                        electricity_old_index=staged.electricity_old_index,
+                    )
+        applied: dict[UUID, UUID] = {}
+        
+        result = InvoiceBulkResult(billing_month=billing_month)
+        pending: list[tuple[dict, InvoiceBulkResultItem]] = []
+        
+        for row in candidates:
+            item = InvoiceBulkResultItem(
+                status="CREATED",
+                room_id=row.room_id,
+                room_number=row.room_number,
+                building_name=row.building_name,
+                contract_id=row.contract_id,
+                contract_number=row.contract_number,
+                tenant_id=row.tenant_id,
+                tenant_name=f"{row.last_name} {row.first_name}",
+            )
+            result.items.append(item)
+            
+            if row.has_invoice:
+                item.status = "SKIPPED"
+                item.message = f"Đã tồn tại hóa đơn cho tháng {billing_month.month}/{billing_month.year}"
+                continue
+            
+            # Lấy chỉ số sau khi bỏ qua hợp đồng đã có hóa đơn: ở ghép, chỉ số của phòng
+            # thuộc về hợp đồng đầu tiên thực sự được lập hóa đơn
+            reading = readings.pop(row.room_id, None)
+            
+            # Chỉ số cũ luôn được điền: nhập tay > hóa đơn gần nhất > chỉ số lúc ký hợp đồng.
+            # Chưa có chỉ số mới thì để trống, nhập sau khi ghi điện.
+            old_index = reading.electricity_old_index if reading else None
+            if old_index is None:
+                old_index = row.previous_electricity_index
+            if old_index is None:
+                old_index = row.initial_electricity_index or 0
+            new_index = None
+            if reading:
+                new_index = reading.electricity_new_index
+                if new_index < old_index:
+                    item.status = "ERROR"
+                    item.message = f"Chỉ số điện mới ({new_index}) nhỏ hơn chỉ số cũ ({old_index})"
+                    continue
+            
+            fees = [ServiceFeeItem.model_validate(fee) for fee in (row.service_fees or [])]
+            service_fee, service_fee_description = summarize_service_fees(fees)
+            values = {
+                "id": generate_uuid7(),
+                "contract_id": row.contract_id,
+                "billing_month": billing_month,
+                "due_date": data.due_date,
+                "room_price": row.rental_price,
+                "electricity_old_index": old_index,
+                "electricity_new_index": new_index,
+                "electricity_unit_price": row.electricity_price or DEFAULT_ELECTRICITY_PRICE,
+                "number_of_people": (reading.number_of_people if reading and reading.number_of_people
+                                     else row.number_of_tenants or 1),
+                "water_unit_price": row.water_price_per_person or DEFAULT_WATER_PRICE_PER_PERSON,
+                "service_fee": service_fee,
+                "internet_fee": Decimal(0),
+                "parking_fee": Decimal(0),
+                "other_fees": Decimal(0),
+                "other_fees_description": service_fee_description,
+                "status": InvoiceStatus.PENDING.value,
+                "notes": data.notes,
+            }
+            pending.append((values, item))
+        
+        # Chỉ số điện của phòng không có hợp đồng cần lập hóa đơn
+        for room_id in readings:
+            result.items.append(InvoiceBulkResultItem(
+                status="ERROR",
+                room_id=room_id,
+                message="Phòng không có hợp đồng ACTIVE trong tháng này (hoặc không thuộc tòa nhà đã chọn)",
+            ))
+        
+        # Cấp mã theo khối (một câu SQL) rồi insert tất cả một lần
+        if pending:
+            numbers = self.numbers.reserve_invoice_numbers(billing_month, len(pending))
+            for (values, item), number in zip(pending, numbers):
+                values["invoice_number"] = number
+                item.invoice_id = values["id"]
+                item.invoice_number = number
+                item.total_amount = calculate_invoice_total(values)
+                if values["electricity_new_index"] is not None and item.room_id in staged_rooms:
+                    applied[item.room_id] = values["id"]
+        self.invoice_repo.bulk_create([values for values, _ in pending])
+        self.meter_repo.mark_applied(billing_month, applied)
+        self.db.commit()
+        
+        result.created = sum(1 for item in result.items if item.status == "CREATED")
+        result.skipped = sum(1 for item in result.items if item.status == "SKIPPED")
+        result.failed = sum(1 for item in result.items if item.status == "ERROR")
+        return result
+    
     def get_invoice(self, invoice_id: UUID, user_id: UUID, user_role: str) -> InvoiceOut:
         """Lấy chi tiết hóa đơn.
         
@@ -235,8 +369,11 @@ class InvoiceService:
         user_role: str,
         status: Optional[str] = None,
         building_id: Optional[UUID] = None,
+        sort_by: Optional[str] = None,
         page: int = 1,
-        pageSize: int = 20
+        pageSize: int = 20,
+        cursor: Optional[str] = None,
+        include_total: bool = False
     ) -> dict:
         """Lấy danh sách hóa đơn.
         
@@ -248,11 +385,15 @@ class InvoiceService:
             user_role: Role code
             status: Lọc theo trạng thái
             building_id: Lọc theo tòa nhà (chỉ admin)
+            sort_by: Sắp xếp (amount_asc, amount_desc), mặc định created_at desc
             page: Số trang (bắt đầu từ 1)
             pageSize: Số items mỗi trang
+            cursor: Bật chế độ cursor khi khác None ("" = trang đầu), bỏ qua page
+            include_total: Chế độ cursor: có chạy COUNT để trả totalItems không
             
         Returns:
-            Dict chứa items và pagination (totalItems, page, pageSize, totalPages)
+            Dict chứa items và pagination (totalItems, page, pageSize, totalPages),
+            hoặc (pageSize, next_cursor, totalItems) ở chế độ cursor
         """
         # Validate page và pageSize
         if page < 1:
@@ -269,6 +410,25 @@ class InvoiceService:
         if user_role != "ADMIN":
             building_id = None
         
+        if cursor is not None:
+            items_data, next_cursor = self.invoice_repo.list_with_details_keyset(
+                status_filter=status,
+                building_id=building_id,
+                tenant_id=tenant_id,
+                sort_by=sort_by,
+                cursor=cursor,
+                limit=pageSize
+            )
+            total = self.invoice_repo.count(
+                status_filter=status,
+                building_id=building_id,
+                tenant_id=tenant_id
+            ) if include_total else None
+            return {
+                "items": [InvoiceListItem(**item) for item in items_data],
+                "pagination": cursor_pagination(pageSize, next_cursor, total)
+            }
+        
         # Tính offset
         offset = (page - 1) * pageSize
         
@@ -276,6 +436,7 @@ class InvoiceService:
             status_filter=status,
             building_id=building_id,
             tenant_id=tenant_id,
+            sort_by=sort_by,
             offset=offset,
             limit=pageSize
         )
@@ -388,7 +549,7 @@ class InvoiceService:
         building = room.building
         tenant = contract.tenant
         
-        # Tính toán
+        # Chi tiết từng khoản (tổng tiền đã lưu sẵn trong invoice.total_amount)
         electricity_usage = None
         electricity_cost = Decimal(0)
         if invoice.electricity_new_index is not None and invoice.electricity_old_index is not None:
@@ -397,16 +558,6 @@ class InvoiceService:
         
         water_cost = invoice.number_of_people * invoice.water_unit_price
         
-        total_amount = (
-            invoice.room_price +
-            electricity_cost +
-            water_cost +
-            invoice.service_fee +
-            invoice.internet_fee +
-            invoice.parking_fee +
-            invoice.other_fees
-        )
-        
         return InvoiceOut(
             id=invoice.id,
             invoice_number=invoice.invoice_number,
@@ -431,7 +582,9 @@ class InvoiceService:
             parking_fee=invoice.parking_fee,
             other_fees=invoice.other_fees,
             other_fees_description=invoice.other_fees_description,
-            total_amount=total_amount,
+            total_amount=invoice.total_amount,
+            amount_paid=invoice.amount_paid,
+            amount_due=invoice.amount_due,
             notes=invoice.notes,
             created_at=invoice.created_at,
             updated_at=invoice.updated_at
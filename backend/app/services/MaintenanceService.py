@@ -25,6 +25,8 @@ from app.core.Enum.maintenanceEnum import (
     MaintenancePriority,
     MaintenanceRequestType,
 )
+from app.infrastructure.storage import get_blob_store, is_data_url
+from app.core.pagination import cursor_pagination
 
 
 class MaintenanceService:
@@ -101,10 +103,21 @@ class MaintenanceService:
 
         # Thêm photos nếu có
         if maintenance_data.photos:
+            # Ảnh gửi dạng data URL base64 được chuyển vào vùng riêng tư của blob store, DB chỉ giữ URL/key
+            photo_urls, storage_keys = [], []
+            for photo in maintenance_data.photos:
+                if is_data_url(photo):
+                    blob = get_blob_store().put_data_url(photo, private=True)
+                    photo_urls.append(blob.url)
+                    storage_keys.append(blob.key)
+                else:
+                    photo_urls.append(photo)
+                    storage_keys.append(None)
             self.maintenance_repo.add_photos(
                 request_id=request_id,
-                photo_urls=maintenance_data.photos,
+                photo_urls=photo_urls,
                 uploaded_by=tenant_id,
+                storage_keys=storage_keys,
             )
 
         # Reload để lấy đầy đủ thông tin
@@ -157,6 +170,8 @@ class MaintenanceService:
         room_id: Optional[UUID] = None,
         page: int = 1,
         pageSize: int = 20,
+        cursor: Optional[str] = None,
+        include_total: bool = False,
     ) -> dict:
         """Lấy danh sách maintenance requests với phân quyền.
 
@@ -169,9 +184,12 @@ class MaintenanceService:
             is_admin: True nếu user là admin.
             page: Số trang (bắt đầu từ 1).
             pageSize: Số items mỗi trang (max 100).
+            cursor: Bật chế độ cursor khi khác None ("" = trang đầu), bỏ qua page.
+            include_total: Chế độ cursor: có chạy COUNT để trả totalItems không.
 
         Returns:
-            Dict chứa items và pagination (totalItems, page, pageSize, totalPages).
+            Dict chứa items và pagination (totalItems, page, pageSize, totalPages),
+            hoặc (pageSize, next_cursor, totalItems) ở chế độ cursor.
         """
         # Validate pageSize
         if pageSize > 100:
@@ -202,6 +220,27 @@ class MaintenanceService:
         # Nếu là tenant, chỉ xem requests của mình
         tenant_id = None if is_admin else user_id
 
+        filters = dict(
+            search=search,
+            status=status,
+            priority=priority,
+            request_type=request_type,
+            building_id=building_id,
+            room_id=room_id,
+            tenant_id=tenant_id,
+        )
+
+        if cursor is not None:
+            # Keyset pagination: không OFFSET, COUNT chỉ chạy khi được yêu cầu
+            items_data, next_cursor = self.maintenance_repo.list_with_filters_keyset(
+                **filters, cursor=cursor, limit=pageSize
+            )
+            total = self.maintenance_repo.count(**filters) if include_total else None
+            return {
+                "items": [MaintenanceListItem(**item) for item in items_data],
+                "pagination": cursor_pagination(pageSize, next_cursor, total),
+            }
+
         # Tính offset
         offset = (page - 1) * pageSize
 
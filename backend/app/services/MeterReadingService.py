@@ -0,0 +1,293 @@
+"""Meter Reading Service - import chỉ số điện từ file CSV/XLSX.
+
+Luồng import:
+1. Đọc file theo từng dòng (``app.core.utils.spreadsheet``), parse số/ngày;
+   lỗi định dạng được báo theo dòng, dòng hợp lệ gom thành các cột.
+2. Kiểm tra cả lô trong một query (``MeterReadingRepository.validate_batch``):
+   phòng không tồn tại, không có hợp đồng, trùng phòng, đã có hóa đơn,
+   chỉ số mới < cũ (cũ lấy từ hóa đơn gần nhất), tiêu thụ bất thường so với
+   trung bình các tháng trước.
+3. Lưu các dòng không lỗi vào ``meter_readings`` (STAGED) trong một lệnh -
+   ``InvoiceService.generate_monthly_invoices`` dùng chúng khi lập hóa đơn.
+
+File mẫu (CSV)::
+
+    room_number,new_index,reading_date
+    101,1250,2025-01-31
+    102,980,2025-01-31
+"""
+
+from __future__ import annotations
+
+import re
+from datetime import date, datetime
+from typing import Any, BinaryIO, Optional
+from uuid import UUID
+
+from sqlalchemy.orm import Session
+
+from app.core.Enum.meterReadingEnum import MeterReadingStatus
+from app.core.settings import settings
+from app.core.utils.spreadsheet import iter_rows
+from app.core.utils.uuid import generate_uuid7
+from app.repositories.meter_reading_repository import MeterReadingRepository
+from app.schemas.meter_reading_schema import MeterReadingImportResult, MeterReadingRowResult
+
+# Tên cột được chấp nhận (đã chuẩn hóa bằng spreadsheet.normalize_header)
+ROOM_COLUMNS = ("room_number", "room", "so_phong", "phong")
+CONTRACT_COLUMNS = ("contract_number", "contract", "ma_hop_dong", "hop_dong")
+NEW_INDEX_COLUMNS = ("new_index", "electricity_new_index", "chi_so_moi")
+OLD_INDEX_COLUMNS = ("old_index", "electricity_old_index", "chi_so_cu")
+DATE_COLUMNS = ("reading_date", "date", "ngay_ghi", "ngay")
+
+_DATE_FORMATS = ("%Y-%m-%d", "%d/%m/%Y", "%d-%m-%Y")
+
+
+def _first(raw: dict[str, Any], names: tuple[str, ...]) -> Any:
+    for name in names:
+        value = raw.get(name)
+        if value is not None and str(value).strip() != "":
+            return value
+    return None
+
+
+def _parse_text(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    # Excel lưu "101" thành số 101.0
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value).strip()
+
+
+_GROUPED_INTEGER = re.compile(r"^[1-9]\d{0,2}(?:[.,]\d{3})+$")
+
+
+def _normalize_number_text(text: str, label: str, raw: Any) -> str:
+    """Chuẩn hóa chuỗi số có dấu phân cách nghìn/thập phân về dạng ``float()`` đọc được.
+
+    - Có cả "." và ",": dấu sau cùng là dấu thập phân ("1.250,5", "1,250.5").
+    - Chỉ một loại dấu, đúng dạng nhóm 3 chữ số ("1,250", "1.250", "1.250.000"):
+      là dấu phân cách nghìn của chỉ số nguyên.
+    - Chỉ một dấu, theo sau không phải 3 chữ số ("1250,5", "12.75"): dấu thập phân.
+    - Còn lại ("0,125", "1,25,0", "1.2.3") không xác định được - báo lỗi dòng.
+
+    Raises:
+        ValueError: Chuỗi số mơ hồ, không rõ dấu nào là phân cách nghìn
+    """
+    has_comma, has_dot = "," in text, "." in text
+    if has_comma and has_dot:
+        decimal = "," if text.rfind(",") > text.rfind(".") else "."
+        integer_part, _, fraction = text.rpartition(decimal)
+        if integer_part and not _GROUPED_INTEGER.match(integer_part):
+            raise ValueError(f"{label} không rõ dấu phân cách: {raw}")
+        return integer_part.replace("," if decimal == "." else ".", "") + "." + fraction
+    if not (has_comma or has_dot):
+        return text
+    if _GROUPED_INTEGER.match(text):
+        return text.replace(",", "").replace(".", "")
+    separator = "," if has_comma else "."
+    integer_part, _, fraction = text.partition(separator)
+    if text.count(separator) > 1 or len(fraction) == 3:
+        raise ValueError(f"{label} không rõ dấu phân cách: {raw}")
+    return f"{integer_part}.{fraction}"
+
+
+def _parse_number(value: Any, label: str) -> Optional[float]:
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        number = float(value)
+    else:
+        text = _normalize_number_text(str(value).strip().replace(" ", ""), label, value)
+        try:
+            number = float(text)
+        except ValueError:
+            raise ValueError(f"{label} không phải số: {value}")
+    if number < 0:
+        raise ValueError(f"{label} không được âm: {value}")
+    return number
+
+
+def _parse_date(value: Any) -> Optional[date]:
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    text = str(value).strip()
+    for fmt in _DATE_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).date()
+        except ValueError:
+            continue
+    raise ValueError(f"Ngày ghi không hợp lệ: {value} (dùng YYYY-MM-DD hoặc DD/MM/YYYY)")
+
+
+def _batch_messages(row) -> list[str]:
+    """Thông điệp lỗi/cảnh báo từ các cờ của validate_batch (lỗi trước, cảnh báo sau)."""
+    if row.room_missing:
+        return ["Không tìm thấy phòng/hợp đồng"]
+    messages = []
+    if row.wrong_building:
+        messages.append("Phòng không thuộc tòa nhà đã chọn")
+    if row.no_contract:
+        messages.append("Phòng không có hợp đồng ACTIVE")
+    if row.duplicate:
+        messages.append("Phòng xuất hiện nhiều lần trong file")
+    if row.invoiced:
+        messages.append("Phòng đã có hóa đơn tháng này")
+    if row.decreasing:
+        messages.append(f"Chỉ số mới ({row.new_index:g}) nhỏ hơn chỉ số cũ ({row.old_index:g})")
+    return messages
+
+
+class MeterReadingService:
+    """Service import chỉ số điện.
+
+    Args:
+        db: SQLAlchemy Session.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.meter_repo = MeterReadingRepository(db)
+
+    def import_readings(
+        self,
+        file: BinaryIO,
+        filename: str,
+        billing_month: date,
+        building_id: Optional[UUID],
+        created_by: UUID,
+        dry_run: bool = False,
+    ) -> MeterReadingImportResult:
+        """Kiểm tra và lưu chỉ số điện từ file.
+
+        Dòng lỗi không được lưu; dòng có cảnh báo (tiêu thụ bất thường) vẫn được
+        lưu kèm cảnh báo. ``dry_run`` chỉ kiểm tra, không lưu gì.
+
+        Args:
+            file: File CSV/XLSX (stream nhị phân).
+            filename: Tên file (xác định định dạng).
+            billing_month: Tháng tính tiền của các chỉ số.
+            building_id: Tòa nhà (bắt buộc nếu file dùng số phòng).
+            created_by: UUID của user import.
+            dry_run: True để chỉ kiểm tra.
+
+        Returns:
+            MeterReadingImportResult với số dòng đã lưu và lỗi/cảnh báo theo dòng.
+
+        Raises:
+            ValueError: Nếu file sai định dạng hoặc quá số dòng cho phép.
+        """
+        billing_month = billing_month.replace(day=1)
+        result = MeterReadingImportResult(
+            batch_id=generate_uuid7(), billing_month=billing_month, dry_run=dry_run
+        )
+
+        # 1. Parse từng dòng thành các cột
+        columns: dict[str, list] = {
+            "row_no": [], "room_number": [], "contract_number": [], "new_index": [], "old_index": [],
+        }
+        reading_dates: dict[int, Optional[date]] = {}
+        problems: list[MeterReadingRowResult] = []
+
+        for line_no, raw in iter_rows(file, filename):
+            result.total_rows += 1
+            if result.total_rows > settings.METER_IMPORT_MAX_ROWS:
+                raise ValueError(f"File vượt quá {settings.METER_IMPORT_MAX_ROWS} dòng")
+            try:
+                room_number = _parse_text(_first(raw, ROOM_COLUMNS))
+                contract_number = _parse_text(_first(raw, CONTRACT_COLUMNS))
+                if not room_number and not contract_number:
+                    raise ValueError("Thiếu số phòng hoặc mã hợp đồng")
+                if not contract_number and building_id is None:
+                    raise ValueError("Cần chọn tòa nhà khi xác định phòng bằng số phòng")
+                new_index = _parse_number(_first(raw, NEW_INDEX_COLUMNS), "Chỉ số mới")
+                if new_index is None:
+                    raise ValueError("Thiếu chỉ số mới")
+                old_index = _parse_number(_first(raw, OLD_INDEX_COLUMNS), "Chỉ số cũ")
+                reading_dates[line_no] = _parse_date(_first(raw, DATE_COLUMNS))
+            except ValueError as exc:
+                problems.append(MeterReadingRowResult(row_number=line_no, status="ERROR", messages=[str(exc)]))
+                continue
+
+            columns["row_no"].append(line_no)
+            columns["room_number"].append(room_number)
+            columns["contract_number"].append(contract_number)
+            columns["new_index"].append(new_index)
+            columns["old_index"].append(old_index)
+
+        # 2. Kiểm tra cả lô trong một query
+        to_stage: list[dict] = []
+        staged_rows: dict[UUID, MeterReadingRowResult] = {}
+        if columns["row_no"]:
+            checked = self.meter_repo.validate_batch(
+                billing_month,
+                building_id,
+                columns,
+                outlier_factor=settings.METER_OUTLIER_FACTOR,
+                history_months=settings.METER_OUTLIER_HISTORY_MONTHS,
+            )
+            for row in checked:
+                item = MeterReadingRowResult(
+                    row_number=row.row_no,
+                    status="VALID",
+                    room_id=row.room_id,
+                    room_number=row.room_number,
+                    contract_number=row.contract_number,
+                    old_index=row.old_index,
+                    new_index=row.new_index,
+                    usage=row.usage,
+                    average_usage=row.average_usage,
+                )
+                item.messages = _batch_messages(row)
+                if item.messages:
+                    item.status = "ERROR"
+                    problems.append(item)
+                    continue
+
+                warning = None
+                if row.outlier:
+                    warning = (
+                        f"Tiêu thụ {row.usage:g} kWh cao bất thường "
+                        f"(trung bình {row.average_usage:.0f} kWh)"
+                    )
+                    item.status = "WARNING"
+                    item.messages.append(warning)
+                    problems.append(item)
+
+                staged_rows[row.room_id] = item
+                to_stage.append({
+                    "batch_id": result.batch_id,
+                    "row_number": row.row_no,
+                    "room_id": row.room_id,
+                    "contract_id": row.contract_id,
+                    "billing_month": billing_month,
+                    "reading_date": reading_dates.get(row.row_no),
+                    "electricity_old_index": row.old_index,
+                    "electricity_new_index": row.new_index,
+                    "average_usage": row.average_usage,
+                    "warning": warning,
+                    "status": MeterReadingStatus.STAGED.value,
+                    "created_by": created_by,
+                })
+
+        # 3. Lưu một lần (chỉ số đã dùng để lập hóa đơn không bị ghi đè)
+        if to_stage and not dry_run:
+            stored = self.meter_repo.stage(to_stage)
+            self.db.commit()
+            for room_id, item in staged_rows.items():
+                if room_id not in stored:
+                    item.status = "ERROR"
+                    item.messages.append("Chỉ số tháng này của phòng đã được dùng để lập hóa đơn")
+                    if item not in problems:
+                        problems.append(item)
+            result.staged = len(stored)
+
+        result.rows = sorted(problems, key=lambda item: item.row_number)
+        result.errors = sum(1 for item in result.rows if item.status == "ERROR")
+        result.warnings = sum(1 for item in result.rows if item.status == "WARNING")
+        return result
@@ -8,8 +8,18 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_
 
 from app.models.notification import Notification
+from app.models.notification_counter import NotificationCounter
 from app.core.Enum.notificationEnum import NotificationType
 
+INVOICE_NOTIFICATION_TITLE = "Hóa đơn mới cần thanh toán"
+
+
+def _invoice_notification_content(invoice_number: str, amount: float, due_date: str) -> str:
+    return (
+        f"Bạn có hóa đơn số {invoice_number} với số tiền {amount:,.0f}đ. "
+        f"Hạn thanh toán: {due_date}. Vui lòng thanh toán đúng hạn."
+    )
+
 
 class NotificationService:
     """Service xử lý logic thông báo."""
@@ -105,13 +115,43 @@ class NotificationService:
         """
         return await self.create_notification(
             user_id=user_id,
-            title="Hóa đơn mới cần thanh toán",
-            content=f"Bạn có hóa đơn số {invoice_number} với số tiền {amount:,.0f}đ. Hạn thanh toán: {due_date}. Vui lòng thanh toán đúng hạn.",
+            title=INVOICE_NOTIFICATION_TITLE,
+            content=_invoice_notification_content(invoice_number, amount, due_date),
             notification_type=NotificationType.INVOICE.value,
             related_id=invoice_id,
             related_type="INVOICE"
         )
 
+    async def create_invoice_notifications(self, invoices: List[dict]) -> int:
+        """
+        Tạo thông báo hóa đơn mới cho nhiều người thuê (lập hóa đơn hàng loạt).
+        
+        Thêm tất cả rồi commit một lần thay vì một commit cho mỗi hóa đơn.
+        
+        Args:
+            invoices: List dict gồm user_id, invoice_id, invoice_number, amount, due_date
+            
+        Returns:
+            Số thông báo đã tạo
+        """
+        self.session.add_all([
+            Notification(
+                notification_id=uuid4(),
+                user_id=invoice["user_id"],
+                title=INVOICE_NOTIFICATION_TITLE,
+                content=_invoice_notification_content(
+                    invoice["invoice_number"], invoice["amount"], invoice["due_date"]
+                ),
+                type=NotificationType.INVOICE.value,
+                related_id=invoice["invoice_id"],
+                related_type="INVOICE",
+                is_read=False
+            )
+            for invoice in invoices
+        ])
+        await self.session.commit()
+        return len(invoices)
+
     async def create_appointment_notification_for_admin(
         self,
         admin_ids: List[UUID],
@@ -154,6 +194,9 @@ class NotificationService:
         """
         Đếm tổng số thông báo của người dùng.
         
+        Đọc từ notification_counters (một dòng theo user) thay vì COUNT trên
+        bảng notifications.
+        
         Args:
             user_id: ID người dùng
             is_read: Lọc theo trạng thái đọc (None = tất cả)
@@ -161,14 +204,18 @@ class NotificationService:
         Returns:
             Tổng số thông báo
         """
-        from sqlalchemy import func
-        stmt = select(func.count(Notification.id)).where(Notification.user_id == user_id)
-        
-        if is_read is not None:
-            stmt = stmt.where(Notification.is_read == is_read)
-        
+        stmt = select(NotificationCounter.total_count, NotificationCounter.unread_count).where(
+            NotificationCounter.user_id == user_id
+        )
         result = await self.session.execute(stmt)
-        return result.scalar() or 0
+        row = result.first()
+        if row is None:
+            return 0
+        
+        total, unread = row
+        if is_read is None:
+            return total
+        return total - unread if is_read else unread
 
     async def get_user_notifications(
         self,
@@ -204,20 +251,17 @@ class NotificationService:
         """
         Đếm số lượng thông báo chưa đọc.
         
+        Đọc bộ đếm notification_counters (theo khóa chính), không quét thông báo.
+        
         Args:
             user_id: ID người dùng
             
         Returns:
             Số lượng thông báo chưa đọc
         """
-        stmt = select(Notification).where(
-            and_(
-                Notification.user_id == user_id,
-                Notification.is_read == False
-            )
-        )
+        stmt = select(NotificationCounter.unread_count).where(NotificationCounter.user_id == user_id)
         result = await self.session.execute(stmt)
-        return len(list(result.scalars().all()))
+        return result.scalar() or 0
 
     async def mark_as_read(self, notification_id: UUID) -> Optional[Notification]:
         """
@@ -1,15 +1,17 @@
 """Payment Service - Business logic for payments."""
 
 import uuid
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 from datetime import datetime
-from decimal import Decimal
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 
 from app.models.payment import Payment
 from app.models.invoice import Invoice
 from app.repositories.payment_repository import PaymentRepository
+from app.repositories.payment_webhook_repository import PaymentWebhookRepository
+from app.infrastructure.db.payment_status_events import payment_event
+from app.infrastructure.payos_gateway import PayOSUnavailableError, payos_gateway
 from app.services.PayOSService import payos_service
 from app.schemas.payment_schema import (
     PaymentCreatePayOSRequest,
@@ -17,9 +19,11 @@ from app.schemas.payment_schema import (
     PaymentConfirmCODRequest,
     PayOSPaymentLinkResponse,
     PaymentResponse,
-    PayOSWebhookData
+    PayOSWebhookData,
+    PayOSWebhookRequest
 )
 from app.core.Enum.invoiceEnum import InvoiceStatus
+from app.core.Enum.webhookEnum import WebhookEventStatus
 import logging
 
 logger = logging.getLogger(__name__)
@@ -32,6 +36,7 @@ class PaymentService:
         """Initialize service."""
         self.db = db
         self.repo = PaymentRepository(db)
+        self.webhook_repo = PaymentWebhookRepository(db)
     
     def _get_invoice_or_404(self, invoice_id: uuid.UUID) -> Invoice:
         """Lấy invoice hoặc raise 404."""
@@ -43,27 +48,6 @@ class PaymentService:
             )
         return invoice
     
-    def _calculate_invoice_total(self, invoice: Invoice) -> Decimal:
-        """Tính tổng tiền của invoice."""
-        electricity_amount = Decimal(0)
-        if invoice.electricity_new_index is not None and invoice.electricity_old_index is not None:
-            electricity_consumed = invoice.electricity_new_index - invoice.electricity_old_index
-            electricity_amount = Decimal(str(electricity_consumed)) * invoice.electricity_unit_price
-        
-        water_amount = Decimal(str(invoice.number_of_people)) * invoice.water_unit_price
-        
-        total = (
-            invoice.room_price +
-            electricity_amount +
-            water_amount +
-            invoice.service_fee +
-            invoice.internet_fee +
-            invoice.parking_fee +
-            invoice.other_fees
-        )
-        
-        return total
-    
     async def create_payos_payment(
         self,
         request: PaymentCreatePayOSRequest,
@@ -74,7 +58,7 @@ class PaymentService:
         
         Flow:
         1. Kiểm tra invoice tồn tại
-        2. Tính tổng tiền invoice
+        2. Lấy số tiền còn nợ của invoice
         3. Tạo payment record với status=pending
         4. Gọi PayOS để tạo QR code
         5. Lưu thông tin PayOS vào payment
@@ -91,8 +75,8 @@ class PaymentService:
                 detail="Invoice already paid"
             )
         
-        # 2. Calculate total amount
-        total_amount = self._calculate_invoice_total(invoice)
+        # 2. Số tiền cần thanh toán (còn nợ của hóa đơn, lưu sẵn trong invoices.amount_due)
+        total_amount = invoice.amount_due
         
         # 3. Create payment record
         payment_id = uuid.uuid4()
@@ -127,7 +111,7 @@ class PaymentService:
             return_url = f"{frontend_url}/payment/success"
             cancel_url = f"{frontend_url}/payment/success"
             
-            payos_response = payos_service.create_payment_link(
+            payos_response = await payos_gateway.create_payment_link(
                 order_code=order_code,
                 amount=int(total_amount),  # PayOS requires int (VND)
                 description=description,
@@ -160,6 +144,12 @@ class PaymentService:
             self.db.commit()
             
             logger.error(f"PayOS payment creation failed: {e}")
+            if isinstance(e, PayOSUnavailableError):
+                # PayOS đang gián đoạn/quá tải - báo client thử lại sau
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail=str(e)
+                )
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Failed to create PayOS payment: {str(e)}"
@@ -175,7 +165,7 @@ class PaymentService:
         
         Flow:
         1. Kiểm tra invoice tồn tại
-        2. Tính tổng tiền
+        2. Lấy số tiền còn nợ
         3. Tạo payment với status=pending
         4. Return payment info
         """
@@ -190,8 +180,8 @@ class PaymentService:
                 detail="Invoice already paid"
             )
         
-        # 2. Calculate total amount
-        total_amount = self._calculate_invoice_total(invoice)
+        # 2. Số tiền cần thanh toán (còn nợ của hóa đơn, lưu sẵn trong invoices.amount_due)
+        total_amount = invoice.amount_due
         
         # 3. Create payment record
         payment_id = uuid.uuid4()
@@ -270,153 +260,151 @@ class PaymentService:
         
         return PaymentResponse.model_validate(payment)
     
-    async def check_and_sync_payos_status(self, payment_id: uuid.UUID) -> Dict[str, Any]:
+    def get_payment_status(self, payment_id: uuid.UUID) -> Dict[str, Any]:
         """
-        Kiểm tra trạng thái thanh toán từ PayOS và sync vào database.
-        Dùng cho polling khi webhook không hoạt động.
-        
+        Trạng thái thanh toán hiện tại trong database (client polling).
+
+        Không gọi PayOS: payment banking được cập nhật bởi webhook và job đối
+        soát nền (``app.infrastructure.payos_reconciler``).
+
         Args:
             payment_id: UUID của payment
-            
+
         Returns:
-            Dict chứa trạng thái mới
+            Dict chứa trạng thái hiện tại
         """
-        # 1. Lấy payment từ DB
         payment = self.repo.get_by_payment_id(payment_id)
         if not payment:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Payment {payment_id} not found"
             )
-        
-        # 2. Kiểm tra đã completed chưa
-        if payment.status == Payment.PaymentStatus.COMPLETED:
-            return {
-                "status": "completed",
-                "message": "Payment already completed",
-                "payment_id": str(payment.payment_id)
-            }
-        
-        # 3. Kiểm tra có phải banking payment không
-        if payment.method != Payment.PaymentMethod.BANKING:
-            return {
-                "status": str(payment.status.value),
-                "message": "Not a PayOS payment, cannot sync",
-                "payment_id": str(payment.payment_id)
-            }
-        
-        # 4. Lấy order_code từ banking_transaction_id
-        order_code = payment.banking_transaction_id
-        if not order_code:
-            return {
-                "status": "error",
-                "message": "No PayOS order code found",
-                "payment_id": str(payment.payment_id)
-            }
-        
-        # 5. Gọi PayOS để check status
-        try:
-            payos_status = payos_service.check_payment_status(int(order_code))
-            
-            # 6. Nếu đã thanh toán trên PayOS, update DB
-            if payos_status.get("is_paid") or payos_status.get("status") == "PAID":
+
+        messages = {
+            Payment.PaymentStatus.COMPLETED: "Payment completed",
+            Payment.PaymentStatus.PENDING: "Payment not yet confirmed",
+            Payment.PaymentStatus.FAILED: "Payment failed",
+            Payment.PaymentStatus.CANCELLED: "Payment cancelled",
+        }
+        return {
+            "status": payment.status.value,
+            "message": messages[payment.status],
+            "payment_id": str(payment.payment_id),
+            "paid_at": payment.paid_at.isoformat() if payment.paid_at else None,
+        }
+
+    def get_payment_event(self, payment_id: uuid.UUID) -> Dict[str, Any]:
+        """Trạng thái hiện tại dạng sự kiện stream (``payment_status_events.payment_event``)."""
+        payment = self.repo.get_by_payment_id(payment_id)
+        if not payment:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Payment {payment_id} not found"
+            )
+        return payment_event(payment)
+
+    def apply_payos_statuses(self, statuses: Dict[uuid.UUID, str]) -> Dict[str, int]:
+        """
+        Áp dụng trạng thái PayOS đã kiểm tra cho một batch payment (một transaction).
+
+        Chỉ payment còn PENDING được khóa và cập nhật (webhook có thể đã xử lý
+        trong lúc chờ PayOS): PAID -> COMPLETED và hóa đơn PAID;
+        CANCELLED/EXPIRED -> CANCELLED.
+
+        Args:
+            statuses: id payment -> trạng thái PayOS (PENDING, PAID, CANCELLED, EXPIRED...).
+
+        Returns:
+            Dict số payment ``completed`` và ``cancelled``.
+        """
+        counts = {"completed": 0, "cancelled": 0}
+        paid_invoice_ids = set()
+        for payment in self.repo.lock_pending_by_ids(list(statuses)):
+            payos_status = statuses[payment.id]
+            if payos_status == "PAID":
                 payment.status = Payment.PaymentStatus.COMPLETED
                 payment.paid_at = datetime.now()
                 payment.note = f"Synced from PayOS - Payment confirmed"
-                
-                # Cập nhật invoice status
-                invoice = self.db.query(Invoice).filter(Invoice.id == payment.invoice_id).first()
-                if invoice:
-                    invoice.status = InvoiceStatus.PAID.value
-                
-                self.db.commit()
-                
-                logger.info(f"Payment {payment_id} synced to COMPLETED from PayOS")
-                
-                return {
-                    "status": "completed",
-                    "message": "Payment confirmed and synced from PayOS",
-                    "payment_id": str(payment.payment_id),
-                    "payos_status": payos_status.get("status")
-                }
-            
-            # Vẫn pending
-            return {
-                "status": "pending",
-                "message": "Payment not yet confirmed on PayOS",
-                "payment_id": str(payment.payment_id),
-                "payos_status": payos_status.get("status")
-            }
-            
-        except Exception as e:
-            logger.error(f"Failed to sync PayOS status: {e}")
-            return {
-                "status": "error",
-                "message": f"Failed to check PayOS status: {str(e)}",
-                "payment_id": str(payment.payment_id)
-            }
+                paid_invoice_ids.add(payment.invoice_id)
+                counts["completed"] += 1
+            elif payos_status in ("CANCELLED", "EXPIRED"):
+                payment.status = Payment.PaymentStatus.CANCELLED
+                payment.note = f"Synced from PayOS - {payos_status}"
+                counts["cancelled"] += 1
+
+        if paid_invoice_ids:
+            invoices = self.db.query(Invoice).filter(
+                Invoice.id.in_(paid_invoice_ids)
+            ).order_by(Invoice.id).with_for_update().all()
+            for invoice in invoices:
+                invoice.status = InvoiceStatus.PAID.value
+
+        self.db.commit()
+        return counts
     
-    async def handle_payos_webhook(
-        self,
-        webhook_data: PayOSWebhookData,
-        signature: str
-    ) -> Dict[str, Any]:
+    def receive_payos_webhook(self, webhook: PayOSWebhookRequest, payload: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Xử lý webhook từ PayOS khi thanh toán thành công.
-        
+        Nhận webhook PayOS vào hộp thư (payment_webhook_events) - không đụng payment/invoice.
+
         Flow:
         1. Verify signature
-        2. Tìm payment theo orderCode
-        3. Kiểm tra code = "00" (success)
-        4. Update payment status = COMPLETED
-        5. Update invoice status = PAID (nếu cần)
+        2. INSERT sự kiện (ON CONFLICT DO NOTHING theo orderCode + reference)
+        3. Trả về ngay; worker ``app.infrastructure.payos_webhooks`` áp dụng sau
+
+        Args:
+            webhook: Body webhook đã parse.
+            payload: Body nguyên bản (lưu lại để đối chiếu).
+
+        Returns:
+            Dict ``status`` và ``duplicate`` (True nếu PayOS gửi lại sự kiện đã nhận).
         """
-        # 1. Verify signature
-        if not payos_service.verify_webhook_signature(webhook_data.dict(), signature):
+        data = webhook.data
+        if not payos_service.verify_webhook_signature(data.dict(), webhook.signature):
             logger.warning(f"Invalid PayOS webhook signature")
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Invalid signature"
             )
-        
-        # 2. Find payment by order code
-        payment = self.repo.get_by_banking_transaction_id(str(webhook_data.orderCode))
+
+        # Webhook test của PayOS có thể thiếu reference - dùng paymentLinkId + code
+        reference = data.reference or f"{data.paymentLinkId}:{data.code}"
+        inserted = self.webhook_repo.insert_event(data.orderCode, reference, data.code, payload)
+        return {"status": "ok", "duplicate": not inserted}
+
+    def apply_payos_event(self, data: PayOSWebhookData) -> Tuple[WebhookEventStatus, str]:
+        """
+        Áp dụng một sự kiện webhook vào payment/invoice (worker gọi, chưa commit).
+
+        Payment bị khóa ``FOR UPDATE`` và chỉ chuyển từ PENDING, nên mỗi payment
+        được chuyển trạng thái đúng một lần dù có bao nhiêu sự kiện trùng.
+
+        Returns:
+            (trạng thái của sự kiện, ghi chú)
+        """
+        payment = self.repo.get_by_banking_transaction_id(str(data.orderCode), for_update=True)
         if not payment:
-            logger.warning(f"Payment not found for order code {webhook_data.orderCode}")
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Payment not found for order {webhook_data.orderCode}"
-            )
-        
-        # 3. Check if already processed
-        if payment.status == Payment.PaymentStatus.COMPLETED:
-            logger.info(f"Payment {payment.payment_id} already completed")
-            return {"status": "ok", "message": "Already processed"}
-        
-        # 4. Check payment success
-        if webhook_data.code != "00":
+            return WebhookEventStatus.IGNORED, f"Payment not found for order {data.orderCode}"
+
+        if payment.status != Payment.PaymentStatus.PENDING:
+            return WebhookEventStatus.IGNORED, f"Payment {payment.payment_id} already {payment.status.value}"
+
+        if data.code != "00":
             payment.status = Payment.PaymentStatus.FAILED
-            payment.note = f"PayOS webhook: {webhook_data.desc}"
-            self.db.commit()
-            
-            return {"status": "failed", "message": webhook_data.desc}
-        
-        # 5. Update payment
+            payment.note = f"PayOS webhook: {data.desc}"
+            return WebhookEventStatus.PROCESSED, f"Payment {payment.payment_id} failed: {data.desc}"
+
         payment.status = Payment.PaymentStatus.COMPLETED
         payment.paid_at = datetime.now()
-        payment.bank_name = webhook_data.counterAccountBankName or "PayOS"
-        payment.bank_account_number = webhook_data.counterAccountNumber
-        payment.note = f"PayOS payment successful: {webhook_data.desc}"
-        
-        self.db.commit()
-        
+        payment.bank_name = data.counterAccountBankName or "PayOS"
+        payment.bank_account_number = data.counterAccountNumber
+        payment.note = f"PayOS payment successful: {data.desc}"
+
+        invoice = self.db.query(Invoice).filter(Invoice.id == payment.invoice_id).with_for_update().first()
+        if invoice:
+            invoice.status = InvoiceStatus.PAID.value
+
         logger.info(f"Payment {payment.payment_id} completed via PayOS webhook")
-        
-        return {
-            "status": "success",
-            "payment_id": str(payment.payment_id),
-            "amount": float(payment.amount)
-        }
+        return WebhookEventStatus.PROCESSED, f"Payment {payment.payment_id} completed"
     
     def get_payment_by_id(self, payment_id: uuid.UUID) -> PaymentResponse:
         """Lấy payment theo ID."""
@@ -10,9 +10,14 @@ from uuid import UUID
 from decimal import Decimal
 from sqlalchemy.orm import Session
 
-from app.repositories.room_repository import RoomRepository
+from app.repositories.room_repository import PRICE_FACET_BOUNDS, RoomRepository
+from app.core.cache import TTLCache
+from app.core.pagination import cursor_pagination
+from app.core.settings import settings
 from app.repositories.building_repository import BuildingRepository
 from app.repositories.contract_repository import ContractRepository
+from app.repositories.utility_repository import UtilityRepository
+from app.repositories.loaders import get_loaders
 from app.schemas.room_schema import (
     RoomCreate, RoomUpdate, RoomListItem, RoomDetailOut,
     RoomPublicDetail, RoomAdminDetail, TenantInfo, RoomPublicListItem,
@@ -27,6 +32,25 @@ from app.models.contract import Contract
 from app.core.Enum.roomEnum import RoomStatus
 from app.core.Enum.contractEnum import ContractStatus
 from app.core.utils.uuid import generate_uuid7
+from app.models.room_photo_variant import RoomPhotoVariant
+from app.infrastructure.imaging import LISTING_VARIANT, collect_variants, submit_variants
+from app.infrastructure.storage import StoredBlob, decode_data_url, get_blob_store, is_data_url
+
+
+# Cache facet của danh sách phòng public theo bộ filter - mỗi worker một cache,
+# xóa khi commit thay đổi phòng/hợp đồng (app.infrastructure.db.room_facets_events)
+_facets_cache: TTLCache[dict] = TTLCache(
+    maxsize=settings.ROOM_FACETS_CACHE_MAX_SIZE,
+    ttl=settings.ROOM_FACETS_CACHE_TTL_SECONDS,
+)
+
+# Tình trạng trống theo availability_priority của RoomRepository
+AVAILABILITY_LABELS = {0: "EMPTY", 1: "PARTIAL", 2: "FULL"}
+
+
+def invalidate_room_facets() -> None:
+    """Xóa toàn bộ cache facet phòng của worker hiện tại."""
+    _facets_cache.clear()
 
 
 class RoomService:
@@ -44,6 +68,8 @@ class RoomService:
         self.room_repo = RoomRepository(db)
         self.building_repo = BuildingRepository(db)
         self.contract_repo = ContractRepository(db)
+        self.utility_repo = UtilityRepository(db)
+        self.loaders = get_loaders(db)
         
         # Import RoomTypeRepository để validate room_type_id
         from app.repositories.room_type_repository import RoomTypeRepository
@@ -131,8 +157,10 @@ class RoomService:
                     description=None
                 )
                 self.db.add(utility)
+            self._sync_utility_ids(room, utilities)
         
         if photos:
+            photo_inputs = []
             for idx, photo_data in enumerate(photos):
                 if isinstance(photo_data, dict):
                     image_base64 = photo_data.get('image_base64')
@@ -146,15 +174,10 @@ class RoomService:
                 if not image_base64:
                     continue
                 
-                photo = RoomPhoto(
-                    room_id=room.id,
-                    image_base64=image_base64,
-                    url=None,
-                    is_primary=is_primary,
-                    sort_order=sort_order,
-                    uploaded_by=user_id
-                )
-                self.db.add(photo)
+                photo_inputs.append((image_base64, is_primary, sort_order))
+            
+            self._add_photos(room.id, photo_inputs, user_id)
+            self._refresh_primary_thumbnail(room)
         
         self.db.commit()
         self.db.refresh(room)
@@ -174,6 +197,8 @@ class RoomService:
         sort_by: Optional[str] = None,
         page: int = 1,
         pageSize: int = 20,
+        cursor: Optional[str] = None,
+        include_total: bool = False,
     ) -> dict:
         """Lấy danh sách phòng với thông tin đầy đủ, filter và pagination.
         
@@ -189,9 +214,12 @@ class RoomService:
             sort_by: Sắp xếp (price_asc, price_desc), mặc định created_at desc.
             page: Số trang (bắt đầu từ 1).
             pageSize: Số items mỗi trang (max 100).
+            cursor: Bật chế độ cursor khi khác None ("" = trang đầu), bỏ qua page.
+            include_total: Chế độ cursor: có chạy COUNT để trả totalItems không.
             
         Returns:
-            Dict chứa items và pagination (totalItems, page, pageSize, totalPages).
+            Dict chứa items và pagination (totalItems, page, pageSize, totalPages),
+            hoặc (pageSize, next_cursor, totalItems) ở chế độ cursor.
         """
         # Validate pageSize
         if pageSize > 100:
@@ -209,6 +237,28 @@ class RoomService:
             if status not in valid_statuses:
                 raise ValueError(f"Trạng thái không hợp lệ. Phải là một trong: {valid_statuses}")
         
+        filters = dict(
+            building_id=building_id,
+            status=status,
+            search=search,
+            city=city,
+            ward=ward,
+            min_price=min_price,
+            max_price=max_price,
+            max_capacity=max_capacity,
+        )
+        
+        if cursor is not None:
+            # Keyset pagination: không OFFSET, COUNT chỉ chạy khi được yêu cầu
+            items_data, next_cursor = self.room_repo.list_with_details_keyset(
+                **filters, sort_by=sort_by, cursor=cursor, limit=pageSize
+            )
+            total = self.room_repo.count(**filters) if include_total else None
+            return {
+                "items": [RoomListItem(**item) for item in items_data],
+                "pagination": cursor_pagination(pageSize, next_cursor, total),
+            }
+        
         # Tính offset
         offset = (page - 1) * pageSize
         
@@ -368,9 +418,15 @@ class RoomService:
             
             # Thêm photos mới từ URLs
             for idx, url in enumerate(photo_urls):
+                # Client cũ có thể gửi data URL trong photo_urls -> chuyển vào blob store
+                storage_key = None
+                if is_data_url(url):
+                    blob = self._store_photo(url)
+                    url, storage_key = blob.url, blob.key
                 photo = RoomPhoto(
                     room_id=room_id,
                     url=url,
+                    storage_key=storage_key,
                     is_primary=(idx == 0),
                     sort_order=idx,
                     uploaded_by=user_id
@@ -396,6 +452,7 @@ class RoomService:
                     RoomPhoto.room_id == room_id
                 ).count()
                 
+                photo_inputs = []
                 for idx, photo_data in enumerate(new_photos):
                     # Xử lý cả dict và RoomPhotoInput object
                     if isinstance(photo_data, dict):
@@ -410,18 +467,17 @@ class RoomService:
                     if not image_base64:
                         continue
                     
-                    photo = RoomPhoto(
-                        room_id=room_id,
-                        image_base64=image_base64,
-                        url=None,
-                        is_primary=is_primary,
-                        sort_order=sort_order,
-                        uploaded_by=user_id
-                    )
-                    self.db.add(photo)
+                    photo_inputs.append((image_base64, is_primary, sort_order))
+                
+                self._add_photos(room_id, photo_inputs, user_id)
             
             photos_updated = True
         
+        # Tính lại thumbnail ảnh đại diện khi danh sách ảnh thay đổi
+        if photos_updated:
+            self.db.flush()
+            self._refresh_primary_thumbnail(updated_room)
+        
         # THÊM utilities MỚI
         if utilities is not None:
             # Thêm utilities mới
@@ -433,6 +489,7 @@ class RoomService:
                     description=None
                 )
                 self.db.add(utility)
+            self._sync_utility_ids(updated_room, utilities)
         
         # Commit tất cả thay đổi
         self.db.commit()
@@ -443,6 +500,14 @@ class RoomService:
         # Convert sang RoomDetailOut
         return self._room_to_detail_out(final_room)
 
+    def _sync_utility_ids(self, room: Room, utility_names: List[str]) -> None:
+        """Ghi lại rooms.utility_ids theo danh sách tên tiện ích của phòng.
+
+        Tiện ích chưa có trong danh mục được thêm mới; gọi mỗi khi
+        room_utilities của phòng thay đổi để hai nơi luôn khớp nhau.
+        """
+        room.utility_ids = self.utility_repo.ensure_ids(utility_names)
+
     def delete_room(self, room_id: UUID) -> None:
         """Xóa phòng.
         
@@ -479,6 +544,106 @@ class RoomService:
         # Xóa phòng (cascade sẽ tự động xóa utilities, photos, appointments, etc.)
         self.room_repo.delete(room_orm)
     
+    def _store_photo(self, image_base64: str) -> StoredBlob:
+        """Lưu ảnh base64 vào blob store (content-addressed).
+
+        Args:
+            image_base64: Data URL hoặc base64 string của ảnh.
+
+        Returns:
+            StoredBlob chứa key và URL của ảnh.
+
+        Raises:
+            ValueError: Nếu base64 không hợp lệ.
+        """
+        return get_blob_store().put_data_url(image_base64)
+
+    def _add_photos(
+        self,
+        room_id: UUID,
+        photo_inputs: list[tuple[str, bool, int]],
+        user_id: Optional[UUID],
+    ) -> list[RoomPhoto]:
+        """Lưu ảnh gốc vào blob store và tạo thumbnail cho từng ảnh.
+
+        Tất cả ảnh được đẩy vào process pool trước rồi mới chờ kết quả,
+        để nhiều ảnh trong cùng request được xử lý song song.
+
+        Args:
+            room_id: UUID của phòng.
+            photo_inputs: List (image_base64, is_primary, sort_order).
+            user_id: UUID của user upload.
+
+        Returns:
+            Danh sách RoomPhoto đã add vào session.
+
+        Raises:
+            ValueError: Nếu base64 không hợp lệ.
+        """
+        store = get_blob_store()
+        pending = []
+        for image_base64, is_primary, sort_order in photo_inputs:
+            data, content_type = decode_data_url(image_base64)
+            blob = store.put(data, content_type)
+            photo = RoomPhoto(
+                room_id=room_id,
+                image_base64=None,
+                url=blob.url,
+                storage_key=blob.key,
+                is_primary=is_primary,
+                sort_order=sort_order,
+                uploaded_by=user_id
+            )
+            self.db.add(photo)
+            pending.append((photo, submit_variants(data)))
+        
+        self.db.flush()  # Flush để có photo.id cho variants
+        
+        for photo, future in pending:
+            for variant in collect_variants(future):
+                variant_blob = store.put(variant.data, variant.content_type)
+                self.db.add(RoomPhotoVariant(
+                    photo_id=photo.id,
+                    label=variant.label,
+                    format=variant.format,
+                    width=variant.width,
+                    height=variant.height,
+                    byte_size=variant.byte_size,
+                    storage_key=variant_blob.key,
+                    url=variant_blob.url,
+                ))
+        
+        return [photo for photo, _ in pending]
+
+    def _refresh_primary_thumbnail(self, room: Room) -> None:
+        """Tính lại `room.primary_thumbnail_url` từ ảnh đại diện hiện tại.
+
+        Ảnh đại diện = ảnh is_primary, nếu không có thì ảnh có sort_order nhỏ nhất.
+        Nếu ảnh chưa có thumbnail thì dùng URL ảnh gốc.
+        """
+        self.db.flush()
+        primary = (
+            self.db.query(RoomPhoto)
+            .filter(RoomPhoto.room_id == room.id)
+            .order_by(RoomPhoto.is_primary.desc(), RoomPhoto.sort_order.asc(), RoomPhoto.created_at.asc())
+            .first()
+        )
+        if not primary:
+            room.primary_thumbnail_url = None
+            return
+        
+        label, fmt = LISTING_VARIANT
+        variant = (
+            self.db.query(RoomPhotoVariant.url)
+            .filter(
+                RoomPhotoVariant.photo_id == primary.id,
+                RoomPhotoVariant.label == label,
+                RoomPhotoVariant.format == fmt,
+            )
+            .scalar()
+        )
+        room.primary_thumbnail_url = variant or primary.url
+
     def _room_to_detail_out(self, room: Room) -> RoomDetailOut:
         """Convert Room ORM instance sang RoomDetailOut schema.
         
@@ -689,7 +854,8 @@ class RoomService:
             max_area: Diện tích tối đa.
             capacity: Sức chứa.
             status: Trạng thái phòng.
-            utilities: Danh sách tiện ích cần có.
+            utilities: Danh sách tiện ích cần có (phòng phải có đủ tất cả,
+                không phân biệt hoa thường/dấu).
             page: Số trang (bắt đầu từ 1).
             pageSize: Số items mỗi trang.
             
@@ -720,64 +886,50 @@ class RoomService:
         if min_area and max_area and min_area > max_area:
             raise ValueError("Diện tích tối thiểu không được lớn hơn diện tích tối đa")
         
-        # TODO: Implement search logic trong repository
-        # Hiện tại tạm dùng list_with_details và filter trong Python
-        # Nên chuyển logic filter xuống repository để tối ưu query
-        
-        # Lấy danh sách phòng
-        from sqlalchemy import and_
-        query = self.db.query(Room)
-        
-        # Apply filters
-        if building_id:
-            query = query.filter(Room.building_id == building_id)
-        if min_price:
-            query = query.filter(Room.base_price >= min_price)
-        if max_price:
-            query = query.filter(Room.base_price <= max_price)
-        if min_area:
-            query = query.filter(Room.area >= min_area)
-        if max_area:
-            query = query.filter(Room.area <= max_area)
-        if capacity:
-            query = query.filter(Room.capacity >= capacity)
-        if status:
-            query = query.filter(Room.status == status)
-        
-        # Filter by utilities (cần join với RoomUtility)
+        # Tiện ích: tra id trong danh mục; thiếu bất kỳ tiện ích nào thì không phòng nào khớp
+        utility_ids = None
         if utilities:
-            for utility in utilities:
-                query = query.join(RoomUtility).filter(RoomUtility.utility_name == utility)
-        
-        # Get total count
-        totalItems = query.count()
-        
-        # Tính offset
+            found = self.utility_repo.get_ids_by_names(utilities)
+            requested = {name.strip() for name in utilities if name.strip()}
+            if requested - found.keys():
+                return {
+                    "items": [],
+                    "pagination": {"totalItems": 0, "page": page, "pageSize": pageSize, "totalPages": 1},
+                }
+            utility_ids = sorted(set(found.values()))
+
         offset = (page - 1) * pageSize
+        rooms, totalItems = self.room_repo.search(
+            building_id=building_id,
+            min_price=min_price,
+            max_price=max_price,
+            min_area=min_area,
+            max_area=max_area,
+            capacity=capacity,
+            status=status,
+            utility_ids=utility_ids,
+            offset=offset,
+            limit=pageSize,
+        )
         
-        # Apply pagination
-        rooms = query.offset(offset).limit(pageSize).all()
+        # Tòa nhà, số người và hợp đồng đại diện của cả trang: mỗi loại một query
+        room_ids = [room.id for room in rooms]
+        buildings = self.loaders.building.load_many(room.building_id for room in rooms)
+        occupants = self.loaders.occupancy.load_many(room_ids)
+        active_contracts = self.loaders.active_contracts.load_many(room_ids)
         
-        # Convert to list items (simple version)
         items = []
-        for room in rooms:
-            building = self.building_repo.get_by_id(room.building_id)
-            building_name = building.building_name if building else "N/A"
-            
-            # Đếm số hợp đồng ACTIVE/PENDING/PENDING_UPDATE để tính current_occupants
-            current_occupants = self.contract_repo.get_total_tenants_in_room(room.id)
-            
-            # Lấy thông tin đại diện từ contract ACTIVE nếu có
-            active_contract = self.contract_repo.get_active_contract_by_room(room.id)
+        for room, building, current_occupants, contracts in zip(rooms, buildings, occupants, active_contracts):
+            # Người đại diện: hợp đồng ACTIVE đầu tiên của phòng
             representative = None
-            if active_contract and hasattr(active_contract, 'tenant'):
-                tenant = active_contract.tenant
-                representative = f"{tenant.first_name} {tenant.last_name}" if tenant else None
+            if contracts and contracts[0].tenant:
+                tenant = contracts[0].tenant
+                representative = f"{tenant.first_name} {tenant.last_name}"
             
             items.append(RoomListItem(
                 id=room.id,
                 room_number=room.room_number,
-                building_name=building_name,
+                building_name=building.building_name if building else "N/A",
                 area=room.area,
                 capacity=room.capacity,
                 current_occupants=current_occupants,
@@ -837,8 +989,6 @@ class RoomService:
         Returns:
             Dict chứa items và pagination (totalItems, page, pageSize, totalPages).
         """
-        from app.models.address import Address
-        
         # Validate pageSize
         if pageSize > 20:
             pageSize = 20
@@ -849,141 +999,21 @@ class RoomService:
         if page < 1:
             page = 1
         
-        # Query rooms với joinedload để tránh N+1
-        from sqlalchemy.orm import joinedload
-        from sqlalchemy import and_, not_, exists
-        from app.models.contract import Contract
-        from app.models.address import Address
-        from app.core.Enum.contractEnum import ContractStatus
-        
-        query = self.db.query(Room).options(
-            joinedload(Room.building).joinedload(Building.address),
-            joinedload(Room.room_photos)
-        )
-        
-        # PUBLIC: Lấy TẤT CẢ phòng (không filter theo status)
-        # Sẽ sắp xếp theo trạng thái sau khi query
-        
-        # Join với Building và Address nếu cần filter theo city/ward
-        needs_join = search or city or ward
-        if needs_join:
-            query = query.join(Building, Room.building_id == Building.id)
-            if city or ward:
-                query = query.join(Address, Building.address_id == Address.id)
-        
-        # Filter by building_id nếu có
-        if building_id:
-            query = query.filter(Room.building_id == building_id)
-        
-        # Apply city and ward filters
-        if city:
-            query = query.filter(Address.city.ilike(f"%{city}%"))
-        if ward:
-            query = query.filter(Address.ward.ilike(f"%{ward}%"))
-        
-        # Apply search filter
-        if search:
-            search_pattern = f"%{search}%"
-            query = query.filter(
-                (Room.room_number.ilike(search_pattern)) |
-                (Room.room_name.ilike(search_pattern)) |
-                (Building.building_name.ilike(search_pattern))
-            )
-        
-        # Apply price filters
-        if min_price is not None:
-            query = query.filter(Room.base_price >= min_price)
-        if max_price is not None:
-            query = query.filter(Room.base_price <= max_price)
-        
-        # Apply capacity filter
-        if max_capacity is not None:
-            query = query.filter(Room.capacity <= max_capacity)
-        
-        # Lấy tất cả rooms (sẽ sắp xếp trong Python sau khi tính occupants)
-        # Sắp xếp sơ bộ theo created_at DESC
-        query = query.order_by(Room.created_at.desc())
-        
-        # Lấy tất cả rooms để tính toán và sắp xếp
-        all_rooms = query.all()
-        
-        # Convert to RoomPublicListItem và tính availability_priority
-        items = []
-        for room in all_rooms:
-            # Lấy building info
-            building = room.building
-            building_name = building.building_name if building else "N/A"
-            
-            # Lấy địa chỉ đầy đủ
-            full_address = "N/A"
-            if building and building.address:
-                addr = building.address
-                full_address = f"{addr.address_line}, {addr.ward}, {addr.city}"
-            
-            # Tính số người đang ở trong phòng
-            current_occupants = self.contract_repo.get_total_tenants_in_room(room.id)
-            
-            # Phòng còn chỗ trống (chưa full) = is_available
-            is_available = current_occupants < room.capacity
-            
-            # Tính priority: 0 = còn trống, 1 = có người nhưng chưa full, 2 = đã full
-            if current_occupants == 0:
-                availability_priority = 0  # Còn trống hoàn toàn
-            elif current_occupants < room.capacity:
-                availability_priority = 1  # Có người nhưng chưa full
-            else:
-                availability_priority = 2  # Đã full
-            
-            # Lấy ảnh đại diện (ảnh có is_primary=True hoặc ảnh đầu tiên)
-            primary_photo = None
-            if room.room_photos:
-                # Tìm ảnh primary
-                primary = next((p for p in room.room_photos if p.is_primary), None)
-                if primary:
-                    primary_photo = primary.image_base64 if primary.image_base64 else primary.url
-                else:
-                    # Lấy ảnh đầu tiên
-                    first_photo = sorted(room.room_photos, key=lambda p: p.sort_order)[0]
-                    primary_photo = first_photo.image_base64 if first_photo.image_base64 else first_photo.url
-            
-            items.append({
-                "item": RoomPublicListItem(
-                    id=room.id,
-                    room_number=room.room_number,
-                    room_name=room.room_name,
-                    building_name=building_name,
-                    full_address=full_address,
-                    base_price=room.base_price,
-                    area=room.area,
-                    capacity=room.capacity,
-                    current_occupants=current_occupants,
-                    is_available=is_available,
-                    description=room.description,
-                    primary_photo=primary_photo,
-                    created_at=room.created_at
-                ),
-                "priority": availability_priority,
-                "created_at": room.created_at,
-                "price": room.base_price
-            })
-        
-        # Sắp xếp theo priority (còn trống -> chưa full -> full), sau đó theo giá hoặc thời gian
-        if sort_by == "price_asc":
-            items.sort(key=lambda x: (x["priority"], x["price"]))
-        elif sort_by == "price_desc":
-            items.sort(key=lambda x: (x["priority"], -x["price"]))
-        else:
-            # Mặc định: theo priority, rồi theo thời gian mới nhất
-            items.sort(key=lambda x: (x["priority"], -x["created_at"].timestamp()))
-        
-        # Tổng số items
-        totalItems = len(items)
-        
-        # Tính offset cho pagination
+        # Occupancy, priority, sắp xếp và phân trang đều tính trong một query SQL
         offset = (page - 1) * pageSize
-        
-        # Lấy items cho trang hiện tại
-        paginated_items = [item["item"] for item in items[offset:offset + pageSize]]
+        rows, totalItems = self.room_repo.list_public(
+            building_id=building_id,
+            search=search,
+            city=city,
+            ward=ward,
+            min_price=min_price,
+            max_price=max_price,
+            max_capacity=max_capacity,
+            sort_by=sort_by,
+            offset=offset,
+            limit=pageSize,
+        )
+        paginated_items = [RoomPublicListItem(**row) for row in rows]
         
         # Tính tổng số trang
         totalPages = (totalItems + pageSize - 1) // pageSize if totalItems > 0 else 1
@@ -996,4 +1026,92 @@ class RoomService:
                 "pageSize": pageSize,
                 "totalPages": totalPages
             }
-        }
\ No newline at end of file
+        }
+
+    def get_public_facets(
+        self,
+        building_id: Optional[UUID] = None,
+        search: Optional[str] = None,
+        city: Optional[str] = None,
+        ward: Optional[str] = None,
+        min_price: Optional[int] = None,
+        max_price: Optional[int] = None,
+        max_capacity: Optional[int] = None,
+    ) -> dict:
+        """Đếm số phòng theo từng facet cho sidebar filter của danh sách phòng public.
+
+        Nhận cùng filter với list_rooms_public; số đếm phản ánh tập phòng sau
+        khi đã áp toàn bộ filter. Kết quả được cache theo bộ filter
+        (ROOM_FACETS_CACHE_TTL_SECONDS), xóa khi phòng/hợp đồng thay đổi.
+
+        Args:
+            building_id: Lọc theo tòa nhà (optional).
+            search: Tìm kiếm theo tên phòng, số phòng, hoặc tên tòa nhà (optional).
+            city: Lọc theo thành phố (optional).
+            ward: Lọc theo phường/quận (optional).
+            min_price: Giá thuê tối thiểu (optional).
+            max_price: Giá thuê tối đa (optional).
+            max_capacity: Số người tối đa (optional).
+
+        Returns:
+            Dict chứa total và các facet cities, wards, room_types,
+            price_ranges, capacities, availability, utilities.
+
+        Raises:
+            ValueError: Nếu min_price > max_price.
+        """
+        if min_price is not None and max_price is not None and min_price > max_price:
+            raise ValueError("Giá tối thiểu không được lớn hơn giá tối đa")
+
+        search = search.strip() if search else None
+        cache_key = (building_id, search, city, ward, min_price, max_price, max_capacity)
+        cached = _facets_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        raw = self.room_repo.public_facets(
+            building_id=building_id,
+            search=search,
+            city=city,
+            ward=ward,
+            min_price=min_price,
+            max_price=max_price,
+            max_capacity=max_capacity,
+        )
+
+        def by_count(items: list[tuple[str, int]]) -> list[dict]:
+            return [
+                {"value": value, "count": count}
+                for value, count in sorted(items, key=lambda item: (-item[1], item[0]))
+            ]
+
+        bounds = [0, *PRICE_FACET_BOUNDS, None]
+        price_ranges = [
+            {
+                "min_price": bounds[int(bucket)],
+                "max_price": bounds[int(bucket) + 1],
+                "count": count,
+            }
+            for bucket, count in sorted(raw["price_bucket"], key=lambda item: int(item[0]))
+        ]
+
+        availability = {int(value): count for value, count in raw["availability"]}
+        result = {
+            # Mỗi phòng có đúng một tình trạng trống nên tổng = tổng số phòng thỏa filter
+            "total": sum(availability.values()),
+            "cities": by_count(raw["city"]),
+            "wards": by_count(raw["ward"]),
+            "room_types": by_count(raw["room_type"]),
+            "price_ranges": price_ranges,
+            "capacities": [
+                {"value": int(value), "count": count}
+                for value, count in sorted(raw["capacity"], key=lambda item: int(item[0]))
+            ],
+            "availability": [
+                {"value": AVAILABILITY_LABELS[priority], "count": availability.get(priority, 0)}
+                for priority in sorted(AVAILABILITY_LABELS)
+            ],
+            "utilities": by_count(raw["utility"]),
+        }
+        _facets_cache.set(cache_key, result)
+        return result
@@ -13,10 +13,19 @@ import base64
 import os
 import re
 
+from app.core.security import invalidate_principal
+from app.core.pagination import cursor_pagination
 from app.repositories.user_repository import UserRepository
 from app.schemas.user_schema import UserUpdate, UserOut, UserListItem, UserStats
 from app.core.Enum.userEnum import UserStatus
 from app.models.user_document import UserDocument
+from app.infrastructure.storage import get_blob_store
+
+
+def _image_content_type(image_type: str) -> str:
+    """Chuẩn hóa extension ảnh (png/jpg/jpeg) thành MIME type."""
+    image_type = image_type.lower()
+    return "image/jpeg" if image_type in ("jpg", "jpeg") else f"image/{image_type}"
 
 
 class UserService:
@@ -98,6 +107,8 @@ class UserService:
         role_code: Optional[str] = None,
         page: int = 1,
         pageSize: int = 20,
+        cursor: Optional[str] = None,
+        include_total: bool = False,
     ) -> dict:
         """Lấy danh sách users với filter, search và pagination.
 
@@ -109,9 +120,12 @@ class UserService:
             role_code: Lọc theo mã role (TENANT, CUSTOMER).
             page: Số trang (bắt đầu từ 1).
             pageSize: Số items mỗi trang (max 100).
+            cursor: Bật chế độ cursor khi khác None ("" = trang đầu), bỏ qua page.
+            include_total: Chế độ cursor: có chạy COUNT để trả totalItems không.
 
         Returns:
-            Dict chứa items và pagination (totalItems, page, pageSize, totalPages).
+            Dict chứa items và pagination (totalItems, page, pageSize, totalPages),
+            hoặc (pageSize, next_cursor, totalItems) ở chế độ cursor.
         """
         # Validate pageSize
         if pageSize > 100:
@@ -140,6 +154,25 @@ class UserService:
                 raise ValueError(f"Mã role không hợp lệ: {role_code}. Phải là TENANT hoặc CUSTOMER")
             role_id = role.id
 
+        filters = dict(
+            search=search,
+            status=status,
+            gender=gender,
+            district=district,
+            role_id=role_id,
+        )
+
+        if cursor is not None:
+            # Keyset pagination: không OFFSET, COUNT chỉ chạy khi được yêu cầu
+            items_data, next_cursor = self.user_repo.list_with_filters_keyset(
+                **filters, cursor=cursor, limit=pageSize
+            )
+            total = self.user_repo.count(**filters) if include_total else None
+            return {
+                "items": [UserListItem(**item) for item in items_data],
+                "pagination": cursor_pagination(pageSize, next_cursor, total),
+            }
+
         # Tính offset
         offset = (page - 1) * pageSize
 
@@ -244,6 +277,7 @@ class UserService:
 
         # Update user
         updated_user = self.user_repo.update(user, update_data)
+        invalidate_principal(user_id)
 
         # Convert sang schema
         user_dict = {
@@ -292,6 +326,7 @@ class UserService:
         #         raise ValueError("Không thể xóa user đang có hợp đồng active")
 
         self.user_repo.delete(user)
+        invalidate_principal(user_id)
 
     async def upload_user_documents(
         self,
@@ -406,9 +441,8 @@ class UserService:
                 f"File {file.filename}: Kích thước vượt quá {max_size // (1024*1024)}MB"
             )
 
-        # Convert to base64
-        base64_data = base64.b64encode(content).decode("utf-8")
-        data_url = f"data:image/{file_ext};base64,{base64_data}"
+        # Lưu vào vùng riêng tư của blob store (content-addressed), DB chỉ giữ URL/key
+        blob = get_blob_store().put(content, _image_content_type(file_ext), private=True)
 
         # Xóa document cũ cùng loại (nếu có)
         old_doc = (
@@ -426,7 +460,8 @@ class UserService:
         new_doc = UserDocument(
             user_id=user_id,
             document_type=document_type,
-            url=data_url,
+            url=blob.url,
+            storage_key=blob.key,
             uploaded_by=uploaded_by or user_id,
         )
         self.db.add(new_doc)
@@ -436,7 +471,7 @@ class UserService:
         result_dict[document_type.lower()] = {
             "id": new_doc.id,
             "type": document_type,
-            "url": data_url,
+            "url": blob.url,
             "filename": file.filename,
         }
 
@@ -560,21 +595,17 @@ class UserService:
         if not base64_data or not isinstance(base64_data, str):
             raise ValueError(f"{document_type}: Base64 string không hợp lệ")
 
-        # Chuẩn hóa base64: nếu có data URI prefix thì giữ nguyên, không thì thêm vào
+        # Tách data URI prefix (nếu có) để lấy loại ảnh và nội dung base64
         if base64_data.startswith("data:image/"):
-            # Đã có data URI prefix
-            data_url = base64_data
-            
             # Validate format: data:image/{type};base64,{data}
-            match = re.match(r'^data:image/(png|jpg|jpeg);base64,(.+)$', data_url)
+            match = re.match(r'^data:image/(png|jpg|jpeg);base64,(.+)$', base64_data, re.DOTALL)
             if not match:
                 raise ValueError(f"{document_type}: Format base64 không hợp lệ. Cần: data:image/(png|jpg|jpeg);base64,...")
             
             image_type = match.group(1)
             base64_content = match.group(2)
         else:
-            # Chưa có prefix, thêm vào (mặc định PNG)
-            data_url = f"data:image/png;base64,{base64_data}"
+            # Chưa có prefix (mặc định PNG)
             base64_content = base64_data
             image_type = "png"
 
@@ -603,10 +634,14 @@ class UserService:
             self.db.delete(old_doc)
 
         # Tạo document mới
+        # Lưu vào vùng riêng tư của blob store (content-addressed), DB chỉ giữ URL/key
+        blob = get_blob_store().put(decoded, _image_content_type(image_type), private=True)
+
         new_doc = UserDocument(
             user_id=user_id,
             document_type=document_type,
-            url=data_url,
+            url=blob.url,
+            storage_key=blob.key,
             uploaded_by=uploaded_by or user_id,
         )
         self.db.add(new_doc)
@@ -616,6 +651,6 @@ class UserService:
         result_dict[document_type.lower()] = {
             "id": new_doc.id,
             "type": document_type,
-            "url": data_url,
+            "url": blob.url,
             "size": len(decoded),
         }
@@ -23,6 +23,20 @@ from starlette.exceptions import HTTPException as StarletteHTTPException
 from app.api.v1.api import api_router
 from app.core import response
 from app.core.settings import settings
+from app.infrastructure.imaging import shutdown_executor
+from app.infrastructure.mailer import shutdown_email_worker, start_email_worker
+from app.infrastructure.payment_events import shutdown_payment_events, start_payment_events
+from app.infrastructure.payos_gateway import shutdown_payos_gateway
+from app.infrastructure.payos_reconciler import shutdown_payos_reconciler, start_payos_reconciler
+from app.infrastructure.payos_webhooks import shutdown_webhook_worker, start_webhook_worker
+from app.services.DashboardService import shutdown_dashboard_executor
+from app.infrastructure.db.session import AsyncBackedSession, SessionLocal, async_engine
+from app.infrastructure.db.building_stats_events import register_building_stats_listeners
+from app.infrastructure.db.invoice_amount_events import register_invoice_amount_listeners
+from app.infrastructure.db.notification_counter_events import register_notification_counter_listeners
+from app.infrastructure.db.payment_status_events import register_payment_status_listeners
+from app.infrastructure.db.room_facets_events import register_room_facets_listeners
+from app.infrastructure.db.room_occupancy_events import register_room_occupancy_listeners
 from app.core.exceptions import AppException
 from app.core.exception_handlers import (
     app_exception_handler,
@@ -63,6 +77,64 @@ app.add_exception_handler(RequestValidationError, validation_exception_handler)
 app.add_exception_handler(Exception, generic_exception_handler)
 
 
+# ============ Lifecycle ============
+
+# Giữ bảng building_stats (dashboard) đồng bộ với các thay đổi phòng/hợp đồng/sự cố
+register_building_stats_listeners(SessionLocal)
+# Giữ rooms.current_occupants / active_contract_count khớp với hợp đồng
+register_room_occupancy_listeners(SessionLocal)
+# Giữ invoices.total_amount / amount_paid / amount_due khớp với hóa đơn và thanh toán
+register_invoice_amount_listeners(SessionLocal)
+# NOTIFY khi payment đổi sang trạng thái cuối (stream GET /payments/{id}/events)
+register_payment_status_listeners(SessionLocal)
+# Giữ notification_counters (badge chưa đọc) khớp với thông báo - ghi qua cả session async
+register_notification_counter_listeners(SessionLocal, AsyncBackedSession)
+# Xóa cache facet phòng (GET /rooms/facets) khi phòng/hợp đồng thay đổi
+register_room_facets_listeners(SessionLocal)
+
+
+@app.on_event("startup")
+def start_background_workers():
+    """Khởi động các worker nền (gửi email từ outbox, áp dụng webhook PayOS)."""
+    start_email_worker()
+    start_webhook_worker()
+
+
+@app.on_event("shutdown")
+def shutdown_background_workers():
+    """Dừng các worker nền (process pool xử lý ảnh, thread pool dashboard, email outbox, webhook PayOS) khi tắt ứng dụng."""
+    shutdown_executor()
+    shutdown_dashboard_executor()
+    shutdown_email_worker()
+    shutdown_webhook_worker()
+
+
+@app.on_event("shutdown")
+async def dispose_async_engine():
+    """Đóng pool kết nối asyncpg của các route async."""
+    await async_engine.dispose()
+
+
+@app.on_event("startup")
+async def start_payos_reconciler_task():
+    """Chạy job đối soát PayOS và LISTEN sự kiện payment trong event loop của app."""
+    start_payos_reconciler()
+    start_payment_events()
+
+
+@app.on_event("shutdown")
+async def close_payos_gateway():
+    """Dừng job đối soát rồi đóng pool kết nối HTTP tới PayOS."""
+    await shutdown_payos_reconciler()
+    await shutdown_payos_gateway()
+
+
+@app.on_event("shutdown")
+async def close_payment_events():
+    """Đóng kết nối LISTEN sự kiện payment."""
+    await shutdown_payment_events()
+
+
 # ============ Routes ============
 
 
@@ -0,0 +1,38 @@
+"""add storage_key to media tables
+
+Revision ID: 7c1e9a4d2b60
+Revises: ef3c1fe16dab
+Create Date: 2026-10-16 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c1e9a4d2b60'
+down_revision: Union[str, Sequence[str], None] = 'ef3c1fe16dab'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('room_photos', sa.Column('storage_key', sa.String(length=255), nullable=True))
+    op.create_index(op.f('ix_room_photos_storage_key'), 'room_photos', ['storage_key'], unique=False)
+    op.add_column('user_documents', sa.Column('storage_key', sa.String(length=255), nullable=True))
+    op.create_index(op.f('ix_user_documents_storage_key'), 'user_documents', ['storage_key'], unique=False)
+    op.add_column('maintenance_photos', sa.Column('storage_key', sa.String(length=255), nullable=True))
+    op.create_index(op.f('ix_maintenance_photos_storage_key'), 'maintenance_photos', ['storage_key'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_maintenance_photos_storage_key'), table_name='maintenance_photos')
+    op.drop_column('maintenance_photos', 'storage_key')
+    op.drop_index(op.f('ix_user_documents_storage_key'), table_name='user_documents')
+    op.drop_column('user_documents', 'storage_key')
+    op.drop_index(op.f('ix_room_photos_storage_key'), table_name='room_photos')
+    op.drop_column('room_photos', 'storage_key')
@@ -0,0 +1,71 @@
+"""add utilities catalog and rooms.utility_ids int array with GIN index
+
+Revision ID: a4d2b7e61c38
+Revises: f1a7c3e92b54
+Create Date: 2026-10-16 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4d2b7e61c38'
+down_revision: Union[str, Sequence[str], None] = 'f1a7c3e92b54'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'utilities',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('normalized_name', sa.String(length=100), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('normalized_name'),
+    )
+    op.add_column(
+        'rooms',
+        sa.Column('utility_ids', postgresql.ARRAY(sa.Integer()), server_default='{}', nullable=False),
+    )
+
+    # Backfill danh mục từ room_utilities: tên hiển thị là lần xuất hiện đầu tiên
+    # (f_unaccent từ migration f1a7c3e92b54, cùng chuẩn hóa với UtilityRepository)
+    op.execute(
+        """
+        INSERT INTO utilities (name, normalized_name)
+        SELECT DISTINCT ON (f_unaccent(lower(trim(utility_name))))
+               trim(utility_name), f_unaccent(lower(trim(utility_name)))
+        FROM room_utilities
+        WHERE trim(utility_name) <> ''
+        ORDER BY f_unaccent(lower(trim(utility_name))), created_at
+        """
+    )
+    op.execute(
+        """
+        UPDATE rooms
+        SET utility_ids = agg.ids
+        FROM (
+            SELECT ru.room_id, array_agg(DISTINCT u.id ORDER BY u.id) AS ids
+            FROM room_utilities ru
+            JOIN utilities u ON u.normalized_name = f_unaccent(lower(trim(ru.utility_name)))
+            GROUP BY ru.room_id
+        ) AS agg
+        WHERE rooms.id = agg.room_id
+        """
+    )
+
+    op.create_index('ix_rooms_utility_ids', 'rooms', ['utility_ids'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_rooms_utility_ids', table_name='rooms', postgresql_using='gin')
+    op.drop_column('rooms', 'utility_ids')
+    op.drop_table('utilities')
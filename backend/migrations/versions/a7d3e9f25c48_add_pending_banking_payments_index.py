@@ -0,0 +1,34 @@
+"""add partial index on pending banking payments for PayOS reconciliation
+
+Revision ID: a7d3e9f25c48
+Revises: f5c2d8e14b37
+Create Date: 2026-10-16 21:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7d3e9f25c48'
+down_revision: Union[str, Sequence[str], None] = 'f5c2d8e14b37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_payments_pending_banking_created_at',
+        'payments',
+        ['created_at'],
+        unique=False,
+        postgresql_where=sa.text("status = 'pending' AND method = 'banking'"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_payments_pending_banking_created_at', table_name='payments')
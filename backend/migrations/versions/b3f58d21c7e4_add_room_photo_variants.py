@@ -0,0 +1,49 @@
+"""add room_photo_variants and rooms.primary_thumbnail_url
+
+Revision ID: b3f58d21c7e4
+Revises: 7c1e9a4d2b60
+Create Date: 2026-10-16 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3f58d21c7e4'
+down_revision: Union[str, Sequence[str], None] = '7c1e9a4d2b60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'room_photo_variants',
+        sa.Column('photo_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('label', sa.String(length=20), nullable=False),
+        sa.Column('format', sa.String(length=10), nullable=False),
+        sa.Column('width', sa.Integer(), nullable=False),
+        sa.Column('height', sa.Integer(), nullable=False),
+        sa.Column('byte_size', sa.Integer(), nullable=False),
+        sa.Column('storage_key', sa.String(length=255), nullable=False),
+        sa.Column('url', sa.String(length=500), nullable=False),
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['photo_id'], ['room_photos.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('photo_id', 'label', 'format', name='uq_room_photo_variants_photo_label_format'),
+    )
+    op.create_index(op.f('ix_room_photo_variants_photo_id'), 'room_photo_variants', ['photo_id'], unique=False)
+    op.add_column('rooms', sa.Column('primary_thumbnail_url', sa.String(length=500), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('rooms', 'primary_thumbnail_url')
+    op.drop_index(op.f('ix_room_photo_variants_photo_id'), table_name='room_photo_variants')
+    op.drop_table('room_photo_variants')
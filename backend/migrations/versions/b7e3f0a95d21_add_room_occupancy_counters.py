@@ -0,0 +1,49 @@
+"""add denormalized rooms.current_occupants and rooms.active_contract_count
+
+Revision ID: b7e3f0a95d21
+Revises: a4d2b7e61c38
+Create Date: 2026-10-16 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e3f0a95d21'
+down_revision: Union[str, Sequence[str], None] = 'a4d2b7e61c38'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('rooms', sa.Column('current_occupants', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('rooms', sa.Column('active_contract_count', sa.Integer(), server_default='0', nullable=False))
+
+    # Backfill từ hợp đồng hiện có (cùng rule với scripts/reconcile_room_occupancy.py)
+    op.execute(
+        """
+        UPDATE rooms
+        SET current_occupants = agg.occupants,
+            active_contract_count = agg.active
+        FROM (
+            SELECT room_id,
+                   COALESCE(SUM(number_of_tenants) FILTER (
+                       WHERE status IN ('ACTIVE', 'PENDING', 'PENDING_UPDATE')
+                   ), 0) AS occupants,
+                   COUNT(*) FILTER (WHERE status = 'ACTIVE') AS active
+            FROM contracts
+            GROUP BY room_id
+        ) AS agg
+        WHERE rooms.id = agg.room_id
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('rooms', 'active_contract_count')
+    op.drop_column('rooms', 'current_occupants')
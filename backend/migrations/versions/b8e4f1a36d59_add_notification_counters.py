@@ -0,0 +1,57 @@
+"""add notification_counters and partial unread index on notifications
+
+Revision ID: b8e4f1a36d59
+Revises: a7d3e9f25c48
+Create Date: 2026-10-16 22:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8e4f1a36d59'
+down_revision: Union[str, Sequence[str], None] = 'a7d3e9f25c48'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'notification_counters',
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('total_count', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('unread_count', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id'),
+    )
+
+    # Backfill bộ đếm từ thông báo hiện có
+    op.execute(
+        """
+        INSERT INTO notification_counters (user_id, total_count, unread_count)
+        SELECT user_id, COUNT(*), COUNT(*) FILTER (WHERE NOT is_read)
+        FROM notifications
+        WHERE user_id IS NOT NULL
+        GROUP BY user_id
+        """
+    )
+
+    op.create_index(
+        'ix_notifications_user_unread',
+        'notifications',
+        ['user_id'],
+        unique=False,
+        postgresql_where=sa.text('NOT is_read'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_notifications_user_unread', table_name='notifications')
+    op.drop_table('notification_counters')
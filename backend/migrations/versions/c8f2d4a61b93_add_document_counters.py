@@ -0,0 +1,55 @@
+"""add document_counters for contract/invoice numbers
+
+Revision ID: c8f2d4a61b93
+Revises: b7e3f0a95d21
+Create Date: 2026-10-16 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c8f2d4a61b93'
+down_revision: Union[str, Sequence[str], None] = 'b7e3f0a95d21'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'document_counters',
+        sa.Column('prefix', sa.String(length=20), nullable=False),
+        sa.Column('period', sa.String(length=20), nullable=False),
+        sa.Column('last_value', sa.BigInteger(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('prefix', 'period'),
+    )
+
+    # Bộ đếm bắt đầu từ số lớn nhất đã dùng để không cấp trùng mã cũ
+    op.execute(
+        """
+        INSERT INTO document_counters (prefix, period, last_value)
+        SELECT 'HD', '', COALESCE(MAX(substring(contract_number FROM '^HD([0-9]+)$')::bigint), 0)
+        FROM contracts
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO document_counters (prefix, period, last_value)
+        SELECT 'INV',
+               substring(invoice_number FROM '^INV-([0-9]{6})-[0-9]+$'),
+               MAX(substring(invoice_number FROM '^INV-[0-9]{6}-([0-9]+)$')::bigint)
+        FROM invoices
+        WHERE invoice_number ~ '^INV-[0-9]{6}-[0-9]+$'
+        GROUP BY 2
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('document_counters')
@@ -0,0 +1,32 @@
+"""add (created_at, id) indexes for keyset pagination
+
+Revision ID: c9d4a7e1f352
+Revises: b3f58d21c7e4
+Create Date: 2026-10-16 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c9d4a7e1f352'
+down_revision: Union[str, Sequence[str], None] = 'b3f58d21c7e4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TABLES = ('rooms', 'invoices', 'contracts', 'users', 'maintenance_requests')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in TABLES:
+        op.create_index(f'ix_{table}_created_at_id', table, ['created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in TABLES:
+        op.drop_index(f'ix_{table}_created_at_id', table_name=table)
@@ -0,0 +1,96 @@
+"""add building_stats table for dashboard aggregates
+
+Revision ID: d2a6f0b8e913
+Revises: c9d4a7e1f352
+Create Date: 2026-10-16 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2a6f0b8e913'
+down_revision: Union[str, Sequence[str], None] = 'c9d4a7e1f352'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'building_stats',
+        sa.Column('building_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('total_rooms', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('empty_rooms', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('occupied_rooms', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('revenue', sa.DECIMAL(precision=18, scale=2), nullable=False, server_default='0'),
+        sa.Column('total_contracts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('active_contracts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('expired_contracts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('maintenance_total', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('maintenance_pending', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('maintenance_in_progress', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('maintenance_processed', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['building_id'], ['buildings.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('building_id'),
+    )
+    # Cho expiring_soon (đếm trực tiếp mỗi lần load dashboard)
+    op.create_index('ix_contracts_status_end_date', 'contracts', ['status', 'end_date'], unique=False)
+
+    # Backfill từ dữ liệu hiện có
+    op.execute(
+        """
+        INSERT INTO building_stats (
+            building_id, total_rooms, empty_rooms, occupied_rooms, revenue,
+            total_contracts, active_contracts, expired_contracts,
+            maintenance_total, maintenance_pending, maintenance_in_progress, maintenance_processed
+        )
+        SELECT
+            b.id,
+            COALESCE(r.total_rooms, 0), COALESCE(r.empty_rooms, 0),
+            COALESCE(r.occupied_rooms, 0), COALESCE(r.revenue, 0),
+            COALESCE(c.total_contracts, 0), COALESCE(c.active_contracts, 0),
+            COALESCE(c.expired_contracts, 0),
+            COALESCE(m.maintenance_total, 0), COALESCE(m.maintenance_pending, 0),
+            COALESCE(m.maintenance_in_progress, 0), COALESCE(m.maintenance_processed, 0)
+        FROM buildings b
+        LEFT JOIN (
+            SELECT building_id,
+                   COUNT(*) AS total_rooms,
+                   COUNT(*) FILTER (WHERE status = 'AVAILABLE') AS empty_rooms,
+                   COUNT(*) FILTER (WHERE status = 'OCCUPIED') AS occupied_rooms,
+                   COALESCE(SUM(base_price) FILTER (WHERE status = 'OCCUPIED'), 0) AS revenue
+            FROM rooms GROUP BY building_id
+        ) r ON r.building_id = b.id
+        LEFT JOIN (
+            SELECT rooms.building_id,
+                   COUNT(*) AS total_contracts,
+                   COUNT(*) FILTER (WHERE contracts.status = 'ACTIVE') AS active_contracts,
+                   COUNT(*) FILTER (WHERE contracts.status = 'EXPIRED') AS expired_contracts
+            FROM contracts JOIN rooms ON contracts.room_id = rooms.id
+            GROUP BY rooms.building_id
+        ) c ON c.building_id = b.id
+        LEFT JOIN (
+            SELECT rooms.building_id,
+                   COUNT(*) AS maintenance_total,
+                   COUNT(*) FILTER (WHERE maintenance_requests.status = 'PENDING') AS maintenance_pending,
+                   COUNT(*) FILTER (WHERE maintenance_requests.status = 'IN_PROGRESS') AS maintenance_in_progress,
+                   COUNT(*) FILTER (
+                       WHERE maintenance_requests.status IN ('COMPLETED', 'CANCELLED')
+                   ) AS maintenance_processed
+            FROM maintenance_requests JOIN rooms ON maintenance_requests.room_id = rooms.id
+            GROUP BY rooms.building_id
+        ) m ON m.building_id = b.id
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_contracts_status_end_date', table_name='contracts')
+    op.drop_table('building_stats')
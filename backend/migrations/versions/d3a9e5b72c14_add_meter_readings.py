@@ -0,0 +1,57 @@
+"""add meter_readings for imported electricity readings
+
+Revision ID: d3a9e5b72c14
+Revises: c8f2d4a61b93
+Create Date: 2026-10-16 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd3a9e5b72c14'
+down_revision: Union[str, Sequence[str], None] = 'c8f2d4a61b93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'meter_readings',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('batch_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('row_number', sa.Integer(), nullable=True),
+        sa.Column('room_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('contract_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('billing_month', sa.Date(), nullable=False),
+        sa.Column('reading_date', sa.Date(), nullable=True),
+        sa.Column('electricity_old_index', sa.Float(), nullable=True),
+        sa.Column('electricity_new_index', sa.Float(), nullable=False),
+        sa.Column('average_usage', sa.Float(), nullable=True),
+        sa.Column('warning', sa.Text(), nullable=True),
+        sa.Column('status', sa.String(length=20), nullable=False, server_default='STAGED'),
+        sa.Column('invoice_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('created_by', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['room_id'], ['rooms.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['contract_id'], ['contracts.id'], ondelete='SET NULL'),
+        sa.ForeignKeyConstraint(['invoice_id'], ['invoices.id'], ondelete='SET NULL'),
+        sa.ForeignKeyConstraint(['created_by'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('room_id', 'billing_month', name='uq_meter_readings_room_month'),
+    )
+    op.create_index(op.f('ix_meter_readings_batch_id'), 'meter_readings', ['batch_id'], unique=False)
+    op.create_index('ix_meter_readings_month_status', 'meter_readings', ['billing_month', 'status'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_meter_readings_month_status', table_name='meter_readings')
+    op.drop_index(op.f('ix_meter_readings_batch_id'), table_name='meter_readings')
+    op.drop_table('meter_readings')
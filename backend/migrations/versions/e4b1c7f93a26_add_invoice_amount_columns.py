@@ -0,0 +1,80 @@
+"""add stored total_amount, amount_paid, amount_due to invoices
+
+Revision ID: e4b1c7f93a26
+Revises: d3a9e5b72c14
+Create Date: 2026-10-16 19:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4b1c7f93a26'
+down_revision: Union[str, Sequence[str], None] = 'd3a9e5b72c14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for column in ('total_amount', 'amount_paid', 'amount_due'):
+        op.add_column(
+            'invoices',
+            sa.Column(column, sa.DECIMAL(precision=15, scale=2), nullable=False, server_default='0'),
+        )
+
+    # Backfill - cùng công thức với app.models.invoice.calculate_invoice_total
+    op.execute(
+        """
+        UPDATE invoices SET total_amount = round(
+            room_price
+            + COALESCE((electricity_new_index - electricity_old_index)::numeric * electricity_unit_price, 0)
+            + number_of_people * water_unit_price
+            + service_fee + internet_fee + parking_fee + other_fees,
+            2
+        )
+        """
+    )
+    op.execute(
+        """
+        UPDATE invoices i SET amount_paid = p.paid
+        FROM (
+            SELECT invoice_id, SUM(amount) AS paid
+            FROM payments
+            WHERE status = 'completed'
+            GROUP BY invoice_id
+        ) p
+        WHERE p.invoice_id = i.id
+        """
+    )
+    op.execute("UPDATE invoices SET amount_due = total_amount - amount_paid")
+
+    op.create_index('ix_invoices_total_amount_id', 'invoices', ['total_amount', 'id'], unique=False)
+    op.create_index(
+        'ix_invoices_billing_month_amounts',
+        'invoices',
+        ['billing_month'],
+        unique=False,
+        postgresql_include=['total_amount', 'amount_paid'],
+    )
+    op.create_index(
+        'ix_invoices_outstanding_due_date',
+        'invoices',
+        ['due_date'],
+        unique=False,
+        postgresql_include=['amount_due'],
+        postgresql_where=sa.text('amount_due > 0'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_invoices_outstanding_due_date', table_name='invoices')
+    op.drop_index('ix_invoices_billing_month_amounts', table_name='invoices')
+    op.drop_index('ix_invoices_total_amount_id', table_name='invoices')
+    op.drop_column('invoices', 'amount_due')
+    op.drop_column('invoices', 'amount_paid')
+    op.drop_column('invoices', 'total_amount')
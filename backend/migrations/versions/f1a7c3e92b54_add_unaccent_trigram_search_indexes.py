@@ -0,0 +1,58 @@
+"""add unaccent + pg_trgm search indexes for rooms, buildings and addresses
+
+Revision ID: f1a7c3e92b54
+Revises: e5b1c8d94a27
+Create Date: 2026-10-16 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1a7c3e92b54'
+down_revision: Union[str, Sequence[str], None] = 'e5b1c8d94a27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Biểu thức index phải trùng với app.core.search.normalized() và
+# RoomRepository.ROOM_SEARCH_TEXT
+SEARCH_INDEXES = [
+    (
+        'ix_rooms_search_trgm',
+        'rooms',
+        "f_unaccent(lower(room_number || ' ' || coalesce(room_name, '')))",
+    ),
+    ('ix_buildings_building_name_trgm', 'buildings', 'f_unaccent(lower(building_name))'),
+    ('ix_addresses_city_trgm', 'addresses', 'f_unaccent(lower(city))'),
+    ('ix_addresses_ward_trgm', 'addresses', 'f_unaccent(lower(ward))'),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS unaccent")
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    # unaccent() chỉ là STABLE (phụ thuộc search_path) nên không dùng được
+    # trong index; bọc lại với dictionary chỉ định rõ schema -> IMMUTABLE
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION f_unaccent(text) RETURNS text
+        LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+        AS $$ SELECT public.unaccent('public.unaccent'::regdictionary, $1) $$
+        """
+    )
+
+    for name, table, expression in SEARCH_INDEXES:
+        op.execute(f"CREATE INDEX {name} ON {table} USING gin ({expression} gin_trgm_ops)")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, _, _ in SEARCH_INDEXES:
+        op.execute(f"DROP INDEX IF EXISTS {name}")
+    op.execute("DROP FUNCTION IF EXISTS f_unaccent(text)")
+    # Giữ lại extension unaccent/pg_trgm: có thể đang được dùng ở nơi khác
@@ -0,0 +1,52 @@
+"""add payment_webhook_events inbox for PayOS webhooks
+
+Revision ID: f5c2d8e14b37
+Revises: e4b1c7f93a26
+Create Date: 2026-10-16 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f5c2d8e14b37'
+down_revision: Union[str, Sequence[str], None] = 'e4b1c7f93a26'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'payment_webhook_events',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('order_code', sa.BigInteger(), nullable=False),
+        sa.Column('reference', sa.String(length=100), nullable=False),
+        sa.Column('code', sa.String(length=10), nullable=False),
+        sa.Column('payload', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False, server_default='PENDING'),
+        sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('processed_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('order_code', 'reference', name='uq_payment_webhook_events_order_reference'),
+    )
+    op.create_index(
+        'ix_payment_webhook_events_pending',
+        'payment_webhook_events',
+        ['order_code', 'id'],
+        unique=False,
+        postgresql_where=sa.text("status = 'PENDING'"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_payment_webhook_events_pending', table_name='payment_webhook_events')
+    op.drop_table('payment_webhook_events')
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""Benchmark giữ chỗ hợp đồng đồng thời vào một phòng.
+
+Bắn song song nhiều lệnh ContractService.create_contract (mỗi lệnh một Session,
+như các request API) vào cùng một phòng. Script báo throughput, độ trễ, và kiểm
+tra phòng không bị overbook: số người giữ chỗ (bộ đếm và SUM từ hợp đồng) không
+vượt sức chứa. Hợp đồng tạo ra được xóa sau khi chạy (trừ khi --keep).
+
+Cần một phòng và một user có sẵn (ví dụ tài khoản CUSTOMER dùng để test).
+
+Usage:
+    python scripts/benchmark_contract_capacity.py --room-id <uuid> --tenant-id <uuid>
+    python scripts/benchmark_contract_capacity.py --room-id <uuid> --tenant-id <uuid> \\
+        --requests 200 --workers 20 --tenants-per-contract 1
+"""
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from decimal import Decimal
+from pathlib import Path
+from uuid import UUID, uuid4
+
+# Ensure project root is on sys.path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.core.Enum.contractEnum import ContractStatus
+from app.infrastructure.db.room_occupancy_events import register_room_occupancy_listeners
+from app.infrastructure.db.session import SessionLocal
+from app.models.contract import Contract
+from app.models.room import Room
+from app.repositories.room_repository import RoomRepository
+from app.schemas.contract_schema import ContractCreate
+from app.services.ContractService import ContractService
+
+# Giống main.py: bộ đếm số người của phòng phải được cập nhật khi tạo hợp đồng
+register_room_occupancy_listeners(SessionLocal)
+
+
+class Result:
+    """Kết quả gom từ các thread worker."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.created: list[UUID] = []
+        self.rejected = 0
+        self.errors: list[str] = []
+        self.latencies: list[float] = []
+
+    def record(self, latency: float, contract_id: UUID | None = None, rejected: bool = False, error: str | None = None):
+        with self.lock:
+            self.latencies.append(latency)
+            if contract_id is not None:
+                self.created.append(contract_id)
+            elif rejected:
+                self.rejected += 1
+            else:
+                self.errors.append(error or "unknown")
+
+
+def create_one(index: int, run_id: str, args, rental_price: Decimal, result: Result) -> None:
+    """Một lệnh tạo hợp đồng trong Session riêng."""
+    payload = ContractCreate(
+        contract_number=f"BENCH-{run_id}-{index:04d}",
+        room_id=args.room_id,
+        tenant_id=args.tenant_id,
+        start_date=date.today(),
+        end_date=date.today() + timedelta(days=365),
+        rental_price=rental_price,
+        deposit_amount=Decimal("0"),
+        number_of_tenants=args.tenants_per_contract,
+        status=args.status,
+        notes="benchmark_contract_capacity",
+    )
+    db = SessionLocal()
+    started = time.perf_counter()
+    try:
+        contract = ContractService(db).create_contract(payload, args.created_by or args.tenant_id)
+        result.record(time.perf_counter() - started, contract_id=contract.id)
+    except ValueError as exc:
+        db.rollback()
+        # Hết chỗ là kết quả mong đợi khi số yêu cầu vượt sức chứa
+        result.record(time.perf_counter() - started, rejected="chỗ trống" in str(exc), error=str(exc))
+    except Exception as exc:
+        db.rollback()
+        result.record(time.perf_counter() - started, error=f"{type(exc).__name__}: {exc}")
+    finally:
+        db.close()
+
+
+def cleanup(contract_ids: list[UUID], room_status: str, room_id: UUID) -> None:
+    """Xóa hợp đồng benchmark (qua ORM để bộ đếm được trừ lại) và trả trạng thái phòng."""
+    db = SessionLocal()
+    try:
+        for contract in db.query(Contract).filter(Contract.id.in_(contract_ids)).all():
+            db.delete(contract)
+        db.query(Room).filter(Room.id == room_id).update({Room.status: room_status})
+        db.commit()
+        print(f"🧹 Đã xóa {len(contract_ids)} hợp đồng benchmark")
+    finally:
+        db.close()
+
+
+def run(args) -> None:
+    """Chạy benchmark và in báo cáo; exit 1 nếu phòng bị overbook."""
+    db = SessionLocal()
+    result = Result()
+    try:
+        room = db.query(Room).filter(Room.id == args.room_id).first()
+        if not room:
+            print(f"❌ Không tìm thấy phòng {args.room_id}", file=sys.stderr)
+            sys.exit(1)
+        capacity = room.capacity
+        occupants_before = room.current_occupants
+        room_status = room.status
+        rental_price = room.base_price or Decimal("1000000")
+        db.rollback()
+
+        run_id = uuid4().hex[:8]
+        print("\n" + "=" * 60)
+        print("🏁 BENCHMARK CONTRACT CAPACITY")
+        print("=" * 60)
+        print(f"Phòng: {room.room_number} - sức chứa {capacity}, đang giữ chỗ {occupants_before}")
+        print(f"Yêu cầu: {args.requests} x {args.tenants_per_contract} người, {args.workers} worker, status {args.status}")
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.workers) as executor:
+            for index in range(args.requests):
+                executor.submit(create_one, index, run_id, args, rental_price, result)
+        elapsed = time.perf_counter() - started
+
+        # Đọc lại sau khi các worker đã commit
+        drift = {row.id: row for row in RoomRepository(db).find_occupancy_drift()}
+        room = db.query(Room).filter(Room.id == args.room_id).populate_existing().one()
+        stored = room.current_occupants
+        actual = drift[room.id].actual_occupants if room.id in drift else stored
+        expected_created = max(capacity - occupants_before, 0) // args.tenants_per_contract
+
+        latencies = sorted(result.latencies)
+        p95 = latencies[int(len(latencies) * 0.95) - 1] if latencies else 0.0
+        print("-" * 60)
+        print(f"⏱️  {elapsed:.2f}s - {args.requests / elapsed:.1f} yêu cầu/s")
+        if latencies:
+            print(f"   Độ trễ p50 {statistics.median(latencies) * 1000:.1f}ms, "
+                  f"p95 {p95 * 1000:.1f}ms, max {latencies[-1] * 1000:.1f}ms")
+        print(f"✅ Tạo thành công: {len(result.created)} (tối đa theo sức chứa: {expected_created})")
+        print(f"🚫 Từ chối vì hết chỗ: {result.rejected}")
+        if result.errors:
+            print(f"⚠️  Lỗi khác: {len(result.errors)}")
+            for message in sorted(set(result.errors))[:5]:
+                print(f"   - {message}")
+        print(f"👥 Giữ chỗ sau benchmark: bộ đếm {stored}, SUM hợp đồng {actual}, sức chứa {capacity}")
+
+        overbooked = max(stored, actual) > max(capacity, occupants_before)
+        if overbooked:
+            print("❌ OVERBOOK: số người giữ chỗ vượt sức chứa")
+        elif stored != actual:
+            print("❌ Bộ đếm lệch với hợp đồng")
+        else:
+            print("✅ Không overbook, bộ đếm khớp hợp đồng")
+        print("=" * 60 + "\n")
+
+        if not args.keep and result.created:
+            cleanup(result.created, room_status, args.room_id)
+
+        if overbooked or stored != actual:
+            sys.exit(1)
+    except Exception as exc:
+        db.rollback()
+        print(f"\n❌ Lỗi: {exc}", file=sys.stderr)
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark tạo hợp đồng đồng thời vào một phòng")
+    parser.add_argument("--room-id", type=UUID, required=True, help="Phòng dùng để benchmark")
+    parser.add_argument("--tenant-id", type=UUID, required=True, help="User làm khách thuê của các hợp đồng")
+    parser.add_argument("--created-by", type=UUID, default=None, help="User tạo hợp đồng (mặc định = tenant)")
+    parser.add_argument("--requests", type=int, default=50, help="Tổng số yêu cầu tạo hợp đồng")
+    parser.add_argument("--workers", type=int, default=10, help="Số yêu cầu chạy song song")
+    parser.add_argument("--tenants-per-contract", type=int, default=1, help="Số người của mỗi hợp đồng")
+    parser.add_argument(
+        "--status",
+        default=ContractStatus.PENDING.value,
+        choices=[ContractStatus.PENDING.value, ContractStatus.ACTIVE.value],
+        help="Trạng thái hợp đồng tạo ra (ACTIVE sẽ nâng quyền user lên TENANT)",
+    )
+    parser.add_argument("--keep", action="store_true", help="Giữ lại hợp đồng đã tạo (không dọn dẹp)")
+    run(parser.parse_args())
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""Benchmark tạo payment link đồng thời qua payos_gateway.
+
+Bắn song song nhiều lệnh ``payos_gateway.create_payment_link`` trong một event
+loop (như nhiều request checkout cùng lúc trên một worker uvicorn) và báo
+throughput, độ trễ, số request bị từ chối nhanh (quá tải/ngắt mạch). Chạy với
+fake server để không tạo đơn thật trên PayOS.
+
+Usage:
+    python scripts/fake_payos_server.py --latency-ms 200 &
+    python scripts/benchmark_payos_gateway.py --base-url http://localhost:8900
+    python scripts/benchmark_payos_gateway.py --base-url http://localhost:8900 \\
+        --requests 500 --concurrency 100
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Ensure project root is on sys.path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.core.settings import settings
+from app.infrastructure.payos_gateway import PayOSGateway, PayOSUnavailableError
+
+
+async def create_one(gateway: PayOSGateway, order_code: int, latencies: list, outcomes: dict) -> None:
+    started = time.perf_counter()
+    try:
+        await gateway.create_payment_link(order_code=order_code, amount=10000, description=f"BENCH{order_code % 100000}")
+        outcomes["ok"] += 1
+    except PayOSUnavailableError:
+        outcomes["rejected"] += 1
+    except Exception as exc:
+        outcomes["errors"].append(f"{type(exc).__name__}: {exc}")
+    finally:
+        latencies.append(time.perf_counter() - started)
+
+
+async def run(args) -> None:
+    """Chạy benchmark và in báo cáo; exit 1 nếu có lỗi không mong đợi."""
+    gateway = PayOSGateway()
+    latencies: list[float] = []
+    outcomes = {"ok": 0, "rejected": 0, "errors": []}
+    base_code = int(time.time() * 1000) % 10**9 * 1000
+
+    print("\n" + "=" * 60)
+    print("🏁 BENCHMARK PAYOS GATEWAY")
+    print("=" * 60)
+    print(f"PayOS: {settings.PAYOS_BASE_URL}")
+    print(f"Yêu cầu: {args.requests}, đồng thời {args.concurrency}, "
+          f"giới hạn gateway {settings.PAYOS_MAX_CONCURRENCY} request / {settings.PAYOS_MAX_CONNECTIONS} kết nối")
+
+    try:
+        started = time.perf_counter()
+        pending = set()
+        for index in range(args.requests):
+            if len(pending) >= args.concurrency:
+                _, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            pending.add(asyncio.create_task(create_one(gateway, base_code + index, latencies, outcomes)))
+        if pending:
+            await asyncio.wait(pending)
+        elapsed = time.perf_counter() - started
+    finally:
+        await gateway.aclose()
+
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95) - 1] if latencies else 0.0
+    print("-" * 60)
+    print(f"⏱️  {elapsed:.2f}s - {args.requests / elapsed:.1f} yêu cầu/s")
+    if latencies:
+        print(f"   Độ trễ p50 {statistics.median(latencies) * 1000:.1f}ms, "
+              f"p95 {p95 * 1000:.1f}ms, max {latencies[-1] * 1000:.1f}ms")
+    print(f"✅ Thành công: {outcomes['ok']}")
+    print(f"🚫 Từ chối nhanh (quá tải/ngắt mạch): {outcomes['rejected']}")
+    print(f"🔌 Circuit breaker: {gateway.breaker.state}")
+    if outcomes["errors"]:
+        print(f"⚠️  Lỗi khác: {len(outcomes['errors'])}")
+        for message in sorted(set(outcomes["errors"]))[:5]:
+            print(f"   - {message}")
+    print("=" * 60 + "\n")
+
+    if outcomes["errors"] and not args.allow_errors:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark tạo payment link đồng thời qua payos_gateway")
+    parser.add_argument("--base-url", default=None, help="PAYOS_BASE_URL (ví dụ fake server http://localhost:8900)")
+    parser.add_argument("--requests", type=int, default=200, help="Tổng số payment link")
+    parser.add_argument("--concurrency", type=int, default=50, help="Số yêu cầu chạy song song")
+    parser.add_argument("--allow-errors", action="store_true", help="Không exit 1 khi có lỗi (thử với --error-rate)")
+    cli_args = parser.parse_args()
+
+    if cli_args.base_url:
+        settings.PAYOS_BASE_URL = cli_args.base_url
+        # Fake server chấp nhận mọi client id/api key, chỉ cần checksum key trùng
+        settings.PAYOS_CLIENT_ID = settings.PAYOS_CLIENT_ID or "fake"
+        settings.PAYOS_API_KEY = settings.PAYOS_API_KEY or "fake"
+        settings.PAYOS_CHECKSUM_KEY = settings.PAYOS_CHECKSUM_KEY or "fake-checksum-key"
+
+    try:
+        asyncio.run(run(cli_args))
+    except Exception as exc:
+        print(f"\n❌ Lỗi: {exc}", file=sys.stderr)
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
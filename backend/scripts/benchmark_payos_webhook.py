@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""Burst test webhook PayOS: ack nhanh và chuyển trạng thái đúng một lần.
+
+Tạo N payment BANKING đang chờ cho một hóa đơn test, rồi bắn song song vào
+endpoint webhook của backend đang chạy: mỗi payment một sự kiện thành công gửi
+lặp ``--duplicates`` lần (PayOS retry) cộng một sự kiện khác reference đến sau.
+Báo độ trễ ack, chờ worker xả hộp thư rồi kiểm tra:
+
+- mỗi (orderCode, reference) chỉ có một dòng trong payment_webhook_events;
+- mọi payment COMPLETED, sự kiện đến sau bị IGNORED;
+- invoices.amount_paid tăng đúng N x amount (không cộng trùng).
+
+Dữ liệu test (payment, sự kiện) được xóa khi xong, trạng thái hóa đơn được trả
+lại; dùng ``--keep`` để giữ lại.
+
+Usage:
+    uvicorn main:app --port 8000 &
+    python scripts/benchmark_payos_webhook.py --invoice-id <uuid>
+    python scripts/benchmark_payos_webhook.py --invoice-id <uuid> \\
+        --payments 200 --duplicates 5 --concurrency 100
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+
+# Ensure project root is on sys.path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+import httpx
+from payos._crypto import CryptoProvider
+from sqlalchemy import func
+
+from app.core.Enum.webhookEnum import WebhookEventStatus
+from app.core.settings import settings
+from app.infrastructure.db.invoice_amount_events import register_invoice_amount_listeners
+from app.infrastructure.db.session import SessionLocal
+from app.models.invoice import Invoice
+from app.models.payment import Payment
+from app.models.payment_webhook_event import PaymentWebhookEvent
+
+
+def webhook_body(crypto: CryptoProvider, order_code: int, amount: int, reference: str) -> dict:
+    """Body webhook PayOS có chữ ký (giống scripts/fake_payos_server.py)."""
+    data = {
+        "orderCode": order_code,
+        "amount": amount,
+        "description": f"BENCH{order_code % 100000}",
+        "accountNumber": "0000000000",
+        "reference": reference,
+        "transactionDateTime": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "currency": "VND",
+        "paymentLinkId": uuid.uuid4().hex,
+        "code": "00",
+        "desc": "success",
+        "counterAccountBankName": "BENCH BANK",
+        "counterAccountNumber": "1111111111",
+    }
+    return {
+        "code": "00",
+        "desc": "success",
+        "success": True,
+        "data": data,
+        "signature": crypto.create_signature_from_object(data, settings.PAYOS_CHECKSUM_KEY),
+    }
+
+
+def seed_payments(db, invoice: Invoice, count: int, amount: int) -> dict[int, Payment]:
+    """Tạo payment BANKING đang chờ với order code riêng."""
+    base_code = int(time.time() * 1000) % 10**9 * 1000
+    payments = {}
+    for index in range(count):
+        order_code = base_code + index
+        payments[order_code] = Payment(
+            payment_id=uuid.uuid4(),
+            invoice_id=invoice.id,
+            amount=Decimal(amount),
+            method=Payment.PaymentMethod.BANKING,
+            status=Payment.PaymentStatus.PENDING,
+            banking_transaction_id=str(order_code),
+            note="benchmark_payos_webhook",
+        )
+    db.add_all(payments.values())
+    db.commit()
+    return payments
+
+
+async def fire(url: str, bodies: list[dict], concurrency: int) -> tuple[list[float], dict]:
+    """Gửi song song, trả về độ trễ ack và đếm kết quả."""
+    latencies: list[float] = []
+    outcomes = {"new": 0, "duplicate": 0, "errors": []}
+    slots = asyncio.Semaphore(concurrency)
+
+    async with httpx.AsyncClient(timeout=30, limits=httpx.Limits(max_connections=concurrency)) as client:
+        async def send(body: dict) -> None:
+            async with slots:
+                started = time.perf_counter()
+                try:
+                    response = await client.post(url, json=body)
+                    latencies.append(time.perf_counter() - started)
+                    if response.status_code != 200:
+                        outcomes["errors"].append(f"HTTP {response.status_code}: {response.text[:200]}")
+                    elif response.json().get("duplicate"):
+                        outcomes["duplicate"] += 1
+                    else:
+                        outcomes["new"] += 1
+                except Exception as exc:
+                    outcomes["errors"].append(f"{type(exc).__name__}: {exc}")
+
+        await asyncio.gather(*(send(body) for body in bodies))
+    return latencies, outcomes
+
+
+def wait_drained(db, order_codes: list[int], timeout: float) -> float:
+    """Chờ worker áp dụng hết sự kiện của các order code; trả về thời gian chờ."""
+    started = time.perf_counter()
+    while time.perf_counter() - started < timeout:
+        pending = db.query(func.count(PaymentWebhookEvent.id)).filter(
+            PaymentWebhookEvent.order_code.in_(order_codes),
+            PaymentWebhookEvent.status == WebhookEventStatus.PENDING.value,
+        ).scalar()
+        db.rollback()
+        if not pending:
+            return time.perf_counter() - started
+        time.sleep(0.2)
+    raise TimeoutError(f"Worker chưa xử lý xong sau {timeout:.0f}s (PAYOS_WEBHOOK_WORKER_ENABLED?)")
+
+
+def run(args) -> None:
+    """Chạy burst test và in báo cáo; exit 1 nếu sai lệch."""
+    register_invoice_amount_listeners(SessionLocal)
+    settings.PAYOS_CHECKSUM_KEY = settings.PAYOS_CHECKSUM_KEY or "fake-checksum-key"
+    crypto = CryptoProvider()
+    db = SessionLocal()
+    payments: dict[int, Payment] = {}
+    order_codes: list[int] = []
+    invoice = None
+    original_status = None
+    problems: list[str] = []
+
+    try:
+        invoice = db.query(Invoice).filter(Invoice.id == args.invoice_id).first()
+        if not invoice:
+            raise ValueError(f"Không tìm thấy hóa đơn {args.invoice_id}")
+        original_status = invoice.status
+        paid_before = invoice.amount_paid
+
+        print("\n" + "=" * 60)
+        print("🏁 BURST TEST WEBHOOK PAYOS")
+        print("=" * 60)
+        print(f"Endpoint: {args.url}")
+        print(f"Hóa đơn: {invoice.invoice_number} (đã trả {paid_before:,.0f})")
+        print(f"{args.payments} payment x ({args.duplicates} lần gửi lặp + 1 sự kiện đến sau), "
+              f"đồng thời {args.concurrency}")
+
+        payments = seed_payments(db, invoice, args.payments, args.amount)
+        order_codes = list(payments)
+        bodies = []
+        for order_code in order_codes:
+            first = webhook_body(crypto, order_code, args.amount, f"REF{order_code}")
+            bodies.extend([first] * args.duplicates)
+            bodies.append(webhook_body(crypto, order_code, args.amount, f"LATE{order_code}"))
+
+        started = time.perf_counter()
+        latencies, outcomes = asyncio.run(fire(args.url, bodies, args.concurrency))
+        elapsed = time.perf_counter() - started
+
+        latencies.sort()
+        p95 = latencies[int(len(latencies) * 0.95) - 1] if latencies else 0.0
+        print("-" * 60)
+        print(f"⏱️  {len(bodies)} webhook trong {elapsed:.2f}s - {len(bodies) / elapsed:.1f} webhook/s")
+        if latencies:
+            print(f"   Ack p50 {statistics.median(latencies) * 1000:.1f}ms, "
+                  f"p95 {p95 * 1000:.1f}ms, max {latencies[-1] * 1000:.1f}ms")
+        print(f"📥 Sự kiện mới: {outcomes['new']}, trùng: {outcomes['duplicate']}")
+        if outcomes["errors"]:
+            problems.append(f"{len(outcomes['errors'])} webhook lỗi, ví dụ: {outcomes['errors'][0]}")
+
+        drained = wait_drained(db, order_codes, args.timeout)
+        print(f"⚙️  Worker xả hộp thư sau {drained:.2f}s")
+
+        # Kiểm tra đúng một lần
+        expected_events = args.payments * 2
+        if outcomes["new"] != expected_events:
+            problems.append(f"{outcomes['new']} sự kiện mới, mong đợi {expected_events}")
+        counts = dict(
+            db.query(PaymentWebhookEvent.status, func.count(PaymentWebhookEvent.id))
+            .filter(PaymentWebhookEvent.order_code.in_(order_codes))
+            .group_by(PaymentWebhookEvent.status)
+            .all()
+        )
+        print(f"📊 Sự kiện theo trạng thái: {counts}")
+        if counts.get(WebhookEventStatus.PROCESSED.value, 0) != args.payments:
+            problems.append(f"{counts.get(WebhookEventStatus.PROCESSED.value, 0)} sự kiện PROCESSED, "
+                            f"mong đợi {args.payments}")
+
+        completed = db.query(func.count(Payment.id)).filter(
+            Payment.banking_transaction_id.in_([str(code) for code in order_codes]),
+            Payment.status == Payment.PaymentStatus.COMPLETED,
+        ).scalar()
+        if completed != args.payments:
+            problems.append(f"{completed}/{args.payments} payment COMPLETED")
+
+        db.refresh(invoice)
+        paid_delta = invoice.amount_paid - paid_before
+        expected_delta = Decimal(args.payments * args.amount)
+        print(f"💰 amount_paid tăng {paid_delta:,.0f} (mong đợi {expected_delta:,.0f})")
+        if paid_delta != expected_delta:
+            problems.append(f"amount_paid tăng {paid_delta}, mong đợi {expected_delta}")
+    finally:
+        db.rollback()
+        if order_codes and not args.keep:
+            # Xóa qua ORM để listener trừ lại invoices.amount_paid
+            for payment in db.query(Payment).filter(
+                Payment.banking_transaction_id.in_([str(code) for code in order_codes])
+            ):
+                db.delete(payment)
+            db.query(PaymentWebhookEvent).filter(
+                PaymentWebhookEvent.order_code.in_(order_codes)
+            ).delete(synchronize_session=False)
+            if invoice is not None:
+                invoice.status = original_status
+            db.commit()
+            print("🧹 Đã xóa dữ liệu test")
+        db.close()
+
+    if problems:
+        print("❌ Sai lệch:")
+        for problem in problems:
+            print(f"   - {problem}")
+    else:
+        print("✅ Mỗi payment chuyển trạng thái đúng một lần")
+    print("=" * 60 + "\n")
+    if problems:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Burst test webhook PayOS (ack nhanh, đúng một lần)")
+    parser.add_argument("--invoice-id", type=uuid.UUID, required=True, help="Hóa đơn test để gắn payment")
+    parser.add_argument("--url", default="http://localhost:8000/api/v1/payments/webhook/payos")
+    parser.add_argument("--payments", type=int, default=50, help="Số payment (order code)")
+    parser.add_argument("--duplicates", type=int, default=5, help="Số lần gửi lặp mỗi sự kiện")
+    parser.add_argument("--concurrency", type=int, default=50, help="Số webhook gửi song song")
+    parser.add_argument("--amount", type=int, default=1000, help="Số tiền mỗi payment")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Thời gian chờ worker tối đa (giây)")
+    parser.add_argument("--keep", action="store_true", help="Giữ lại payment/sự kiện test")
+    cli_args = parser.parse_args()
+
+    try:
+        run(cli_args)
+    except Exception as exc:
+        print(f"\n❌ Lỗi: {exc}", file=sys.stderr)
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""Fake PayOS server chạy local - dùng để test và chạy tải checkout.
+
+Giả lập các endpoint PayOS v2 mà ``app.infrastructure.payos_gateway`` gọi
+(tạo/xem/hủy payment link), ký response bằng checksum key giống PayOS thật nên
+SDK kiểm tra chữ ký được. Có thể thêm độ trễ và tỉ lệ lỗi 5xx để thử timeout
+và circuit breaker; ``POST /fake/payments/{order_code}/pay`` đánh dấu đã thanh
+toán và (nếu có ``--webhook-url``) gửi webhook như PayOS.
+
+Trạng thái lưu trong bộ nhớ, mất khi tắt server.
+
+Usage:
+    python scripts/fake_payos_server.py
+    python scripts/fake_payos_server.py --port 8900 --latency-ms 300 --jitter-ms 100 --error-rate 0.05
+    python scripts/fake_payos_server.py \\
+        --webhook-url http://localhost:8000/api/v1/payments/webhook/payos
+
+Backend dùng fake server:
+    PAYOS_BASE_URL=http://localhost:8900 PAYOS_CLIENT_ID=fake PAYOS_API_KEY=fake \\
+    PAYOS_CHECKSUM_KEY=<cùng --checksum-key> uvicorn main:app
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from uuid import uuid4
+
+# Ensure project root is on sys.path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+import httpx
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+from payos._crypto import CryptoProvider
+
+from app.core.settings import settings
+
+DEFAULT_CHECKSUM_KEY = "fake-checksum-key"
+
+
+def create_app(checksum_key: str, latency_ms: int = 0, jitter_ms: int = 0,
+               error_rate: float = 0.0, webhook_url: str | None = None) -> FastAPI:
+    """Tạo app fake PayOS với cấu hình độ trễ/lỗi."""
+    app = FastAPI(title="Fake PayOS")
+    crypto = CryptoProvider()
+    links: dict[int, dict] = {}
+
+    def signed(data: dict) -> JSONResponse:
+        return JSONResponse({
+            "code": "00",
+            "desc": "success",
+            "data": data,
+            "signature": crypto.create_signature_from_object(data, checksum_key),
+        })
+
+    def error(status_code: int, code: str, desc: str) -> JSONResponse:
+        return JSONResponse({"code": code, "desc": desc, "data": None, "signature": None}, status_code=status_code)
+
+    def find(link_id: str) -> dict | None:
+        if link_id.isdigit() and int(link_id) in links:
+            return links[int(link_id)]
+        return next((link for link in links.values() if link["id"] == link_id), None)
+
+    def link_data(link: dict) -> dict:
+        return {key: link[key] for key in (
+            "id", "orderCode", "amount", "amountPaid", "amountRemaining", "status",
+            "createdAt", "transactions", "cancellationReason", "canceledAt",
+        )}
+
+    @app.middleware("http")
+    async def simulate_network(request: Request, call_next):
+        if request.url.path.startswith("/v2/"):
+            delay = max(latency_ms + random.uniform(-jitter_ms, jitter_ms), 0)
+            if delay:
+                await asyncio.sleep(delay / 1000)
+            if error_rate and random.random() < error_rate:
+                return error(503, "99", "Fake PayOS: service unavailable")
+            if not request.headers.get("x-client-id") or not request.headers.get("x-api-key"):
+                return error(401, "401", "Missing x-client-id / x-api-key")
+        return await call_next(request)
+
+    @app.post("/v2/payment-requests")
+    async def create_payment_link(request: Request):
+        body = await request.json()
+        expected = crypto.create_signature_of_payment_request(body, checksum_key)
+        if not expected or body.get("signature") != expected:
+            return error(400, "20", "Chữ ký không hợp lệ")
+        order_code = int(body["orderCode"])
+        if order_code in links:
+            return error(400, "231", "Đơn thanh toán đã tồn tại")
+
+        link_id = uuid4().hex
+        links[order_code] = {
+            "id": link_id,
+            "orderCode": order_code,
+            "amount": body["amount"],
+            "amountPaid": 0,
+            "amountRemaining": body["amount"],
+            "status": "PENDING",
+            "createdAt": datetime.now(timezone.utc).isoformat(),
+            "transactions": [],
+            "cancellationReason": None,
+            "canceledAt": None,
+            "description": body["description"],
+        }
+        return signed({
+            "bin": "970422",
+            "accountNumber": "0000000000",
+            "accountName": "FAKE PAYOS",
+            "amount": body["amount"],
+            "description": body["description"],
+            "orderCode": order_code,
+            "currency": "VND",
+            "paymentLinkId": link_id,
+            "status": "PENDING",
+            "expiredAt": body.get("expiredAt"),
+            "checkoutUrl": f"{request.base_url}checkout/{link_id}",
+            "qrCode": f"FAKE-QR-{order_code}",
+        })
+
+    @app.get("/v2/payment-requests/{link_id}")
+    async def get_payment_link(link_id: str):
+        link = find(link_id)
+        if not link:
+            return error(404, "101", "Không tìm thấy đơn thanh toán")
+        return signed(link_data(link))
+
+    @app.post("/v2/payment-requests/{link_id}/cancel")
+    async def cancel_payment_link(link_id: str, request: Request):
+        link = find(link_id)
+        if not link:
+            return error(404, "101", "Không tìm thấy đơn thanh toán")
+        body = await request.json() if await request.body() else {}
+        link["status"] = "CANCELLED"
+        link["cancellationReason"] = body.get("cancellationReason")
+        link["canceledAt"] = datetime.now(timezone.utc).isoformat()
+        return signed(link_data(link))
+
+    @app.post("/fake/payments/{order_code}/pay")
+    async def pay(order_code: int):
+        """Đánh dấu đã thanh toán (giả lập khách quét QR) và gửi webhook nếu có."""
+        link = links.get(order_code)
+        if not link:
+            return error(404, "101", "Không tìm thấy đơn thanh toán")
+        link.update(status="PAID", amountPaid=link["amount"], amountRemaining=0)
+
+        webhook = None
+        if webhook_url:
+            data = {
+                "orderCode": order_code,
+                "amount": link["amount"],
+                "description": link["description"],
+                "accountNumber": "0000000000",
+                "reference": uuid4().hex[:12],
+                "transactionDateTime": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                "currency": "VND",
+                "paymentLinkId": link["id"],
+                "code": "00",
+                "desc": "success",
+                "counterAccountBankName": "FAKE BANK",
+                "counterAccountNumber": "1111111111",
+            }
+            payload = {
+                "code": "00",
+                "desc": "success",
+                "success": True,
+                "data": data,
+                "signature": crypto.create_signature_from_object(data, checksum_key),
+            }
+            async with httpx.AsyncClient(timeout=10) as client:
+                response = await client.post(webhook_url, json=payload)
+            webhook = response.status_code
+        return {"order_code": order_code, "status": "PAID", "webhook_status": webhook}
+
+    return app
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fake PayOS server cho test/load")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument(
+        "--checksum-key",
+        default=settings.PAYOS_CHECKSUM_KEY or DEFAULT_CHECKSUM_KEY,
+        help="Key ký response (phải trùng PAYOS_CHECKSUM_KEY của backend)",
+    )
+    parser.add_argument("--latency-ms", type=int, default=0, help="Độ trễ mỗi request")
+    parser.add_argument("--jitter-ms", type=int, default=0, help="Dao động độ trễ (+/-)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Tỉ lệ trả 503 (0-1)")
+    parser.add_argument("--webhook-url", default=None, help="URL nhận webhook khi gọi /fake/payments/{order_code}/pay")
+    args = parser.parse_args()
+
+    print("\n" + "=" * 60)
+    print("🧪 FAKE PAYOS SERVER")
+    print("=" * 60)
+    print(f"URL: http://{args.host}:{args.port}  (PAYOS_BASE_URL)")
+    print(f"Độ trễ: {args.latency_ms}±{args.jitter_ms}ms, lỗi 503: {args.error_rate:.0%}")
+    if args.webhook_url:
+        print(f"Webhook: {args.webhook_url}")
+    print("=" * 60 + "\n")
+
+    uvicorn.run(
+        create_app(args.checksum_key, args.latency_ms, args.jitter_ms, args.error_rate, args.webhook_url),
+        host=args.host,
+        port=args.port,
+        log_level="warning",
+    )
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""Tạo thumbnail cho các ảnh phòng chưa có variant và tính lại ảnh đại diện.
+
+Chạy sau ``migrate_media_to_blob_store.py`` (ảnh phải nằm trong blob store).
+Quét theo batch (keyset theo id); chạy lại an toàn.
+
+Usage:
+    python scripts/generate_room_thumbnails.py
+    python scripts/generate_room_thumbnails.py --batch-size 50
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+# Ensure project root is on sys.path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import exists, select
+
+from app.infrastructure.db.session import SessionLocal
+from app.infrastructure.imaging import collect_variants, shutdown_executor, submit_variants
+from app.infrastructure.storage import get_blob_store
+from app.models.room import Room
+from app.models.room_photo import RoomPhoto
+from app.models.room_photo_variant import RoomPhotoVariant
+from app.services.RoomService import RoomService
+
+
+def generate(batch_size: int) -> None:
+    """Tạo variants cho ảnh còn thiếu, sau đó refresh primary_thumbnail_url."""
+    db = SessionLocal()
+    store = get_blob_store()
+    try:
+        print("\n" + "=" * 60)
+        print("🖼️  TẠO THUMBNAIL ẢNH PHÒNG")
+        print("=" * 60)
+
+        last_id = None
+        processed = 0
+        touched_rooms: set = set()
+        while True:
+            stmt = (
+                select(RoomPhoto.id, RoomPhoto.room_id, RoomPhoto.storage_key)
+                .where(RoomPhoto.storage_key.is_not(None))
+                .where(~exists().where(RoomPhotoVariant.photo_id == RoomPhoto.id))
+            )
+            if last_id is not None:
+                stmt = stmt.where(RoomPhoto.id > last_id)
+            rows = db.execute(stmt.order_by(RoomPhoto.id).limit(batch_size)).all()
+            if not rows:
+                break
+
+            # Đẩy cả batch vào process pool rồi mới chờ kết quả
+            pending = []
+            for photo_id, room_id, key in rows:
+                last_id = photo_id
+                data = store.get(key)
+                if data is None:
+                    print(f"   ⚠️  Ảnh {photo_id}: không tìm thấy blob {key}")
+                    continue
+                pending.append((photo_id, room_id, submit_variants(data)))
+
+            for photo_id, room_id, future in pending:
+                for variant in collect_variants(future):
+                    blob = store.put(variant.data, variant.content_type)
+                    db.add(RoomPhotoVariant(
+                        photo_id=photo_id,
+                        label=variant.label,
+                        format=variant.format,
+                        width=variant.width,
+                        height=variant.height,
+                        byte_size=variant.byte_size,
+                        storage_key=blob.key,
+                        url=blob.url,
+                    ))
+                touched_rooms.add(room_id)
+                processed += 1
+
+            db.commit()
+            print(f"   … {processed} ảnh")
+
+        # Tính lại ảnh đại diện cho các phòng bị ảnh hưởng
+        room_service = RoomService(db)
+        for room in db.query(Room).filter(Room.id.in_(touched_rooms)).all() if touched_rooms else []:
+            room_service._refresh_primary_thumbnail(room)
+        db.commit()
+
+        print(f"✅ Đã tạo thumbnail cho {processed} ảnh, {len(touched_rooms)} phòng")
+        print("=" * 60 + "\n")
+    except Exception as exc:
+        db.rollback()
+        print(f"\n❌ Lỗi: {exc}", file=sys.stderr)
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+    finally:
+        db.close()
+        shutdown_executor()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tạo thumbnail cho ảnh phòng")
+    parser.add_argument("--batch-size", type=int, default=50, help="Số ảnh mỗi batch")
+
+    args = parser.parse_args()
+    generate(batch_size=args.batch_size)
+
+
+if __name__ == "__main__":
+    main()
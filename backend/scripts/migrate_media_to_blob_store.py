@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""Chuyển ảnh base64 đang lưu trong Postgres sang blob store.
+
+Quét theo batch (keyset theo id, không OFFSET) các bảng:
+- room_photos.image_base64
+- user_documents.url (data URL)
+- maintenance_photos.url (data URL)
+
+Mỗi batch: upload blob (content-addressed nên chạy lại an toàn), ghi key/URL
+vào DB, xóa base64 và commit. Có thể dừng giữa chừng và chạy lại.
+
+Tài liệu cá nhân và ảnh bảo trì được lưu vào vùng ``private/``. ``--privatize``
+chuyển thêm các blob của hai bảng này từng được lưu ở vùng public (trước khi có
+``private/``) sang vùng riêng tư và xóa bản public không còn ảnh phòng nào dùng.
+
+Usage:
+    python scripts/migrate_media_to_blob_store.py
+    python scripts/migrate_media_to_blob_store.py --batch-size 200 --dry-run
+    python scripts/migrate_media_to_blob_store.py --privatize
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+# Ensure project root is on sys.path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import select, update
+
+from app.infrastructure.db.session import SessionLocal
+from app.infrastructure.storage import PRIVATE_PREFIX, get_blob_store
+from app.models.maintenance_photo import MaintenancePhoto
+from app.models.room_photo import RoomPhoto
+from app.models.room_photo_variant import RoomPhotoVariant
+from app.models.user_document import UserDocument
+
+# Bảng chứa blob riêng tư (chỉ tải qua route /media/private)
+PRIVATE_MODELS = (UserDocument, MaintenancePhoto)
+
+
+def _migrate_column(db, model, column, clear_column: bool, batch_size: int, dry_run: bool) -> tuple[int, int]:
+    """Migrate một cột base64 của một bảng.
+
+    Args:
+        model: ORM model (RoomPhoto, UserDocument, MaintenancePhoto).
+        column: Cột chứa base64/data URL.
+        clear_column: True nếu cột base64 được set NULL sau khi migrate
+            (room_photos.image_base64); False nếu cột chính là url.
+        batch_size: Số row mỗi batch.
+        dry_run: Chỉ đếm, không ghi.
+
+    Returns:
+        Tuple (số row đã migrate, tổng bytes).
+    """
+    store = get_blob_store()
+    last_id = None
+    migrated = 0
+    total_bytes = 0
+
+    while True:
+        stmt = select(model.id, column).where(column.is_not(None))
+        if not clear_column:
+            stmt = stmt.where(column.like("data:%"))
+        if last_id is not None:
+            stmt = stmt.where(model.id > last_id)
+        rows = db.execute(stmt.order_by(model.id).limit(batch_size)).all()
+        if not rows:
+            break
+
+        for row_id, payload in rows:
+            last_id = row_id
+            try:
+                blob = store.put_data_url(payload, private=model in PRIVATE_MODELS) if not dry_run else None
+            except ValueError as exc:
+                print(f"   ⚠️  {model.__tablename__} {row_id}: bỏ qua ({exc})")
+                continue
+
+            migrated += 1
+            total_bytes += len(payload)
+            if dry_run:
+                continue
+
+            values = {"url": blob.url, "storage_key": blob.key}
+            if clear_column:
+                values[column.key] = None
+            db.execute(update(model).where(model.id == row_id).values(**values))
+
+        if not dry_run:
+            db.commit()
+        # Giải phóng payload của batch trước khỏi identity map
+        db.expunge_all()
+        print(f"   … {model.__tablename__}: {migrated} rows")
+
+    return migrated, total_bytes
+
+
+def _content_type(key: str) -> str:
+    """Content-type theo extension của key."""
+    ext = key.rsplit(".", 1)[-1]
+    return {
+        "png": "image/png",
+        "jpg": "image/jpeg",
+        "webp": "image/webp",
+        "gif": "image/gif",
+        "pdf": "application/pdf",
+    }.get(ext, "application/octet-stream")
+
+
+def _is_public_photo(db, key: str) -> bool:
+    """Blob có còn được ảnh phòng/thumbnail (public) dùng không."""
+    for model in (RoomPhoto, RoomPhotoVariant):
+        if db.execute(select(model.id).where(model.storage_key == key).limit(1)).first():
+            return True
+    return False
+
+
+def _privatize(db, model, batch_size: int, dry_run: bool) -> int:
+    """Chuyển blob public của một bảng riêng tư sang vùng ``private/``.
+
+    Returns:
+        Số row đã chuyển.
+    """
+    store = get_blob_store()
+    last_id = None
+    moved = 0
+
+    while True:
+        stmt = select(model.id, model.storage_key).where(
+            model.storage_key.is_not(None),
+            model.storage_key.not_like(f"{PRIVATE_PREFIX}%"),
+        )
+        if last_id is not None:
+            stmt = stmt.where(model.id > last_id)
+        rows = db.execute(stmt.order_by(model.id).limit(batch_size)).all()
+        if not rows:
+            break
+
+        old_keys = set()
+        for row_id, key in rows:
+            last_id = row_id
+            data = store.get(key)
+            if data is None:
+                print(f"   ⚠️  {model.__tablename__} {row_id}: không tìm thấy blob {key}")
+                continue
+            moved += 1
+            if dry_run:
+                continue
+
+            blob = store.put(data, _content_type(key), private=True)
+            db.execute(update(model).where(model.id == row_id).values(url=blob.url, storage_key=blob.key))
+            old_keys.add(key)
+
+        if not dry_run:
+            db.commit()
+            # Chỉ xóa bản public khi không còn row nào (public hoặc chưa chuyển) dùng nó
+            for key in old_keys:
+                still_used = _is_public_photo(db, key) or any(
+                    db.execute(select(m.id).where(m.storage_key == key).limit(1)).first()
+                    for m in PRIVATE_MODELS
+                )
+                if not still_used:
+                    store.delete(key)
+        db.expunge_all()
+        print(f"   … {model.__tablename__}: {moved} rows")
+
+    return moved
+
+
+def migrate(batch_size: int, dry_run: bool, privatize: bool = False) -> None:
+    """Chạy migrate cho tất cả các bảng media."""
+    db = SessionLocal()
+    try:
+        print("\n" + "=" * 60)
+        print("📦 MIGRATE BASE64 -> BLOB STORE" + (" (dry-run)" if dry_run else ""))
+        print("=" * 60)
+
+        targets = [
+            (RoomPhoto, RoomPhoto.image_base64, True),
+            (UserDocument, UserDocument.url, False),
+            (MaintenancePhoto, MaintenancePhoto.url, False),
+        ]
+        for model, column, clear_column in targets:
+            count, size = _migrate_column(db, model, column, clear_column, batch_size, dry_run)
+            print(f"✅ {model.__tablename__}: {count} rows, {size / 1024 / 1024:.1f} MB base64")
+
+        if privatize:
+            for model in PRIVATE_MODELS:
+                moved = _privatize(db, model, batch_size, dry_run)
+                print(f"🔒 {model.__tablename__}: {moved} blob chuyển sang vùng riêng tư")
+
+        print("=" * 60 + "\n")
+    except Exception as exc:
+        db.rollback()
+        print(f"\n❌ Lỗi: {exc}", file=sys.stderr)
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Chuyển ảnh base64 trong DB sang blob store")
+    parser.add_argument("--batch-size", type=int, default=100, help="Số row mỗi batch")
+    parser.add_argument("--dry-run", action="store_true", help="Chỉ thống kê, không ghi")
+    parser.add_argument(
+        "--privatize", action="store_true",
+        help="Chuyển blob tài liệu cá nhân/ảnh bảo trì cũ từ vùng public sang private/",
+    )
+
+    args = parser.parse_args()
+    migrate(batch_size=args.batch_size, dry_run=args.dry_run, privatize=args.privatize)
+
+
+if __name__ == "__main__":
+    main()
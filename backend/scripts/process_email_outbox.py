@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""Gửi các email đang chờ trong outbox.
+
+Dùng khi tắt worker trong app (EMAIL_WORKER_ENABLED=false) để chạy worker như
+một process riêng, hoặc để xả hàng đợi thủ công.
+
+Usage:
+    python scripts/process_email_outbox.py           # gửi hết email đến hạn rồi thoát
+    python scripts/process_email_outbox.py --loop    # chạy liên tục (Ctrl+C để dừng)
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import threading
+from pathlib import Path
+
+# Ensure project root is on sys.path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.infrastructure.mailer import EmailOutboxWorker
+
+
+def process(loop: bool) -> None:
+    """Xả outbox một lần hoặc chạy vòng lặp worker."""
+    worker = EmailOutboxWorker()
+    try:
+        print("\n" + "=" * 60)
+        print("📧 GỬI EMAIL TỪ OUTBOX")
+        print("=" * 60)
+
+        if loop:
+            print("   … đang chạy, Ctrl+C để dừng")
+            stop_event = threading.Event()
+            try:
+                worker.run(stop_event)
+            except KeyboardInterrupt:
+                stop_event.set()
+            print("✅ Đã dừng worker")
+        else:
+            processed = worker.drain()
+            print(f"✅ Đã xử lý {processed} email")
+        print("=" * 60 + "\n")
+    except Exception as exc:
+        print(f"\n❌ Lỗi: {exc}", file=sys.stderr)
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+    finally:
+        worker.connection.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gửi email từ bảng email_outbox")
+    parser.add_argument("--loop", action="store_true", help="Chạy liên tục như worker")
+
+    args = parser.parse_args()
+    process(loop=args.loop)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""Áp dụng các webhook PayOS đang chờ trong hộp thư (payment_webhook_events).
+
+Dùng khi tắt worker trong app (PAYOS_WEBHOOK_WORKER_ENABLED=false) để chạy
+worker như một process riêng, hoặc để xả hàng đợi thủ công.
+
+Usage:
+    python scripts/process_payment_webhooks.py           # áp dụng hết sự kiện chờ rồi thoát
+    python scripts/process_payment_webhooks.py --loop    # chạy liên tục (Ctrl+C để dừng)
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import threading
+from pathlib import Path
+
+# Ensure project root is on sys.path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.infrastructure.db.invoice_amount_events import register_invoice_amount_listeners
+from app.infrastructure.db.payment_status_events import register_payment_status_listeners
+from app.infrastructure.db.session import SessionLocal
+from app.infrastructure.payos_webhooks import PaymentWebhookWorker
+
+
+def process(loop: bool) -> None:
+    """Xả hộp thư webhook một lần hoặc chạy vòng lặp worker."""
+    # Payment COMPLETED phải cộng vào invoices.amount_paid và báo cho stream SSE như trong app
+    register_invoice_amount_listeners(SessionLocal)
+    register_payment_status_listeners(SessionLocal)
+    worker = PaymentWebhookWorker()
+    try:
+        print("\n" + "=" * 60)
+        print("💳 ÁP DỤNG WEBHOOK PAYOS")
+        print("=" * 60)
+
+        if loop:
+            print("   … đang chạy, Ctrl+C để dừng")
+            stop_event = threading.Event()
+            try:
+                worker.run(stop_event)
+            except KeyboardInterrupt:
+                stop_event.set()
+            print("✅ Đã dừng worker")
+        else:
+            processed = worker.drain()
+            print(f"✅ Đã xử lý {processed} sự kiện")
+        print("=" * 60 + "\n")
+    except Exception as exc:
+        print(f"\n❌ Lỗi: {exc}", file=sys.stderr)
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Áp dụng webhook PayOS từ bảng payment_webhook_events")
+    parser.add_argument("--loop", action="store_true", help="Chạy liên tục như worker")
+
+    args = parser.parse_args()
+    process(loop=args.loop)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""Đối soát payment PayOS đang chờ với PayOS (chạy tay hoặc như process riêng).
+
+Cùng logic với job nền trong app (``app.infrastructure.payos_reconciler``):
+lấy tất cả payment BANKING còn PENDING trong một query, hỏi PayOS với số request
+song song và tốc độ giới hạn, ghi kết quả mỗi batch trong một transaction.
+Dùng khi tắt job trong app (PAYOS_RECONCILE_ENABLED=false).
+
+Usage:
+    python scripts/reconcile_payos_payments.py                  # một lượt rồi thoát
+    python scripts/reconcile_payos_payments.py --min-age 0      # kể cả payment vừa tạo
+    python scripts/reconcile_payos_payments.py --loop           # chạy định kỳ (Ctrl+C để dừng)
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+# Ensure project root is on sys.path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.core.settings import settings
+from app.infrastructure.db.invoice_amount_events import register_invoice_amount_listeners
+from app.infrastructure.db.payment_status_events import register_payment_status_listeners
+from app.infrastructure.db.session import SessionLocal
+from app.infrastructure.payos_gateway import payos_gateway
+from app.infrastructure.payos_reconciler import PayOSReconciler, ReconcileStats
+
+
+def print_stats(stats: ReconcileStats) -> None:
+    if stats.skipped:
+        print("⏭️  Process khác đang đối soát, bỏ qua lượt này")
+        return
+    print(f"🔍 Đã kiểm tra: {stats.checked}")
+    print(f"✅ Đã thanh toán: {stats.completed}")
+    print(f"🚫 Đã hủy/hết hạn: {stats.cancelled}")
+    print(f"⚠️  Lỗi: {stats.errors}")
+    print(f"⏱️  Chờ lâu nhất {stats.lag_seconds:.0f}s, lượt chạy {stats.duration_seconds:.2f}s")
+
+
+async def reconcile(loop: bool) -> None:
+    """Một lượt đối soát hoặc chạy định kỳ."""
+    reconciler = PayOSReconciler()
+    print("\n" + "=" * 60)
+    print("🔄 ĐỐI SOÁT PAYMENT PAYOS")
+    print("=" * 60)
+    print(f"Payment chờ > {settings.PAYOS_RECONCILE_MIN_AGE_SECONDS}s, batch {settings.PAYOS_RECONCILE_BATCH_SIZE}, "
+          f"song song {settings.PAYOS_RECONCILE_CONCURRENCY}, {settings.PAYOS_RECONCILE_RATE_PER_SECOND:g} request/s")
+    try:
+        if loop:
+            print(f"   … chạy mỗi {settings.PAYOS_RECONCILE_INTERVAL_SECONDS:g}s, Ctrl+C để dừng")
+            try:
+                await reconciler.run(asyncio.Event())
+            finally:
+                print("-" * 60)
+                print_stats(reconciler.totals)
+        else:
+            print_stats(await reconciler.run_once())
+    finally:
+        await payos_gateway.aclose()
+    print("=" * 60 + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Đối soát payment PayOS đang chờ")
+    parser.add_argument("--loop", action="store_true", help="Chạy định kỳ như job nền")
+    parser.add_argument("--min-age", type=int, default=None, help="PAYOS_RECONCILE_MIN_AGE_SECONDS")
+    args = parser.parse_args()
+
+    if args.min_age is not None:
+        settings.PAYOS_RECONCILE_MIN_AGE_SECONDS = args.min_age
+    # Payment COMPLETED phải cộng vào invoices.amount_paid và báo cho stream SSE như trong app
+    register_invoice_amount_listeners(SessionLocal)
+    register_payment_status_listeners(SessionLocal)
+
+    try:
+        asyncio.run(reconcile(args.loop))
+    except KeyboardInterrupt:
+        print("✅ Đã dừng")
+    except Exception as exc:
+        print(f"\n❌ Lỗi: {exc}", file=sys.stderr)
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
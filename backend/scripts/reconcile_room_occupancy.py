@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""Đối soát bộ đếm rooms.current_occupants / rooms.active_contract_count với hợp đồng.
+
+Bình thường bộ đếm được cập nhật trong cùng transaction khi ghi hợp đồng qua
+API. Chạy script này sau khi import/sửa hợp đồng trực tiếp trong DB, hoặc định
+kỳ để phát hiện lệch. Mặc định chỉ báo cáo; thêm --fix để ghi lại giá trị đúng.
+
+Usage:
+    python scripts/reconcile_room_occupancy.py
+    python scripts/reconcile_room_occupancy.py --fix
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+# Ensure project root is on sys.path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.infrastructure.db.session import SessionLocal
+from app.repositories.room_repository import RoomRepository
+
+
+def reconcile(fix: bool) -> None:
+    """Tính lại bộ đếm cho tất cả phòng (set-based), báo lệch và sửa nếu ``fix``."""
+    db = SessionLocal()
+    try:
+        print("\n" + "=" * 60)
+        print("🔎 RECONCILE ROOM OCCUPANCY")
+        print("=" * 60)
+
+        repo = RoomRepository(db)
+        drift = repo.find_occupancy_drift(lock=fix)
+
+        if not drift:
+            print("✅ Không có phòng nào bị lệch")
+            print("=" * 60 + "\n")
+            return
+
+        print(f"⚠️  {len(drift)} phòng bị lệch:")
+        for row in drift:
+            print(
+                f"   - Phòng {row.room_number} ({row.id}): "
+                f"occupants {row.stored_occupants} → {row.actual_occupants}, "
+                f"active_contracts {row.stored_active} → {row.actual_active}"
+            )
+
+        if fix:
+            fixed = repo.fix_occupancy(drift)
+            db.commit()
+            print(f"✅ Đã sửa {fixed} phòng")
+        else:
+            print("ℹ️  Chạy lại với --fix để ghi giá trị đúng")
+        print("=" * 60 + "\n")
+    except Exception as exc:
+        db.rollback()
+        print(f"\n❌ Lỗi: {exc}", file=sys.stderr)
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Đối soát bộ đếm số người/hợp đồng của phòng")
+    parser.add_argument("--fix", action="store_true", help="Ghi lại giá trị đúng cho các phòng bị lệch")
+    args = parser.parse_args()
+    reconcile(args.fix)
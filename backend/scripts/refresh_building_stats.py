@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""Tính lại toàn bộ bảng building_stats (số liệu dashboard theo tòa nhà).
+
+Bình thường bảng được refresh tự động khi ghi phòng/hợp đồng/sự cố qua API.
+Chạy script này sau khi import/sửa dữ liệu trực tiếp trong DB.
+
+Usage:
+    python scripts/refresh_building_stats.py
+"""
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+# Ensure project root is on sys.path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import func, select
+
+from app.infrastructure.db.session import SessionLocal
+from app.models.building_stats import BuildingStats
+from app.repositories.building_stats_repository import BuildingStatsRepository
+
+
+def refresh() -> None:
+    """UPSERT thống kê cho tất cả tòa nhà trong một câu lệnh."""
+    db = SessionLocal()
+    try:
+        print("\n" + "=" * 60)
+        print("📊 REFRESH BUILDING STATS")
+        print("=" * 60)
+
+        BuildingStatsRepository(db).refresh()
+        db.commit()
+
+        count = db.execute(select(func.count()).select_from(BuildingStats)).scalar()
+        print(f"✅ Đã cập nhật thống kê cho {count} tòa nhà")
+        print("=" * 60 + "\n")
+    except Exception as exc:
+        db.rollback()
+        print(f"\n❌ Lỗi: {exc}", file=sys.stderr)
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    refresh()
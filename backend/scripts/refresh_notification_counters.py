@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""Tính lại toàn bộ bảng notification_counters (badge thông báo chưa đọc).
+
+Bình thường bộ đếm được cập nhật tự động khi tạo/đọc/xóa thông báo qua ORM.
+Chạy script này sau khi import/sửa thông báo trực tiếp trong DB (bulk UPDATE,
+SQL thô).
+
+Usage:
+    python scripts/refresh_notification_counters.py
+"""
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+# Ensure project root is on sys.path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import func, select
+
+from app.infrastructure.db.session import SessionLocal
+from app.models.notification_counter import NotificationCounter
+from app.repositories.notification_counter_repository import NotificationCounterRepository
+
+
+def refresh() -> None:
+    """UPSERT bộ đếm thông báo cho tất cả người dùng."""
+    db = SessionLocal()
+    try:
+        print("\n" + "=" * 60)
+        print("🔔 REFRESH NOTIFICATION COUNTERS")
+        print("=" * 60)
+
+        NotificationCounterRepository(db).refresh()
+        db.commit()
+
+        users, unread = db.execute(
+            select(func.count(), func.coalesce(func.sum(NotificationCounter.unread_count), 0))
+        ).one()
+        print(f"✅ Đã cập nhật bộ đếm cho {users} người dùng ({unread} thông báo chưa đọc)")
+        print("=" * 60 + "\n")
+    except Exception as exc:
+        db.rollback()
+        print(f"\n❌ Lỗi: {exc}", file=sys.stderr)
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    refresh()
@@ -0,0 +1,90 @@
+"""Tests cho DocumentNumberService - mã hợp đồng nhập tay và tự sinh.
+
+Để chạy test: pytest tests/test_document_numbers.py -v
+"""
+
+import re
+
+from app.services.DocumentNumberService import DocumentNumberService
+
+
+class FakeCounterRepository:
+    """Bộ đếm document_counters trong bộ nhớ."""
+
+    def __init__(self, last_value: int = 0):
+        self.last_value = last_value
+
+    def allocate(self, prefix, period="", count=1):
+        self.last_value += count
+        return range(self.last_value - count + 1, self.last_value + 1)
+
+    def raise_to(self, prefix, period, value):
+        self.last_value = max(self.last_value, value)
+
+
+class FakeContractRepository:
+    """Bảng contracts (chỉ cột contract_number) trong bộ nhớ."""
+
+    def __init__(self, numbers=()):
+        self.numbers = set(numbers)
+
+    def get_existing_numbers(self, contract_numbers):
+        return self.numbers & set(contract_numbers)
+
+    def get_max_sequence_number(self, prefix):
+        values = [
+            int(match.group(1))
+            for match in (re.match(rf"^{prefix}(\d+)$", number) for number in self.numbers)
+            if match
+        ]
+        return max(values, default=0)
+
+
+def make_service(last_value=0, existing=()):
+    service = DocumentNumberService.__new__(DocumentNumberService)
+    service.counter_repo = FakeCounterRepository(last_value)
+    service.contract_repo = FakeContractRepository(existing)
+    return service
+
+
+def create_contract(service, contract_number=None):
+    """Mô phỏng ContractService.create_contract (bước cấp mã + insert)."""
+    if contract_number:
+        service.note_contract_number(contract_number)
+    else:
+        contract_number = service.next_contract_number()
+    assert contract_number not in service.contract_repo.numbers, f"Trùng mã {contract_number}"
+    service.contract_repo.numbers.add(contract_number)
+    return contract_number
+
+
+def test_manual_number_ahead_of_counter_then_auto():
+    """Nhập tay HD005 khi bộ đếm ở 2: mã tự sinh tiếp theo là HD006, không kẹt ở HD005."""
+    service = make_service(last_value=2, existing={"HD001", "HD002"})
+
+    assert create_contract(service, "HD005") == "HD005"
+    assert create_contract(service) == "HD006"
+    assert create_contract(service) == "HD007"
+
+
+def test_auto_skips_manual_number_saved_before_counter_bump():
+    """Mã nhập tay đã lưu vượt bộ đếm (dữ liệu cũ) vẫn được bỏ qua."""
+    service = make_service(last_value=2, existing={"HD001", "HD002", "HD003", "HD005"})
+
+    assert create_contract(service) == "HD006"
+    assert create_contract(service) == "HD007"
+
+
+def test_manual_number_other_format_does_not_move_counter():
+    """Mã nhập tay không theo dạng HD<số> không ảnh hưởng bộ đếm."""
+    service = make_service(last_value=2, existing={"HD001", "HD002"})
+
+    assert create_contract(service, "HD-VIP-01") == "HD-VIP-01"
+    assert create_contract(service) == "HD003"
+
+
+def test_reserve_block_skips_existing_numbers():
+    """Cấp theo khối cũng không trả về mã đã tồn tại."""
+    service = make_service(last_value=0, existing={"HD002"})
+
+    assert service.reserve_contract_numbers(3) == ["HD004", "HD005", "HD006"]
@@ -0,0 +1,67 @@
+"""Tests cho BatchLoader - memo bị xóa bởi flush giữa lúc load_many.
+
+Để chạy test: pytest tests/test_loaders.py -v
+"""
+
+from uuid import uuid4
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from app.infrastructure.db.session import Base
+from app.models.notification import Notification
+from app.repositories.loaders import BatchLoader, get_loaders
+
+
+def make_session() -> Session:
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[Notification.__table__])
+    return Session(bind=engine)
+
+
+def test_load_many_survives_autoflush_clearing_memo():
+    """Key đã memo vẫn được trả về khi query của batch_fn autoflush và xóa memo."""
+    db = make_session()
+    loaders = get_loaders(db)
+    calls = []
+
+    def batch_fn(keys):
+        calls.append(list(keys))
+        # Query autoflush khi session có thay đổi -> listener after_flush xóa memo
+        db.execute(select(Notification.id)).all()
+        return {key: f"value-{key}" for key in keys}
+
+    loaders.occupancy = BatchLoader(batch_fn)
+    assert loaders.occupancy.load_many([1, 2]) == ["value-1", "value-2"]
+
+    db.add(Notification(
+        notification_id=uuid4(), user_id=None, title="t", content="c", type="SYSTEM", is_read=False,
+    ))
+    assert loaders.occupancy.load_many([1, 3, 2, 3]) == ["value-1", "value-3", "value-2", "value-3"]
+    assert calls == [[1, 2], [3]]
+    assert not db.new  # Đã autoflush trong batch_fn
+
+    db.close()
+
+
+def test_load_many_reloads_after_flush():
+    """Sau flush, memo được xóa và key được load lại."""
+    db = make_session()
+    loaders = get_loaders(db)
+    calls = []
+
+    def batch_fn(keys):
+        calls.append(list(keys))
+        return {key: len(calls) for key in keys}
+
+    loaders.occupancy = BatchLoader(batch_fn)
+    assert loaders.occupancy.load(1) == 1
+    assert loaders.occupancy.load(1) == 1
+    db.flush()
+    db.add(Notification(
+        notification_id=uuid4(), user_id=None, title="t", content="c", type="SYSTEM", is_read=False,
+    ))
+    db.flush()
+    assert loaders.occupancy.load(1) == 2
+
+    db.close()
@@ -0,0 +1,60 @@
+"""Tests cho việc đọc chỉ số điện trong MeterReadingService - dấu phân cách nghìn/thập phân.
+
+Để chạy test: pytest tests/test_meter_reading_parse.py -v
+"""
+
+import io
+import uuid
+from datetime import date
+
+import pytest
+
+from app.services.MeterReadingService import MeterReadingService, _parse_number
+
+
+class FakeMeterReadingRepository:
+    """validate_batch ghi lại các cột nhận được, không trả dòng nào."""
+
+    def __init__(self):
+        self.columns = None
+
+    def validate_batch(self, billing_month, building_id, columns, **kwargs):
+        self.columns = columns
+        return []
+
+
+def test_single_separator_with_three_digits_is_grouping():
+    """"1,250" và "1.250" đều là 1250 (phân cách nghìn), không phải 1.25."""
+    assert _parse_number("1,250", "Chỉ số mới") == 1250
+    assert _parse_number("1.250", "Chỉ số mới") == 1250
+    assert _parse_number("1.250.000", "Chỉ số mới") == 1250000
+
+
+def test_decimal_separator_still_accepted():
+    """Dấu thập phân rõ ràng vẫn đọc đúng."""
+    assert _parse_number("1250,5", "Chỉ số mới") == 1250.5
+    assert _parse_number("12.75", "Chỉ số mới") == 12.75
+    assert _parse_number("1.250,5", "Chỉ số mới") == 1250.5
+    assert _parse_number("1,250.5", "Chỉ số mới") == 1250.5
+
+
+@pytest.mark.parametrize("value", ["0,125", "1,25,0", "1.2.3", "12,50.5"])
+def test_ambiguous_separator_rejected(value):
+    """Chuỗi không xác định được dấu phân cách bị từ chối."""
+    with pytest.raises(ValueError, match="không rõ dấu phân cách"):
+        _parse_number(value, "Chỉ số mới")
+
+
+def test_import_reports_ambiguous_value_per_row():
+    """Dòng có chỉ số mơ hồ báo lỗi theo dòng; dòng "1.250" được đọc là 1250."""
+    service = MeterReadingService.__new__(MeterReadingService)
+    service.meter_repo = FakeMeterReadingRepository()
+    csv = "contract_number,new_index\nHD001,1.250\nHD002,\"1,25,0\"\n"
+
+    result = service.import_readings(
+        io.BytesIO(csv.encode()), "readings.csv", date(2025, 1, 1), None, uuid.uuid4(), dry_run=True
+    )
+
+    assert service.meter_repo.columns["new_index"] == [1250]
+    assert [(row.row_number, row.status) for row in result.rows] == [(3, "ERROR")]
+    assert "không rõ dấu phân cách" in result.rows[0].messages[0]
@@ -16,8 +16,10 @@ import React, { useState, useRef, useEffect } from 'react';
 import { Link } from 'react-router-dom';
 import { Menu } from 'lucide-react';
 import NotificationCenter from './NotificationCenter';
+import useMediaUrl from '@/hooks/useMediaUrl';
 
 export default function Header({ user, onLogout, onToggleSidebar }) {
+  const avatarSrc = useMediaUrl(user?.avatar);
   const [isDropdownOpen, setIsDropdownOpen] = useState(false);
   const dropdownRef = useRef(null);
   console.log(user);
@@ -73,7 +75,7 @@ export default function Header({ user, onLogout, onToggleSidebar }) {
               className="w-8 h-8 rounded-full bg-gray-200 border overflow-hidden hover:ring-2 hover:ring-gray-300 transition focus:outline-none"
             >
               <img 
-                src= {user.avatar ||"https://github.com/shadcn.png"}
+                src= {avatarSrc ||"https://github.com/shadcn.png"}
                 alt="Avatar" 
                 className="w-full h-full object-cover"
               />
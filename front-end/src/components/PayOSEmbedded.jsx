@@ -4,15 +4,15 @@ import { paymentService } from "@/services/paymentService";
 import { FaCheckCircle, FaSpinner } from "react-icons/fa";
 
 /**
- * PayOSEmbedded - Component hiển thị thông tin thanh toán PayOS với polling
+ * PayOSEmbedded - Component hiển thị thông tin thanh toán PayOS, nhận trạng thái qua SSE
  * 
  * @param {string} qrCode - Mã QR từ PayOS (VietQR format)
  * @param {string} checkoutUrl - URL checkout để mở trong tab mới
  * @param {string} amount - Số tiền thanh toán
  * @param {string} description - Mô tả thanh toán
- * @param {string} paymentId - ID của payment để polling kiểm tra trạng thái
+ * @param {string} paymentId - ID của payment để theo dõi trạng thái
  * @param {function} onPaymentSuccess - Callback khi thanh toán thành công
- * @param {number} pollingInterval - Khoảng thời gian polling (ms), mặc định 3000ms
+ * @param {number} pollingInterval - Khoảng thời gian polling dự phòng khi SSE lỗi (ms), mặc định 3000ms
  */
 const PayOSEmbedded = ({ 
   qrCode, 
@@ -26,70 +26,92 @@ const PayOSEmbedded = ({
   const [paymentStatus, setPaymentStatus] = useState("pending"); // pending | checking | success | failed
   const [countdown, setCountdown] = useState(null);
   const pollingRef = useRef(null);
+  const finishedRef = useRef(false);
   const countdownRef = useRef(null);
 
   /**
-   * Kiểm tra trạng thái thanh toán - Gọi API check-status để sync từ PayOS
+   * Xử lý trạng thái thanh toán nhận được (từ stream SSE hoặc polling dự phòng)
+   */
+  const handleStatus = useCallback((status) => {
+    const stopPolling = () => {
+      if (pollingRef.current) {
+        clearInterval(pollingRef.current);
+        pollingRef.current = null;
+      }
+    };
+
+    if (status === "completed") {
+      finishedRef.current = true;
+      setPaymentStatus("success");
+      stopPolling();
+      // Bắt đầu countdown trước khi callback
+      setCountdown(3);
+    } else if (status === "failed" || status === "cancelled") {
+      finishedRef.current = true;
+      setPaymentStatus("failed");
+      stopPolling();
+    } else {
+      setPaymentStatus("pending");
+    }
+  }, []);
+
+  /**
+   * Kiểm tra trạng thái thanh toán - Gọi API check-status (đọc DB, dự phòng khi SSE lỗi)
    */
   const checkPaymentStatus = useCallback(async () => {
     if (!paymentId) return;
 
     try {
       setPaymentStatus("checking");
-      
-      // Gọi API check-status để sync trạng thái từ PayOS
       const response = await paymentService.checkAndSyncPaymentStatus(paymentId);
-      const status = response?.status;
-
       console.log("Payment status check:", response);
-
-      if (status === "completed") {
-        setPaymentStatus("success");
-        // Dừng polling
-        if (pollingRef.current) {
-          clearInterval(pollingRef.current);
-          pollingRef.current = null;
-        }
-        // Bắt đầu countdown trước khi callback
-        setCountdown(3);
-      } else if (status === "failed" || status === "error") {
-        // Nếu error, vẫn tiếp tục polling
-        if (status === "error") {
-          setPaymentStatus("pending");
-        } else {
-          setPaymentStatus("failed");
-          if (pollingRef.current) {
-            clearInterval(pollingRef.current);
-            pollingRef.current = null;
-          }
-        }
-      } else {
-        setPaymentStatus("pending");
-      }
+      handleStatus(response?.status);
     } catch (error) {
       console.error("Error checking payment status:", error);
       setPaymentStatus("pending");
     }
-  }, [paymentId]);
+  }, [paymentId, handleStatus]);
 
   /**
-   * Bắt đầu polling khi có paymentId
+   * Nhận trạng thái qua stream SSE khi có paymentId; stream lỗi thì chuyển sang polling
    */
   useEffect(() => {
     if (!paymentId) return;
 
-    // Polling định kỳ
-    pollingRef.current = setInterval(checkPaymentStatus, pollingInterval);
+    let cancelled = false;
+    let unsubscribe = null;
+    finishedRef.current = false;
 
-    // Kiểm tra ngay lần đầu
-    checkPaymentStatus();
+    const connect = () => {
+      unsubscribe = paymentService.subscribePaymentEvents(
+        paymentId,
+        (event) => handleStatus(event.status),
+        (error) => {
+          if (cancelled || finishedRef.current) return;
+          if (error) {
+            console.error("Payment event stream error, fallback to polling:", error);
+            if (!pollingRef.current) {
+              checkPaymentStatus();
+              pollingRef.current = setInterval(checkPaymentStatus, pollingInterval);
+            }
+          } else {
+            // Server đóng stream định kỳ - kết nối lại
+            connect();
+          }
+        }
+      );
+    };
+    connect();
 
     return () => {
+      cancelled = true;
+      if (unsubscribe) unsubscribe();
       if (pollingRef.current) {
         clearInterval(pollingRef.current);
+        pollingRef.current = null;
       }
     };
-  }, [paymentId, pollingInterval, checkPaymentStatus]);
+  }, [paymentId, pollingInterval, checkPaymentStatus, handleStatus]);
 
   /**
    * Countdown và callback khi thanh toán thành công
@@ -4,6 +4,7 @@ import { zodResolver } from "@hookform/resolvers/zod";
 import { tenantSchema } from "../schema/tenantSchema";
 import { userService } from "@/services/userService";
 import { toast } from "sonner";
+import { loadMediaUrl } from "@/lib/media";
 
 export const useTenantForm = (isOpen, tenantToEdit, setFrontImage, setBackImage) => {
   const [isLoadingDetail, setIsLoadingDetail] = useState(false);
@@ -38,8 +39,9 @@ export const useTenantForm = (isOpen, tenantToEdit, setFrontImage, setBackImage)
           if (data.documents && Array.isArray(data.documents)) {
             const front = data.documents.find((d) => d.type === "CCCD_FRONT");
             const back = data.documents.find((d) => d.type === "CCCD_BACK");
-            if (front) setFrontImage({ preview: front.url, file: null, isExisting: true });
-            if (back) setBackImage({ preview: back.url, file: null, isExisting: true });
+            // Ảnh CCCD là ảnh riêng tư - tải kèm token
+            if (front) setFrontImage({ preview: await loadMediaUrl(front.url).catch(() => null), file: null, isExisting: true });
+            if (back) setBackImage({ preview: await loadMediaUrl(back.url).catch(() => null), file: null, isExisting: true });
           }
         } catch (error) {
           toast.error("Không tải được thông tin chi tiết");
@@ -0,0 +1,35 @@
+import { useEffect, useState } from "react";
+import { isPrivateMediaUrl, loadMediaUrl } from "@/lib/media";
+
+const useMediaUrl = (url) => {
+  const [src, setSrc] = useState(isPrivateMediaUrl(url) ? null : url);
+
+  useEffect(() => {
+    if (!isPrivateMediaUrl(url)) {
+      setSrc(url);
+      return undefined;
+    }
+
+    let objectUrl = null;
+    let cancelled = false;
+    setSrc(null);
+    loadMediaUrl(url)
+      .then((loaded) => {
+        objectUrl = loaded;
+        if (cancelled) URL.revokeObjectURL(loaded);
+        else setSrc(loaded);
+      })
+      .catch(() => {
+        if (!cancelled) setSrc(null);
+      });
+
+    return () => {
+      cancelled = true;
+      if (objectUrl) URL.revokeObjectURL(objectUrl);
+    };
+  }, [url]);
+
+  return src;
+};
+
+export default useMediaUrl;
@@ -0,0 +1,18 @@
+import api from "@/lib/api";
+
+// Tài liệu cá nhân (CCCD, avatar) và ảnh bảo trì chỉ tải được khi kèm token
+const PRIVATE_MEDIA_PATH = "/media/private/";
+
+export const isPrivateMediaUrl = (url) =>
+  typeof url === "string" && url.includes(PRIVATE_MEDIA_PATH);
+
+/**
+ * Trả về URL dùng được cho <img>: ảnh public giữ nguyên, ảnh riêng tư được tải
+ * kèm Authorization rồi chuyển thành object URL (nhớ URL.revokeObjectURL khi bỏ).
+ */
+export const loadMediaUrl = async (url) => {
+  if (!isPrivateMediaUrl(url)) return url;
+  const path = url.slice(url.indexOf(PRIVATE_MEDIA_PATH));
+  const response = await api.get(path, { responseType: "blob" });
+  return URL.createObjectURL(response.data);
+};
@@ -1,12 +1,15 @@
 import React from "react";
+import useMediaUrl from "@/hooks/useMediaUrl";
 
 const AccountChangePhone = ({ user }) => {
+  const avatarSrc = useMediaUrl(user?.avatar);
+
   return (
     <div className="w-full flex justify-center mt-6">
       <div className="w-[450px] bg-white p-8 rounded-xl shadow-lg border">
         <div className="flex flex-col items-center mb-4">
           <img
-            src={user?.avatar || "/img/avatar-default.png"}
+            src={avatarSrc || "/img/avatar-default.png"}
             alt="avatar"
             className="w-16 h-16 rounded-full border object-cover"
           />
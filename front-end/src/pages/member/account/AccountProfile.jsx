@@ -4,6 +4,7 @@ import { authService } from "@/services/authService";
 import { userService } from "@/services/userService";
 import { useAuth } from "@/context/AuthContext";
 import { toast } from "sonner";
+import { loadMediaUrl } from "@/lib/media";
 
 const AccountProfile = () => {
   const { user: currentUser, refreshUser } = useAuth();
@@ -62,11 +63,13 @@ const AccountProfile = () => {
           // Parse existing images from documents array
           if (data.documents && Array.isArray(data.documents)) {
             const images = {};
-            data.documents.forEach(doc => {
-              if (doc.type === "AVATAR") images.avatar = doc.url;
-              if (doc.type === "CCCD_FRONT") images.cccd_front = doc.url;
-              if (doc.type === "CCCD_BACK") images.cccd_back = doc.url;
-            });
+            // Tài liệu cá nhân là ảnh riêng tư - tải kèm token
+            await Promise.all(data.documents.map(async (doc) => {
+              const url = await loadMediaUrl(doc.url).catch(() => null);
+              if (doc.type === "AVATAR") images.avatar = url;
+              if (doc.type === "CCCD_FRONT") images.cccd_front = url;
+              if (doc.type === "CCCD_BACK") images.cccd_back = url;
+            }));
             setExistingImages(images);
           }
         }
@@ -22,6 +22,14 @@ import { useParams } from "react-router-dom";
 import { roomService } from "@/services/roomService";
 import AppointmentBookingForm from "@/components/AppointmentBookingForm";
 
+// Ảnh lưu ở blob store có url + thumbnail (variants); image_base64 chỉ còn ở dữ liệu cũ
+const getPhotoSrc = (photo, label) => {
+  if (!photo) return null;
+  if (typeof photo === "string") return photo;
+  const variant = label && photo.variants?.find((v) => v.label === label && v.format === "webp");
+  return variant?.url || photo.url || photo.image_base64 || null;
+};
+
 /**
  * RoomDetailPage - Trang chi tiết phòng cho thuê
  * 
@@ -112,7 +120,7 @@ const RoomDetailPage = () => {
             <img
               src={
                 roomInfor?.photos?.length > 0
-                  ? roomInfor?.photos?.[activeImageIndex]?.image_base64
+                  ? getPhotoSrc(roomInfor.photos[activeImageIndex])
                   : "https://placehold.net/1280x720.png?text=Chưa+có+ảnh"
               }
               alt={roomInfor?.room_name || "Ảnh phòng"}
@@ -160,7 +168,7 @@ const RoomDetailPage = () => {
                   className="flex-shrink-0"
                 >
                   <img
-                    src={img?.image_base64 || img}
+                    src={getPhotoSrc(img, "w320")}
                     alt={`Thumbnail ${idx + 1}`}
                     className={`w-20 h-20 object-cover rounded-lg transition-all ${
                       activeImageIndex === idx
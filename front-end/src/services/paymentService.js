@@ -1,5 +1,20 @@
 import api from "@/lib/api";
 
+/**
+ * Access token trong localStorage (giống request interceptor của api).
+ */
+const getAccessToken = () => {
+  const rawToken = localStorage.getItem("token");
+  if (!rawToken) return null;
+  try {
+    const parsed = JSON.parse(rawToken);
+    if (parsed && parsed.access_token) return parsed.access_token;
+  } catch {
+    // Token is not JSON, use as-is
+  }
+  return rawToken;
+};
+
 /**
  * Payment Service - Xử lý thanh toán hoá đơn.
  * 
@@ -53,17 +68,69 @@ export const paymentService = {
   },
 
   /**
-   * Kiểm tra và sync trạng thái thanh toán từ PayOS.
-   * Dùng khi polling hoặc webhook không hoạt động.
+   * Lấy trạng thái thanh toán hiện tại (đọc từ database, không gọi PayOS).
+   * Dùng làm dự phòng khi stream SSE không kết nối được.
    * 
    * @param {string} paymentId - UUID của payment
-   * @returns {Promise<Object>} - { status, message, payment_id, payos_status }
+   * @returns {Promise<Object>} - { status, message, payment_id, paid_at }
    */
   checkAndSyncPaymentStatus: async (paymentId) => {
     const response = await api.post(`/payments/${paymentId}/check-status`);
     return response.data?.data || response.data;
   },
 
+  /**
+   * Nhận trạng thái thanh toán qua stream SSE (GET /payments/{id}/events).
+   * Dùng fetch thay cho EventSource để gửi được header Authorization.
+   *
+   * @param {string} paymentId - UUID của payment
+   * @param {function} onEvent - Gọi với { status, payment_id, ... } mỗi khi có sự kiện
+   * @param {function} onClose - Gọi khi stream đóng (kèm lỗi nếu có)
+   * @returns {function} - Hàm huỷ stream
+   */
+  subscribePaymentEvents: (paymentId, onEvent, onClose) => {
+    const controller = new AbortController();
+    const token = getAccessToken();
+
+    (async () => {
+      try {
+        const response = await fetch(`${api.defaults.baseURL}/payments/${paymentId}/events`, {
+          headers: token ? { Authorization: `Bearer ${token}` } : {},
+          signal: controller.signal,
+        });
+        if (!response.ok || !response.body) {
+          throw new Error(`SSE HTTP ${response.status}`);
+        }
+
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = "";
+        for (;;) {
+          const { done, value } = await reader.read();
+          if (done) break;
+          buffer += decoder.decode(value, { stream: true });
+          // Mỗi sự kiện SSE kết thúc bằng một dòng trống
+          let boundary;
+          while ((boundary = buffer.indexOf("\n\n")) !== -1) {
+            const block = buffer.slice(0, boundary);
+            buffer = buffer.slice(boundary + 2);
+            const data = block
+              .split("\n")
+              .filter((line) => line.startsWith("data:"))
+              .map((line) => line.slice(5).trim())
+              .join("\n");
+            if (data) onEvent(JSON.parse(data));
+          }
+        }
+        onClose?.();
+      } catch (error) {
+        if (!controller.signal.aborted) onClose?.(error);
+      }
+    })();
+
+    return () => controller.abort();
+  },
+
   /**
    * Lấy danh sách payments theo invoice.
    * 